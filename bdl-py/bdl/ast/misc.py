@@ -0,0 +1,56 @@
+import re
+from typing import List
+
+from bdl.parser.bdl_parser import (
+    Attribute,
+    BdlAst,
+    Identifier,
+    Import,
+    ModuleLevelStatement,
+    PathItem,
+)
+from bdl.parser.parser import Span
+
+_DASH_CONTENT_PREFIX_PATTERN = re.compile(r"^- ?")
+_PIPE_CONTENT_PREFIX_PATTERN = re.compile(r"^\s*\|\x20?")
+
+
+def slice_span(text: str, span: Span) -> str:
+    """
+    `text` may also be the UTF-8 bytes given to `parse_bdl_bytes`, in which
+    case the slice is decoded.
+    """
+    result = text[span.start : span.end]
+    if type(result) is str:
+        return result
+    return str(result, "utf-8")
+
+
+def is_import(statement: ModuleLevelStatement) -> bool:
+    return statement.type == "Import"
+
+
+def path_items_to_string(text: str, path_items: List[PathItem]) -> str:
+    return ".".join(
+        slice_span(text, item.span) for item in path_items if type(item) is Identifier
+    )
+
+
+def get_import_paths(text: str, bdl_ast: BdlAst) -> List[str]:
+    return [
+        path_items_to_string(text, statement.path)
+        for statement in bdl_ast.statements
+        if type(statement) is Import
+    ]
+
+
+def get_attribute_content(text: str, attribute: Attribute) -> str:
+    if attribute.content is None:
+        return ""
+    content = slice_span(text, attribute.content)
+    if content.startswith("-"):
+        return _DASH_CONTENT_PREFIX_PATTERN.sub("", content, count=1).strip()
+    return "\n".join(
+        _PIPE_CONTENT_PREFIX_PATTERN.sub("", line, count=1)
+        for line in content.split("\n")
+    )
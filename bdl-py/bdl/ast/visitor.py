@@ -0,0 +1,267 @@
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from bdl.parser.bdl_parser import (
+    Attribute,
+    BdlAst,
+    Container,
+    Custom,
+    Enum,
+    EnumItem,
+    Import,
+    ImportItem,
+    Oneof,
+    OneofItem,
+    Proc,
+    Struct,
+    StructField,
+    TypeExpression,
+    Union,
+    UnionItem,
+)
+from bdl.parser.parser import Span
+
+# Counterpart of `bdl-ts/src/ast/visitor.ts`, visiting the same nodes in the
+# same order. There a visitor is an object of `visitX` functions that call
+# each other down the tree; here `walk` drives the traversal with an explicit
+# stack, and finds the method for a node in a table built once per visitor
+# class, keyed by the node's class.
+
+# Returned by a visit method to leave the node's children out of the walk.
+SKIP = object()
+
+# Node class -> method a visitor defines to visit it.
+VISIT_METHOD_NAMES: Dict[type, str] = {
+    BdlAst: "visit_bdl_ast",
+    Attribute: "visit_attribute",
+    Import: "visit_import",
+    ImportItem: "visit_import_item",
+    Custom: "visit_custom",
+    Enum: "visit_enum",
+    EnumItem: "visit_enum_item",
+    Oneof: "visit_oneof",
+    OneofItem: "visit_oneof_item",
+    Proc: "visit_proc",
+    Struct: "visit_struct",
+    StructField: "visit_struct_field",
+    Union: "visit_union",
+    UnionItem: "visit_union_item",
+    TypeExpression: "visit_type_expression",
+    Container: "visit_container",
+    Span: "visit_span",
+}
+
+
+class Visitor:
+    """
+    Base of AST visitors. A visitor defines `visit_<kind>(self, node)` for
+    the node kinds it acts on (`VISIT_METHOD_NAMES`) and nothing else::
+
+        class FieldNames(Visitor):
+            def __init__(self, text):
+                self.text = text
+                self.names = []
+
+            def visit_struct_field(self, node):
+                self.names.append(self.text[node.name.start : node.name.end])
+
+        walk(bdl_ast, FieldNames(text))
+
+    Nodes are visited parent first, children in source order. Returning
+    `SKIP` leaves the children of a node out. Subtrees that can't contain a
+    kind the visitor defines a method for are never entered, so a visitor
+    of struct fields doesn't pay for attributes or type expressions.
+
+    Methods are looked up on the class, once; assigning them to an instance
+    has no effect.
+    """
+
+
+# How to reach one kind of child of a node: getter, whether it returns a
+# list (else a node or None), and the classes the children can be.
+_Slot = Tuple[Callable[[Any], Any], bool, Tuple[type, ...]]
+Push = Callable[[List[Any], Any], None]
+
+_attributes: _Slot = (attrgetter("attributes"), True, (Attribute,))
+_name: _Slot = (attrgetter("name"), False, (Span,))
+
+# Node class -> its slots, in source order.
+_SLOTS: Dict[type, Tuple[_Slot, ...]] = {
+    BdlAst: (
+        _attributes,
+        (
+            attrgetter("statements"),
+            True,
+            (Import, Custom, Enum, Oneof, Proc, Struct, Union),
+        ),
+    ),
+    Attribute: (_name, (attrgetter("content"), False, (Span,))),
+    Import: (
+        _attributes,
+        (lambda node: [path_item.span for path_item in node.path], True, (Span,)),
+        (attrgetter("items"), True, (ImportItem,)),
+    ),
+    ImportItem: (
+        _name,
+        (lambda node: node.alias and node.alias.name, False, (Span,)),
+    ),
+    Custom: (
+        _attributes,
+        _name,
+        (attrgetter("original_type"), False, (TypeExpression,)),
+    ),
+    Enum: (_attributes, _name, (attrgetter("items"), True, (EnumItem,))),
+    EnumItem: (_attributes, _name),
+    Oneof: (_attributes, _name, (attrgetter("items"), True, (OneofItem,))),
+    OneofItem: (_attributes, (attrgetter("item_type"), False, (TypeExpression,))),
+    Proc: (
+        _attributes,
+        _name,
+        (attrgetter("input_type"), False, (TypeExpression,)),
+        (attrgetter("output_type"), False, (TypeExpression,)),
+        (lambda node: node.error and node.error.error_type, False, (TypeExpression,)),
+    ),
+    Struct: (_attributes, _name, (attrgetter("fields"), True, (StructField,))),
+    StructField: (
+        _attributes,
+        _name,
+        (attrgetter("question"), False, (Span,)),
+        (attrgetter("field_type"), False, (TypeExpression,)),
+    ),
+    Union: (_attributes, _name, (attrgetter("items"), True, (UnionItem,))),
+    UnionItem: (
+        _attributes,
+        _name,
+        (lambda node: node.struct.fields if node.struct else (), True, (StructField,)),
+    ),
+    TypeExpression: (
+        (attrgetter("value_type"), False, (Span,)),
+        (attrgetter("container"), False, (Container,)),
+    ),
+    Container: ((attrgetter("key_type"), False, (Span,)),),
+    Span: (),
+}
+
+
+def _get_descendant_classes(node_class: type) -> Set[type]:
+    result: Set[type] = set()
+    queue = [child for slot in _SLOTS[node_class] for child in slot[2]]
+    for child_class in queue:
+        if child_class not in result:
+            result.add(child_class)
+            queue.extend(child for slot in _SLOTS[child_class] for child in slot[2])
+    return result
+
+
+def _compile_push(slots: Tuple[_Slot, ...]) -> Optional[Push]:
+    """
+    Pushes the children in `slots` onto the stack, last child first.
+    """
+    if not slots:
+        return None
+    if len(slots) == 1:
+        get, is_list, _ = slots[0]
+        if is_list:
+
+            def push_list(stack: List[Any], node: Any) -> None:
+                stack.extend(reversed(get(node)))
+
+            return push_list
+
+        def push_node(stack: List[Any], node: Any) -> None:
+            child = get(node)
+            if child is not None:
+                stack.append(child)
+
+        return push_node
+    reversed_slots = [(get, is_list) for get, is_list, _ in reversed(slots)]
+
+    def push(stack: List[Any], node: Any) -> None:
+        for get, is_list in reversed_slots:
+            if is_list:
+                stack.extend(reversed(get(node)))
+            else:
+                child = get(node)
+                if child is not None:
+                    stack.append(child)
+
+    return push
+
+
+_DESCENDANT_CLASSES = {
+    node_class: _get_descendant_classes(node_class) for node_class in _SLOTS
+}
+_PUSH_ALL = {node_class: _compile_push(slots) for node_class, slots in _SLOTS.items()}
+
+# Visit method or None, and children pusher or None.
+_Entry = Tuple[Optional[Callable[[Any, Any], Any]], Optional[Push]]
+
+
+@dataclass(slots=True)
+class _DispatchTable:
+    entries: Dict[type, _Entry]
+
+
+_dispatch_tables: Dict[type, _DispatchTable] = {}
+
+
+def _get_dispatch_table(visitor_class: type) -> _DispatchTable:
+    """
+    Per node class, the method of `visitor_class` visiting it and a pusher
+    of only the children that can lead to another visited node.
+    """
+    table = _dispatch_tables.get(visitor_class)
+    if table is None:
+        visit_fns = {
+            node_class: getattr(visitor_class, method_name, None)
+            for node_class, method_name in VISIT_METHOD_NAMES.items()
+        }
+        visited = {node_class for node_class, fn in visit_fns.items() if fn}
+
+        def leads_to_visited(slot: _Slot) -> bool:
+            return any(
+                child in visited or _DESCENDANT_CLASSES[child] & visited
+                for child in slot[2]
+            )
+
+        table = _dispatch_tables[visitor_class] = _DispatchTable(
+            entries={
+                node_class: (
+                    visit_fns[node_class],
+                    _compile_push(tuple(filter(leads_to_visited, slots))),
+                )
+                for node_class, slots in _SLOTS.items()
+            }
+        )
+    return table
+
+
+def walk(node: Any, visitor: Visitor) -> None:
+    """
+    Visits `node` and everything below it, depth first, without recursion.
+    """
+    entries = _get_dispatch_table(type(visitor)).entries
+    stack = [node]
+    pop = stack.pop
+    while stack:
+        node = pop()
+        visit, push = entries[type(node)]
+        if visit is not None and visit(visitor, node) is SKIP:
+            continue
+        if push is not None:
+            push(stack, node)
+
+
+def iter_nodes(node: Any) -> Iterator[Any]:
+    """
+    `node` and everything below it, in the order `walk` visits them.
+    """
+    stack = [node]
+    pop = stack.pop
+    while stack:
+        node = pop()
+        yield node
+        push = _PUSH_ALL[type(node)]
+        if push is not None:
+            push(stack, node)
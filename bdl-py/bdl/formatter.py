@@ -0,0 +1,1920 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, List, Literal, Optional, Tuple
+
+from bdl.parser.bdl_parser import (
+    Attribute,
+    BdlAst,
+    Custom,
+    Enum,
+    EnumItem,
+    Import,
+    ImportItem,
+    Oneof,
+    OneofItem,
+    Proc,
+    Struct,
+    StructField,
+    TypeExpression,
+    Union,
+    UnionItem,
+    UnionItemStruct,
+    parse_module,
+)
+from bdl.parser.bdl_lexer import TokenParser
+from bdl.parser.parser import Span
+
+# Port of `bdl-ts/src/formatter/bdl.ts`; both produce the same output. The
+# TypeScript formatter renders nodes to strings, measures them, then trims
+# and re-indents the joined pieces. Here every layout decision is made from
+# span lengths first, and the result is written once, in order, through a
+# `_Printer`.
+
+
+@dataclass(slots=True)
+class FormatConfig:
+    line_width: int = 80
+    indent_type: Literal["space", "tab"] = "space"
+    indent_count: int = 2
+    final_newline: bool = True
+
+
+def format_bdl(text: str, config: Optional[FormatConfig] = None) -> str:
+    """
+    Formats a BDL module. When `text` is already formatted it is returned
+    as is, and no output is built at all.
+    """
+    if "bdlc-fmt-ignore-file" in text and _IGNORE_FILE_PATTERN.search(text):
+        return text
+    bdl_ast = parse_module(TokenParser(text), trailing_attributes=True)
+    return _Formatter(text, config or FormatConfig()).format(bdl_ast)
+
+
+class _Printer:
+    """
+    Output buffer that compares before it copies. As long as everything
+    written is a prefix of the input, nothing is stored: a span written at
+    the current position only moves the position, and other strings are
+    compared in place. At the first difference, the matched prefix becomes
+    the first chunk and later writes are appended, to be joined once.
+    """
+
+    __slots__ = ("text", "pos", "chunks")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.chunks: Optional[List[str]] = None
+
+    def write(self, value: str) -> None:
+        if not value:
+            return
+        chunks = self.chunks
+        if chunks is None:
+            if self.text.startswith(value, self.pos):
+                self.pos += len(value)
+                return
+            chunks = self.chunks = [self.text[: self.pos]]
+        chunks.append(value)
+
+    def write_span(self, start: int, end: int) -> None:
+        if self.chunks is None and start == self.pos:
+            self.pos = end
+        elif start < end:
+            self.write(self.text[start:end])
+
+    def is_empty(self) -> bool:
+        return self.chunks is None and self.pos == 0
+
+    def getvalue(self) -> str:
+        if self.chunks is not None:
+            return "".join(self.chunks)
+        if self.pos == len(self.text):
+            return self.text
+        return self.text[: self.pos]
+
+
+# Trivia is `(kind, start, end, newline count)`.
+_NEWLINE = 0
+_COMMENT = 1
+_Trivia = Tuple[int, int, int, int]
+
+# How lines of a block are indented: module level lines are written as they
+# are, block lines are stripped and indented, and union lines are indented
+# without stripping, like `indentGeneratedText` and `indentMultilinePreserve`.
+_MODULE = 0
+_BLOCK = 1
+_UNION = 2
+
+# (break after `=`, break before `throws`, break after `->`), tried in order.
+_PROC_WRAP_MODES = [
+    (False, False, False),
+    (True, False, False),
+    (True, True, False),
+    (True, True, True),
+]
+
+_WHITESPACE_PATTERN = re.compile(r"[ \t\r\n]+")
+_SPACES_PATTERN = re.compile(r"\s*")
+_LINE_BREAK_PATTERN = re.compile(r"[\r\n]")
+_GAP_PATTERN = re.compile(r"(?:\r?\n[ \t]*){3,}")
+_BLANK_LINE_PATTERN = re.compile(r"\r?\n[ \t]*\r?\n")
+_IGNORE_FILE_PATTERN = re.compile(r"^\s*//\s*bdlc-fmt-ignore-file\s*$", re.MULTILINE)
+_IGNORE_PATTERN = re.compile(r"[ \t]*//\s*bdlc-fmt-ignore\s*$", re.MULTILINE)
+_IGNORE_COMMENT_PATTERN = re.compile(r"\s*//\s*bdlc-fmt-ignore\s*")
+
+
+@dataclass(slots=True)
+class _Wrapped:
+    node: Any
+    above: List[_Trivia]
+    after: Optional[_Trivia] = None
+
+
+@dataclass(slots=True)
+class _ImportUnit:
+    """
+    An import and the `@` attributes right before it, moved as one when
+    imports are sorted.
+    """
+
+    start_index: int
+    end_index: int
+    import_node: Import
+    leading_gap_start: int
+
+
+@dataclass(slots=True)
+class _ItemStructLayout:
+    nodes: List[_Wrapped]
+    after: List[_Trivia]
+    oneline: bool
+    # Length of `Name(fields)` on one line, without the comma.
+    oneline_length: int
+
+
+class _Formatter:
+    def __init__(self, text: str, config: FormatConfig):
+        self.text = text
+        self.out = _Printer(text)
+        self.line_width = config.line_width
+        indent_char = "\t" if config.indent_type == "tab" else " "
+        self.indent = indent_char * config.indent_count
+        self.final_newline = config.final_newline
+        # Most modules have no comments; then only line breaks are trivia.
+        self.has_comments = "//" in text
+
+    def format(self, bdl_ast: BdlAst) -> str:
+        text = self.text
+        out = self.out
+        statements = _get_module_statements(bdl_ast)
+        prev_end = 0
+        index = 0
+        while index < len(statements):
+            statement = statements[index]
+            start = _get_statement_start(statement)
+            if _has_ignore_directive_in_range(text, prev_end, start):
+                if prev_end == start and not out.is_empty():
+                    out.write("\n")
+                out.write_span(prev_end, start)
+                end_index = _get_ignored_end_index(statements, index, _is_attribute)
+                prev_end = self._get_statement_end(statements[end_index])
+                out.write_span(start, prev_end)
+                index = end_index + 1
+                continue
+            run = self._collect_sortable_import_run(statements, index, prev_end)
+            if len(run) > 1:
+                self._write_import_run(statements, run, prev_end)
+                index = run[-1].end_index + 1
+                prev_end = self._get_statement_end(statements[run[-1].end_index])
+                continue
+            self._write_gap(prev_end, start)
+            self._write_statement(statement)
+            prev_end = self._get_statement_end(statement)
+            index += 1
+        end = len(text)
+        while end > prev_end and text[end - 1].isspace():
+            end -= 1
+        out.write_span(prev_end, end)
+        if self.final_newline and not out.is_empty():
+            out.write("\n")
+        return out.getvalue()
+
+    def _write_statement(self, statement: Any) -> None:
+        if _is_attribute(statement):
+            self._write_trivia(self._get_attribute_comments(statement))
+            self._write_attribute_node(statement, "", _MODULE)
+        else:
+            _write_statement_fns[statement.type](self, statement)
+
+    def _write_gap(self, start: int, end: int) -> None:
+        """
+        Text between two module level statements, with runs of blank lines
+        cut down to one.
+        """
+        if start == end:
+            if not self.out.is_empty():
+                self.out.write("\n")
+        elif self.text.count("\n", start, end) >= 3:
+            self.out.write(_normalize_gap(self.text[start:end]))
+        else:
+            self.out.write_span(start, end)
+
+    def _get_statement_end(self, statement: Any) -> int:
+        if _is_attribute(statement):
+            return _get_attribute_end(statement)
+        type = statement.type
+        if type == "Import":
+            end = statement.bracket_close.end
+        elif type == "Custom":
+            end = _get_type_end(statement.original_type)
+        elif type == "Proc":
+            error = statement.error
+            end = _get_type_end(error.error_type if error else statement.output_type)
+        else:
+            return statement.bracket_close.end
+        comment = self._get_following_comment(end)
+        return end if comment is None else comment[2]
+
+    # trivia
+
+    def _scan_trivia(self, loc: int) -> List[_Trivia]:
+        """
+        Line breaks and comments from `loc` up to the next token. Spaces
+        that don't break the line are dropped.
+        """
+        text = self.text
+        result = []
+        while True:
+            match = _WHITESPACE_PATTERN.match(text, loc)
+            if match is not None:
+                end = match.end()
+                count = text.count("\n", loc, end)
+                if count:
+                    result.append((_NEWLINE, loc, end, count))
+                loc = end
+            if text.startswith("//", loc):
+                end = text.find("\n", loc)
+                if end < 0:
+                    end = len(text)
+                result.append((_COMMENT, loc, end, 0))
+                loc = end
+            else:
+                return result
+
+    def _get_comments(self, loc: int) -> List[_Trivia]:
+        if not self.has_comments:
+            return []
+        return [trivia for trivia in self._scan_trivia(loc) if trivia[0] == _COMMENT]
+
+    def _get_following_comment(self, loc: int) -> Optional[_Trivia]:
+        """
+        The comment on the rest of the line, if nothing else is before it.
+        """
+        if not self.has_comments:
+            return None
+        text = self.text
+        while loc < len(text) and text[loc] in " \t":
+            loc += 1
+        if not text.startswith("//", loc):
+            return None
+        end = text.find("\n", loc)
+        return (_COMMENT, loc, len(text) if end < 0 else end, 0)
+
+    def _get_attribute_comments(self, attribute: Attribute) -> List[_Trivia]:
+        comments = self._get_comments(attribute.symbol.span.end)
+        comments.extend(self._get_comments(attribute.name.end))
+        return comments
+
+    def _get_type_trivia(self, type_expression: TypeExpression) -> List[_Trivia]:
+        container = type_expression.container
+        if container is None:
+            return []
+        result = self._scan_trivia(type_expression.value_type.end)
+        result.extend(self._scan_trivia(container.bracket_open.end))
+        if container.key_type is not None:
+            result.extend(self._scan_trivia(container.key_type.end))
+        return result
+
+    def _write_trivia(
+        self,
+        trivia: List[_Trivia],
+        prefix: str = "",
+        mode: int = _MODULE,
+        leading_newline: bool = False,
+        trim_start: bool = False,
+        trim_end: bool = False,
+        at_line_start: bool = True,
+    ) -> bool:
+        """
+        Writes comments one per line, and line breaks, at most two at a
+        time. Returns whether the output is left at the start of a line.
+        """
+        tokens = _stringify_trivia(trivia, leading_newline)
+        lo = 0
+        hi = len(tokens)
+        if trim_start:
+            while lo < hi and tokens[lo] is None:
+                lo += 1
+        if trim_end:
+            while hi > lo and tokens[hi - 1] is None:
+                hi -= 1
+        out = self.out
+        for index in range(lo, hi):
+            token = tokens[index]
+            if token is None:
+                out.write("\n")
+                at_line_start = True
+                continue
+            start, end = token
+            if at_line_start:
+                out.write(prefix)
+            if mode == _BLOCK or (trim_end and index == hi - 1):
+                end = self._rstrip(start, end)
+            out.write_span(start, end)
+            at_line_start = False
+        return at_line_start
+
+    def _write_comment(self, comment: _Trivia, strip: bool = True) -> None:
+        end = self._rstrip(comment[1], comment[2]) if strip else comment[2]
+        self.out.write_span(comment[1], end)
+
+    def _find_ignore_directive(
+        self, trivia: List[_Trivia], node_start: int
+    ) -> Optional[int]:
+        text = self.text
+        for kind, start, end, _ in trivia:
+            if (
+                kind == _COMMENT
+                and start < node_start
+                and _IGNORE_COMMENT_PATTERN.fullmatch(text, start, end)
+                and _is_only_whitespace_before(text, start)
+            ):
+                return start
+        return None
+
+    # layout
+
+    def _rstrip(self, start: int, end: int) -> int:
+        text = self.text
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return end
+
+    def _has_line_break(self, start: int, end: int) -> bool:
+        return _LINE_BREAK_PATTERN.search(self.text, start, end) is not None
+
+    def _can_collapse(
+        self,
+        block_start: int,
+        bracket_open: Span,
+        bracket_close: Span,
+        first_start: Optional[int],
+        content_end: int,
+    ) -> bool:
+        """
+        Whether the source of a block allows it on one line: it is on one
+        line already, its first item is on the line of the opening bracket,
+        or only whitespace follows the items.
+        """
+        if not self._has_line_break(block_start, bracket_close.end):
+            return True
+        if first_start is not None and not self._has_line_break(
+            bracket_open.end, first_start
+        ):
+            return True
+        return (
+            not self._has_line_break(block_start, content_end)
+            and _SPACES_PATTERN.fullmatch(self.text, content_end, bracket_close.start)
+            is not None
+        )
+
+    def _can_use_oneline(
+        self,
+        collapsible: bool,
+        nodes: List[_Wrapped],
+        after: List[_Trivia],
+        source_has_newline: bool = False,
+        source_oneline_intent: bool = True,
+        has_node_oneline_intent: Optional[Callable[[Any], bool]] = None,
+    ) -> bool:
+        if not collapsible:
+            return False
+        if source_has_newline and not source_oneline_intent:
+            return False
+        if _has_comment(after):
+            return False
+        for wrapped in nodes:
+            if _is_attribute(wrapped.node):
+                return False
+            if wrapped.after is not None or _has_comment(wrapped.above):
+                return False
+            if (
+                source_has_newline
+                and has_node_oneline_intent is not None
+                and not has_node_oneline_intent(wrapped.node)
+            ):
+                return False
+        return True
+
+    def _has_tight_open(self, bracket_open: Span, first_start: Optional[int]) -> bool:
+        return first_start is None or not self._has_line_break(
+            bracket_open.end, first_start
+        )
+
+    def _write_type(self, type_expression: TypeExpression) -> None:
+        out = self.out
+        value_type = type_expression.value_type
+        out.write_span(value_type.start, value_type.end)
+        container = type_expression.container
+        if container is not None:
+            out.write_span(container.bracket_open.start, container.bracket_open.end)
+            key_type = container.key_type
+            if key_type is not None:
+                out.write_span(key_type.start, key_type.end)
+            out.write_span(container.bracket_close.start, container.bracket_close.end)
+
+    def _write_list_comma(
+        self, comma: Optional[Span], is_last: bool, oneline: bool
+    ) -> None:
+        if is_last:
+            if not oneline:
+                self.out.write(",")
+        elif comma is not None:
+            self.out.write_span(comma.start, comma.end)
+
+    def _write_block_header(self, node: Any) -> None:
+        out = self.out
+        out.write_span(node.keyword.start, node.keyword.end)
+        out.write(" ")
+        out.write_span(node.name.start, node.name.end)
+        out.write(" ")
+        out.write_span(node.bracket_open.start, node.bracket_open.end)
+
+    def _write_block_footer(self, node: Any) -> None:
+        self.out.write("\n")
+        self.out.write_span(node.bracket_close.start, node.bracket_close.end)
+
+    def _write_block(
+        self,
+        nodes: List[_Wrapped],
+        after: List[_Trivia],
+        write_node: Callable[[Any, bool, str], None],
+        get_span: Callable[[Any], Tuple[int, int]],
+        outer_prefix: str = "",
+    ) -> None:
+        """
+        Items of a multiline block, one level deeper than `outer_prefix`.
+        An item after a `bdlc-fmt-ignore` comment is copied from the source
+        with the trivia before it, and with the item after it when it is an
+        attribute.
+        """
+        out = self.out
+        text = self.text
+        prefix = outer_prefix + self.indent
+        count = len(nodes)
+        at_line_start = True
+        index = 0
+        while index < count:
+            wrapped = nodes[index]
+            first = index == 0
+            node_start = get_span(wrapped.node)[0]
+            directive_start = self._find_ignore_directive(wrapped.above, node_start)
+            if directive_start is not None:
+                end_index = _get_ignored_end_index(
+                    nodes, index, lambda wrapped: _is_attribute(wrapped.node)
+                )
+                start = next(
+                    (trivia[1] for trivia in wrapped.above if trivia[1] < node_start),
+                    directive_start,
+                )
+                if text.startswith("\r\n", start):
+                    start += 2
+                elif text.startswith("\n", start):
+                    start += 1
+                end_wrapped = nodes[end_index]
+                if end_wrapped.after is not None:
+                    end = end_wrapped.after[2]
+                else:
+                    end = get_span(end_wrapped.node)[1]
+                if not first:
+                    out.write("\n")
+                self._write_lines(start, end, outer_prefix, _UNION)
+                at_line_start = False
+                index = end_index + 1
+                continue
+            self._write_trivia(
+                wrapped.above, prefix, _BLOCK, leading_newline=True, trim_start=first
+            )
+            out.write(prefix)
+            write_node(wrapped.node, index == count - 1, prefix)
+            if wrapped.after is not None:
+                out.write(" ")
+                self._write_comment(wrapped.after)
+            at_line_start = False
+            index += 1
+        self._write_trivia(
+            after, prefix, _BLOCK, trim_end=True, at_line_start=at_line_start
+        )
+
+    def _write_lines(self, start: int, end: int, prefix: str, mode: int) -> None:
+        """
+        Source lines from `start` to `end`, each indented with `prefix` as
+        `mode` says.
+        """
+        out = self.out
+        if not prefix and mode != _BLOCK:
+            out.write_span(start, end)
+            return
+        text = self.text
+        line_start = start
+        while True:
+            line_end = text.find("\n", line_start, end)
+            if line_end < 0:
+                line_end = end
+            content_start = line_start
+            while content_start < line_end and text[content_start].isspace():
+                content_start += 1
+            if content_start < line_end:
+                out.write(prefix)
+                if mode == _BLOCK:
+                    out.write_span(content_start, self._rstrip(content_start, line_end))
+                else:
+                    out.write_span(line_start, line_end)
+            else:
+                out.write_span(line_start, line_end)
+            if line_end == end:
+                return
+            out.write("\n")
+            line_start = line_end + 1
+
+    # attribute
+
+    def _write_attribute_node(
+        self, attribute: Attribute, prefix: str, mode: int
+    ) -> None:
+        out = self.out
+        symbol = attribute.symbol.span
+        out.write_span(symbol.start, symbol.end)
+        out.write(" ")
+        out.write_span(attribute.name.start, attribute.name.end)
+        content = attribute.content
+        if content is None:
+            return
+        first_char = self.text[content.start : content.start + 1]
+        if first_char == "|":
+            out.write("\n")
+            self._write_lines(
+                content.start, self._rstrip(content.start, content.end), prefix, mode
+            )
+        elif first_char == "-":
+            out.write(" ")
+            end = (
+                content.end
+                if mode == _UNION
+                else self._rstrip(content.start, content.end)
+            )
+            out.write_span(content.start, end)
+
+    def _write_block_attribute(
+        self, attribute: Attribute, is_last: bool, prefix: str
+    ) -> None:
+        self._write_attribute_node(attribute, prefix, _BLOCK)
+
+    # import
+
+    def _write_import(self, node: Import) -> None:
+        out = self.out
+        above = self._get_comments(node.keyword.end)
+        for index, path_item in enumerate(node.path):
+            above.extend(self._get_comments(path_item.span.end))
+            if index < len(node.path) - 1:
+                # The parser keeps only the identifiers of a path.
+                dot_start = _skip_trivia(self.text, path_item.span.end)
+                above.extend(self._get_comments(dot_start + 1))
+        after = self._get_following_comment(node.bracket_close.end)
+        nodes, items_after = self._collect_import_items(node)
+        nodes = self._sort_import_items(nodes)
+        items = node.items
+        collapsible = self._can_collapse(
+            node.keyword.start,
+            node.bracket_open,
+            node.bracket_close,
+            items[0].name.start if items else None,
+            _get_import_item_span(items[-1])[1] if items else node.bracket_open.end,
+        )
+        if not _has_comment(above) and self._can_use_oneline(
+            collapsible, nodes, items_after
+        ):
+            length = (
+                _get_span_length(node.keyword)
+                + sum(_get_span_length(path_item.span) for path_item in node.path)
+                + len(node.path)
+                + 1
+                + _get_span_length(node.bracket_open)
+                + _get_span_length(node.bracket_close)
+            )
+            if nodes:
+                length += len(nodes) + sum(
+                    _get_import_item_length(wrapped.node) for wrapped in nodes
+                )
+            if after is not None:
+                length += 1 + after[2] - after[1]
+            if length <= self.line_width:
+                self._write_import_header(node)
+                last_index = len(nodes) - 1
+                for index, wrapped in enumerate(nodes):
+                    out.write(" ")
+                    self._write_import_item(wrapped.node)
+                    if index < last_index:
+                        out.write(",")
+                if nodes:
+                    out.write(" ")
+                out.write_span(node.bracket_close.start, node.bracket_close.end)
+                if after is not None:
+                    out.write(" ")
+                    self._write_comment(after)
+                return
+        self._write_trivia(above)
+        self._write_import_header(node)
+        out.write("\n")
+        prefix = self.indent
+        at_line_start = True
+        for index, wrapped in enumerate(nodes):
+            if index > 0 and not wrapped.above:
+                out.write("\n")
+                at_line_start = True
+            at_line_start = self._write_trivia(
+                wrapped.above,
+                prefix,
+                _BLOCK,
+                trim_start=index == 0,
+                at_line_start=at_line_start,
+            )
+            item = wrapped.node
+            at_line_start = False
+            if self._find_ignore_directive(wrapped.above, item.name.start) is not None:
+                if wrapped.after is not None:
+                    end = wrapped.after[2]
+                else:
+                    end = _get_import_item_span(item)[1]
+                out.write(prefix)
+                out.write_span(item.name.start, end)
+                continue
+            out.write(prefix)
+            self._write_import_item(item)
+            out.write(",")
+            if wrapped.after is not None:
+                out.write(" ")
+                self._write_comment(wrapped.after)
+        self._write_trivia(
+            items_after, prefix, _BLOCK, trim_end=True, at_line_start=at_line_start
+        )
+        self._write_block_footer(node)
+        if after is not None:
+            out.write(" ")
+            self._write_comment(after)
+
+    def _write_import_header(self, node: Import) -> None:
+        out = self.out
+        out.write_span(node.keyword.start, node.keyword.end)
+        out.write(" ")
+        for index, path_item in enumerate(node.path):
+            if index > 0:
+                out.write(".")
+            out.write_span(path_item.span.start, path_item.span.end)
+        out.write(" ")
+        out.write_span(node.bracket_open.start, node.bracket_open.end)
+
+    def _write_import_item(self, item: ImportItem) -> None:
+        out = self.out
+        out.write_span(item.name.start, item.name.end)
+        alias = item.alias
+        if alias is not None:
+            out.write(" ")
+            out.write_span(alias.as_keyword.start, alias.as_keyword.end)
+            out.write(" ")
+            out.write_span(alias.name.start, alias.name.end)
+
+    def _collect_import_items(
+        self, node: Import
+    ) -> Tuple[List[_Wrapped], List[_Trivia]]:
+        nodes = []
+        prev_end = node.bracket_open.end
+        for item in node.items:
+            above = self._scan_trivia(prev_end)
+            comments = self._get_comments(item.name.end)
+            if item.alias is not None:
+                comments.extend(self._get_comments(item.alias.as_keyword.end))
+                comments.extend(self._get_comments(item.alias.name.end))
+            end = _get_import_item_span(item)[1]
+            after = self._get_following_comment(end)
+            if after is not None:
+                comments.append(after)
+            last = comments.pop() if comments else None
+            above.extend(comments)
+            nodes.append(_Wrapped(item, above, last))
+            prev_end = end if last is None else max(end, last[2])
+        return nodes, self._scan_trivia(prev_end)
+
+    def _sort_import_items(self, nodes: List[_Wrapped]) -> List[_Wrapped]:
+        """
+        Items sorted by name and alias, unless a comment is attached to any
+        of them.
+        """
+        for wrapped in nodes:
+            if wrapped.after is not None or _has_comment(wrapped.above):
+                return nodes
+        text = self.text
+
+        def get_key(wrapped: _Wrapped) -> Tuple[str, str]:
+            item = wrapped.node
+            alias = item.alias
+            return (
+                text[item.name.start : item.name.end],
+                "" if alias is None else text[alias.name.start : alias.name.end],
+            )
+
+        return sorted(nodes, key=get_key)
+
+    # import sorting
+
+    def _collect_sortable_import_run(
+        self, statements: List[Any], start_index: int, run_start: int
+    ) -> List[_ImportUnit]:
+        """
+        Consecutive import units from `start_index`, separated by nothing
+        but whitespace and line comments.
+        """
+        first = self._get_sortable_import_unit(statements, start_index, run_start)
+        if first is None:
+            return []
+        text = self.text
+        run = [first]
+        index = first.end_index + 1
+        while index < len(statements):
+            prev_end = self._get_statement_end(statements[run[-1].end_index])
+            current = self._get_sortable_import_unit(statements, index, prev_end)
+            if current is None:
+                break
+            next_start = _get_statement_start(statements[current.start_index])
+            if not _is_sortable_import_gap(text, prev_end, next_start):
+                break
+            if _has_ignore_directive_in_range(text, prev_end, next_start):
+                break
+            run.append(current)
+            index = current.end_index + 1
+        return run
+
+    def _get_sortable_import_unit(
+        self, statements: List[Any], index: int, leading_gap_start: int
+    ) -> Optional[_ImportUnit]:
+        statement = statements[index]
+        if not _is_attribute(statement):
+            if statement.type != "Import":
+                return None
+            return _ImportUnit(index, index, statement, leading_gap_start)
+        if statement.symbol.type != "At":
+            return None
+        text = self.text
+        end_index = index
+        while end_index + 1 < len(statements) and _is_attribute(
+            statements[end_index + 1]
+        ):
+            next_attribute = statements[end_index + 1]
+            if next_attribute.symbol.type != "At":
+                return None
+            if _has_ignore_directive_in_range(
+                text,
+                _get_attribute_end(statements[end_index]),
+                next_attribute.symbol.span.start,
+            ):
+                return None
+            end_index += 1
+        if end_index + 1 == len(statements):
+            return None
+        next_statement = statements[end_index + 1]
+        if next_statement.type != "Import":
+            return None
+        if _has_ignore_directive_in_range(
+            text,
+            _get_attribute_end(statements[end_index]),
+            next_statement.keyword.start,
+        ):
+            return None
+        return _ImportUnit(index, end_index + 1, next_statement, leading_gap_start)
+
+    def _write_import_run(
+        self, statements: List[Any], run: List[_ImportUnit], prev_end: int
+    ) -> None:
+        """
+        Import units sorted by module path. Comments and blank lines before
+        each unit move with it, except what is anchored before the first:
+        a comment ending the line of the previous statement, or anything
+        before the last blank line.
+        """
+        text = self.text
+        out = self.out
+        first = run[0]
+        anchored, movable = _split_detached_run_leading_gap(
+            text, prev_end, _get_statement_start(statements[first.start_index])
+        )
+
+        def get_key(unit: _ImportUnit) -> str:
+            return ".".join(
+                text[path_item.span.start : path_item.span.end]
+                for path_item in unit.import_node.path
+            )
+
+        anchored_gap = _normalize_gap(anchored)
+        out.write(anchored_gap)
+        for index, unit in enumerate(sorted(run, key=get_key)):
+            if unit is first:
+                gap = movable
+            else:
+                start = _get_statement_start(statements[unit.start_index])
+                gap = text[unit.leading_gap_start : start]
+            gap = _normalize_gap(gap)
+            if index == 0:
+                gap = gap.lstrip("\r\n") if gap.startswith(("\n", "\r\n")) else gap
+            if out.is_empty() or (index == 0 and anchored_gap):
+                out.write(gap)
+            elif not gap:
+                out.write("\n")
+            elif not gap.startswith(("\n", "\r\n")):
+                out.write("\n")
+                out.write(gap)
+            else:
+                out.write(gap)
+            unit_end = _get_statement_start(statements[unit.start_index])
+            for statement_index in range(unit.start_index, unit.end_index + 1):
+                statement = statements[statement_index]
+                if statement_index > unit.start_index:
+                    self._write_gap(unit_end, _get_statement_start(statement))
+                self._write_statement(statement)
+                unit_end = self._get_statement_end(statement)
+
+    # struct
+
+    def _write_struct(self, node: Struct) -> None:
+        above = self._get_comments(node.keyword.end)
+        above.extend(self._get_comments(node.name.end))
+        statements = _get_block_statements(
+            node.attributes, node.fields, node.bracket_open.start, _get_field_start
+        )
+        nodes, after = self._collect_struct_like(node.bracket_open, statements)
+        collapsible = self._can_collapse(
+            node.keyword.start,
+            node.bracket_open,
+            node.bracket_close,
+            _get_struct_statement_span(statements[0])[0] if statements else None,
+            _get_struct_statement_span(statements[-1])[1]
+            if statements
+            else node.bracket_open.end,
+        )
+        if self._can_use_oneline(collapsible, nodes, after):
+            length = _get_block_header_length(node) + _get_inline_length(
+                nodes, _get_oneline_field_length
+            )
+            if length <= self.line_width:
+                self._write_trivia(above)
+                self._write_block_header(node)
+                self._write_inline(nodes, self._write_oneline_field)
+                self.out.write_span(node.bracket_close.start, node.bracket_close.end)
+                return
+        self._write_trivia(above)
+        self._write_block_header(node)
+        self.out.write("\n")
+        self._write_block(
+            nodes, after, self._write_struct_statement, _get_struct_statement_span
+        )
+        self._write_block_footer(node)
+
+    def _collect_struct_like(
+        self, bracket_open: Span, statements: List[Any]
+    ) -> Tuple[List[_Wrapped], List[_Trivia]]:
+        nodes = []
+        prev_end = bracket_open.end
+        for statement in statements:
+            above = self._scan_trivia(prev_end)
+            if _is_attribute(statement):
+                above.extend(self._get_attribute_comments(statement))
+                nodes.append(_Wrapped(statement, above))
+                prev_end = _get_attribute_end(statement)
+                continue
+            above.extend(self._get_comments(statement.name.end))
+            if statement.question is not None:
+                above.extend(self._get_comments(statement.question.end))
+            above.extend(self._get_comments(statement.colon.end))
+            field_type = statement.field_type
+            above.extend(self._get_type_trivia(field_type))
+            type_end = _get_type_end(field_type)
+            above.extend(self._get_comments(type_end))
+            comma_end = statement.comma.end if statement.comma is not None else 0
+            after = self._get_following_comment(max(type_end, comma_end))
+            nodes.append(_Wrapped(statement, above, after))
+            prev_end = max(comma_end, field_type.value_type.end)
+            if after is not None:
+                prev_end = max(prev_end, after[2])
+        return nodes, self._scan_trivia(prev_end)
+
+    def _write_inline(
+        self, nodes: List[_Wrapped], write_node: Callable[[Any, bool], None]
+    ) -> None:
+        """
+        ` item, item ` between the brackets of a one line block.
+        """
+        out = self.out
+        last_index = len(nodes) - 1
+        for index, wrapped in enumerate(nodes):
+            out.write(" ")
+            write_node(wrapped.node, index == last_index)
+        if nodes:
+            out.write(" ")
+
+    def _write_field(self, field: StructField) -> None:
+        out = self.out
+        out.write_span(field.name.start, field.name.end)
+        if field.question is not None:
+            out.write_span(field.question.start, field.question.end)
+        out.write_span(field.colon.start, field.colon.end)
+        out.write(" ")
+        self._write_type(field.field_type)
+
+    def _write_oneline_field(self, field: StructField, is_last: bool) -> None:
+        self._write_field(field)
+        self._write_list_comma(field.comma, is_last, True)
+
+    def _write_struct_statement(
+        self, statement: Any, is_last: bool, prefix: str
+    ) -> None:
+        if _is_attribute(statement):
+            self._write_attribute_node(statement, prefix, _BLOCK)
+        else:
+            self._write_field(statement)
+            self._write_list_comma(statement.comma, is_last, False)
+
+    # enum
+
+    def _write_enum(self, node: Enum) -> None:
+        above = self._get_comments(node.keyword.end)
+        above.extend(self._get_comments(node.name.end))
+        statements = _get_block_statements(
+            node.attributes, node.items, node.bracket_open.start, _get_enum_item_start
+        )
+        nodes, after = self._collect_enum_items(node.bracket_open, statements)
+        collapsible = self._can_collapse(
+            node.keyword.start,
+            node.bracket_open,
+            node.bracket_close,
+            _get_enum_statement_span(statements[0])[0] if statements else None,
+            _get_enum_statement_span(statements[-1])[1]
+            if statements
+            else node.bracket_open.end,
+        )
+        if self._can_use_oneline(collapsible, nodes, after):
+            length = _get_block_header_length(node) + _get_inline_length(
+                nodes, _get_oneline_enum_item_length
+            )
+            if length <= self.line_width:
+                self._write_trivia(above)
+                self._write_block_header(node)
+                self._write_inline(nodes, self._write_oneline_enum_item)
+                self.out.write_span(node.bracket_close.start, node.bracket_close.end)
+                return
+        self._write_trivia(above)
+        self._write_block_header(node)
+        self.out.write("\n")
+        self._write_block(
+            nodes, after, self._write_enum_statement, _get_enum_statement_span
+        )
+        self._write_block_footer(node)
+
+    def _collect_enum_items(
+        self, bracket_open: Span, statements: List[Any]
+    ) -> Tuple[List[_Wrapped], List[_Trivia]]:
+        nodes = []
+        prev_end = bracket_open.end
+        for statement in statements:
+            above = self._scan_trivia(prev_end)
+            if _is_attribute(statement):
+                above.extend(self._get_attribute_comments(statement))
+                nodes.append(_Wrapped(statement, above))
+                prev_end = _get_attribute_end(statement)
+                continue
+            above.extend(self._get_comments(statement.name.end))
+            end = _get_enum_statement_span(statement)[1]
+            after = self._get_following_comment(end)
+            nodes.append(_Wrapped(statement, above, after))
+            prev_end = end if after is None else max(end, after[2])
+        return nodes, self._scan_trivia(prev_end)
+
+    def _write_oneline_enum_item(self, item: EnumItem, is_last: bool) -> None:
+        self.out.write_span(item.name.start, item.name.end)
+        self._write_list_comma(item.comma, is_last, True)
+
+    def _write_enum_statement(self, statement: Any, is_last: bool, prefix: str) -> None:
+        if _is_attribute(statement):
+            self._write_attribute_node(statement, prefix, _BLOCK)
+        else:
+            self.out.write_span(statement.name.start, statement.name.end)
+            self._write_list_comma(statement.comma, is_last, False)
+
+    # oneof
+
+    def _write_oneof(self, node: Oneof) -> None:
+        out = self.out
+        above = self._get_comments(node.keyword.end)
+        above.extend(self._get_comments(node.name.end))
+        statements = _get_block_statements(
+            node.attributes, node.items, node.bracket_open.start, _get_oneof_item_start
+        )
+        nodes, after = self._collect_oneof_items(node.bracket_open, statements)
+        collapsible = self._can_collapse(
+            node.keyword.start,
+            node.bracket_open,
+            node.bracket_close,
+            _get_oneof_statement_span(statements[0])[0] if statements else None,
+            _get_oneof_statement_span(statements[-1])[1]
+            if statements
+            else node.bracket_open.end,
+        )
+        if self._can_use_oneline(collapsible, nodes, after):
+            # Unlike the other blocks, an empty oneof keeps both spaces.
+            length = (
+                _get_block_header_length(node)
+                + 2
+                + max(len(nodes) - 1, 0)
+                + sum(
+                    _get_oneline_oneof_item_length(
+                        wrapped.node, index == len(nodes) - 1
+                    )
+                    for index, wrapped in enumerate(nodes)
+                )
+            )
+            if length <= self.line_width:
+                self._write_trivia(above)
+                self._write_block_header(node)
+                last_index = len(nodes) - 1
+                out.write(" ")
+                for index, wrapped in enumerate(nodes):
+                    if index > 0:
+                        out.write(" ")
+                    self._write_type(wrapped.node.item_type)
+                    self._write_list_comma(
+                        wrapped.node.comma, index == last_index, True
+                    )
+                out.write(" ")
+                out.write_span(node.bracket_close.start, node.bracket_close.end)
+                return
+        self._write_trivia(above)
+        self._write_block_header(node)
+        out.write("\n")
+        self._write_block(
+            nodes, after, self._write_oneof_statement, _get_oneof_statement_span
+        )
+        self._write_block_footer(node)
+
+    def _collect_oneof_items(
+        self, bracket_open: Span, statements: List[Any]
+    ) -> Tuple[List[_Wrapped], List[_Trivia]]:
+        nodes = []
+        prev_end = bracket_open.end
+        for statement in statements:
+            leading = self._scan_trivia(prev_end)
+            if _is_attribute(statement):
+                leading.extend(self._get_attribute_comments(statement))
+                nodes.append(_Wrapped(statement, leading))
+                prev_end = _get_attribute_end(statement)
+                continue
+            item_type = statement.item_type
+            above = self._get_type_trivia(item_type)
+            above.extend(leading)
+            above.extend(self._get_comments(_get_type_end(item_type)))
+            comma_end = statement.comma.end if statement.comma is not None else 0
+            after = self._get_following_comment(
+                max(item_type.value_type.end, comma_end)
+            )
+            nodes.append(_Wrapped(statement, above, after))
+            prev_end = max(comma_end, item_type.value_type.end)
+            if after is not None:
+                prev_end = max(prev_end, after[2])
+        return nodes, self._scan_trivia(prev_end)
+
+    def _write_oneof_statement(
+        self, statement: Any, is_last: bool, prefix: str
+    ) -> None:
+        if _is_attribute(statement):
+            self._write_attribute_node(statement, prefix, _BLOCK)
+        else:
+            self._write_type(statement.item_type)
+            self._write_list_comma(statement.comma, is_last, False)
+
+    # union
+
+    def _write_union(self, node: Union) -> None:
+        out = self.out
+        above = self._get_comments(node.keyword.end)
+        above.extend(self._get_comments(node.name.end))
+        statements = _get_block_statements(
+            node.attributes, node.items, node.bracket_open.start, _get_union_item_start
+        )
+        nodes, after = self._collect_union_items(node.bracket_open, statements)
+        layouts = [
+            None
+            if _is_attribute(wrapped.node) or wrapped.node.struct is None
+            else self._get_item_struct_layout(wrapped.node)
+            for wrapped in nodes
+        ]
+        first_start = (
+            _get_union_statement_span(statements[0])[0] if statements else None
+        )
+        collapsible = self._can_collapse(
+            node.keyword.start,
+            node.bracket_open,
+            node.bracket_close,
+            first_start,
+            _get_union_statement_span(statements[-1])[1]
+            if statements
+            else node.bracket_open.end,
+        )
+        inline_length = self._get_union_inline_length(nodes, layouts)
+        if inline_length is not None and self._can_use_oneline(
+            collapsible,
+            nodes,
+            after,
+            self._has_line_break(node.keyword.start, node.bracket_close.end),
+            self._has_tight_open(node.bracket_open, first_start),
+            self._has_union_item_oneline_intent,
+        ):
+            length = _get_block_header_length(node) + inline_length
+            if length <= self.line_width:
+                self._write_trivia(above)
+                self._write_block_header(node)
+                last_index = len(nodes) - 1
+                for index, wrapped in enumerate(nodes):
+                    out.write(" ")
+                    self._write_oneline_union_item(
+                        wrapped.node, index == last_index, True
+                    )
+                if nodes:
+                    out.write(" ")
+                out.write_span(node.bracket_close.start, node.bracket_close.end)
+                return
+        self._write_trivia(above)
+        self._write_block_header(node)
+        out.write("\n")
+        self._write_union_block(nodes, layouts, after)
+        self._write_block_footer(node)
+
+    def _collect_union_items(
+        self, bracket_open: Span, statements: List[Any]
+    ) -> Tuple[List[_Wrapped], List[_Trivia]]:
+        nodes = []
+        prev_end = bracket_open.end
+        for statement in statements:
+            above = self._scan_trivia(prev_end)
+            if _is_attribute(statement):
+                above.extend(self._get_attribute_comments(statement))
+                nodes.append(_Wrapped(statement, above))
+                prev_end = _get_attribute_end(statement)
+                continue
+            above.extend(self._get_comments(statement.name.end))
+            end = _get_union_statement_span(statement)[1]
+            after = None
+            if statement.struct is not None:
+                after = self._get_following_comment(statement.struct.bracket_close.end)
+            if after is None:
+                after = self._get_following_comment(end)
+            nodes.append(_Wrapped(statement, above, after))
+            prev_end = end if after is None else max(end, after[2])
+        return nodes, self._scan_trivia(prev_end)
+
+    def _get_item_struct_layout(self, item: UnionItem) -> _ItemStructLayout:
+        struct = item.struct
+        self._check_item_struct(struct)
+        statements = _get_block_statements([], struct.fields, 0, _get_field_start)
+        nodes, after = self._collect_struct_like(struct.bracket_open, statements)
+        first_start = (
+            _get_struct_statement_span(statements[0])[0] if statements else None
+        )
+        collapsible = self._can_collapse(
+            item.name.start,
+            struct.bracket_open,
+            struct.bracket_close,
+            first_start,
+            _get_struct_statement_span(statements[-1])[1]
+            if statements
+            else struct.bracket_open.end,
+        )
+        oneline = self._can_use_oneline(
+            collapsible,
+            nodes,
+            after,
+            self._has_line_break(item.name.start, struct.bracket_close.end),
+            self._has_tight_open(struct.bracket_open, first_start),
+        )
+        if not oneline:
+            return _ItemStructLayout(nodes, after, False, 0)
+        oneline_length = (
+            _get_span_length(item.name)
+            + _get_span_length(struct.bracket_open)
+            + _get_span_length(struct.bracket_close)
+            + max(len(nodes) - 1, 0)
+            + sum(
+                _get_oneline_field_length(wrapped.node, index == len(nodes) - 1)
+                for index, wrapped in enumerate(nodes)
+            )
+        )
+        return _ItemStructLayout(nodes, after, oneline, oneline_length)
+
+    def _check_item_struct(self, struct: UnionItemStruct) -> None:
+        """
+        The parser drops `#` attributes inside a union item struct, so they
+        can't be written back; refuse rather than lose them.
+        """
+        text = self.text
+        open_end = struct.bracket_open.end
+        close_start = struct.bracket_close.start
+        if text.find("#", open_end, close_start) < 0:
+            return
+        pos = open_end
+        for statement in _get_block_statements([], struct.fields, 0, _get_field_start):
+            start, end = _get_struct_statement_span(statement)
+            if _skip_trivia(text, pos) != start:
+                break
+            pos = end
+        else:
+            if _skip_trivia(text, pos) == close_start:
+                return
+        raise ValueError(
+            "Attributes with `#` in a union item struct can't be formatted"
+        )
+
+    def _get_union_inline_length(
+        self, nodes: List[_Wrapped], layouts: List[Optional[_ItemStructLayout]]
+    ) -> Optional[int]:
+        """
+        Length of ` item, item ` when every item can be on one line.
+        """
+        length = 1 if nodes else 0
+        last_index = len(nodes) - 1
+        for index, wrapped in enumerate(nodes):
+            item = wrapped.node
+            if _is_attribute(item):
+                return None
+            layout = layouts[index]
+            comma_length = _get_list_comma_length(item.comma, index == last_index, True)
+            if layout is None:
+                length += 1 + _get_span_length(item.name) + comma_length
+                continue
+            item_length = layout.oneline_length + comma_length
+            if not layout.oneline or item_length > self.line_width:
+                return None
+            length += 1 + item_length
+        return length
+
+    def _has_union_item_oneline_intent(self, item: UnionItem) -> bool:
+        struct = item.struct
+        if struct is None:
+            return True
+        fields = struct.fields
+        first_start = None
+        if fields:
+            first_start = _get_struct_statement_span(
+                fields[0].attributes[0] if fields[0].attributes else fields[0]
+            )[0]
+        return self._has_tight_open(struct.bracket_open, first_start)
+
+    def _write_oneline_union_item(
+        self, item: UnionItem, is_last: bool, oneline: bool
+    ) -> None:
+        out = self.out
+        out.write_span(item.name.start, item.name.end)
+        struct = item.struct
+        if struct is not None:
+            out.write_span(struct.bracket_open.start, struct.bracket_open.end)
+            fields = struct.fields
+            last_index = len(fields) - 1
+            for index, field in enumerate(fields):
+                if index > 0:
+                    out.write(" ")
+                self._write_oneline_field(field, index == last_index)
+            out.write_span(struct.bracket_close.start, struct.bracket_close.end)
+        self._write_list_comma(item.comma, is_last, oneline)
+
+    def _write_union_block(
+        self,
+        nodes: List[_Wrapped],
+        layouts: List[Optional[_ItemStructLayout]],
+        after: List[_Trivia],
+    ) -> None:
+        out = self.out
+        prefix = self.indent
+        count = len(nodes)
+        index = 0
+        while index < count:
+            wrapped = nodes[index]
+            is_last = index == count - 1
+            self._write_trivia(
+                wrapped.above,
+                prefix,
+                _UNION,
+                leading_newline=True,
+                trim_start=index == 0,
+            )
+            node = wrapped.node
+            start, end = _get_union_statement_span(node)
+            if self._find_ignore_directive(wrapped.above, start) is not None:
+                end_index = _get_ignored_end_index(
+                    nodes, index, lambda wrapped: _is_attribute(wrapped.node)
+                )
+                end_wrapped = nodes[end_index]
+                if end_wrapped.after is not None:
+                    end = end_wrapped.after[2]
+                else:
+                    end = _get_union_statement_span(end_wrapped.node)[1]
+                if start < end:
+                    out.write(prefix)
+                    out.write_span(start, end)
+                index = end_index + 1
+                continue
+            layout = layouts[index]
+            if _is_attribute(node):
+                multiline = (
+                    self.text.startswith("|", node.content.start)
+                    if node.content
+                    else False
+                )
+            else:
+                multiline = layout is not None and not (
+                    layout.oneline
+                    and layout.oneline_length
+                    + _get_list_comma_length(node.comma, is_last, False)
+                    + len(prefix)
+                    <= self.line_width
+                )
+            if wrapped.after is not None and multiline:
+                out.write(prefix)
+                self._write_comment(wrapped.after, strip=False)
+                out.write("\n")
+            out.write(prefix)
+            if _is_attribute(node):
+                self._write_attribute_node(node, prefix, _UNION)
+            elif not multiline:
+                self._write_oneline_union_item(node, is_last, False)
+            else:
+                struct = node.struct
+                out.write_span(node.name.start, node.name.end)
+                out.write_span(struct.bracket_open.start, struct.bracket_open.end)
+                out.write("\n")
+                self._write_block(
+                    layout.nodes,
+                    layout.after,
+                    self._write_struct_statement,
+                    _get_struct_statement_span,
+                    prefix,
+                )
+                out.write("\n")
+                out.write(prefix)
+                out.write_span(struct.bracket_close.start, struct.bracket_close.end)
+                self._write_list_comma(node.comma, is_last, False)
+            if wrapped.after is not None and not multiline:
+                out.write(" ")
+                self._write_comment(wrapped.after, strip=False)
+            index += 1
+        self._write_trivia(after, "", _UNION, trim_end=True)
+
+    # proc
+
+    def _write_proc(self, node: Proc) -> None:
+        out = self.out
+        above = self._get_comments(node.keyword.end)
+        above.extend(self._get_comments(node.name.end))
+        error = node.error
+        output_end = _get_type_end(node.output_type)
+        source_end = _get_type_end(error.error_type) if error else output_end
+        after = self._get_following_comment(source_end)
+
+        # Comments in the gaps after `=`, the input type, `->`, the output
+        # type and `throws`; each gap breaks the line when it has any.
+        gap_comments = [
+            self._get_comments(node.eq.end),
+            _filter_comments(self._get_type_trivia(node.input_type))
+            + self._get_comments(_get_type_end(node.input_type)),
+            self._get_comments(node.arrow.end),
+        ]
+        piece_lengths = [
+            _get_type_length(node.input_type),
+            _get_span_length(node.arrow),
+            _get_type_length(node.output_type),
+        ]
+        if error is not None:
+            gap_comments.append(
+                _filter_comments(self._get_type_trivia(node.output_type))
+                + self._get_comments(output_end)
+            )
+            gap_comments.append(
+                _filter_comments(self._get_type_trivia(error.error_type))
+                + self._get_comments(error.keyword_throws.end)
+            )
+            piece_lengths.append(_get_span_length(error.keyword_throws))
+            piece_lengths.append(_get_type_length(error.error_type))
+
+        head_length = (
+            _get_span_length(node.keyword)
+            + _get_span_length(node.name)
+            + _get_span_length(node.eq)
+            + 2
+        )
+        indent_length = len(self.indent)
+        breaks = None
+        for break_after_eq, break_before_throws, break_after_arrow in _PROC_WRAP_MODES:
+            forced = [
+                break_after_eq,
+                False,
+                break_after_arrow,
+                break_before_throws,
+                False,
+            ]
+            breaks = [
+                forced[index] or bool(comments)
+                for index, comments in enumerate(gap_comments)
+            ]
+            longest = current = head_length
+            for index, piece_length in enumerate(piece_lengths):
+                if breaks[index]:
+                    longest = max(longest, current)
+                    current = indent_length
+                else:
+                    current += 1
+                current += piece_length
+            if max(longest, current) <= self.line_width:
+                break
+
+        self._write_trivia(above)
+        move_after = (
+            after is not None
+            and any(breaks)
+            and not self._has_line_break(node.keyword.start, source_end)
+        )
+        if move_after:
+            self._write_comment(after, strip=False)
+            out.write("\n")
+        out.write_span(node.keyword.start, node.keyword.end)
+        out.write(" ")
+        out.write_span(node.name.start, node.name.end)
+        out.write(" ")
+        out.write_span(node.eq.start, node.eq.end)
+        pieces = [node.input_type, node.arrow, node.output_type]
+        if error is not None:
+            pieces.append(error.keyword_throws)
+            pieces.append(error.error_type)
+        for index, piece in enumerate(pieces):
+            if breaks[index]:
+                out.write("\n")
+                for comment in gap_comments[index]:
+                    out.write(self.indent)
+                    self._write_comment(comment, strip=False)
+                    out.write("\n")
+                out.write(self.indent)
+            else:
+                out.write(" ")
+            if isinstance(piece, Span):
+                out.write_span(piece.start, piece.end)
+            else:
+                self._write_type(piece)
+        if after is not None and not move_after:
+            out.write(" ")
+            self._write_comment(after)
+
+    # custom
+
+    def _write_custom(self, node: Custom) -> None:
+        out = self.out
+        above = self._get_comments(node.keyword.end)
+        above.extend(self._get_comments(node.name.end))
+        original_type = node.original_type
+        after = self._get_following_comment(_get_type_end(original_type))
+        eq_trivia = self._scan_trivia(node.eq.end)
+        eq_trivia.extend(self._get_type_trivia(original_type))
+        wrap = (
+            _get_span_length(node.keyword)
+            + _get_span_length(node.name)
+            + _get_span_length(node.eq)
+            + _get_type_length(original_type)
+            + 3
+            > self.line_width
+        )
+        self._write_trivia(above)
+        if after is not None and wrap:
+            self._write_comment(after, strip=False)
+            out.write("\n")
+        out.write_span(node.keyword.start, node.keyword.end)
+        out.write(" ")
+        out.write_span(node.name.start, node.name.end)
+        out.write(" ")
+        out.write_span(node.eq.start, node.eq.end)
+        if wrap:
+            out.write("\n")
+            for comment in _filter_comments(eq_trivia):
+                out.write(self.indent)
+                self._write_comment(comment, strip=False)
+                out.write("\n")
+            out.write(self.indent)
+        elif _has_comment(eq_trivia):
+            self._write_trivia(eq_trivia, at_line_start=False)
+        else:
+            out.write(" ")
+        self._write_type(original_type)
+        if after is not None and not wrap:
+            out.write(" ")
+            self._write_comment(after)
+
+
+_write_statement_fns = {
+    "Custom": _Formatter._write_custom,
+    "Enum": _Formatter._write_enum,
+    "Import": _Formatter._write_import,
+    "Oneof": _Formatter._write_oneof,
+    "Proc": _Formatter._write_proc,
+    "Struct": _Formatter._write_struct,
+    "Union": _Formatter._write_union,
+}
+
+
+def _is_attribute(node: Any) -> bool:
+    return type(node) is Attribute
+
+
+def _get_module_statements(bdl_ast: BdlAst) -> List[Any]:
+    """
+    Attributes and statements of a module in source order, with outer
+    attributes as statements of their own.
+    """
+    statements = list(bdl_ast.attributes)
+    for statement in bdl_ast.statements:
+        statements.extend(statement.attributes)
+        statements.append(statement)
+    if bdl_ast.attributes:
+        statements.sort(key=_get_statement_start)
+    return statements
+
+
+def _get_block_statements(
+    attributes: List[Attribute],
+    items: List[Any],
+    bracket_open_start: int,
+    get_item_start: Callable[[Any], int],
+) -> List[Any]:
+    """
+    Items of a block with their attributes as statements of their own,
+    in source order. `attributes` are the block's own, of which those after
+    its opening bracket are inner attributes.
+    """
+    statements = [
+        attribute
+        for attribute in attributes
+        if attribute.symbol.span.start > bracket_open_start
+    ]
+    inner_attributes = bool(statements)
+    for item in items:
+        statements.extend(item.attributes)
+        statements.append(item)
+    if inner_attributes:
+        statements.sort(
+            key=lambda statement: (
+                statement.symbol.span.start
+                if _is_attribute(statement)
+                else get_item_start(statement)
+            )
+        )
+    return statements
+
+
+def _get_statement_start(statement: Any) -> int:
+    if _is_attribute(statement):
+        return statement.symbol.span.start
+    return statement.keyword.start
+
+
+def _get_attribute_end(attribute: Attribute) -> int:
+    return (
+        attribute.content.end if attribute.content is not None else attribute.name.end
+    )
+
+
+def _get_ignored_end_index(
+    nodes: List[Any], index: int, is_attribute: Callable[[Any], bool]
+) -> int:
+    """
+    An ignored attribute takes the attributes after it and the statement
+    they belong to along.
+    """
+    end_index = index
+    if is_attribute(nodes[index]):
+        while end_index + 1 < len(nodes) and is_attribute(nodes[end_index + 1]):
+            end_index += 1
+        if end_index + 1 < len(nodes):
+            end_index += 1
+    return end_index
+
+
+def _get_span_length(span: Span) -> int:
+    return span.end - span.start
+
+
+def _get_type_end(type_expression: TypeExpression) -> int:
+    container = type_expression.container
+    if container is not None:
+        return container.bracket_close.end
+    return type_expression.value_type.end
+
+
+def _get_type_length(type_expression: TypeExpression) -> int:
+    length = _get_span_length(type_expression.value_type)
+    container = type_expression.container
+    if container is not None:
+        length += _get_span_length(container.bracket_open)
+        length += _get_span_length(container.bracket_close)
+        if container.key_type is not None:
+            length += _get_span_length(container.key_type)
+    return length
+
+
+def _get_list_comma_length(comma: Optional[Span], is_last: bool, oneline: bool) -> int:
+    if is_last:
+        return 0 if oneline else 1
+    return 0 if comma is None else _get_span_length(comma)
+
+
+def _get_block_header_length(node: Any) -> int:
+    """
+    Length of `keyword Name {}`.
+    """
+    return (
+        _get_span_length(node.keyword)
+        + _get_span_length(node.name)
+        + _get_span_length(node.bracket_open)
+        + _get_span_length(node.bracket_close)
+        + 2
+    )
+
+
+def _get_inline_length(
+    nodes: List[_Wrapped], get_length: Callable[[Any, bool], int]
+) -> int:
+    if not nodes:
+        return 0
+    last_index = len(nodes) - 1
+    return (
+        len(nodes)
+        + 1
+        + sum(
+            get_length(wrapped.node, index == last_index)
+            for index, wrapped in enumerate(nodes)
+        )
+    )
+
+
+def _get_oneline_field_length(field: StructField, is_last: bool) -> int:
+    length = (
+        _get_span_length(field.name)
+        + _get_span_length(field.colon)
+        + _get_type_length(field.field_type)
+        + 1
+        + _get_list_comma_length(field.comma, is_last, True)
+    )
+    if field.question is not None:
+        length += _get_span_length(field.question)
+    return length
+
+
+def _get_oneline_enum_item_length(item: EnumItem, is_last: bool) -> int:
+    return _get_span_length(item.name) + _get_list_comma_length(
+        item.comma, is_last, True
+    )
+
+
+def _get_oneline_oneof_item_length(item: OneofItem, is_last: bool) -> int:
+    return _get_type_length(item.item_type) + _get_list_comma_length(
+        item.comma, is_last, True
+    )
+
+
+def _get_import_item_length(item: ImportItem) -> int:
+    """
+    Length of `Name as Alias,`, with the comma.
+    """
+    length = _get_span_length(item.name) + 1
+    if item.alias is not None:
+        length += (
+            _get_span_length(item.alias.as_keyword)
+            + _get_span_length(item.alias.name)
+            + 2
+        )
+    return length
+
+
+def _get_field_start(field: StructField) -> int:
+    return field.name.start
+
+
+def _get_enum_item_start(item: EnumItem) -> int:
+    return item.name.start
+
+
+def _get_oneof_item_start(item: OneofItem) -> int:
+    return item.item_type.value_type.start
+
+
+def _get_union_item_start(item: UnionItem) -> int:
+    return item.name.start
+
+
+def _get_struct_statement_span(statement: Any) -> Tuple[int, int]:
+    if _is_attribute(statement):
+        return statement.symbol.span.start, _get_attribute_end(statement)
+    end = _get_type_end(statement.field_type)
+    if statement.comma is not None:
+        end = max(end, statement.comma.end)
+    return statement.name.start, end
+
+
+def _get_enum_statement_span(statement: Any) -> Tuple[int, int]:
+    if _is_attribute(statement):
+        return statement.symbol.span.start, _get_attribute_end(statement)
+    end = statement.name.end
+    if statement.comma is not None:
+        end = max(end, statement.comma.end)
+    return statement.name.start, end
+
+
+def _get_oneof_statement_span(statement: Any) -> Tuple[int, int]:
+    if _is_attribute(statement):
+        return statement.symbol.span.start, _get_attribute_end(statement)
+    item_type = statement.item_type
+    end = _get_type_end(item_type)
+    if statement.comma is not None:
+        end = max(end, statement.comma.end)
+    return item_type.value_type.start, end
+
+
+def _get_union_statement_span(statement: Any) -> Tuple[int, int]:
+    if _is_attribute(statement):
+        return statement.symbol.span.start, _get_attribute_end(statement)
+    end = statement.name.end
+    if statement.struct is not None:
+        end = statement.struct.bracket_close.end
+    if statement.comma is not None:
+        end = max(end, statement.comma.end)
+    return statement.name.start, end
+
+
+def _get_import_item_span(item: ImportItem) -> Tuple[int, int]:
+    end = item.name.end
+    if item.alias is not None:
+        end = item.alias.name.end
+    if item.comma is not None:
+        end = max(end, item.comma.end)
+    return item.name.start, end
+
+
+def _has_comment(trivia: List[_Trivia]) -> bool:
+    for kind, _, _, _ in trivia:
+        if kind == _COMMENT:
+            return True
+    return False
+
+
+def _filter_comments(trivia: List[_Trivia]) -> List[_Trivia]:
+    return [item for item in trivia if item[0] == _COMMENT]
+
+
+def _stringify_trivia(
+    trivia: List[_Trivia], leading_newline: bool
+) -> List[Optional[Tuple[int, int]]]:
+    """
+    Trivia as tokens: `None` for a line break and `(start, end)` for a
+    comment. Consecutive comments and a last comment end their lines.
+    """
+    tokens: List[Optional[Tuple[int, int]]] = []
+    prev_comment = False
+    for kind, start, end, count in trivia:
+        if kind == _COMMENT:
+            if prev_comment:
+                tokens.append(None)
+            tokens.append((start, end))
+            prev_comment = True
+        else:
+            tokens.append(None)
+            if count > 1:
+                tokens.append(None)
+            prev_comment = False
+    if prev_comment:
+        tokens.append(None)
+    if leading_newline and (not tokens or tokens[0] is not None):
+        tokens.insert(0, None)
+    return tokens
+
+
+def _skip_trivia(text: str, loc: int) -> int:
+    while True:
+        match = _WHITESPACE_PATTERN.match(text, loc)
+        if match is not None:
+            loc = match.end()
+        if not text.startswith("//", loc):
+            return loc
+        end = text.find("\n", loc)
+        loc = len(text) if end < 0 else end
+
+
+def _normalize_gap(gap: str) -> str:
+    return _GAP_PATTERN.sub("\n\n", gap)
+
+
+def _is_only_whitespace_before(text: str, start: int) -> bool:
+    index = start - 1
+    while index >= 0:
+        char = text[index]
+        if char != " " and char != "\t":
+            return char == "\n" or char == "\r"
+        index -= 1
+    return True
+
+
+def _has_ignore_directive_in_range(text: str, start: int, end: int) -> bool:
+    if text.find("bdlc-fmt-ignore", start, end) < 0:
+        return False
+    for match in _IGNORE_PATTERN.finditer(text, start, end):
+        if _is_only_whitespace_before(text, match.start()):
+            return True
+    return False
+
+
+def _is_sortable_import_gap(text: str, start: int, end: int) -> bool:
+    """
+    Whether only whitespace and comments on lines of their own are between
+    two imports.
+    """
+    index = start
+    while index < end:
+        char = text[index]
+        if char in " \t\r\n":
+            index += 1
+        elif text.startswith("//", index) and index + 1 < end:
+            if not _is_only_whitespace_before(text, index):
+                return False
+            index += 2
+            while index < end and text[index] != "\n" and text[index] != "\r":
+                index += 1
+        else:
+            return False
+    return True
+
+
+def _split_detached_run_leading_gap(text: str, start: int, end: int) -> Tuple[str, str]:
+    """
+    Splits the gap before a run of imports into what stays in place and
+    what moves with the first import.
+    """
+    gap = text[start:end]
+    anchor_length = _find_inline_trailing_comment_anchor_length(text, start, end)
+    if anchor_length > 0:
+        return gap[:anchor_length], gap[anchor_length:]
+    split_index = 0
+    for match in _BLANK_LINE_PATTERN.finditer(gap):
+        split_index = match.end()
+    return gap[:split_index], gap[split_index:]
+
+
+def _find_inline_trailing_comment_anchor_length(text: str, start: int, end: int) -> int:
+    """
+    Length up to the end of the line of the first comment that follows code
+    on its line, or 0 without one.
+    """
+    index = start
+    line_has_code = not _is_only_whitespace_before(text, start)
+    while index < end:
+        char = text[index]
+        if char == "\r" or char == "\n":
+            index += 2 if text.startswith("\r\n", index) else 1
+            line_has_code = False
+        elif char == " " or char == "\t":
+            index += 1
+        elif text.startswith("//", index):
+            inline_trailing = line_has_code
+            index += 2
+            while index < end and text[index] != "\n" and text[index] != "\r":
+                index += 1
+            anchor_end = index
+            if index < end:
+                anchor_end = index + (2 if text.startswith("\r\n", index) else 1)
+            if inline_trailing:
+                return anchor_end - start
+            index = anchor_end
+            line_has_code = False
+        else:
+            line_has_code = True
+            index += 1
+    return 0
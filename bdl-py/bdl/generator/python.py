@@ -0,0 +1,665 @@
+import json
+import keyword
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from bdl.ir import model as ir
+
+# Counterpart of `bdl-ts/src/generator/ts/ts-generator.ts`, for Python. The
+# TypeScript output describes each def to the generic `$d` runtime; there is
+# no such runtime here, so every def gets its own JSON conversion code
+# instead, written out field by field.
+#
+# What a module looks like:
+#
+# - `struct` is a `@dataclass(slots=True, kw_only=True)`, optional fields
+#   defaulting to `None`.
+# - `union` is an empty base class, with one dataclass per item named
+#   `<Union>_<Item>`. The discriminator is a class variable of the items.
+# - `enum` is a `StrEnum` whose values are the `value` attributes of its
+#   items, or their names.
+# - `oneof` and `custom` are type aliases, with `<Name>_from_json` and
+#   `<Name>_to_json` functions next to them.
+# - `proc` is skipped.
+#
+# Classes have a static `from_json` and a `to_json` method. `from_json`
+# takes what `json.loads` returns and `to_json` returns what `json.dumps`
+# takes. Decoding follows `bdl-ts/runtime/src/pojo-ser-des.ts`:
+#
+# - A missing required field gets its primitive's zero value, or `[]` or
+#   `{}`. If it has none, decoding fails.
+# - A missing optional field becomes `None`. `to_json` leaves out `None`s.
+# - Integers and floats are converted with `int` and `float`, so numeric
+#   strings are accepted. Bytes are base64 strings.
+# - Primitives a standard adds on top of the conventional ones (`datetime`,
+#   ...) are passed through as they are.
+#
+# A oneof whose items all have a `mapping` attribute and that has a
+# `discriminator` attribute, as in the portone REST API schemas, is decoded
+# by that discriminator. Any other oneof is decoded as the first item whose
+# JSON shape matches, required fields of structs included, and whose decoder
+# succeeds.
+#
+# Decoders convert the data; they don't validate it. They raise `KeyError`,
+# `TypeError` or `ValueError` on data they can't convert.
+
+
+@dataclass(slots=True)
+class GeneratePythonResult:
+    # file path (`portone/v2/api/data.py`, ...) -> python code
+    files: Dict[str, str] = field(default_factory=dict)
+
+
+def generate_python(bdl_ir: ir.BdlIr) -> GeneratePythonResult:
+    """
+    One Python module per BDL module, at the module path with dots turned
+    into slashes. A module that other modules are nested in becomes the
+    `__init__.py` of their package, since `payment.py` would hide the
+    `payment/` directory.
+    """
+    result = GeneratePythonResult()
+    package_paths = {
+        module_path.rsplit(".", 1)[0]
+        for module_path in bdl_ir.modules
+        if "." in module_path
+    }
+    for module_path, module in bdl_ir.modules.items():
+        file_path = module_path.replace(".", "/")
+        if module_path in package_paths:
+            file_path += "/__init__.py"
+        else:
+            file_path += ".py"
+        result.files[file_path] = _ModuleGenerator(
+            bdl_ir, module_path, module
+        ).generate()
+    return result
+
+
+_PRIMITIVE_HINTS = {
+    "boolean": "bool",
+    "int32": "int",
+    "int64": "int",
+    "integer": "int",
+    "float64": "float",
+    "string": "str",
+    "bytes": "bytes",
+    "object": "dict[str, _Any]",
+    "void": "None",
+}
+
+# Value a missing required field of the primitive decodes from.
+_PRIMITIVE_JSON_DEFAULTS = {
+    "boolean": "False",
+    "int32": "0",
+    "int64": "0",
+    "integer": "0",
+    "float64": "0.0",
+    "string": '""',
+    "bytes": '""',
+    "object": "{}",
+    "void": "None",
+}
+
+# `{}` is replaced with the value. Primitives not listed are passed as is.
+_PRIMITIVE_DECODERS = {
+    "int32": "int({})",
+    "int64": "int({})",
+    "integer": "int({})",
+    "float64": "float({})",
+    "bytes": "_b64decode({})",
+}
+_PRIMITIVE_ENCODERS = {
+    "bytes": "_b64encode({}).decode()",
+}
+
+# Conditions telling the JSON form of the primitive apart from other values.
+_PRIMITIVE_JSON_CHECKS = {
+    "boolean": "isinstance({}, bool)",
+    "int32": "type({}) is int",
+    "int64": "type({}) is int",
+    "integer": "type({}) is int",
+    "float64": "type({}) in (int, float)",
+    "string": "isinstance({}, str)",
+    "bytes": "isinstance({}, str)",
+    "object": "isinstance({}, dict)",
+    "void": "{} is None",
+}
+# Same, for the Python form.
+_PRIMITIVE_PYTHON_CHECKS = {
+    **_PRIMITIVE_JSON_CHECKS,
+    "float64": "isinstance({}, float)",
+    "bytes": "isinstance({}, bytes)",
+}
+
+# `_Name` in generated code -> (module, name) imported as it.
+_RUNTIME_IMPORTS = {
+    "_b64decode": ("base64", "b64decode"),
+    "_b64encode": ("base64", "b64encode"),
+    "_dataclass": ("dataclasses", "dataclass"),
+    "_StrEnum": ("enum", "StrEnum"),
+    "_Any": ("typing", "Any"),
+    "_ClassVar": ("typing", "ClassVar"),
+    "_TypeAlias": ("typing", "TypeAlias"),
+}
+
+_METHOD_NAMES = {"from_json", "to_json"}
+
+
+def _to_identifier(name: str) -> str:
+    """
+    Python name of a field or enum item, with `_` appended to keywords and to
+    the names of the generated methods.
+    """
+    if not name.isidentifier():
+        raise ValueError(f"Not a valid Python identifier: {name!r}")
+    if keyword.iskeyword(name) or name in _METHOD_NAMES:
+        return name + "_"
+    return name
+
+
+def _literal(value: str) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+class _ModuleGenerator:
+    def __init__(self, bdl_ir: ir.BdlIr, module_path: str, module: ir.Module):
+        self.defs = bdl_ir.defs
+        self.module_path = module_path
+        self.module = module
+        self.lines: List[str] = []
+        # imported module path -> alias
+        self.module_aliases: Dict[str, str] = {}
+        # Module-level names the generated code defines, which an alias
+        # mustn't shadow.
+        self.reserved_names: Set[str] = {"_new", *_RUNTIME_IMPORTS}
+        for def_path in module.def_paths:
+            name = def_path.rsplit(".", 1)[-1]
+            self.reserved_names.update((name, f"_{name}_items", f"_{name}_members"))
+        self.runtime_names: Set[str] = set()
+        self.uses_new = False
+        # Customs and oneofs being expanded, to stop at self-referencing ones.
+        self.inlining: Set[str] = set()
+
+    def generate(self) -> str:
+        write_fns = {
+            "Custom": self._write_custom,
+            "Enum": self._write_enum,
+            "Oneof": self._write_oneof,
+            "Struct": self._write_struct,
+            "Union": self._write_union,
+        }
+        for def_path in self.module.def_paths:
+            definition = self.defs[def_path]
+            write_fn = write_fns.get(definition.type)
+            if write_fn is not None:
+                self.lines.append("\n\n")
+                write_fn(definition)
+        return "".join(self._get_header() + self.lines)
+
+    def _get_header(self) -> List[str]:
+        header = [
+            f"# Generated from `{self.module_path}` by bdl. Do not edit.\n",
+            "\nfrom __future__ import annotations\n",
+        ]
+        names_by_module: Dict[str, List[str]] = {}
+        for alias in sorted(self.runtime_names):
+            module_name, name = _RUNTIME_IMPORTS[alias]
+            names_by_module.setdefault(module_name, []).append(f"{name} as {alias}")
+        if names_by_module:
+            header.append("\n")
+        for module_name, names in sorted(names_by_module.items()):
+            header.append(f"from {module_name} import {', '.join(names)}\n")
+        if self.module_aliases:
+            header.append("\n")
+        for module_path, alias in sorted(self.module_aliases.items()):
+            header.append(f"import {module_path} as {alias}\n")
+        if self.uses_new:
+            header.append("\n_new = object.__new__\n")
+        return header
+
+    def _use(self, runtime_name: str) -> str:
+        self.runtime_names.add(runtime_name)
+        return runtime_name
+
+    def _write(self, *lines: str) -> None:
+        self.lines.extend(line + "\n" for line in lines)
+
+    def _ref(self, def_path: str, suffix: str = "") -> str:
+        """
+        How this module names a def, or the function `<Name><suffix>`.
+        """
+        module_path, name = def_path.rsplit(".", 1)
+        if module_path == self.module_path:
+            return name + suffix
+        alias = self.module_aliases.get(module_path)
+        if alias is None:
+            taken = self.reserved_names | set(self.module_aliases.values())
+            alias = "_" + module_path.rsplit(".", 1)[-1]
+            candidate, count = alias, 1
+            while candidate in taken:
+                count += 1
+                candidate = f"{alias}_{count}"
+            alias = self.module_aliases[module_path] = candidate
+        return f"{alias}.{name}{suffix}"
+
+    def _get_def(self, type_path: str) -> Optional[ir.Def]:
+        """
+        The def of a non-primitive type path, `None` for primitives, procs
+        and missing defs.
+        """
+        if "." not in type_path:
+            return None
+        definition = self.defs.get(type_path)
+        if definition is None or definition.type == "Proc":
+            return None
+        return definition
+
+    def _is_inlinable_custom(self, type_path: str, definition: ir.Def) -> bool:
+        return definition.type == "Custom" and type_path not in self.inlining
+
+    # Type hints
+
+    def _type_hint(self, type: ir.Type) -> str:
+        value_hint = self._plain_hint(type.value_type_path)
+        if type.type == "Array":
+            return f"list[{value_hint}]"
+        if type.type == "Dictionary":
+            return f"dict[{self._plain_hint(type.key_type_path)}, {value_hint}]"
+        return value_hint
+
+    def _plain_hint(self, type_path: str) -> str:
+        if "." not in type_path:
+            hint = _PRIMITIVE_HINTS.get(type_path, "_Any")
+            if "_Any" in hint:
+                self._use("_Any")
+            return hint
+        if self._get_def(type_path) is None:
+            return self._use("_Any")
+        return self._ref(type_path)
+
+    # Conversions. `x` is an expression used once; `None` means the value
+    # converts to itself.
+
+    def _decode(self, type: ir.Type, x: str, depth: int = 0) -> Optional[str]:
+        if type.type == "Plain":
+            return self._decode_plain(type.value_type_path, x, depth)
+        item = f"item{depth}"
+        value = self._decode_plain(type.value_type_path, item, depth + 1)
+        if type.type == "Array":
+            return None if value is None else f"[{value} for {item} in {x}]"
+        key = f"key{depth}"
+        key_value = self._decode_plain(type.key_type_path, key, depth + 1)
+        if value is None and key_value is None:
+            return None
+        return (
+            f"{{{key_value or key}: {value or item} for {key}, {item} in {x}.items()}}"
+        )
+
+    def _decode_plain(self, type_path: str, x: str, depth: int) -> Optional[str]:
+        if "." not in type_path:
+            decoder = _PRIMITIVE_DECODERS.get(type_path)
+            if decoder is None:
+                return None
+            if type_path == "bytes":
+                self._use("_b64decode")
+            return decoder.format(x)
+        definition = self._get_def(type_path)
+        if definition is None:
+            return None
+        if definition.type in ("Struct", "Union", "Enum"):
+            return f"{self._ref(type_path)}.from_json({x})"
+        if self._is_inlinable_custom(type_path, definition):
+            self.inlining.add(type_path)
+            try:
+                return self._decode(definition.original_type, x, depth)
+            finally:
+                self.inlining.discard(type_path)
+        return f"{self._ref(type_path, '_from_json')}({x})"
+
+    def _encode(self, type: ir.Type, x: str, depth: int = 0) -> Optional[str]:
+        if type.type == "Plain":
+            return self._encode_plain(type.value_type_path, x, depth)
+        item = f"item{depth}"
+        value = self._encode_plain(type.value_type_path, item, depth + 1)
+        if type.type == "Array":
+            return None if value is None else f"[{value} for {item} in {x}]"
+        key = f"key{depth}"
+        key_value = None
+        if _PRIMITIVE_HINTS.get(type.key_type_path) == "int":
+            key_value = f"str({key})"
+        if value is None and key_value is None:
+            return None
+        return (
+            f"{{{key_value or key}: {value or item} for {key}, {item} in {x}.items()}}"
+        )
+
+    def _encode_plain(self, type_path: str, x: str, depth: int) -> Optional[str]:
+        if "." not in type_path:
+            encoder = _PRIMITIVE_ENCODERS.get(type_path)
+            if encoder is None:
+                return None
+            self._use("_b64encode")
+            return encoder.format(x)
+        definition = self._get_def(type_path)
+        if definition is None or definition.type == "Enum":
+            # Enum members are `str`s already.
+            return None
+        if definition.type in ("Struct", "Union") or self._has_to_json(definition):
+            return f"{x}.to_json()"
+        if self._is_inlinable_custom(type_path, definition):
+            self.inlining.add(type_path)
+            try:
+                return self._encode(definition.original_type, x, depth)
+            finally:
+                self.inlining.discard(type_path)
+        return f"{self._ref(type_path, '_to_json')}({x})"
+
+    def _has_to_json(self, definition: ir.Def) -> bool:
+        """
+        Whether every value of a oneof is a struct or union item.
+        """
+        if definition.type != "Oneof":
+            return False
+        for item in definition.items:
+            item_def = self._get_def(item.item_type.value_type_path)
+            if item.item_type.type != "Plain" or item_def is None:
+                return False
+            if item_def.type not in ("Struct", "Union"):
+                return False
+        return True
+
+    def _json_default(self, type: ir.Type) -> Optional[str]:
+        if type.type == "Array":
+            return "[]"
+        if type.type == "Dictionary":
+            return "{}"
+        return _PRIMITIVE_JSON_DEFAULTS.get(type.value_type_path)
+
+    def _check(self, type: ir.Type, x: str, is_json: bool) -> Optional[str]:
+        """
+        Condition telling the JSON (or Python) form of `type` apart from
+        others as far as the shape of the value goes, `None` if any value
+        might be one.
+        """
+        if type.type == "Array":
+            return f"isinstance({x}, list)"
+        if type.type == "Dictionary":
+            return f"isinstance({x}, dict)"
+        type_path = type.value_type_path
+        if "." not in type_path:
+            checks = _PRIMITIVE_JSON_CHECKS if is_json else _PRIMITIVE_PYTHON_CHECKS
+            check = checks.get(type_path)
+            return None if check is None else check.format(x)
+        definition = self._get_def(type_path)
+        if definition is None or type_path in self.inlining:
+            return None
+        if definition.type in ("Custom", "Oneof"):
+            self.inlining.add(type_path)
+            try:
+                if definition.type == "Custom":
+                    return self._check(definition.original_type, x, is_json)
+                checks = [
+                    self._check(item.item_type, x, is_json) for item in definition.items
+                ]
+            finally:
+                self.inlining.discard(type_path)
+            if not checks or None in checks:
+                return None
+            return f"({' or '.join(dict.fromkeys(checks))})"
+        if not is_json:
+            return f"isinstance({x}, {self._ref(type_path)})"
+        if definition.type == "Enum":
+            return f"isinstance({x}, str)"
+        if definition.type == "Union":
+            return f"isinstance({x}, dict)"
+        # Like the runtime's validator, a struct needs its required fields.
+        return " and ".join(
+            [f"isinstance({x}, dict)"]
+            + [
+                f"{_literal(struct_field.name)} in {x}"
+                for struct_field in definition.fields
+                if not struct_field.optional
+            ]
+        )
+
+    # Defs
+
+    def _write_custom(self, custom: ir.Custom) -> None:
+        name = custom.name
+        original_type = custom.original_type
+        hint = self._type_hint(original_type)
+        self._write(
+            f"{name}: {self._use('_TypeAlias')} = {_literal(hint)}",
+            "",
+            "",
+            f"def {name}_from_json(data: {self._use('_Any')}) -> {name}:",
+            f"    return {self._decode(original_type, 'data') or 'data'}",
+            "",
+            "",
+            f"def {name}_to_json(value: {name}) -> _Any:",
+            f"    return {self._encode(original_type, 'value') or 'value'}",
+        )
+
+    def _write_enum(self, enum: ir.Enum) -> None:
+        name = enum.name
+        self._write(f"class {name}({self._use('_StrEnum')}):")
+        for item in enum.items:
+            value = item.attributes.get("value") or item.name
+            self._write(f"    {_to_identifier(item.name)} = {_literal(value)}")
+        if enum.items:
+            self._write("")
+        self._write(
+            "    @staticmethod",
+            f"    def from_json(data: {self._use('_Any')}) -> {name}:",
+            "        try:",
+            f"            return _{name}_members[data]",
+            "        except (KeyError, TypeError):",
+            f'            raise ValueError(f"Invalid {name}: {{data!r}}") from None',
+            "",
+            "    def to_json(self) -> str:",
+            "        return self._value_",
+            "",
+            "",
+            f"_{name}_members: dict[str, {name}] = {{",
+            f"    member._value_: member for member in {name}",
+            "}",
+        )
+
+    def _write_oneof(self, oneof: ir.Oneof) -> None:
+        name = oneof.name
+        # Items of the same type can only be told apart by a discriminator.
+        item_types = list(
+            {
+                (
+                    type.type,
+                    type.value_type_path,
+                    getattr(type, "key_type_path", None),
+                ): type
+                for type in (item.item_type for item in oneof.items)
+            }.values()
+        )
+        hint = " | ".join(self._type_hint(item_type) for item_type in item_types)
+        self._write(
+            f"{name}: {self._use('_TypeAlias')} = {_literal(hint or 'None')}",
+            "",
+            "",
+            f"def {name}_from_json(data: {self._use('_Any')}) -> {name}:",
+        )
+        discriminator = oneof.attributes.get("discriminator")
+        if (
+            discriminator
+            and oneof.items
+            and all("mapping" in item.attributes for item in oneof.items)
+        ):
+            self._write(
+                f"    kind = data[{_literal(discriminator)}]",
+                "    match kind:",
+            )
+            for item in oneof.items:
+                decoded = self._decode(item.item_type, "data") or "data"
+                self._write(
+                    f"        case {_literal(item.attributes['mapping'])}:",
+                    f"            return {decoded}",
+                )
+            self._write(
+                f'    raise ValueError(f"Invalid {name} {discriminator}: {{kind!r}}")'
+            )
+        else:
+            for item_type in item_types:
+                check = self._check(item_type, "data", is_json=True)
+                decoded = self._decode(item_type, "data")
+                indent = "    " if check is None else "        "
+                if check is not None:
+                    self._write(f"    if {check}:")
+                if decoded is None:
+                    self._write(f"{indent}return data")
+                else:
+                    self._write(
+                        f"{indent}try:",
+                        f"{indent}    return {decoded}",
+                        f"{indent}except (KeyError, TypeError, ValueError):",
+                        f"{indent}    pass",
+                    )
+                if check is None and decoded is None:
+                    break
+            else:
+                self._write(f'    raise ValueError(f"Invalid {name}: {{data!r}}")')
+
+        self._write("", "", f"def {name}_to_json(value: {name}) -> _Any:")
+        if self._has_to_json(oneof):
+            self._write("    return value.to_json()")
+            return
+        for item_type in item_types:
+            check = self._check(item_type, "value", is_json=False)
+            encoded = self._encode(item_type, "value") or "value"
+            if check is None:
+                self._write(f"    return {encoded}")
+                return
+            self._write(f"    if {check}:", f"        return {encoded}")
+        self._write(f'    raise TypeError(f"Invalid {name}: {{value!r}}")')
+
+    def _write_struct(self, struct: ir.Struct) -> None:
+        self._write_dataclass(struct.name, struct.fields)
+
+    def _write_union(self, union: ir.Union) -> None:
+        name = union.name
+        discriminator = union.attributes.get("discriminator") or "type"
+        key = _literal(discriminator)
+        self._write(
+            f"class {name}:",
+            "    __slots__ = ()",
+            "",
+            "    @staticmethod",
+            f"    def from_json(data: {self._use('_Any')}) -> {name}:",
+            "        try:",
+            f"            item = _{name}_items[data[{key}]]",
+            "        except KeyError:",
+            f'            raise ValueError("Invalid {name} {discriminator}") from None',
+            "        return item.from_json(data)",
+            "",
+            "    def to_json(self) -> dict[str, _Any]:",
+            "        raise NotImplementedError",
+        )
+        for item in union.items:
+            self._write("", "")
+            self._write_dataclass(
+                f"{name}_{item.name}", item.fields, name, (discriminator, item.name)
+            )
+        self._write(
+            "",
+            "",
+            f"_{name}_items: dict[str, type[{name}]] = {{",
+            *(
+                f"    {_literal(item.name)}: {name}_{item.name},"
+                for item in union.items
+            ),
+            "}",
+        )
+
+    def _write_dataclass(
+        self,
+        name: str,
+        fields: List[ir.StructField],
+        base: Optional[str] = None,
+        discriminator: Optional[Tuple[str, str]] = None,
+    ) -> None:
+        """
+        A struct, or a union item that is a `base` and gets `discriminator`
+        (its key and value) written into its JSON first.
+        """
+        self.uses_new = True
+        attributes = [_to_identifier(struct_field.name) for struct_field in fields]
+        self._write(
+            f"@{self._use('_dataclass')}(slots=True, kw_only=True)",
+            f"class {name}({base}):" if base else f"class {name}:",
+        )
+        if discriminator is not None:
+            discriminator_attribute = _to_identifier(discriminator[0])
+            if discriminator_attribute in attributes:
+                raise ValueError(f"{name} has a field named after its discriminator")
+            self._write(
+                f"    {discriminator_attribute}: {self._use('_ClassVar')}[str] = "
+                f"{_literal(discriminator[1])}"
+            )
+        for struct_field, attribute in zip(fields, attributes):
+            hint = self._type_hint(struct_field.field_type)
+            if struct_field.optional:
+                self._write(f"    {attribute}: {hint} | None = None")
+            else:
+                self._write(f"    {attribute}: {hint}")
+        if fields or discriminator is not None:
+            self._write("")
+
+        self._write(
+            "    @staticmethod",
+            f"    def from_json(data: {self._use('_Any')}) -> {name}:",
+            f"        self = _new({name})",
+        )
+        for struct_field, attribute in zip(fields, attributes):
+            key = _literal(struct_field.name)
+            if struct_field.optional:
+                decoded = self._decode(struct_field.field_type, "value")
+                value = f"data.get({key})"
+                if decoded is not None:
+                    value = f"None if (value := {value}) is None else {decoded}"
+            else:
+                default = self._json_default(struct_field.field_type)
+                value = f"data[{key}]"
+                if default is not None:
+                    value = f"data.get({key}, {default})"
+                value = self._decode(struct_field.field_type, value) or value
+            self._write(f"        self.{attribute} = {value}")
+        self._write("        return self", "")
+
+        self._write(f"    def to_json(self) -> dict[str, {self._use('_Any')}]:")
+        # Required fields before the first optional one go in the literal;
+        # the rest are added one by one, to keep the order of the fields.
+        entries = []
+        if discriminator is not None:
+            entries.append(
+                f"{_literal(discriminator[0])}: {_literal(discriminator[1])}"
+            )
+        index = 0
+        while index < len(fields) and not fields[index].optional:
+            struct_field = fields[index]
+            value = f"self.{attributes[index]}"
+            value = self._encode(struct_field.field_type, value) or value
+            entries.append(f"{_literal(struct_field.name)}: {value}")
+            index += 1
+        if index == len(fields):
+            self._write(f"        return {{{', '.join(entries)}}}")
+            return
+        self._write(f"        data: dict[str, _Any] = {{{', '.join(entries)}}}")
+        for struct_field, attribute in zip(fields[index:], attributes[index:]):
+            key = _literal(struct_field.name)
+            if struct_field.optional:
+                value = self._encode(struct_field.field_type, "value") or "value"
+                self._write(
+                    f"        if (value := self.{attribute}) is not None:",
+                    f"            data[{key}] = {value}",
+                )
+            else:
+                value = f"self.{attribute}"
+                value = self._encode(struct_field.field_type, value) or value
+                self._write(f"        data[{key}] = {value}")
+        self._write("        return data")
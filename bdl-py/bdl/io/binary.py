@@ -0,0 +1,565 @@
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, Iterator, List, Tuple
+
+from bdl.ir import model as ir
+from bdl.parser import bdl_parser as ast
+from bdl.parser.parser import Span
+
+# Layout, all integers little endian:
+#
+#   magic "BDLB", version u8
+#   string count u32, string offsets u32 * (count + 1), UTF-8 string data
+#   class count varint, then per class: name (string index), field count
+#   root value
+#
+# A value is a tag byte followed by its payload:
+#
+#   NONE, FALSE, TRUE
+#   INT     zigzag varint
+#   STRING  string index
+#   SPAN    start, end - start
+#   LIST    count, items
+#   DICT    count, key and value pairs
+#   NODE    class index, payload length, field values in declaration order
+#
+# Strings are found through the fixed-width offsets and nodes carry their
+# length, so a reader can jump to any def and skip the rest undecoded.
+
+MAGIC = b"BDLB"
+VERSION = 1
+
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_STRING = 4
+_SPAN = 5
+_LIST = 6
+_DICT = 7
+_NODE = 8
+
+_U32 = struct.Struct("<I")
+_HEADER_SIZE = len(MAGIC) + 1 + _U32.size
+
+
+class BinaryFormatError(ValueError):
+    """
+    Data that isn't a complete serialized AST or IR of this version.
+    """
+
+
+# What reading past the end or following a garbled offset, tag or index
+# raises before it's reported as a `BinaryFormatError`.
+_CORRUPT_DATA_ERRORS = (IndexError, TypeError, UnicodeDecodeError, struct.error)
+
+
+def _corrupt(error: Exception) -> BinaryFormatError:
+    return BinaryFormatError(f"Truncated or corrupt data: {error!r}")
+
+
+def _get_node_classes() -> Dict[str, type]:
+    classes = {}
+    for prefix, module in (("ast", ast), ("ir", ir)):
+        for name, value in vars(module).items():
+            if (
+                isinstance(value, type)
+                and is_dataclass(value)
+                and value.__module__ == module.__name__
+            ):
+                classes[f"{prefix}.{name}"] = value
+    return classes
+
+
+# Only these classes are ever instantiated when decoding.
+_NODE_CLASSES = _get_node_classes()
+_NODE_CLASS_NAMES = {cls: name for name, cls in _NODE_CLASSES.items()}
+_field_names: Dict[type, Tuple[str, ...]] = {}
+
+
+def _get_field_names(cls: type) -> Tuple[str, ...]:
+    names = _field_names.get(cls)
+    if names is None:
+        names = _field_names[cls] = tuple(f.name for f in fields(cls))
+    return names
+
+
+def dump_bdl_ast(bdl_ast: ast.BdlAst) -> bytes:
+    return _dump(bdl_ast)
+
+
+def load_bdl_ast(data: bytes) -> ast.BdlAst:
+    return _load(data, ast.BdlAst)
+
+
+def dump_bdl_ir(bdl_ir: ir.BdlIr) -> bytes:
+    return _dump(bdl_ir)
+
+
+def load_bdl_ir(data: bytes) -> ir.BdlIr:
+    return _load(data, ir.BdlIr)
+
+
+class LazyList(Sequence):
+    """
+    Serialized list whose items are decoded on first access.
+    """
+
+    def __init__(self, reader: "_Reader", offsets: List[int]):
+        self._reader = reader
+        self._offsets = offsets
+        self._items: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._offsets)))]
+        if index < 0:
+            index += len(self._offsets)
+        item = self._items.get(index, self)
+        if item is self:
+            offset = self._offsets[index]
+            try:
+                item, _ = self._reader.read(offset)
+            except _CORRUPT_DATA_ERRORS as error:
+                raise _corrupt(error) from error
+            self._items[index] = item
+        return item
+
+
+class LazyDict(Mapping):
+    """
+    Serialized dict whose keys are decoded up front and values on first access.
+    """
+
+    def __init__(self, reader: "_Reader", offsets: Dict[Any, int]):
+        self._reader = reader
+        self._offsets = offsets
+        self._values: Dict[Any, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._offsets)
+
+    def __getitem__(self, key):
+        value = self._values.get(key, self)
+        if value is self:
+            offset = self._offsets[key]
+            try:
+                value, _ = self._reader.read(offset)
+            except _CORRUPT_DATA_ERRORS as error:
+                raise _corrupt(error) from error
+            self._values[key] = value
+        return value
+
+
+class LazyBdlAst:
+    """
+    `BdlAst` read by `open_bdl_ast`; statements are decoded one at a time.
+    """
+
+    def __init__(self, data: bytes):
+        self.attributes, self.statements = _open(data, ast.BdlAst)
+
+    def to_ast(self) -> ast.BdlAst:
+        return ast.BdlAst(
+            attributes=list(self.attributes), statements=list(self.statements)
+        )
+
+
+class LazyBdlIr:
+    """
+    `BdlIr` read by `open_bdl_ir`. Opening reads the module and def paths
+    only; `defs["a.b.C"]` decodes that one def.
+    """
+
+    def __init__(self, data: bytes):
+        self.modules, self.defs = _open(data, ir.BdlIr)
+
+    def to_ir(self) -> ir.BdlIr:
+        return ir.BdlIr(modules=dict(self.modules), defs=dict(self.defs))
+
+
+def open_bdl_ast(data: bytes) -> LazyBdlAst:
+    return LazyBdlAst(data)
+
+
+def open_bdl_ir(data: bytes) -> LazyBdlIr:
+    return LazyBdlIr(data)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class _Encoder:
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+        self.classes: Dict[type, int] = {}
+
+    def get_string_index(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def encode(self, value: Any, out: bytearray) -> None:
+        value_type = type(value)
+        if value_type is Span:
+            out.append(_SPAN)
+            _write_varint(out, value.start)
+            _write_varint(out, value.end - value.start)
+        elif value_type is str:
+            out.append(_STRING)
+            _write_varint(out, self.get_string_index(value))
+        elif value is None:
+            out.append(_NONE)
+        elif value_type is bool:
+            out.append(_TRUE if value else _FALSE)
+        elif value_type is int:
+            out.append(_INT)
+            _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+        elif value_type is list:
+            out.append(_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                self.encode(item, out)
+        elif value_type is dict:
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                self.encode(key, out)
+                self.encode(item, out)
+        else:
+            class_index = self.classes.get(value_type)
+            if class_index is None:
+                if value_type not in _NODE_CLASS_NAMES:
+                    raise TypeError(f"Cannot serialize {value_type.__name__}")
+                class_index = self.classes[value_type] = len(self.classes)
+            payload = bytearray()
+            for name in _get_field_names(value_type):
+                self.encode(getattr(value, name), payload)
+            out.append(_NODE)
+            _write_varint(out, class_index)
+            _write_varint(out, len(payload))
+            out += payload
+
+
+def _dump(root: Any) -> bytes:
+    encoder = _Encoder()
+    body = bytearray()
+    encoder.encode(root, body)
+
+    class_table = bytearray()
+    _write_varint(class_table, len(encoder.classes))
+    for cls in encoder.classes:
+        _write_varint(class_table, encoder.get_string_index(_NODE_CLASS_NAMES[cls]))
+        _write_varint(class_table, len(_get_field_names(cls)))
+
+    encoded_strings = [
+        value.encode("utf-8", "surrogatepass") for value in encoder.strings
+    ]
+    offsets = array("I", [0])
+    total = 0
+    for encoded in encoded_strings:
+        total += len(encoded)
+        offsets.append(total)
+    if sys.byteorder == "big":
+        offsets.byteswap()
+
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    out += _U32.pack(len(encoded_strings))
+    out += offsets.tobytes()
+    out += b"".join(encoded_strings)
+    out += class_table
+    out += body
+    return bytes(out)
+
+
+def _load(data: bytes, root_class: type) -> Any:
+    try:
+        reader = _Reader(data)
+        root, pos = reader.read(reader.root_pos)
+    except _CORRUPT_DATA_ERRORS as error:
+        raise _corrupt(error) from error
+    if type(root) is not root_class:
+        raise BinaryFormatError(f"Expected a serialized {root_class.__name__}")
+    if pos != len(data):
+        raise BinaryFormatError(f"Trailing data at {pos}")
+    return root
+
+
+def _open(data: bytes, root_class: type) -> List[Any]:
+    """
+    Reads the fields of the root node, indexing lists and dicts instead of
+    decoding them.
+    """
+    try:
+        return _open_root(data, root_class)
+    except _CORRUPT_DATA_ERRORS as error:
+        raise _corrupt(error) from error
+
+
+def _open_root(data: bytes, root_class: type) -> List[Any]:
+    reader = _Reader(data)
+    pos = reader.root_pos
+    if data[pos] != _NODE:
+        raise BinaryFormatError(f"Expected a serialized {root_class.__name__}")
+    class_index, pos = reader.read_varint(pos + 1)
+    _, pos = reader.read_varint(pos)
+    cls, _ = reader.classes[class_index]
+    if cls is not root_class:
+        raise BinaryFormatError(f"Expected a serialized {root_class.__name__}")
+    values = []
+    for _ in _get_field_names(cls):
+        value, pos = reader.read_lazy(pos)
+        values.append(value)
+    if pos != len(data):
+        raise BinaryFormatError(f"Trailing data at {pos}")
+    return values
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        if data[: len(MAGIC)] != MAGIC or len(data) < _HEADER_SIZE:
+            raise BinaryFormatError("Not a serialized BDL file")
+        if data[len(MAGIC)] != VERSION:
+            raise BinaryFormatError(f"Unsupported version {data[len(MAGIC)]}")
+        self.data = data
+        (string_count,) = _U32.unpack_from(data, len(MAGIC) + 1)
+        self._offsets_pos = _HEADER_SIZE
+        self._strings_pos = _HEADER_SIZE + _U32.size * (string_count + 1)
+        self._strings: List[Any] = [None] * string_count
+        (strings_size,) = _U32.unpack_from(data, self._offsets_pos + 4 * string_count)
+        if self._strings_pos + strings_size > len(data):
+            raise BinaryFormatError("Truncated string data")
+
+        pos = self._strings_pos + strings_size
+        class_count, pos = self.read_varint(pos)
+        self.classes: List[Tuple[type, int]] = []
+        for _ in range(class_count):
+            name_index, pos = self.read_varint(pos)
+            field_count, pos = self.read_varint(pos)
+            name = self.get_string(name_index)
+            cls = _NODE_CLASSES.get(name)
+            if cls is None or len(_get_field_names(cls)) != field_count:
+                raise BinaryFormatError(f"Unknown or changed node class {name}")
+            self.classes.append((cls, field_count))
+        self.root_pos = pos
+
+    def get_string(self, index: int) -> str:
+        value = self._strings[index]
+        if value is None:
+            start, end = struct.unpack_from(
+                "<II", self.data, self._offsets_pos + 4 * index
+            )
+            value = str(
+                self.data[self._strings_pos + start : self._strings_pos + end],
+                "utf-8",
+                "surrogatepass",
+            )
+            self._strings[index] = value
+        return value
+
+    def read_varint(self, pos: int) -> Tuple[int, int]:
+        data = self.data
+        byte = data[pos]
+        if byte < 0x80:
+            return byte, pos + 1
+        value = byte & 0x7F
+        shift = 7
+        while True:
+            pos += 1
+            byte = data[pos]
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value, pos + 1
+            shift += 7
+
+    def read(self, pos: int) -> Tuple[Any, int]:
+        data = self.data
+        read_varint = self.read_varint
+        tag = data[pos]
+        pos += 1
+        # Spans and strings make up most values, and most of their varints
+        # fit in a byte, so those cases are inlined.
+        if tag == _SPAN:
+            start = data[pos]
+            if start < 0x80:
+                pos += 1
+            else:
+                start, pos = read_varint(pos)
+            length = data[pos]
+            if length < 0x80:
+                pos += 1
+            else:
+                length, pos = read_varint(pos)
+            return Span(start, start + length), pos
+        if tag == _STRING:
+            index = data[pos]
+            if index < 0x80:
+                pos += 1
+            else:
+                index, pos = read_varint(pos)
+            value = self._strings[index]
+            if value is None:
+                value = self.get_string(index)
+            return value, pos
+        if tag == _NODE:
+            class_index = data[pos]
+            if class_index < 0x80:
+                pos += 1
+            else:
+                class_index, pos = read_varint(pos)
+            _, pos = read_varint(pos)
+            cls, field_count = self.classes[class_index]
+            values, pos = self.read_values(pos, field_count)
+            return cls(*values), pos
+        if tag == _NONE:
+            return None, pos
+        if tag == _LIST:
+            count, pos = read_varint(pos)
+            return self.read_values(pos, count)
+        if tag == _DICT:
+            count, pos = read_varint(pos)
+            result = {}
+            for _ in range(count):
+                key, pos = self.read(pos)
+                result[key], pos = self.read(pos)
+            return result, pos
+        if tag == _FALSE or tag == _TRUE:
+            return tag == _TRUE, pos
+        if tag == _INT:
+            value, pos = read_varint(pos)
+            return (value >> 1) ^ -(value & 1), pos
+        raise BinaryFormatError(f"Unknown tag {tag} at {pos - 1}")
+
+    def read_values(self, pos: int, count: int) -> Tuple[List[Any], int]:
+        """
+        `count` values in a row, the fields of a node or the items of a list.
+        Everything but dicts, booleans and integers is decoded here rather
+        than through `read`: this is where decoding spends its time. Span
+        starts take up to three varint bytes in files under 2MB, and those
+        are decoded inline too.
+        """
+        data = self.data
+        strings = self._strings
+        classes = self.classes
+        read_values = self.read_values
+        read_varint = self.read_varint
+        values: List[Any] = []
+        append = values.append
+        for _ in range(count):
+            tag = data[pos]
+            if tag == _SPAN:
+                start = data[pos + 1]
+                if start < 0x80:
+                    pos += 2
+                else:
+                    byte = data[pos + 2]
+                    if byte < 0x80:
+                        start = (start & 0x7F) | byte << 7
+                        pos += 3
+                    else:
+                        start = (start & 0x7F) | (byte & 0x7F) << 7
+                        byte = data[pos + 3]
+                        if byte < 0x80:
+                            start |= byte << 14
+                            pos += 4
+                        else:
+                            start, pos = read_varint(pos + 1)
+                length = data[pos]
+                if length < 0x80:
+                    pos += 1
+                else:
+                    length, pos = read_varint(pos)
+                append(Span(start, start + length))
+            elif tag == _NODE:
+                class_index = data[pos + 1]
+                if class_index < 0x80:
+                    pos += 2
+                else:
+                    class_index, pos = read_varint(pos + 1)
+                # The payload length is only for skipping.
+                while data[pos] >= 0x80:
+                    pos += 1
+                cls, field_count = classes[class_index]
+                fields, pos = read_values(pos + 1, field_count)
+                append(cls(*fields))
+            elif tag == _STRING:
+                index = data[pos + 1]
+                if index < 0x80:
+                    pos += 2
+                else:
+                    index, pos = read_varint(pos + 1)
+                value = strings[index]
+                append(value if value is not None else self.get_string(index))
+            elif tag == _NONE:
+                append(None)
+                pos += 1
+            elif tag == _LIST:
+                items_count = data[pos + 1]
+                if items_count < 0x80:
+                    pos += 2
+                else:
+                    items_count, pos = read_varint(pos + 1)
+                items, pos = read_values(pos, items_count)
+                append(items)
+            else:
+                value, pos = self.read(pos)
+                append(value)
+        return values, pos
+
+    def skip(self, pos: int) -> int:
+        data = self.data
+        tag = data[pos]
+        pos += 1
+        if tag == _NODE:
+            _, pos = self.read_varint(pos)
+            length, pos = self.read_varint(pos)
+            return pos + length
+        if tag == _LIST or tag == _DICT:
+            count, pos = self.read_varint(pos)
+            for _ in range(count if tag == _LIST else count * 2):
+                pos = self.skip(pos)
+            return pos
+        if tag == _SPAN:
+            _, pos = self.read_varint(pos)
+            _, pos = self.read_varint(pos)
+            return pos
+        if tag == _STRING or tag == _INT:
+            _, pos = self.read_varint(pos)
+            return pos
+        if tag == _NONE or tag == _FALSE or tag == _TRUE:
+            return pos
+        raise BinaryFormatError(f"Unknown tag {tag} at {pos - 1}")
+
+    def read_lazy(self, pos: int) -> Tuple[Any, int]:
+        tag = self.data[pos]
+        if tag == _LIST:
+            count, pos = self.read_varint(pos + 1)
+            offsets = []
+            for _ in range(count):
+                offsets.append(pos)
+                pos = self.skip(pos)
+            return LazyList(self, offsets), pos
+        if tag == _DICT:
+            count, pos = self.read_varint(pos + 1)
+            offsets = {}
+            for _ in range(count):
+                key, pos = self.read(pos)
+                offsets[key] = pos
+                pos = self.skip(pos)
+            return LazyDict(self, offsets), pos
+        return self.read(pos)
@@ -0,0 +1,96 @@
+import os
+import re
+from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+from bdl.ir.builder import ModuleFile, ResolveModuleFile
+
+_MODULE_NAME_PATTERN = re.compile(r"^[a-z_][a-z0-9_]*$", re.IGNORECASE)
+
+
+@dataclass(slots=True)
+class BdlConfig:
+    paths: Dict[str, str] = field(default_factory=dict)  # package name -> directory
+    standards: Optional[Dict[str, str]] = None  # standard id -> path or url
+
+
+@dataclass(slots=True)
+class LoadBdlConfigResult:
+    config_directory: str
+    bdl_config: BdlConfig
+
+
+def load_bdl_config(config: Optional[str] = None) -> LoadBdlConfigResult:
+    config_path = os.path.abspath(config or find_bdl_config_path())
+    with open(config_path, "r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f) or {}
+    bdl_config = BdlConfig(
+        paths=dict(raw.get("paths") or {}), standards=raw.get("standards")
+    )
+    return LoadBdlConfigResult(
+        config_directory=os.path.dirname(config_path), bdl_config=bdl_config
+    )
+
+
+def gather_entry_module_paths(
+    config_directory: str, paths: Dict[str, str]
+) -> List[str]:
+    result = []
+    for package_name, directory_path in paths.items():
+        resolved_directory_path = os.path.join(config_directory, directory_path)
+        for root, dirs, files in os.walk(resolved_directory_path):
+            dirs.sort()
+            for file_name in sorted(files):
+                if not file_name.endswith(".bdl"):
+                    continue
+                file_path = os.path.join(root, file_name)
+                if os.path.islink(file_path):
+                    continue
+                relative_path = os.path.relpath(file_path, resolved_directory_path)
+                names = relative_path[: -len(".bdl")].split(os.sep)
+                if all(_MODULE_NAME_PATTERN.match(name) for name in names):
+                    result.append(".".join([package_name, *names]))
+    return result
+
+
+def get_module_file_path(
+    config: BdlConfig, config_directory: str, module_path: str
+) -> str:
+    package_name, *fragments = module_path.split(".")
+    directory_path = os.path.join(config_directory, config.paths[package_name])
+    return os.path.abspath(os.path.join(directory_path, *fragments) + ".bdl")
+
+
+def get_resolve_module_file_fn(
+    config: BdlConfig, config_directory: str
+) -> ResolveModuleFile:
+    def resolve_module_file(module_path: str) -> ModuleFile:
+        file_path = get_module_file_path(config, config_directory, module_path)
+        with open(file_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        return ModuleFile(text=text, file_url=Path(file_path).as_uri())
+
+    return resolve_module_file
+
+
+def find_bdl_config_path(cwd: Optional[str] = None) -> str:
+    for path in get_bdl_config_candidates(cwd or os.getcwd()):
+        if os.path.isfile(path):
+            return path
+    return "/bdl.yaml"
+
+
+def get_bdl_config_candidates(cwd: str) -> List[str]:
+    result = []
+    directory = os.path.abspath(cwd)
+    while True:
+        result.append(os.path.join(directory, "bdl.yml"))
+        result.append(os.path.join(directory, "bdl.yaml"))
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+    return result
@@ -0,0 +1,64 @@
+from typing import Optional
+
+from bdl.io.config import (
+    BdlConfig,
+    gather_entry_module_paths,
+    get_resolve_module_file_fn,
+    load_bdl_config,
+)
+from bdl.ir.builder import BuildBdlIrResult, build_bdl_ir
+from bdl.ir.tree_shaking import get_entry_proc_paths, shake_bdl_ir
+from bdl.parser.bdl_parser import parse_bdl
+from bdl.parser.parse_cache import ParseCache
+
+
+def build_ir(
+    config: Optional[str] = None,
+    standard: Optional[str] = None,
+    omit_file_url: bool = False,
+    cache_directory: Optional[str] = None,
+    tree_shake: bool = False,
+) -> BuildBdlIrResult:
+    """
+    With `tree_shake`, the IR only keeps the defs reachable from the procs
+    of the entry modules (see `bdl.ir.tree_shaking`).
+    """
+    loaded = load_bdl_config(config)
+    return build_ir_with_config_object(
+        loaded.config_directory,
+        loaded.bdl_config,
+        standard,
+        omit_file_url,
+        cache_directory,
+        tree_shake,
+    )
+
+
+def build_ir_with_config_object(
+    config_directory: str,
+    bdl_config: BdlConfig,
+    standard: Optional[str] = None,
+    omit_file_url: bool = False,
+    cache_directory: Optional[str] = None,
+    tree_shake: bool = False,
+) -> BuildBdlIrResult:
+    entry_module_paths = gather_entry_module_paths(config_directory, bdl_config.paths)
+    resolve_module_file = get_resolve_module_file_fn(bdl_config, config_directory)
+    filter_entry_module = None
+    if standard is not None:
+
+        def filter_entry_module(params) -> bool:
+            return params.attributes.get("standard") == standard
+
+    parse = parse_bdl
+    if cache_directory is not None:
+        parse = ParseCache(cache_directory).parse
+    result = build_bdl_ir(
+        entry_module_paths, resolve_module_file, filter_entry_module, parse
+    )
+    if omit_file_url:
+        for module in result.ir.modules.values():
+            module.file_url = None
+    if tree_shake:
+        result.ir = shake_bdl_ir(result.ir, get_entry_proc_paths(result.ir, standard))
+    return result
@@ -0,0 +1,150 @@
+import re
+from typing import Callable, Dict, Iterable, List, Optional
+
+from bdl.ast.misc import get_import_paths
+from bdl.io.config import get_resolve_module_file_fn, load_bdl_config
+from bdl.io.project import CompiledModule
+from bdl.ir import model as ir
+from bdl.ir.builder import (
+    BuildBdlIrResult,
+    ModuleFile,
+    ParsedModuleFile,
+    ResolveModuleFile,
+    build_module,
+)
+from bdl.parser.bdl_parser import BdlAst, parse_bdl
+from bdl.parser.parse_cache import ParseCache
+
+# `import a.b.c {` at the start of a line. Imports written any other way
+# (a comment inside the path, say) are still found by the full parse.
+_IMPORT_PATTERN = re.compile(
+    r"^[ \t]*import\s+([A-Za-z_]\w*(?:\s*\.\s*[A-Za-z_]\w*)*)\s*\{", re.MULTILINE
+)
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def scan_import_paths(text: str) -> List[str]:
+    """
+    Module paths named by the `import` lines of a module, without parsing
+    it. Can be fooled by unusual formatting; `get_import_paths` on the AST
+    is the authority.
+    """
+    return [
+        _WHITESPACE_PATTERN.sub("", match.group(1))
+        for match in _IMPORT_PATTERN.finditer(text)
+    ]
+
+
+class ModuleLoader:
+    """
+    Builds the IR of some modules and the modules they import, and nothing
+    else::
+
+        loader = create_module_loader("bdl.yaml")
+        result = loader.load(["portone.v2.api.payment"])
+
+    Before any full parse, `load` follows the pre-scanned imports to read
+    every file of the dependency closure, so a missing module fails fast.
+    Modules are then parsed and built on demand, each at most once for the
+    lifetime of the loader; later loads reuse them. Results of different
+    loads share their module and def objects, so treat them as read-only.
+    """
+
+    def __init__(
+        self,
+        resolve_module_file: ResolveModuleFile,
+        parse: Callable[[str], BdlAst] = parse_bdl,
+    ):
+        self.resolve_module_file = resolve_module_file
+        self.parse = parse
+        # Read and pre-scanned, but not parsed yet.
+        self._files: Dict[str, ModuleFile] = {}
+        self._scanned_import_paths: Dict[str, List[str]] = {}
+        self._compiled: Dict[str, CompiledModule] = {}
+
+    def get_scanned_import_paths(self, module_path: str) -> List[str]:
+        import_paths = self._scanned_import_paths.get(module_path)
+        if import_paths is None:
+            compiled = self._compiled.get(module_path)
+            if compiled is not None:
+                import_paths = compiled.import_paths
+            else:
+                module_file = self.resolve_module_file(module_path)
+                self._files[module_path] = module_file
+                import_paths = scan_import_paths(module_file.text)
+            self._scanned_import_paths[module_path] = import_paths
+        return import_paths
+
+    def get_dependency_closure(self, module_paths: Iterable[str]) -> List[str]:
+        """
+        The given modules and everything they import, transitively, by the
+        pre-scan. Reads files but doesn't parse them.
+        """
+        result = list(dict.fromkeys(module_paths))
+        seen = set(result)
+        for module_path in result:
+            for import_path in self.get_scanned_import_paths(module_path):
+                if import_path not in seen:
+                    seen.add(import_path)
+                    result.append(import_path)
+        return result
+
+    def compile(self, module_path: str) -> CompiledModule:
+        compiled = self._compiled.get(module_path)
+        if compiled is not None:
+            return compiled
+        module_file = self._files.pop(module_path, None)
+        if module_file is None:
+            module_file = self.resolve_module_file(module_path)
+        bdl_ast = self.parse(module_file.text)
+        defs = []
+        module = build_module(
+            ParsedModuleFile(
+                module_path=module_path,
+                text=module_file.text,
+                ast=bdl_ast,
+                file_url=module_file.file_url,
+            ),
+            lambda def_path, definition: defs.append((def_path, definition)),
+        )
+        compiled = self._compiled[module_path] = CompiledModule(
+            module_path=module_path,
+            module=module,
+            defs=defs,
+            import_paths=get_import_paths(module_file.text, bdl_ast),
+            ast=bdl_ast,
+        )
+        return compiled
+
+    def load(self, module_paths: Iterable[str]) -> BuildBdlIrResult:
+        """
+        Same result as `bdl.ir.builder.build_bdl_ir` with `module_paths` as
+        the entry modules.
+        """
+        queue = list(module_paths)
+        self.get_dependency_closure(queue)
+        asts = {}
+        result = ir.BdlIr()
+        while queue:
+            module_path = queue.pop()
+            if module_path in result.modules:
+                continue
+            compiled = self.compile(module_path)
+            asts[module_path] = compiled.ast
+            result.modules[module_path] = compiled.module
+            result.defs.update(compiled.defs)
+            queue.extend(compiled.import_paths)
+        return BuildBdlIrResult(asts=asts, ir=result)
+
+
+def create_module_loader(
+    config: Optional[str] = None, cache_directory: Optional[str] = None
+) -> ModuleLoader:
+    loaded = load_bdl_config(config)
+    resolve_module_file = get_resolve_module_file_fn(
+        loaded.bdl_config, loaded.config_directory
+    )
+    parse = parse_bdl
+    if cache_directory is not None:
+        parse = ParseCache(cache_directory).parse
+    return ModuleLoader(resolve_module_file, parse)
@@ -0,0 +1,246 @@
+import os
+import sys
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bdl.ast.misc import get_import_paths
+from bdl.io.config import (
+    BdlConfig,
+    gather_entry_module_paths,
+    get_resolve_module_file_fn,
+    load_bdl_config,
+)
+from bdl.ir import model as ir
+from bdl.ir.builder import BuildBdlIrResult, ParsedModuleFile, build_module
+from bdl.ir.tree_shaking import get_entry_proc_paths, shake_bdl_ir
+from bdl.parser.bdl_parser import BdlAst, parse_bdl
+from bdl.parser.parse_cache import ParseCache
+from bdl.parser.parser import SyntaxError
+
+
+@dataclass(slots=True)
+class CompiledModule:
+    """
+    What a worker sends back for one module: its IR fragment rather than its
+    AST, since pickling an AST costs about as much as parsing it again.
+    """
+
+    module_path: str
+    module: Optional[ir.Module] = None
+    defs: List[Tuple[str, ir.Def]] = field(default_factory=list)
+    import_paths: List[str] = field(default_factory=list)
+    ast: Optional[BdlAst] = None
+    syntax_error: bool = False
+
+
+def build_project(
+    config_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    standard: Optional[str] = None,
+    omit_file_url: bool = False,
+    include_asts: bool = False,
+    cache_directory: Optional[str] = None,
+    tree_shake: bool = False,
+) -> BuildBdlIrResult:
+    """
+    Same result as `bdl.io.ir.build_ir`, with modules parsed in parallel.
+
+    Uses a thread pool on free-threaded builds and a process pool otherwise.
+    `workers` defaults to the CPU count; with one worker everything runs in
+    the calling process. ASTs are only shipped back when `include_asts` is
+    set, otherwise `BuildBdlIrResult.asts` is left empty. Workers share the
+    parse cache in `cache_directory` when one is given.
+    """
+    loaded = load_bdl_config(config_path)
+    config_directory = loaded.config_directory
+    bdl_config = loaded.bdl_config
+    entry_module_paths = gather_entry_module_paths(config_directory, bdl_config.paths)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        compiled_modules = _compile_serially(
+            config_directory,
+            bdl_config,
+            entry_module_paths,
+            include_asts,
+            cache_directory,
+        )
+    else:
+        with _create_executor(workers) as executor:
+            compiled_modules = _compile_in_parallel(
+                executor,
+                config_directory,
+                bdl_config,
+                entry_module_paths,
+                include_asts,
+                cache_directory,
+            )
+
+    for compiled in compiled_modules.values():
+        if compiled.syntax_error:
+            # Reparse here so the caller gets the original `SyntaxError`.
+            resolve_module_file = get_resolve_module_file_fn(
+                bdl_config, config_directory
+            )
+            parse_bdl(resolve_module_file(compiled.module_path).text)
+
+    result = _merge(compiled_modules, entry_module_paths, standard, omit_file_url)
+    if tree_shake:
+        result.ir = shake_bdl_ir(result.ir, get_entry_proc_paths(result.ir, standard))
+    return result
+
+
+def compile_module(
+    config_directory: str,
+    bdl_config: BdlConfig,
+    module_path: str,
+    include_ast: bool = False,
+    cache_directory: Optional[str] = None,
+) -> CompiledModule:
+    resolve_module_file = get_resolve_module_file_fn(bdl_config, config_directory)
+    module_file = resolve_module_file(module_path)
+    try:
+        bdl_ast = _get_parse_fn(cache_directory)(module_file.text)
+    except SyntaxError:
+        return CompiledModule(module_path=module_path, syntax_error=True)
+    defs = []
+    module = build_module(
+        ParsedModuleFile(
+            module_path=module_path,
+            text=module_file.text,
+            ast=bdl_ast,
+            file_url=module_file.file_url,
+        ),
+        lambda def_path, definition: defs.append((def_path, definition)),
+    )
+    return CompiledModule(
+        module_path=module_path,
+        module=module,
+        defs=defs,
+        import_paths=get_import_paths(module_file.text, bdl_ast),
+        ast=bdl_ast if include_ast else None,
+    )
+
+
+_parse_caches: Dict[str, ParseCache] = {}
+
+
+def _get_parse_fn(cache_directory: Optional[str]) -> Callable[[str], BdlAst]:
+    if cache_directory is None:
+        return parse_bdl
+    # One cache object per process, so its entry index is only loaded once.
+    parse_cache = _parse_caches.get(cache_directory)
+    if parse_cache is None:
+        parse_cache = _parse_caches[cache_directory] = ParseCache(cache_directory)
+    return parse_cache.parse
+
+
+def _create_executor(workers: int) -> Executor:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    if is_gil_enabled is not None and not is_gil_enabled():
+        return ThreadPoolExecutor(max_workers=workers)
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _compile_serially(
+    config_directory: str,
+    bdl_config: BdlConfig,
+    entry_module_paths: List[str],
+    include_asts: bool,
+    cache_directory: Optional[str],
+) -> Dict[str, CompiledModule]:
+    compiled_modules = {}
+    queue = list(entry_module_paths)
+    while queue:
+        module_path = queue.pop()
+        if module_path in compiled_modules:
+            continue
+        compiled = compile_module(
+            config_directory, bdl_config, module_path, include_asts, cache_directory
+        )
+        compiled_modules[module_path] = compiled
+        queue.extend(compiled.import_paths)
+    return compiled_modules
+
+
+def _compile_in_parallel(
+    executor: Executor,
+    config_directory: str,
+    bdl_config: BdlConfig,
+    entry_module_paths: List[str],
+    include_asts: bool,
+    cache_directory: Optional[str],
+) -> Dict[str, CompiledModule]:
+    compiled_modules = {}
+    submitted = set()
+    pending = set()
+
+    def submit(module_path: str) -> None:
+        if module_path in submitted:
+            return
+        submitted.add(module_path)
+        pending.add(
+            executor.submit(
+                compile_module,
+                config_directory,
+                bdl_config,
+                module_path,
+                include_asts,
+                cache_directory,
+            )
+        )
+
+    for module_path in entry_module_paths:
+        submit(module_path)
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.discard(future)
+            compiled = future.result()
+            compiled_modules[compiled.module_path] = compiled
+            for import_path in compiled.import_paths:
+                submit(import_path)
+    return compiled_modules
+
+
+def _merge(
+    compiled_modules: Dict[str, CompiledModule],
+    entry_module_paths: List[str],
+    standard: Optional[str],
+    omit_file_url: bool,
+) -> BuildBdlIrResult:
+    """
+    Assembles the IR in the order `bdl.ir.builder.gather` visits modules, so
+    the result doesn't depend on which worker finished first.
+    """
+    if standard is None:
+        queue = list(entry_module_paths)
+    else:
+        queue = [
+            module_path
+            for module_path in entry_module_paths
+            if compiled_modules[module_path].module.attributes.get("standard")
+            == standard
+        ]
+    asts = {}
+    result = ir.BdlIr()
+    while queue:
+        module_path = queue.pop()
+        if module_path in result.modules:
+            continue
+        compiled = compiled_modules[module_path]
+        if omit_file_url:
+            compiled.module.file_url = None
+        result.modules[module_path] = compiled.module
+        result.defs.update(compiled.defs)
+        if compiled.ast is not None:
+            asts[module_path] = compiled.ast
+        queue.extend(compiled.import_paths)
+    return BuildBdlIrResult(asts=asts, ir=result)
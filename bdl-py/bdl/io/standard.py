@@ -0,0 +1,58 @@
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import yaml
+
+# `standards/` at the root of the repository.
+BUILTIN_STANDARDS_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "standards"
+)
+BUILTIN_STANDARD_IDS = ("conventional", "global")
+
+
+@dataclass(slots=True)
+class StandardAttribute:
+    key: str
+    name: Optional[str] = None
+    description: Optional[str] = None
+
+
+@dataclass(slots=True)
+class BdlStandard:
+    name: Optional[str] = None
+    description: Optional[str] = None
+    # primitive name -> {"name": ..., "description": ...}
+    primitives: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    # attribute slot (`bdl.struct.field`, ...) -> attributes allowed there
+    attributes: Dict[str, List[StandardAttribute]] = field(default_factory=dict)
+
+
+def load_bdl_standard(path: str) -> BdlStandard:
+    with open(path, "r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f) or {}
+    return BdlStandard(
+        name=raw.get("name"),
+        description=raw.get("description"),
+        primitives=dict(raw.get("primitives") or {}),
+        attributes={
+            slot: [StandardAttribute(**attribute) for attribute in attributes or []]
+            for slot, attributes in (raw.get("attributes") or {}).items()
+        },
+    )
+
+
+_builtin_standards: Dict[str, BdlStandard] = {}
+
+
+def get_builtin_standard(standard_id: str) -> BdlStandard:
+    """
+    One of `BUILTIN_STANDARD_IDS`, loaded once.
+    """
+    standard = _builtin_standards.get(standard_id)
+    if standard is None:
+        if standard_id not in BUILTIN_STANDARD_IDS:
+            raise ValueError(f"Unknown builtin standard: {standard_id}")
+        path = os.path.join(BUILTIN_STANDARDS_DIRECTORY, f"{standard_id}.yaml")
+        standard = _builtin_standards[standard_id] = load_bdl_standard(path)
+    return standard
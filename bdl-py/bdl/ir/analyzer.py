@@ -0,0 +1,199 @@
+from typing import Dict, Iterable, List, Optional, Set
+
+from bdl.ir import model as ir
+
+# Counterpart of `bdl-ts/src/ir-analyzer.ts`. The TypeScript functions walk
+# the defs of a module on every call; here the references of every def are
+# indexed once, and module and graph queries are answered from the index.
+
+
+def get_def_type_paths(definition: ir.Def) -> List[str]:
+    """
+    Type paths a def refers to, in order and with repeats. Primitives are
+    included as their bare names (`string`, `int32`, ...).
+    """
+    types = _get_def_types_fns[definition.type](definition)
+    result = []
+    for type in types:
+        if type is None:
+            continue
+        if type.type == "Dictionary":
+            result.append(type.key_type_path)
+        result.append(type.value_type_path)
+    return result
+
+
+_get_def_types_fns = {
+    "Custom": lambda definition: [definition.original_type],
+    "Enum": lambda definition: [],
+    "Oneof": lambda definition: [item.item_type for item in definition.items],
+    "Proc": lambda definition: [
+        definition.input_type,
+        definition.output_type,
+        definition.error_type,
+    ],
+    "Struct": lambda definition: [field.field_type for field in definition.fields],
+    "Union": lambda definition: [
+        field.field_type for item in definition.items for field in item.fields
+    ],
+}
+
+
+class TypeReferenceIndex:
+    """
+    Forward and reverse type references between the defs of an IR::
+
+        index = TypeReferenceIndex(bdl_ir)
+        index.get_dependent_procs("portone.v2.api.data.Payment")
+        index.get_dead_defs()
+
+    Every def path and every referenced type path that isn't a def (a
+    primitive or a missing def) gets an integer id; `paths[id]` maps it back.
+    Def ids come first, in `bdl_ir.defs` order, so `id < def_count` tells
+    defs apart. Closures are breadth-first walks over the id lists, so a
+    query costs what it reaches, not the size of the IR.
+
+    The index doesn't follow later changes to the IR; build a new one.
+    """
+
+    def __init__(self, bdl_ir: ir.BdlIr):
+        self.bdl_ir = bdl_ir
+        self.paths: List[str] = list(bdl_ir.defs)
+        self.ids: Dict[str, int] = {path: id for id, path in enumerate(self.paths)}
+        self.def_count = len(self.paths)
+        # id -> ids it refers to / ids referring to it, without repeats
+        self.references: List[List[int]] = []
+        paths = self.paths
+        ids = self.ids
+        for definition in bdl_ir.defs.values():
+            reference_ids = {}
+            for type_path in get_def_type_paths(definition):
+                id = ids.get(type_path)
+                if id is None:
+                    id = ids[type_path] = len(paths)
+                    paths.append(type_path)
+                reference_ids[id] = None
+            self.references.append(list(reference_ids))
+        self.references.extend([] for _ in range(len(paths) - self.def_count))
+        self.referrers: List[List[int]] = [[] for _ in paths]
+        for id, reference_ids in enumerate(self.references):
+            for reference_id in reference_ids:
+                self.referrers[reference_id].append(id)
+
+    def is_def(self, path: str) -> bool:
+        id = self.ids.get(path)
+        return id is not None and id < self.def_count
+
+    def get_references(self, path: str) -> List[str]:
+        paths = self.paths
+        return [paths[id] for id in self.references[self.ids[path]]]
+
+    def get_referrers(self, path: str) -> List[str]:
+        paths = self.paths
+        return [paths[id] for id in self.referrers[self.ids[path]]]
+
+    def get_dependency_closure(self, paths: Iterable[str]) -> Set[str]:
+        """
+        The given paths and everything they refer to, transitively.
+        Raises `KeyError` for paths that are neither defs nor referenced.
+        """
+        return self._to_paths(self._walk(paths, self.references))
+
+    def get_dependent_closure(self, paths: Iterable[str]) -> Set[str]:
+        """
+        The given paths and every def that refers to them, transitively.
+        """
+        return self._to_paths(self._walk(paths, self.referrers))
+
+    def get_dependent_procs(self, path: str) -> List[str]:
+        """
+        Procs whose input, output or error type uses `path`, transitively.
+        """
+        defs = self.bdl_ir.defs
+        paths = self.paths
+        def_count = self.def_count
+        return [
+            paths[id]
+            for id in self._walk([path], self.referrers)
+            if id < def_count and defs[paths[id]].type == "Proc"
+        ]
+
+    def get_proc_paths(self) -> List[str]:
+        return [
+            path
+            for path, definition in self.bdl_ir.defs.items()
+            if definition.type == "Proc"
+        ]
+
+    def get_reachable_defs(
+        self, entry_paths: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """
+        Defs reachable from `entry_paths` (every proc by default), in
+        `bdl_ir.defs` order.
+        """
+        if entry_paths is None:
+            entry_paths = self.get_proc_paths()
+        reachable = self._walk(entry_paths, self.references)
+        def_ids = sorted(id for id in reachable if id < self.def_count)
+        paths = self.paths
+        return [paths[id] for id in def_ids]
+
+    def get_dead_defs(self, entry_paths: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Defs not reachable from `entry_paths` (every proc by default), in
+        `bdl_ir.defs` order.
+        """
+        if entry_paths is None:
+            entry_paths = self.get_proc_paths()
+        reachable = self._walk(entry_paths, self.references)
+        reached = bytearray(len(self.paths))
+        for id in reachable:
+            reached[id] = 1
+        paths = self.paths
+        return [paths[id] for id in range(self.def_count) if not reached[id]]
+
+    def get_referenced_type_paths(self, module_path: str) -> Set[str]:
+        paths = self.paths
+        ids = self.ids
+        references = self.references
+        return {
+            paths[reference_id]
+            for def_path in self.bdl_ir.modules[module_path].def_paths
+            for reference_id in references[ids[def_path]]
+        }
+
+    def get_imported_type_paths(self, module_path: str) -> Set[str]:
+        return {
+            f"{import_statement.module_path}.{item.name}"
+            for import_statement in self.bdl_ir.modules[module_path].imports
+            for item in import_statement.items
+        }
+
+    def get_external_type_paths(self, module_path: str) -> Set[str]:
+        return {
+            type_path
+            for type_path in self.get_referenced_type_paths(module_path)
+            if "." in type_path and type_path.rpartition(".")[0] != module_path
+        }
+
+    def get_missing_external_type_paths(self, module_path: str) -> Set[str]:
+        external_type_paths = self.get_external_type_paths(module_path)
+        return external_type_paths - self.get_imported_type_paths(module_path)
+
+    def _walk(self, paths: Iterable[str], edges: List[List[int]]) -> List[int]:
+        ids = self.ids
+        queue = list(dict.fromkeys(ids[path] for path in paths))
+        seen = bytearray(len(self.paths))
+        for id in queue:
+            seen[id] = 1
+        for id in queue:
+            for next_id in edges[id]:
+                if not seen[next_id]:
+                    seen[next_id] = 1
+                    queue.append(next_id)
+        return queue
+
+    def _to_paths(self, ids: List[int]) -> Set[str]:
+        paths = self.paths
+        return {paths[id] for id in ids}
@@ -0,0 +1,322 @@
+from typing import Callable, Dict, Iterator, List, Optional, Set
+from dataclasses import dataclass
+
+from bdl.ast.misc import (
+    get_attribute_content,
+    get_import_paths,
+    path_items_to_string,
+    slice_span,
+)
+from bdl.ir import model as ir
+from bdl.parser import bdl_parser as ast
+from bdl.parser.bdl_parser import parse_bdl
+
+
+@dataclass(slots=True)
+class ModuleFile:
+    text: str
+    file_url: Optional[str] = None
+
+
+ResolveModuleFile = Callable[[str], ModuleFile]
+
+
+@dataclass(slots=True)
+class FilterEntryModuleParams:
+    module_path: str
+    attributes: Dict[str, str]
+
+
+@dataclass(slots=True)
+class ParsedModuleFile:
+    module_path: str
+    text: str
+    ast: ast.BdlAst
+    file_url: Optional[str] = None
+
+
+@dataclass(slots=True)
+class BuildBdlIrResult:
+    asts: Dict[str, ast.BdlAst]
+    ir: ir.BdlIr
+
+
+def build_bdl_ir(
+    entry_module_paths: List[str],
+    resolve_module_file: ResolveModuleFile,
+    filter_entry_module: Optional[Callable[[FilterEntryModuleParams], bool]] = None,
+    parse: Callable[[str], ast.BdlAst] = parse_bdl,
+) -> BuildBdlIrResult:
+    asts: Dict[str, ast.BdlAst] = {}
+    result = ir.BdlIr()
+    defs = result.defs
+    for module_file in gather(
+        entry_module_paths, resolve_module_file, filter_entry_module, parse
+    ):
+        module_path = module_file.module_path
+        asts[module_path] = module_file.ast
+        result.modules[module_path] = build_module(module_file, defs.__setitem__)
+    return BuildBdlIrResult(asts=asts, ir=result)
+
+
+def build_module(
+    module_file: ParsedModuleFile, emit_def: Callable[[str, ir.Def], None]
+) -> ir.Module:
+    text = module_file.text
+    module_path = module_file.module_path
+    bdl_ast = module_file.ast
+    attributes = build_attributes(text, bdl_ast.attributes)
+    imports = build_imports(text, bdl_ast)
+    def_statements = get_def_statements(bdl_ast)
+    local_def_names = get_local_def_names(text, def_statements)
+    type_name_table = get_type_name_table(module_path, imports, local_def_names)
+    def_paths = []
+    for statement in def_statements:
+        definition = build_def(text, statement, type_name_table)
+        def_path = f"{module_path}.{definition.name}"
+        def_paths.append(def_path)
+        emit_def(def_path, definition)
+    return ir.Module(
+        file_url=module_file.file_url,
+        attributes=attributes,
+        def_paths=def_paths,
+        imports=imports,
+    )
+
+
+def get_type_name_table(
+    module_path: str, imports: List[ir.Import], local_def_names: Set[str]
+) -> Dict[str, str]:
+    """
+    Maps every type name visible in a module to its def path. Names that
+    aren't in the table are primitives (or unknown) and resolve to themselves.
+    """
+    table = {}
+    for import_statement in imports:
+        for import_item in import_statement.items:
+            type_path = f"{import_statement.module_path}.{import_item.name}"
+            table[import_item.as_ or import_item.name] = type_path
+    for name in local_def_names:
+        table[name] = f"{module_path}.{name}"
+    return table
+
+
+def get_local_def_names(
+    text: str, def_statements: List[ast.ModuleLevelStatement]
+) -> Set[str]:
+    return {slice_span(text, statement.name) for statement in def_statements}
+
+
+def get_def_statements(bdl_ast: ast.BdlAst) -> List[ast.ModuleLevelStatement]:
+    return [
+        statement
+        for statement in bdl_ast.statements
+        if statement.type in _build_def_body_fns
+    ]
+
+
+def build_imports(text: str, bdl_ast: ast.BdlAst) -> List[ir.Import]:
+    return [
+        build_import(text, statement)
+        for statement in bdl_ast.statements
+        if statement.type == "Import"
+    ]
+
+
+def build_def(
+    text: str,
+    statement: ast.ModuleLevelStatement,
+    type_name_table: Dict[str, str],
+) -> ir.Def:
+    definition = _build_def_body_fns[statement.type](text, statement, type_name_table)
+    definition.attributes = build_attributes(text, statement.attributes)
+    definition.name = slice_span(text, statement.name)
+    return definition
+
+
+def build_custom(
+    text: str, statement: ast.Custom, type_name_table: Dict[str, str]
+) -> ir.Custom:
+    return ir.Custom(
+        original_type=build_type(text, statement.original_type, type_name_table)
+    )
+
+
+def build_enum(
+    text: str, statement: ast.Enum, type_name_table: Dict[str, str]
+) -> ir.Enum:
+    return ir.Enum(
+        items=[
+            ir.EnumItem(
+                attributes=build_attributes(text, item.attributes),
+                name=slice_span(text, item.name),
+            )
+            for item in statement.items
+        ]
+    )
+
+
+def build_oneof(
+    text: str, statement: ast.Oneof, type_name_table: Dict[str, str]
+) -> ir.Oneof:
+    return ir.Oneof(
+        items=[
+            ir.OneofItem(
+                attributes=build_attributes(text, item.attributes),
+                item_type=build_type(text, item.item_type, type_name_table),
+            )
+            for item in statement.items
+        ]
+    )
+
+
+def build_proc(
+    text: str, statement: ast.Proc, type_name_table: Dict[str, str]
+) -> ir.Proc:
+    error_type = None
+    if statement.error is not None:
+        error_type = build_type(text, statement.error.error_type, type_name_table)
+    return ir.Proc(
+        input_type=build_type(text, statement.input_type, type_name_table),
+        output_type=build_type(text, statement.output_type, type_name_table),
+        error_type=error_type,
+    )
+
+
+def build_struct(
+    text: str, statement: ast.Struct, type_name_table: Dict[str, str]
+) -> ir.Struct:
+    return ir.Struct(
+        fields=[
+            build_struct_field(text, field, type_name_table)
+            for field in statement.fields
+        ]
+    )
+
+
+def build_struct_field(
+    text: str, field: ast.StructField, type_name_table: Dict[str, str]
+) -> ir.StructField:
+    return ir.StructField(
+        attributes=build_attributes(text, field.attributes),
+        name=slice_span(text, field.name),
+        field_type=build_type(text, field.field_type, type_name_table),
+        optional=field.question is not None,
+    )
+
+
+def build_union(
+    text: str, statement: ast.Union, type_name_table: Dict[str, str]
+) -> ir.Union:
+    items = []
+    for item in statement.items:
+        fields = []
+        if item.struct is not None:
+            fields = [
+                build_struct_field(text, field, type_name_table)
+                for field in item.struct.fields
+            ]
+        items.append(
+            ir.UnionItem(
+                attributes=build_attributes(text, item.attributes),
+                name=slice_span(text, item.name),
+                fields=fields,
+            )
+        )
+    return ir.Union(items=items)
+
+
+_build_def_body_fns = {
+    "Custom": build_custom,
+    "Enum": build_enum,
+    "Oneof": build_oneof,
+    "Proc": build_proc,
+    "Struct": build_struct,
+    "Union": build_union,
+}
+
+
+def build_type(
+    text: str, type_expression: ast.TypeExpression, type_name_table: Dict[str, str]
+) -> ir.Type:
+    value_type = slice_span(text, type_expression.value_type)
+    value_type_path = type_name_table.get(value_type, value_type)
+    container = type_expression.container
+    if container is None:
+        return ir.Plain(value_type_path=value_type_path)
+    if container.key_type is None:
+        return ir.Array(value_type_path=value_type_path)
+    key_type = slice_span(text, container.key_type)
+    return ir.Dictionary(
+        value_type_path=value_type_path,
+        key_type_path=type_name_table.get(key_type, key_type),
+    )
+
+
+def build_import(text: str, import_node: ast.Import) -> ir.Import:
+    return ir.Import(
+        attributes=build_attributes(text, import_node.attributes),
+        module_path=path_items_to_string(text, import_node.path),
+        items=[
+            ir.ImportItem(
+                name=slice_span(text, item.name),
+                as_=slice_span(text, item.alias.name) if item.alias else None,
+            )
+            for item in import_node.items
+        ],
+    )
+
+
+def build_attributes(text: str, attributes: List[ast.Attribute]) -> Dict[str, str]:
+    return {
+        slice_span(text, attribute.name): get_attribute_content(text, attribute)
+        for attribute in attributes
+    }
+
+
+def gather(
+    entry_module_paths: List[str],
+    resolve_module_file: ResolveModuleFile,
+    filter_entry_module: Optional[Callable[[FilterEntryModuleParams], bool]] = None,
+    parse: Callable[[str], ast.BdlAst] = parse_bdl,
+) -> Iterator[ParsedModuleFile]:
+    """
+    Yields the entry modules and everything they import, each parsed once.
+    """
+    memo: Dict[str, ParsedModuleFile] = {}
+
+    def read(module_path: str) -> ParsedModuleFile:
+        parsed = memo.get(module_path)
+        if parsed is None:
+            module_file = resolve_module_file(module_path)
+            parsed = ParsedModuleFile(
+                module_path=module_path,
+                text=module_file.text,
+                ast=parse(module_file.text),
+                file_url=module_file.file_url,
+            )
+            memo[module_path] = parsed
+        return parsed
+
+    if filter_entry_module is None:
+        queue = list(entry_module_paths)
+    else:
+        queue = []
+        for module_path in entry_module_paths:
+            parsed = read(module_path)
+            attributes = build_attributes(parsed.text, parsed.ast.attributes)
+            params = FilterEntryModuleParams(
+                module_path=module_path, attributes=attributes
+            )
+            if filter_entry_module(params):
+                queue.append(module_path)
+
+    visited = set()
+    while queue:
+        module_path = queue.pop()
+        if module_path in visited:
+            continue
+        visited.add(module_path)
+        parsed = read(module_path)
+        yield parsed
+        queue.extend(get_import_paths(parsed.text, parsed.ast))
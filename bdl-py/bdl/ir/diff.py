@@ -0,0 +1,48 @@
+from typing import List
+from dataclasses import dataclass, field
+
+from bdl.ir.ref import BdlIrRef
+
+# Mirrors `bdl/ir_diff.bdl`.
+
+
+@dataclass(slots=True)
+class Keep:
+    type: str = "Keep"
+    prev_ref: BdlIrRef = None
+
+
+@dataclass(slots=True)
+class Add:
+    type: str = "Add"
+    next_ref: BdlIrRef = None
+
+
+@dataclass(slots=True)
+class Remove:
+    type: str = "Remove"
+    prev_ref: BdlIrRef = None
+
+
+@dataclass(slots=True)
+class Replace:
+    type: str = "Replace"
+    prev_ref: BdlIrRef = None
+    next_ref: BdlIrRef = None
+
+
+@dataclass(slots=True)
+class Modify:
+    type: str = "Modify"
+    prev_ref: BdlIrRef = None
+    next_ref: BdlIrRef = None
+    items: List["DiffItem"] = field(default_factory=list)
+
+
+DiffItem = Keep | Add | Remove | Replace | Modify
+
+
+@dataclass(slots=True)
+class BdlIrDiff:
+    modules: List[DiffItem] = field(default_factory=list)
+    defs: List[DiffItem] = field(default_factory=list)
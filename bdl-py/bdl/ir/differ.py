@@ -0,0 +1,633 @@
+from hashlib import blake2b
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from dataclasses import dataclass
+
+from bdl.ir import model as ir
+from bdl.ir import ref
+from bdl.ir.diff import Add, BdlIrDiff, DiffItem, Keep, Modify, Remove, Replace
+
+# Port of `bdl-ts/src/ir-differ.ts`, with three differences: shared defs and
+# modules are compared as a whole before being descended into, list diffs
+# skip the common prefix and suffix and use the textbook edit distance, and
+# `StructField.optional` is diffed (the TypeScript differ skips it).
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# `("keep", prev, next) | ("add", next) | ("remove", prev) |
+# ("replace", prev, next)`, where the items are keys, indices or values.
+Diff = Tuple[Any, ...]
+# Builds the full ref of a nested ref, on the prev (True) or next side.
+WrapRef = Callable[[R, bool], ref.BdlIrRef]
+
+
+@dataclass(slots=True)
+class BdlIrFingerprints:
+    modules: Dict[str, bytes]  # key: module path
+    defs: Dict[str, bytes]  # key: def path
+
+
+def diff_bdl_ir(
+    prev: ir.BdlIr,
+    next: ir.BdlIr,
+    prev_fingerprints: Optional[BdlIrFingerprints] = None,
+    next_fingerprints: Optional[BdlIrFingerprints] = None,
+) -> BdlIrDiff:
+    """
+    Modules and defs present on both sides are `Keep` without being looked
+    into when they are the same object, their fingerprints match (when both
+    are given, e.g. stored with each release by `fingerprint_bdl_ir`) or
+    they compare equal. Only the ones that differ are diffed item by item.
+    """
+    return BdlIrDiff(
+        modules=_diff_records(
+            prev.modules,
+            next.modules,
+            prev_fingerprints.modules if prev_fingerprints else {},
+            next_fingerprints.modules if next_fingerprints else {},
+            lambda path, module_ref: ref.Module(path=path, ref=module_ref),
+            _diff_module,
+        ),
+        defs=_diff_records(
+            prev.defs,
+            next.defs,
+            prev_fingerprints.defs if prev_fingerprints else {},
+            next_fingerprints.defs if next_fingerprints else {},
+            lambda path, def_ref: ref.Def(path=path, ref=def_ref),
+            _diff_def,
+        ),
+    )
+
+
+def fingerprint_bdl_ir(bdl_ir: ir.BdlIr) -> BdlIrFingerprints:
+    return BdlIrFingerprints(
+        modules={
+            path: get_module_fingerprint(module)
+            for path, module in bdl_ir.modules.items()
+        },
+        defs={
+            path: get_def_fingerprint(definition)
+            for path, definition in bdl_ir.defs.items()
+        },
+    )
+
+
+def get_module_fingerprint(module: ir.Module) -> bytes:
+    key = (
+        module.file_url,
+        _get_attributes_key(module.attributes),
+        tuple(module.def_paths),
+        tuple(
+            (
+                _get_attributes_key(import_statement.attributes),
+                import_statement.module_path,
+                tuple((item.name, item.as_) for item in import_statement.items),
+            )
+            for import_statement in module.imports
+        ),
+    )
+    return _hash_key(key)
+
+
+def get_def_fingerprint(definition: ir.Def) -> bytes:
+    """
+    A digest of everything `diff_bdl_ir` compares. Like dict equality, it
+    ignores attribute order. Digests are stable across processes, so they
+    can be stored and passed to later diffs.
+    """
+    key = (
+        definition.type,
+        definition.name,
+        _get_attributes_key(definition.attributes),
+        _get_def_body_key_fns[definition.type](definition),
+    )
+    return _hash_key(key)
+
+
+def _hash_key(key: tuple) -> bytes:
+    return blake2b(repr(key).encode("utf-8"), digest_size=16).digest()
+
+
+def _get_attributes_key(attributes: Dict[str, str]) -> tuple:
+    return tuple(sorted(attributes.items()))
+
+
+def _get_type_key(type: Optional[ir.Type]) -> Optional[tuple]:
+    if type is None:
+        return None
+    if type.type == "Dictionary":
+        return (type.type, type.value_type_path, type.key_type_path)
+    return (type.type, type.value_type_path)
+
+
+def _get_struct_field_key(field: ir.StructField) -> tuple:
+    return (
+        _get_attributes_key(field.attributes),
+        field.name,
+        _get_type_key(field.field_type),
+        field.optional,
+    )
+
+
+_get_def_body_key_fns: Dict[str, Callable[[Any], tuple]] = {
+    "Custom": lambda definition: (_get_type_key(definition.original_type),),
+    "Enum": lambda definition: tuple(
+        (_get_attributes_key(item.attributes), item.name) for item in definition.items
+    ),
+    "Oneof": lambda definition: tuple(
+        (_get_attributes_key(item.attributes), _get_type_key(item.item_type))
+        for item in definition.items
+    ),
+    "Proc": lambda definition: (
+        _get_type_key(definition.input_type),
+        _get_type_key(definition.output_type),
+        _get_type_key(definition.error_type),
+    ),
+    "Struct": lambda definition: tuple(
+        _get_struct_field_key(field) for field in definition.fields
+    ),
+    "Union": lambda definition: tuple(
+        (
+            _get_attributes_key(item.attributes),
+            item.name,
+            tuple(_get_struct_field_key(field) for field in item.fields),
+        )
+        for item in definition.items
+    ),
+}
+
+
+def _diff_records(
+    prev: Dict[str, T],
+    next: Dict[str, T],
+    prev_fingerprints: Dict[str, bytes],
+    next_fingerprints: Dict[str, bytes],
+    to_ir_ref: Callable[[str, Any], ref.BdlIrRef],
+    diff_fn: Callable[[T, T, WrapRef], List[DiffItem]],
+) -> List[DiffItem]:
+    def diff_shared(path: str, _: str) -> List[DiffItem]:
+        prev_value = prev[path]
+        next_value = next[path]
+        if prev_value is next_value:
+            return []
+        prev_fingerprint = prev_fingerprints.get(path)
+        next_fingerprint = next_fingerprints.get(path)
+        if prev_fingerprint is None or next_fingerprint is None:
+            # Hashing both sides costs more than comparing them.
+            if prev_value == next_value:
+                return []
+        elif prev_fingerprint == next_fingerprint:
+            return []
+        return diff_fn(
+            prev_value, next_value, lambda nested, is_prev: to_ir_ref(path, nested)
+        )
+
+    return _convert_diffs(
+        _diff_keys(prev, next),
+        lambda path, is_prev: to_ir_ref(path, ref.This()),
+        diff_shared,
+    )
+
+
+def _diff_module(
+    prev: ir.Module, next: ir.Module, wrap: WrapRef[ref.ModuleRef]
+) -> List[DiffItem]:
+    return [
+        *_convert_diffs(
+            _diff_primitive(prev.file_url, next.file_url),
+            lambda _, is_prev: wrap(ref.FileUrl(), is_prev),
+        ),
+        *_diff_attributes(prev.attributes, next.attributes, wrap),
+        *_convert_diffs(
+            _diff_array(prev.def_paths, next.def_paths),
+            lambda index, is_prev: wrap(ref.DefPath(index=index), is_prev),
+        ),
+        *_diff_imports(prev.imports, next.imports, wrap),
+    ]
+
+
+def _diff_imports(
+    prev: List[ir.Import], next: List[ir.Import], wrap: WrapRef[ref.Import]
+) -> List[DiffItem]:
+    def diff_import(i: int, j: int) -> List[DiffItem]:
+        def wrap_import(import_ref: ref.ImportRef, is_prev: bool):
+            index = i if is_prev else j
+            return wrap(ref.Import(index=index, ref=import_ref), is_prev)
+
+        return [
+            *_diff_attributes(prev[i].attributes, next[j].attributes, wrap_import),
+            *_diff_import_items(prev[i].items, next[j].items, wrap_import),
+        ]
+
+    return _convert_diffs(
+        _diff_array(prev, next, _get_module_path),
+        lambda index, is_prev: wrap(ref.Import(index=index, ref=ref.This()), is_prev),
+        diff_import,
+    )
+
+
+def _diff_import_items(
+    prev: List[ir.ImportItem],
+    next: List[ir.ImportItem],
+    wrap: WrapRef[ref.ImportItem],
+) -> List[DiffItem]:
+    def diff_import_item(i: int, j: int) -> List[DiffItem]:
+        return _convert_diffs(
+            _diff_primitive(prev[i].as_, next[j].as_),
+            lambda _, is_prev: wrap(
+                ref.ImportItem(index=i if is_prev else j, ref=ref.As()), is_prev
+            ),
+        )
+
+    return _convert_diffs(
+        _diff_array(prev, next, _get_name),
+        lambda index, is_prev: wrap(
+            ref.ImportItem(index=index, ref=ref.This()), is_prev
+        ),
+        diff_import_item,
+    )
+
+
+def _diff_attributes(
+    prev: Dict[str, str], next: Dict[str, str], wrap: WrapRef[ref.Attribute]
+) -> List[DiffItem]:
+    if prev == next:
+        return [
+            Keep(prev_ref=wrap(ref.Attribute(key=key, ref=ref.This()), True))
+            for key in prev
+        ]
+
+    def diff_value(key: str, _: str) -> List[DiffItem]:
+        return _convert_diffs(
+            _diff_primitive(prev[key], next[key]),
+            lambda _, is_prev: wrap(ref.Attribute(key=key, ref=ref.Value()), is_prev),
+        )
+
+    return _convert_diffs(
+        _diff_keys(prev, next),
+        lambda key, is_prev: wrap(ref.Attribute(key=key, ref=ref.This()), is_prev),
+        diff_value,
+    )
+
+
+def _diff_def(prev: ir.Def, next: ir.Def, wrap: WrapRef[ref.DefRef]) -> List[DiffItem]:
+    return [
+        *_diff_attributes(prev.attributes, next.attributes, wrap),
+        *_convert_diffs(
+            _diff_primitive(prev.name, next.name),
+            lambda _, is_prev: wrap(ref.Name(), is_prev),
+        ),
+        *_diff_def_body(prev, next, wrap),
+    ]
+
+
+def _diff_def_body(
+    prev: ir.Def, next: ir.Def, wrap: WrapRef[ref.DefRef]
+) -> List[DiffItem]:
+    kind = "keep" if prev.type == next.type else "replace"
+    return _convert_diffs(
+        [(kind, prev, next)],
+        lambda _, is_prev: wrap(ref.This(), is_prev),
+        lambda prev, next: _diff_def_body_fns[prev.type](prev, next, wrap),
+    )
+
+
+def _diff_custom(
+    prev: ir.Custom, next: ir.Custom, wrap: WrapRef[ref.DefRef]
+) -> List[DiffItem]:
+    return _diff_type(
+        prev.original_type,
+        next.original_type,
+        lambda type_ref, is_prev: wrap(ref.Custom(type_ref=type_ref), is_prev),
+    )
+
+
+def _diff_enum(
+    prev: ir.Enum, next: ir.Enum, wrap: WrapRef[ref.DefRef]
+) -> List[DiffItem]:
+    def diff_enum_item(i: int, j: int) -> List[DiffItem]:
+        def wrap_item(item_ref: ref.EnumItemRef, is_prev: bool):
+            index = i if is_prev else j
+            return wrap(ref.Enum(index=index, ref=item_ref), is_prev)
+
+        prev_item = prev.items[i]
+        next_item = next.items[j]
+        return [
+            *_diff_attributes(prev_item.attributes, next_item.attributes, wrap_item),
+            *_convert_diffs(
+                _diff_primitive(prev_item.name, next_item.name),
+                lambda _, is_prev: wrap_item(ref.Name(), is_prev),
+            ),
+        ]
+
+    return _convert_diffs(
+        _diff_array(prev.items, next.items, _get_name),
+        lambda index, is_prev: wrap(ref.Enum(index=index, ref=ref.Name()), is_prev),
+        diff_enum_item,
+    )
+
+
+def _diff_oneof(
+    prev: ir.Oneof, next: ir.Oneof, wrap: WrapRef[ref.DefRef]
+) -> List[DiffItem]:
+    def diff_oneof_item(i: int, j: int) -> List[DiffItem]:
+        def wrap_item(item_ref: ref.OneofItemRef, is_prev: bool):
+            index = i if is_prev else j
+            return wrap(ref.Oneof(index=index, ref=item_ref), is_prev)
+
+        prev_item = prev.items[i]
+        next_item = next.items[j]
+        return [
+            *_diff_attributes(prev_item.attributes, next_item.attributes, wrap_item),
+            *_diff_type(
+                prev_item.item_type,
+                next_item.item_type,
+                lambda type_ref, is_prev: wrap_item(
+                    ref.ItemType(ref=type_ref), is_prev
+                ),
+            ),
+        ]
+
+    return _convert_diffs(
+        _diff_array(prev.items, next.items, _get_item_type_key),
+        lambda index, is_prev: wrap(
+            ref.Oneof(index=index, ref=ref.ItemType(ref=ref.This())), is_prev
+        ),
+        diff_oneof_item,
+    )
+
+
+def _diff_proc(
+    prev: ir.Proc, next: ir.Proc, wrap: WrapRef[ref.DefRef]
+) -> List[DiffItem]:
+    return [
+        *_diff_type(
+            prev.input_type,
+            next.input_type,
+            lambda type_ref, is_prev: wrap(
+                ref.Proc(ref=ref.InputType(ref=type_ref)), is_prev
+            ),
+        ),
+        *_diff_type(
+            prev.output_type,
+            next.output_type,
+            lambda type_ref, is_prev: wrap(
+                ref.Proc(ref=ref.OutputType(ref=type_ref)), is_prev
+            ),
+        ),
+        *_diff_type(
+            prev.error_type,
+            next.error_type,
+            lambda type_ref, is_prev: wrap(
+                ref.Proc(ref=ref.ErrorType(ref=type_ref)), is_prev
+            ),
+        ),
+    ]
+
+
+def _diff_struct(
+    prev: ir.Struct, next: ir.Struct, wrap: WrapRef[ref.DefRef]
+) -> List[DiffItem]:
+    return _diff_struct_fields(
+        prev.fields,
+        next.fields,
+        lambda index, field_ref, is_prev: wrap(
+            ref.Struct(index=index, ref=field_ref), is_prev
+        ),
+    )
+
+
+def _diff_union(
+    prev: ir.Union, next: ir.Union, wrap: WrapRef[ref.DefRef]
+) -> List[DiffItem]:
+    def diff_union_item(i: int, j: int) -> List[DiffItem]:
+        def wrap_item(item_ref: ref.UnionItemRef, is_prev: bool):
+            index = i if is_prev else j
+            return wrap(ref.Union(index=index, ref=item_ref), is_prev)
+
+        prev_item = prev.items[i]
+        next_item = next.items[j]
+        return [
+            *_diff_attributes(prev_item.attributes, next_item.attributes, wrap_item),
+            *_diff_struct_fields(
+                prev_item.fields,
+                next_item.fields,
+                lambda index, field_ref, is_prev: wrap_item(
+                    ref.Fields(index=index, ref=field_ref), is_prev
+                ),
+            ),
+        ]
+
+    return _convert_diffs(
+        _diff_array(prev.items, next.items, _get_name),
+        lambda index, is_prev: wrap(ref.Union(index=index, ref=ref.This()), is_prev),
+        diff_union_item,
+    )
+
+
+def _diff_struct_fields(
+    prev: List[ir.StructField],
+    next: List[ir.StructField],
+    wrap: Callable[[int, ref.StructFieldRef, bool], ref.BdlIrRef],
+) -> List[DiffItem]:
+    def diff_struct_field(i: int, j: int) -> List[DiffItem]:
+        def wrap_field(field_ref: ref.StructFieldRef, is_prev: bool):
+            return wrap(i if is_prev else j, field_ref, is_prev)
+
+        prev_field = prev[i]
+        next_field = next[j]
+        return [
+            *_diff_attributes(prev_field.attributes, next_field.attributes, wrap_field),
+            *_convert_diffs(
+                _diff_primitive(prev_field.name, next_field.name),
+                lambda _, is_prev: wrap_field(ref.Name(), is_prev),
+            ),
+            *_diff_type(
+                prev_field.field_type,
+                next_field.field_type,
+                lambda type_ref, is_prev: wrap_field(
+                    ref.FieldType(ref=type_ref), is_prev
+                ),
+            ),
+            *_convert_diffs(
+                _diff_primitive(prev_field.optional, next_field.optional),
+                lambda _, is_prev: wrap_field(ref.Optional(), is_prev),
+            ),
+        ]
+
+    return _convert_diffs(
+        _diff_array(prev, next, _get_name),
+        lambda index, is_prev: wrap(index, ref.This(), is_prev),
+        diff_struct_field,
+    )
+
+
+def _diff_type(
+    prev: Optional[ir.Type], next: Optional[ir.Type], wrap: WrapRef[ref.TypeRef]
+) -> List[DiffItem]:
+    def diff_type_paths(prev: ir.Type, next: ir.Type) -> List[DiffItem]:
+        result = _convert_diffs(
+            _diff_primitive(prev.value_type_path, next.value_type_path),
+            lambda _, is_prev: wrap(ref.ValueTypePath(), is_prev),
+        )
+        if prev.type == "Dictionary":
+            result += _convert_diffs(
+                _diff_primitive(prev.key_type_path, next.key_type_path),
+                lambda _, is_prev: wrap(ref.KeyTypePath(), is_prev),
+            )
+        return result
+
+    diffs = _diff_primitive(prev, next)
+    if diffs and diffs[0][0] == "replace" and prev.type == next.type:
+        diffs = [("keep", prev, next)]
+    return _convert_diffs(
+        diffs, lambda _, is_prev: wrap(ref.This(), is_prev), diff_type_paths
+    )
+
+
+_diff_def_body_fns: Dict[str, Callable[[Any, Any, WrapRef], List[DiffItem]]] = {
+    "Custom": _diff_custom,
+    "Enum": _diff_enum,
+    "Oneof": _diff_oneof,
+    "Proc": _diff_proc,
+    "Struct": _diff_struct,
+    "Union": _diff_union,
+}
+
+
+def _get_name(item: Any) -> str:
+    return item.name
+
+
+def _get_module_path(item: ir.Import) -> str:
+    return item.module_path
+
+
+def _get_item_type_key(item: ir.OneofItem) -> Optional[tuple]:
+    return _get_type_key(item.item_type)
+
+
+def _convert_diffs(
+    diffs: List[Diff],
+    to_ir_ref: Callable[[Any, bool], ref.BdlIrRef],
+    diff_nested: Optional[Callable[[Any, Any], List[DiffItem]]] = None,
+) -> List[DiffItem]:
+    """
+    A `keep` becomes `Modify` when `diff_nested` finds anything but `Keep`
+    inside it.
+    """
+    result: List[DiffItem] = []
+    for diff in diffs:
+        kind = diff[0]
+        if kind == "keep":
+            prev_ref = to_ir_ref(diff[1], True)
+            if diff_nested is not None:
+                items = diff_nested(diff[1], diff[2])
+                if any(item.type != "Keep" for item in items):
+                    next_ref = to_ir_ref(diff[2], False)
+                    result.append(
+                        Modify(prev_ref=prev_ref, next_ref=next_ref, items=items)
+                    )
+                    continue
+            result.append(Keep(prev_ref=prev_ref))
+        elif kind == "add":
+            result.append(Add(next_ref=to_ir_ref(diff[1], False)))
+        elif kind == "remove":
+            result.append(Remove(prev_ref=to_ir_ref(diff[1], True)))
+        else:
+            result.append(
+                Replace(
+                    prev_ref=to_ir_ref(diff[1], True),
+                    next_ref=to_ir_ref(diff[2], False),
+                )
+            )
+    return result
+
+
+def _diff_primitive(prev: Optional[T], next: Optional[T]) -> List[Diff]:
+    if prev is None:
+        return [] if next is None else [("add", next)]
+    if next is None:
+        return [("remove", prev)]
+    if prev == next:
+        return [("keep", prev, next)]
+    return [("replace", prev, next)]
+
+
+def _diff_keys(prev: Dict[str, Any], next: Dict[str, Any]) -> List[Diff]:
+    """
+    Removed keys in `prev` order, then kept and added keys in `next` order.
+    """
+    result: List[Diff] = [("remove", key) for key in prev if key not in next]
+    for key in next:
+        result.append(("keep", key, key) if key in prev else ("add", key))
+    return result
+
+
+def _diff_array(
+    prev: List[T], next: List[T], key: Optional[Callable[[T], Any]] = None
+) -> List[Diff]:
+    """
+    Edit script between two lists, as index diffs. Items are matched by
+    `key` (by value without one). The common prefix and suffix are kept
+    without going through the edit distance table, which is quadratic.
+    """
+    prev_keys = prev if key is None else [key(item) for item in prev]
+    next_keys = next if key is None else [key(item) for item in next]
+    prev_end = len(prev_keys)
+    next_end = len(next_keys)
+    start = 0
+    while (
+        start < prev_end and start < next_end and prev_keys[start] == next_keys[start]
+    ):
+        start += 1
+    while (
+        prev_end > start
+        and next_end > start
+        and prev_keys[prev_end - 1] == next_keys[next_end - 1]
+    ):
+        prev_end -= 1
+        next_end -= 1
+
+    # Built back to front, then reversed.
+    result: List[Diff] = [
+        ("keep", len(prev_keys) - 1 - k, len(next_keys) - 1 - k)
+        for k in range(len(prev_keys) - prev_end)
+    ]
+    table = _levenshtein(prev_keys[start:prev_end], next_keys[start:next_end])
+    i = prev_end - start
+    j = next_end - start
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and prev_keys[start + i - 1] == next_keys[start + j - 1]:
+            result.append(("keep", start + i - 1, start + j - 1))
+            i -= 1
+            j -= 1
+        elif j > 0 and (i == 0 or table[i][j] == table[i][j - 1] + 1):
+            result.append(("add", start + j - 1))
+            j -= 1
+        elif i > 0 and (j == 0 or table[i][j] == table[i - 1][j] + 1):
+            result.append(("remove", start + i - 1))
+            i -= 1
+        else:
+            result.append(("replace", start + i - 1, start + j - 1))
+            i -= 1
+            j -= 1
+    result.extend(("keep", index, index) for index in range(start - 1, -1, -1))
+    result.reverse()
+    return result
+
+
+def _levenshtein(prev: List[Any], next: List[Any]) -> List[List[int]]:
+    width = len(next) + 1
+    table = [list(range(width))]
+    for i, prev_item in enumerate(prev, 1):
+        above = table[-1]
+        row = [i] * width
+        for j, next_item in enumerate(next, 1):
+            row[j] = min(
+                above[j] + 1,
+                row[j - 1] + 1,
+                above[j - 1] + (prev_item != next_item),
+            )
+        table.append(row)
+    return table
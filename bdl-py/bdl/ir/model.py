@@ -0,0 +1,133 @@
+from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+
+# Mirrors `bdl/ir.bdl`. Field names are snake_cased; `ImportItem.as` is `as_`.
+
+
+@dataclass(slots=True)
+class ImportItem:
+    name: str
+    as_: Optional[str] = None
+
+
+@dataclass(slots=True)
+class Import:
+    attributes: Dict[str, str] = field(default_factory=dict)
+    module_path: str = ""
+    items: List[ImportItem] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Module:
+    file_url: Optional[str] = None
+    attributes: Dict[str, str] = field(default_factory=dict)
+    def_paths: List[str] = field(default_factory=list)
+    imports: List[Import] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Plain:
+    type: str = "Plain"
+    value_type_path: str = ""
+
+
+@dataclass(slots=True)
+class Array:
+    type: str = "Array"
+    value_type_path: str = ""
+
+
+@dataclass(slots=True)
+class Dictionary:
+    type: str = "Dictionary"
+    value_type_path: str = ""
+    key_type_path: str = ""
+
+
+Type = Plain | Array | Dictionary
+
+
+@dataclass(slots=True)
+class StructField:
+    attributes: Dict[str, str] = field(default_factory=dict)
+    name: str = ""
+    field_type: Type = None
+    optional: bool = False
+
+
+@dataclass(slots=True)
+class EnumItem:
+    attributes: Dict[str, str] = field(default_factory=dict)
+    name: str = ""
+
+
+@dataclass(slots=True)
+class OneofItem:
+    attributes: Dict[str, str] = field(default_factory=dict)
+    item_type: Type = None
+
+
+@dataclass(slots=True)
+class UnionItem:
+    attributes: Dict[str, str] = field(default_factory=dict)
+    name: str = ""
+    fields: List[StructField] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Custom:
+    type: str = "Custom"
+    attributes: Dict[str, str] = field(default_factory=dict)
+    name: str = ""
+    original_type: Type = None
+
+
+@dataclass(slots=True)
+class Enum:
+    type: str = "Enum"
+    attributes: Dict[str, str] = field(default_factory=dict)
+    name: str = ""
+    items: List[EnumItem] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Oneof:
+    type: str = "Oneof"
+    attributes: Dict[str, str] = field(default_factory=dict)
+    name: str = ""
+    items: List[OneofItem] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Proc:
+    type: str = "Proc"
+    attributes: Dict[str, str] = field(default_factory=dict)
+    name: str = ""
+    input_type: Type = None
+    output_type: Type = None
+    error_type: Optional[Type] = None
+
+
+@dataclass(slots=True)
+class Struct:
+    type: str = "Struct"
+    attributes: Dict[str, str] = field(default_factory=dict)
+    name: str = ""
+    fields: List[StructField] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Union:
+    type: str = "Union"
+    attributes: Dict[str, str] = field(default_factory=dict)
+    name: str = ""
+    items: List[UnionItem] = field(default_factory=list)
+
+
+Def = Custom | Enum | Oneof | Proc | Struct | Union
+
+
+@dataclass(slots=True)
+class BdlIr:
+    modules: Dict[str, Module] = field(default_factory=dict)  # key: module path
+    defs: Dict[str, Def] = field(default_factory=dict)  # key: def path
@@ -0,0 +1,208 @@
+from dataclasses import dataclass
+
+# Mirrors `bdl/ir_ref.bdl`. Variants that share a name across unions (`This`,
+# `Attribute`, `Name`, ...) share one class, like the generated TypeScript.
+
+
+@dataclass(slots=True)
+class This:
+    type: str = "This"
+
+
+@dataclass(slots=True)
+class Key:
+    type: str = "Key"
+
+
+@dataclass(slots=True)
+class Value:
+    type: str = "Value"
+
+
+AttributeRef = This | Key | Value
+
+
+@dataclass(slots=True)
+class Attribute:
+    type: str = "Attribute"
+    key: str = ""
+    ref: AttributeRef = None
+
+
+@dataclass(slots=True)
+class Name:
+    type: str = "Name"
+
+
+@dataclass(slots=True)
+class As:
+    type: str = "As"
+
+
+ImportItemRef = This | Name | As
+
+
+@dataclass(slots=True)
+class ModulePath:
+    type: str = "ModulePath"
+
+
+@dataclass(slots=True)
+class ImportItem:
+    type: str = "ImportItem"
+    index: int = 0
+    ref: ImportItemRef = None
+
+
+ImportRef = This | Attribute | ModulePath | ImportItem
+
+
+@dataclass(slots=True)
+class FileUrl:
+    type: str = "FileUrl"
+
+
+@dataclass(slots=True)
+class DefPath:
+    type: str = "DefPath"
+    index: int = 0
+
+
+@dataclass(slots=True)
+class Import:
+    type: str = "Import"
+    index: int = 0
+    ref: ImportRef = None
+
+
+ModuleRef = This | FileUrl | Attribute | DefPath | Import
+
+
+@dataclass(slots=True)
+class ValueTypePath:
+    type: str = "ValueTypePath"
+
+
+@dataclass(slots=True)
+class KeyTypePath:
+    type: str = "KeyTypePath"
+
+
+TypeRef = This | ValueTypePath | KeyTypePath
+
+
+EnumItemRef = Attribute | Name
+
+
+@dataclass(slots=True)
+class ItemType:
+    type: str = "ItemType"
+    ref: TypeRef = None
+
+
+OneofItemRef = Attribute | ItemType
+
+
+@dataclass(slots=True)
+class InputType:
+    type: str = "InputType"
+    ref: TypeRef = None
+
+
+@dataclass(slots=True)
+class OutputType:
+    type: str = "OutputType"
+    ref: TypeRef = None
+
+
+@dataclass(slots=True)
+class ErrorType:
+    type: str = "ErrorType"
+    ref: TypeRef = None
+
+
+ProcRef = InputType | OutputType | ErrorType
+
+
+@dataclass(slots=True)
+class FieldType:
+    type: str = "FieldType"
+    ref: TypeRef = None
+
+
+@dataclass(slots=True)
+class Optional:
+    type: str = "Optional"
+
+
+StructFieldRef = This | Attribute | Name | FieldType | Optional
+
+
+@dataclass(slots=True)
+class Fields:
+    type: str = "Fields"
+    index: int = 0
+    ref: StructFieldRef = None
+
+
+UnionItemRef = This | Attribute | Name | Fields
+
+
+@dataclass(slots=True)
+class Custom:
+    type: str = "Custom"
+    type_ref: TypeRef = None
+
+
+@dataclass(slots=True)
+class Enum:
+    type: str = "Enum"
+    index: int = 0
+    ref: EnumItemRef = None
+
+
+@dataclass(slots=True)
+class Oneof:
+    type: str = "Oneof"
+    index: int = 0
+    ref: OneofItemRef = None
+
+
+@dataclass(slots=True)
+class Proc:
+    type: str = "Proc"
+    ref: ProcRef = None
+
+
+@dataclass(slots=True)
+class Struct:
+    type: str = "Struct"
+    index: int = 0
+    ref: StructFieldRef = None
+
+
+@dataclass(slots=True)
+class Union:
+    type: str = "Union"
+    index: int = 0
+    ref: UnionItemRef = None
+
+
+DefRef = This | Attribute | Name | Custom | Enum | Oneof | Proc | Struct | Union
+
+
+@dataclass(slots=True)
+class Module:
+    type: str = "Module"
+    path: str = ""
+    ref: ModuleRef = None
+
+
+@dataclass(slots=True)
+class Def:
+    type: str = "Def"
+    path: str = ""
+    ref: DefRef = None
+
+
+BdlIrRef = Module | Def
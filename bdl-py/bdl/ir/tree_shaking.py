@@ -0,0 +1,77 @@
+from typing import Dict, Iterable, List, Optional
+
+from bdl.ir import model as ir
+from bdl.ir.analyzer import TypeReferenceIndex
+
+
+def shake_bdl_ir(
+    bdl_ir: ir.BdlIr,
+    entry_paths: Iterable[str],
+    index: Optional[TypeReferenceIndex] = None,
+) -> ir.BdlIr:
+    """
+    Minimal IR holding the entry defs and every def they reach through
+    struct and union fields, oneof items, custom original types and proc
+    input, output and error types.
+
+    Defs keep their order and are shared with `bdl_ir`, not copied. Modules
+    without a reachable def are dropped; the others keep only their
+    reachable def paths and the import items that name a reachable def.
+    """
+    if index is None:
+        index = TypeReferenceIndex(bdl_ir)
+    defs = bdl_ir.defs
+    result = ir.BdlIr()
+    for def_path in index.get_reachable_defs(entry_paths):
+        result.defs[def_path] = defs[def_path]
+    kept_defs = result.defs
+    for module_path, module in bdl_ir.modules.items():
+        def_paths = [path for path in module.def_paths if path in kept_defs]
+        if not def_paths:
+            continue
+        result.modules[module_path] = ir.Module(
+            file_url=module.file_url,
+            attributes=module.attributes,
+            def_paths=def_paths,
+            imports=_shake_imports(module.imports, kept_defs),
+        )
+    return result
+
+
+def get_entry_proc_paths(bdl_ir: ir.BdlIr, standard: Optional[str] = None) -> List[str]:
+    """
+    Procs of the modules whose `standard` attribute is `standard`, or of
+    every module when it is `None`.
+    """
+    defs = bdl_ir.defs
+    return [
+        def_path
+        for module in bdl_ir.modules.values()
+        if standard is None or module.attributes.get("standard") == standard
+        for def_path in module.def_paths
+        if defs[def_path].type == "Proc"
+    ]
+
+
+def _shake_imports(
+    imports: List[ir.Import], kept_defs: Dict[str, ir.Def]
+) -> List[ir.Import]:
+    result = []
+    for import_statement in imports:
+        module_path = import_statement.module_path
+        items = [
+            item
+            for item in import_statement.items
+            if f"{module_path}.{item.name}" in kept_defs
+        ]
+        if len(items) == len(import_statement.items):
+            result.append(import_statement)
+        elif items:
+            result.append(
+                ir.Import(
+                    attributes=import_statement.attributes,
+                    module_path=module_path,
+                    items=items,
+                )
+            )
+    return result
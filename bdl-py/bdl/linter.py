@@ -0,0 +1,764 @@
+import json
+import re
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import cached_property
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from bdl.ast.misc import get_attribute_content
+from bdl.io.config import BdlConfig
+from bdl.io.standard import BUILTIN_STANDARD_IDS, BdlStandard, get_builtin_standard
+from bdl.ir import model as ir
+from bdl.ir.builder import (
+    build_imports,
+    get_def_statements,
+    get_local_def_names,
+    get_type_name_table,
+)
+from bdl.parser.bdl_parser import (
+    Attribute,
+    BdlAst,
+    Custom,
+    Enum,
+    EnumItem,
+    Import,
+    ImportItem,
+    Oneof,
+    OneofItem,
+    Proc,
+    Struct,
+    StructField,
+    Union,
+    UnionItem,
+    parse_bdl,
+)
+from bdl.parser.parser import EOF, PatternType, Span, SyntaxError
+
+# Counterpart of `bdl-ts/src/linter/bdl.ts`, without the checks that read
+# other modules. There every check walks the AST on its own; here checks
+# are rules that subscribe to node kinds, and a `Linter` runs all of them
+# in one walk.
+
+Severity = Literal["error", "warning"]
+# (node, parent, context). The parent of a module attribute is the `BdlAst`,
+# and the parent of the `BdlAst` is `None`.
+Handler = Callable[[Any, Any, "LintContext"], None]
+
+
+@dataclass(slots=True)
+class LintDiagnostic:
+    code: str
+    message: str
+    severity: Severity
+    span: Span
+
+
+@dataclass(slots=True)
+class LintResult:
+    ast: Optional[BdlAst] = None
+    diagnostics: List[LintDiagnostic] = field(default_factory=list)
+
+
+# Node kind -> method a rule defines to subscribe to it.
+NODE_KINDS = {
+    "Module": "visit_module",
+    "Attribute": "visit_attribute",
+    "Import": "visit_import",
+    "ImportItem": "visit_import_item",
+    "Custom": "visit_custom",
+    "Enum": "visit_enum",
+    "EnumItem": "visit_enum_item",
+    "Oneof": "visit_oneof",
+    "OneofItem": "visit_oneof_item",
+    "Proc": "visit_proc",
+    "Struct": "visit_struct",
+    "StructField": "visit_struct_field",
+    "Union": "visit_union",
+    "UnionItem": "visit_union_item",
+    "TypeExpression": "visit_type_expression",
+}
+
+_ATTRIBUTE_SLOTS = {
+    BdlAst: "bdl.module",
+    Import: "bdl.import",
+    Custom: "bdl.custom",
+    Enum: "bdl.enum",
+    EnumItem: "bdl.enum.item",
+    Oneof: "bdl.oneof",
+    OneofItem: "bdl.oneof.item",
+    Proc: "bdl.proc",
+    Struct: "bdl.struct",
+    StructField: "bdl.struct.field",
+    Union: "bdl.union",
+    UnionItem: "bdl.union.item",
+}
+
+
+_NO_ATTRIBUTES: Mapping[str, List[Attribute]] = MappingProxyType({})
+
+
+class LintContext:
+    """
+    The module being linted, as rules see it. Facts that several rules need
+    (the type name table, primitives, allowed attribute keys, attributes by
+    name) are computed on first use and then shared, so rules that don't
+    run don't pay for them.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        bdl_ast: BdlAst,
+        module_path: str = "",
+        standard: Optional[BdlStandard] = None,
+        bdl_config: Optional[BdlConfig] = None,
+    ):
+        self.text = text
+        self.bdl_ast = bdl_ast
+        self.module_path = module_path
+        self.standard = standard
+        self.bdl_config = bdl_config
+        self.diagnostics: List[LintDiagnostic] = []
+        self._attributes_by_name: Dict[int, Dict[str, List[Attribute]]] = {}
+
+    def report(
+        self, code: str, message: str, span: Span, severity: Severity = "error"
+    ) -> None:
+        self.diagnostics.append(LintDiagnostic(code, message, severity, span))
+
+    def get_text(self, span: Span) -> str:
+        return self.text[span.start : span.end]
+
+    @cached_property
+    def def_statements(self) -> List[Any]:
+        return get_def_statements(self.bdl_ast)
+
+    @cached_property
+    def imports(self) -> List[ir.Import]:
+        return build_imports(self.text, self.bdl_ast)
+
+    @cached_property
+    def local_def_names(self) -> Set[str]:
+        return get_local_def_names(self.text, self.def_statements)
+
+    @cached_property
+    def type_name_table(self) -> Dict[str, str]:
+        """
+        Type name -> def path, for the imported and local defs.
+        """
+        return get_type_name_table(self.module_path, self.imports, self.local_def_names)
+
+    @cached_property
+    def primitives(self) -> Set[str]:
+        result = set(get_builtin_standard("global").primitives)
+        if self.standard is not None:
+            result.update(self.standard.primitives)
+        return result
+
+    @cached_property
+    def attribute_keys(self) -> Dict[str, Set[str]]:
+        """
+        Attribute slot -> keys the global and the module's standard allow.
+        """
+        result: Dict[str, Set[str]] = {}
+        standards = [get_builtin_standard("global")]
+        if self.standard is not None:
+            standards.append(self.standard)
+        for standard in standards:
+            for slot, attributes in standard.attributes.items():
+                keys = result.setdefault(slot, set())
+                keys.update(attribute.key for attribute in attributes)
+        return result
+
+    @cached_property
+    def known_standard_ids(self) -> Set[str]:
+        result = set(BUILTIN_STANDARD_IDS)
+        if self.bdl_config is not None and self.bdl_config.standards:
+            result.update(self.bdl_config.standards)
+        return result
+
+    def get_attribute_slot(self, owner: Any) -> str:
+        return _ATTRIBUTE_SLOTS[type(owner)]
+
+    def get_attributes_by_name(self, node: Any) -> Mapping[str, List[Attribute]]:
+        """
+        Attributes of `node` grouped by name, in source order. Don't modify
+        the result; it is shared.
+        """
+        attributes = node.attributes
+        if not attributes:
+            return _NO_ATTRIBUTES
+        result = self._attributes_by_name.get(id(node))
+        if result is None:
+            result = self._attributes_by_name[id(node)] = {}
+            text = self.text
+            for attribute in attributes:
+                name = text[attribute.name.start : attribute.name.end]
+                names = result.get(name)
+                if names is None:
+                    result[name] = [attribute]
+                else:
+                    names.append(attribute)
+        return result
+
+
+class LintRule:
+    """
+    Base of lint rules. A rule subscribes to a node kind by defining the
+    method `NODE_KINDS` names for it, e.g. `visit_struct_field(self, node,
+    parent, context)`, and reports through `context.report`. `start` and
+    `finish` run before and after the walk; rules that keep state across
+    nodes reset it in `start`.
+    """
+
+    name: str = ""
+
+    def start(self, context: LintContext) -> None:
+        pass
+
+    def finish(self, context: LintContext) -> None:
+        pass
+
+
+@dataclass(slots=True)
+class RuleTiming:
+    calls: int = 0
+    seconds: float = 0.0
+
+
+class LintProfile:
+    """
+    Time spent in each rule, over every lint run given this profile::
+
+        profile = LintProfile()
+        linter.lint(text, profile=profile)
+        print(profile.report())
+
+    `walk_seconds` is the time of the runs minus the time in rules: the cost
+    of the walk itself.
+    """
+
+    def __init__(self):
+        self.rules: Dict[str, RuleTiming] = {}
+        self.runs = 0
+        self.seconds = 0.0
+
+    @property
+    def walk_seconds(self) -> float:
+        return self.seconds - sum(timing.seconds for timing in self.rules.values())
+
+    def report(self, limit: Optional[int] = None) -> str:
+        rows = sorted(
+            self.rules.items(), key=lambda item: item[1].seconds, reverse=True
+        )
+        lines = [f"{'rule':<32} {'calls':>10} {'ms':>10}"]
+        for name, timing in rows[:limit]:
+            lines.append(
+                f"{name:<32} {timing.calls:>10,} {timing.seconds * 1e3:>10.2f}"
+            )
+        lines.append(
+            f"{'(walk)':<32} {self.runs:>10,} {self.walk_seconds * 1e3:>10.2f}"
+        )
+        return "\n".join(lines)
+
+
+class Linter:
+    """
+    Runs rules together in a single walk over the AST::
+
+        linter = Linter(get_default_rules())
+        result = linter.lint(text, standard=get_builtin_standard("conventional"))
+
+    Each node kind has the list of handlers subscribed to it, built once
+    here; the walk calls them in rule order and skips the subtrees no rule
+    looks into. A linter can be reused for any number of modules, but not
+    from several threads at once, since rules may keep per-run state.
+    """
+
+    def __init__(self, rules: Iterable[LintRule]):
+        self.rules = list(rules)
+        self._handlers = self._get_handlers(None)
+
+    def lint(
+        self,
+        text: str,
+        bdl_ast: Optional[BdlAst] = None,
+        module_path: str = "",
+        standard: Optional[BdlStandard] = None,
+        bdl_config: Optional[BdlConfig] = None,
+        profile: Optional[LintProfile] = None,
+    ) -> LintResult:
+        """
+        Diagnostics sorted by position, without those on lines turned off
+        by `bdlc-lint-*` comments. A syntax error is reported as the only
+        diagnostic when `bdl_ast` is not given.
+        """
+        result = LintResult(ast=bdl_ast)
+        if bdl_ast is None:
+            try:
+                result.ast = bdl_ast = parse_bdl(text)
+            except SyntaxError as error:
+                result.diagnostics.append(_get_syntax_diagnostic(error))
+                result.diagnostics = _filter_disabled_lines(text, result.diagnostics)
+                return result
+        context = LintContext(text, bdl_ast, module_path, standard, bdl_config)
+        if profile is None:
+            self._run(context, self._handlers)
+        else:
+            start = time.perf_counter()
+            self._run(context, self._get_handlers(profile))
+            profile.seconds += time.perf_counter() - start
+            profile.runs += 1
+        context.diagnostics.sort(key=lambda diagnostic: diagnostic.span.start)
+        result.diagnostics = _filter_disabled_lines(text, context.diagnostics)
+        return result
+
+    def _get_handlers(
+        self, profile: Optional[LintProfile]
+    ) -> Dict[str, Tuple[Handler, ...]]:
+        """
+        Node kind -> handlers, plus `start` and `finish`. With a profile,
+        every handler is wrapped to add its time to its rule's timing.
+        """
+        handlers: Dict[str, List[Handler]] = {kind: [] for kind in NODE_KINDS}
+        handlers["start"] = []
+        handlers["finish"] = []
+        for rule in self.rules:
+            timing = None
+            if profile is not None:
+                name = rule.name or type(rule).__name__
+                timing = profile.rules.setdefault(name, RuleTiming())
+            for kind, method_name in NODE_KINDS.items():
+                handler = getattr(rule, method_name, None)
+                if handler is not None:
+                    handlers[kind].append(_timed(handler, timing))
+            handlers["start"].append(_timed(_ignore_node(rule.start), timing))
+            handlers["finish"].append(_timed(_ignore_node(rule.finish), timing))
+        return {kind: tuple(kind_handlers) for kind, kind_handlers in handlers.items()}
+
+    def _run(self, context: LintContext, handlers: Dict[str, Tuple[Handler, ...]]):
+        for handler in handlers["start"]:
+            handler(None, None, context)
+        _walk(context, handlers)
+        for handler in handlers["finish"]:
+            handler(None, None, context)
+
+
+def _timed(handler: Handler, timing: Optional[RuleTiming]) -> Handler:
+    if timing is None:
+        return handler
+    perf_counter = time.perf_counter
+
+    def timed_handler(node: Any, parent: Any, context: LintContext) -> None:
+        start = perf_counter()
+        handler(node, parent, context)
+        timing.seconds += perf_counter() - start
+        timing.calls += 1
+
+    return timed_handler
+
+
+def _ignore_node(fn: Callable[[LintContext], None]) -> Handler:
+    return lambda node, parent, context: fn(context)
+
+
+def _walk(context: LintContext, handlers: Dict[str, Tuple[Handler, ...]]) -> None:
+    """
+    Visits every node once: a node, then its attributes, then its children.
+    """
+    bdl_ast = context.bdl_ast
+    on_attribute = handlers["Attribute"]
+    on_type = handlers["TypeExpression"]
+    for handler in handlers["Module"]:
+        handler(bdl_ast, None, context)
+    if on_attribute:
+        for attribute in bdl_ast.attributes:
+            for handler in on_attribute:
+                handler(attribute, bdl_ast, context)
+    for statement in bdl_ast.statements:
+        statement_type = statement.type
+        for handler in handlers[statement_type]:
+            handler(statement, bdl_ast, context)
+        if on_attribute:
+            for attribute in statement.attributes:
+                for handler in on_attribute:
+                    handler(attribute, statement, context)
+        if statement_type == "Struct":
+            _walk_fields(statement.fields, statement, context, handlers)
+        elif statement_type == "Union":
+            on_item = handlers["UnionItem"]
+            for item in statement.items:
+                for handler in on_item:
+                    handler(item, statement, context)
+                if on_attribute:
+                    for attribute in item.attributes:
+                        for handler in on_attribute:
+                            handler(attribute, item, context)
+                if item.struct is not None:
+                    _walk_fields(item.struct.fields, item, context, handlers)
+        elif statement_type == "Enum":
+            on_item = handlers["EnumItem"]
+            for item in statement.items:
+                for handler in on_item:
+                    handler(item, statement, context)
+                if on_attribute:
+                    for attribute in item.attributes:
+                        for handler in on_attribute:
+                            handler(attribute, item, context)
+        elif statement_type == "Oneof":
+            on_item = handlers["OneofItem"]
+            for item in statement.items:
+                for handler in on_item:
+                    handler(item, statement, context)
+                if on_attribute:
+                    for attribute in item.attributes:
+                        for handler in on_attribute:
+                            handler(attribute, item, context)
+                for handler in on_type:
+                    handler(item.item_type, item, context)
+        elif statement_type == "Proc":
+            if on_type:
+                types = [statement.input_type, statement.output_type]
+                if statement.error is not None:
+                    types.append(statement.error.error_type)
+                for type_expression in types:
+                    for handler in on_type:
+                        handler(type_expression, statement, context)
+        elif statement_type == "Custom":
+            for handler in on_type:
+                handler(statement.original_type, statement, context)
+        elif statement_type == "Import":
+            on_item = handlers["ImportItem"]
+            if on_item:
+                for item in statement.items:
+                    for handler in on_item:
+                        handler(item, statement, context)
+
+
+def _walk_fields(
+    fields: List[StructField],
+    parent: Any,
+    context: LintContext,
+    handlers: Dict[str, Tuple[Handler, ...]],
+) -> None:
+    on_field = handlers["StructField"]
+    on_attribute = handlers["Attribute"]
+    on_type = handlers["TypeExpression"]
+    if not (on_field or on_attribute or on_type):
+        return
+    for struct_field in fields:
+        for handler in on_field:
+            handler(struct_field, parent, context)
+        if on_attribute:
+            for attribute in struct_field.attributes:
+                for handler in on_attribute:
+                    handler(attribute, struct_field, context)
+        for handler in on_type:
+            handler(struct_field.field_type, struct_field, context)
+
+
+def _get_syntax_diagnostic(error: SyntaxError) -> LintDiagnostic:
+    # As `checkParseError` of `bdl-ts/src/linter/bdl.ts`: the span covers
+    # what was found instead of the expected patterns.
+    got_span = error.got_span
+    got = EOF if got_span is None else error.parser.get_text(got_span)
+    expected = " or ".join(
+        _pattern_to_string(pattern) for pattern in error.expected_patterns
+    )
+    return LintDiagnostic(
+        code="bdl/syntax",
+        message=f"Expected {expected}, got {_pattern_to_string(got)}.",
+        severity="error",
+        span=got_span or Span(error.loc, error.loc),
+    )
+
+
+_REGEX_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+
+
+def _pattern_to_string(pattern: PatternType) -> str:
+    # As `patternToString`: strings as `JSON.stringify` quotes them, and
+    # regexes as JavaScript writes them.
+    if isinstance(pattern, str):
+        return json.dumps(pattern, ensure_ascii=False)
+    if isinstance(pattern, re.Pattern):
+        flags = "".join(flag for value, flag in _REGEX_FLAGS if pattern.flags & value)
+        return f"/{pattern.pattern}/{flags}"
+    return SyntaxError._pattern_to_string(pattern)
+
+
+# lint line control
+
+
+_LINT_DIRECTIVES = ("enable", "disable", "disable-line", "disable-next-line")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_ATTRIBUTE_LINE_CONTENT_PATTERN = re.compile(r"^[@#]\s*\S+\s*-")
+
+
+def get_disabled_lines(text: str) -> Set[int]:
+    """
+    1-based numbers of the lines `bdlc-lint-disable`, `-enable`,
+    `-disable-line` and `-disable-next-line` comments turn linting off for.
+    """
+    disabled_lines = set()
+    if "bdlc-lint-" not in text:
+        return disabled_lines
+    enabled = True
+    for line_index, line in enumerate(text.split("\n")):
+        line_number = line_index + 1
+        line_disabled = not enabled
+        for directive in _get_lint_directives(line):
+            if directive == "disable-line":
+                line_disabled = True
+            elif directive == "disable-next-line":
+                disabled_lines.add(line_number + 1)
+            elif directive == "disable":
+                line_disabled = True
+                enabled = False
+            elif directive == "enable":
+                enabled = True
+        if line_disabled:
+            disabled_lines.add(line_number)
+    return disabled_lines
+
+
+def _get_lint_directives(line: str) -> List[str]:
+    index = line.find("//")
+    while index >= 0:
+        if _is_lint_directive_comment_start(line, index):
+            comment_body = line[index + 2 :].lstrip()
+            if not comment_body.startswith("bdlc-lint-"):
+                return []
+            return [
+                token[len("bdlc-lint-") :]
+                for token in _WHITESPACE_PATTERN.split(comment_body)
+                if token.startswith("bdlc-lint-")
+                and token[len("bdlc-lint-") :] in _LINT_DIRECTIVES
+            ]
+        index = line.find("//", index + 1)
+    return []
+
+
+def _is_lint_directive_comment_start(line: str, comment_start: int) -> bool:
+    prefix = line[:comment_start].lstrip()
+    if not prefix:
+        return True
+    if prefix.startswith("|"):
+        return False
+    return not _ATTRIBUTE_LINE_CONTENT_PATTERN.match(prefix)
+
+
+def _filter_disabled_lines(
+    text: str, diagnostics: List[LintDiagnostic]
+) -> List[LintDiagnostic]:
+    disabled_lines = get_disabled_lines(text)
+    if not disabled_lines or not diagnostics:
+        return diagnostics
+    line_starts = [0]
+    index = text.find("\n")
+    while index >= 0:
+        line_starts.append(index + 1)
+        index = text.find("\n", index + 1)
+    return [
+        diagnostic
+        for diagnostic in diagnostics
+        if bisect_right(line_starts, diagnostic.span.start) not in disabled_lines
+    ]
+
+
+# rules
+
+
+class StandardRule(LintRule):
+    """
+    The module names a known standard with a `# standard` attribute.
+    """
+
+    name = "standard"
+
+    def visit_module(self, bdl_ast: BdlAst, parent: None, context: LintContext):
+        attribute = next(
+            (
+                attribute
+                for attribute in bdl_ast.attributes
+                if context.get_text(attribute.name) == "standard"
+            ),
+            None,
+        )
+        if attribute is None:
+            context.report(
+                "bdl/missing-standard", "No BDL standard specified.", Span(0, 0)
+            )
+            return
+        standard_id = get_attribute_content(context.text, attribute)
+        if standard_id and standard_id not in context.known_standard_ids:
+            context.report(
+                "bdl/unknown-standard", "Unknown BDL standard.", attribute.name
+            )
+
+
+class UnknownTypeRule(LintRule):
+    """
+    Every type name is a primitive, a local def or an imported one.
+    """
+
+    name = "unknown-type"
+
+    def visit_type_expression(self, node, parent, context: LintContext) -> None:
+        self._check(node.value_type, context)
+        if node.container is not None and node.container.key_type is not None:
+            self._check(node.container.key_type, context)
+
+    def _check(self, span: Span, context: LintContext) -> None:
+        type_name = context.get_text(span)
+        if "." in context.type_name_table.get(type_name, type_name):
+            return
+        if type_name in context.primitives:
+            return
+        context.report("bdl/unknown-type", f"Cannot find name '{type_name}'.", span)
+
+
+class UnknownAttributeRule(LintRule):
+    """
+    Every attribute is one the global or the module's standard allows where
+    it is written.
+    """
+
+    name = "unknown-attribute"
+
+    def visit_attribute(self, attribute: Attribute, owner, context: LintContext):
+        keys = context.attribute_keys.get(context.get_attribute_slot(owner))
+        key = context.get_text(attribute.name)
+        if keys is None or key not in keys:
+            context.report(
+                "bdl/unknown-attribute", f"Unknown attribute '{key}'.", attribute.name
+            )
+
+
+class DuplicateNameRule(LintRule):
+    """
+    Local defs and imported names don't share a name.
+    """
+
+    name = "duplicate-name"
+
+    def start(self, context: LintContext) -> None:
+        self._spans_by_name: Dict[str, List[Span]] = {}
+
+    def _add(self, span: Span, context: LintContext) -> None:
+        self._spans_by_name.setdefault(context.get_text(span), []).append(span)
+
+    def visit_import_item(self, item: ImportItem, parent, context: LintContext):
+        self._add(item.alias.name if item.alias else item.name, context)
+
+    def visit_def(self, statement, parent, context: LintContext) -> None:
+        self._add(statement.name, context)
+
+    visit_custom = visit_enum = visit_oneof = visit_proc = visit_def
+    visit_struct = visit_union = visit_def
+
+    def finish(self, context: LintContext) -> None:
+        for name, spans in self._spans_by_name.items():
+            if len(spans) > 1:
+                for span in spans:
+                    context.report(
+                        "bdl/duplicate-name", f"Duplicated name '{name}'.", span
+                    )
+
+
+class DuplicateAttributeRule(LintRule):
+    """
+    No attribute is given twice to the same node.
+    """
+
+    name = "duplicate-attribute"
+
+    def visit_node(self, node, parent, context: LintContext) -> None:
+        if len(node.attributes) < 2:
+            return
+        for name, attributes in context.get_attributes_by_name(node).items():
+            if len(attributes) > 1:
+                for attribute in attributes:
+                    context.report(
+                        "bdl/duplicate-attribute",
+                        f"Duplicated attribute '{name}'.",
+                        attribute.name,
+                    )
+
+    visit_import = visit_custom = visit_enum = visit_enum_item = visit_node
+    visit_oneof = visit_oneof_item = visit_proc = visit_struct = visit_node
+    visit_struct_field = visit_union = visit_union_item = visit_node
+
+
+class DuplicateItemRule(LintRule):
+    """
+    Enum items, union items and the fields of a struct or union item have
+    distinct names.
+    """
+
+    name = "duplicate-item"
+
+    def visit_enum(self, node: Enum, parent, context: LintContext) -> None:
+        self._check(node.items, context)
+
+    def visit_union(self, node: Union, parent, context: LintContext) -> None:
+        self._check(node.items, context)
+
+    def visit_union_item(self, node: UnionItem, parent, context: LintContext):
+        if node.struct is not None:
+            self._check(node.struct.fields, context)
+
+    def visit_struct(self, node: Struct, parent, context: LintContext) -> None:
+        self._check(node.fields, context)
+
+    def _check(self, items: List[Any], context: LintContext) -> None:
+        items_by_name: Dict[str, List[Any]] = {}
+        for item in items:
+            items_by_name.setdefault(context.get_text(item.name), []).append(item)
+        if len(items_by_name) == len(items):
+            return
+        for name, named_items in items_by_name.items():
+            if len(named_items) > 1:
+                for item in named_items:
+                    context.report(
+                        "bdl/duplicate-item", f"Duplicated item '{name}'.", item.name
+                    )
+
+
+def get_default_rules() -> List[LintRule]:
+    """
+    The checks of the TypeScript linter that need nothing but the module.
+    """
+    return [
+        StandardRule(),
+        UnknownTypeRule(),
+        UnknownAttributeRule(),
+        DuplicateNameRule(),
+        DuplicateAttributeRule(),
+        DuplicateItemRule(),
+    ]
+
+
+def lint_bdl(
+    text: str,
+    bdl_ast: Optional[BdlAst] = None,
+    module_path: str = "",
+    standard: Optional[BdlStandard] = None,
+    bdl_config: Optional[BdlConfig] = None,
+) -> LintResult:
+    return Linter(get_default_rules()).lint(
+        text, bdl_ast, module_path, standard, bdl_config
+    )
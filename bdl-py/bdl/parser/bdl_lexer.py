@@ -0,0 +1,323 @@
+import re
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+from .parser import EOF, Parser, PatternType, Span, SyntaxError, anchor_pattern
+
+IDENT_PATTERN = re.compile(r"^[a-z_][a-z0-9_]*", re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r"^(?:\x20|\t|\r|\n)+")
+SINGLELINE_COMMENT_PATTERN = re.compile(r"^//.*(?:\n|$)")
+ATTRIBUTE_CONTENT_PATTERN = re.compile(
+    r"^- ?[^\n]*|^(?:(?:\x20|\t|\r)*\|[^\n]*(?:\n|$))+"
+)
+
+# Token kinds. Trivia kinds come first so that skipping them is a single
+# comparison.
+WHITESPACE = 0
+COMMENT = 1
+IDENT = 2
+ARROW = 3
+COMMA = 4
+BRACE_OPEN = 5
+BRACE_CLOSE = 6
+PAREN_OPEN = 7
+PAREN_CLOSE = 8
+BRACKET_OPEN = 9
+BRACKET_CLOSE = 10
+EQ = 11
+COLON = 12
+QUESTION = 13
+DOT = 14
+SHARP = 15
+AT = 16
+ATTRIBUTE_CONTENT = 17
+UNKNOWN = 18
+END = 19
+
+LAST_TRIVIA = COMMENT
+
+# What each kind is reported as in `SyntaxError` messages.
+TOKEN_PATTERNS: Dict[int, PatternType] = {
+    WHITESPACE: WHITESPACE_PATTERN,
+    COMMENT: SINGLELINE_COMMENT_PATTERN,
+    IDENT: IDENT_PATTERN,
+    ARROW: "->",
+    COMMA: ",",
+    BRACE_OPEN: "{",
+    BRACE_CLOSE: "}",
+    PAREN_OPEN: "(",
+    PAREN_CLOSE: ")",
+    BRACKET_OPEN: "[",
+    BRACKET_CLOSE: "]",
+    EQ: "=",
+    COLON: ":",
+    QUESTION: "?",
+    DOT: ".",
+    SHARP: "#",
+    AT: "@",
+    ATTRIBUTE_CONTENT: ATTRIBUTE_CONTENT_PATTERN,
+    END: EOF,
+}
+
+# Group order must follow the kind numbering above: `lastindex - 1` is the kind.
+_TOKEN_SOURCE = "|".join(
+    [
+        r"([\x20\t\r\n]+)",
+        r"(//[^\n]*\n?)",
+        r"([a-z_][a-z0-9_]*)",
+        r"(->)",
+        r"(,)",
+        r"(\{)",
+        r"(\})",
+        r"(\()",
+        r"(\))",
+        r"(\[)",
+        r"(\])",
+        r"(=)",
+        r"(:)",
+        r"(\?)",
+        r"(\.)",
+        r"(#)",
+        r"(@)",
+        r"((?!))",  # ATTRIBUTE_CONTENT is only produced after an attribute name
+        r"([\s\S])",
+    ]
+)
+_TOKEN_PATTERN = re.compile(_TOKEN_SOURCE, re.IGNORECASE)
+_WORD_PATTERN = re.compile(r"\w")
+
+# The same tokens over UTF-8 bytes. Everything outside comments and attribute
+# content is ASCII, so the two lexers agree except on offsets, which count
+# bytes here. (The str lexer's IGNORECASE also folds a few non-ASCII letters,
+# like KELVIN SIGN, into `[a-z]`; bytes patterns can't, so those stay UNKNOWN.)
+_TOKEN_BYTES_PATTERN = re.compile(_TOKEN_SOURCE.encode(), re.IGNORECASE)
+_ATTRIBUTE_CONTENT_MATCH = anchor_pattern(ATTRIBUTE_CONTENT_PATTERN).match
+_ATTRIBUTE_CONTENT_BYTES_PATTERN = re.compile(
+    anchor_pattern(ATTRIBUTE_CONTENT_PATTERN).pattern.encode()
+)
+
+
+@dataclass(slots=True)
+class TokenStream:
+    """
+    Every character of the input belongs to exactly one token, trivia
+    included, so token `i` spans `starts[i]:starts[i + 1]`. The stream always
+    ends with an `END` token, and `starts` carries one extra entry holding
+    the input length.
+    """
+
+    kinds: array
+    starts: array
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+
+def tokenize_bdl(
+    text: Union[str, bytes], reuse: Optional[TokenStream] = None
+) -> TokenStream:
+    """
+    Tokenizes `text`, or UTF-8 bytes (`bytes`, `mmap`, `memoryview`) with
+    offsets counted in bytes. The arrays of `reuse` are refilled and it is
+    returned, which saves allocating new ones for every small input.
+    """
+    if reuse is None:
+        kinds = array("B")
+        starts = array("I")
+    else:
+        kinds = reuse.kinds
+        starts = reuse.starts
+        del kinds[:]
+        del starts[:]
+    if isinstance(text, str):
+        match_token = _TOKEN_PATTERN.match
+        match_content = _ATTRIBUTE_CONTENT_MATCH
+    else:
+        match_token = _TOKEN_BYTES_PATTERN.match
+        match_content = _ATTRIBUTE_CONTENT_BYTES_PATTERN.match
+    push_kind = kinds.append
+    push_start = starts.append
+    pos = 0
+    length = len(text)
+
+    while pos < length:
+        match = match_token(text, pos)
+        kind = match.lastindex - 1
+        push_kind(kind)
+        push_start(pos)
+        pos = match.end()
+        if kind != SHARP and kind != AT:
+            continue
+
+        # `accept_attribute` reads: symbol, trivia, name, trivia, content.
+        # Content is the only context sensitive token, so scan it here.
+        attribute_name_seen = False
+        while pos < length:
+            match = match_token(text, pos)
+            kind = match.lastindex - 1
+            if kind <= LAST_TRIVIA:
+                pass
+            elif kind == IDENT and not attribute_name_seen:
+                attribute_name_seen = True
+            else:
+                break
+            push_kind(kind)
+            push_start(pos)
+            pos = match.end()
+        if attribute_name_seen and pos < length:
+            match = match_content(text, pos)
+            if match is not None:
+                push_kind(ATTRIBUTE_CONTENT)
+                push_start(pos)
+                pos = match.end()
+
+    push_kind(END)
+    push_start(length)
+    push_start(length)
+    if reuse is not None:
+        return reuse
+    return TokenStream(kinds=kinds, starts=starts)
+
+
+class TokenParser(Parser):
+    """
+    `Parser` over a `TokenStream`. `loc` always sits at a token boundary, so
+    spans and error locations are identical to scanning the raw text.
+    """
+
+    def __init__(self, input_text: str, tokens: Optional[TokenStream] = None):
+        self.tokens = tokens if tokens is not None else tokenize_bdl(input_text)
+        self.kinds = self.tokens.kinds
+        self.starts = self.tokens.starts
+        self.index = 0
+        super().__init__(input_text)
+
+    def reset(self, input_text: str) -> None:
+        """
+        Starts over on `input_text`, refilling the token arrays in place.
+        Anything still holding this parser, like a `SyntaxError`, sees the
+        new input afterwards.
+        """
+        tokenize_bdl(input_text, self.tokens)
+        self.index = 0
+        self.input = input_text
+        self._line_index = None
+        self._accept_budget = len(input_text) * 5
+
+    @property
+    def loc(self) -> int:
+        return self.starts[self.index]
+
+    @loc.setter
+    def loc(self, loc: int) -> None:
+        starts = self.starts
+        low, high = 0, len(self.kinds) - 1
+        while low < high:
+            mid = (low + high) >> 1
+            if starts[mid] < loc:
+                low = mid + 1
+            else:
+                high = mid
+        self.index = low
+
+    def look(self, accept_fn):
+        index = self.index
+        try:
+            return accept_fn(self)
+        finally:
+            self.index = index
+
+    def peek_kind(self) -> int:
+        return self.kinds[self.index]
+
+    def peek_ident(self) -> Optional[str]:
+        index = self.index
+        if self.kinds[index] != IDENT:
+            return None
+        starts = self.starts
+        return self.input[starts[index] : starts[index + 1]]
+
+    def accept(self, pattern: PatternType) -> Optional[Span]:
+        return self.accept_token(_PATTERN_KINDS[pattern])
+
+    def accept_token(self, kind: int) -> Optional[Span]:
+        index = self.index
+        if self.kinds[index] != kind:
+            return None
+        self.index = index + 1
+        starts = self.starts
+        return Span(start=starts[index], end=starts[index + 1])
+
+    def expect_token(
+        self,
+        kind: int,
+        expected_patterns: List[PatternType] = None,
+        mistake_patterns: List[PatternType] = None,
+    ) -> Span:
+        result = self.accept_token(kind)
+        if result is None:
+            _expected_patterns = [TOKEN_PATTERNS[kind]]
+            if expected_patterns:
+                _expected_patterns.extend(expected_patterns)
+            raise SyntaxError(self, _expected_patterns, mistake_patterns)
+        return result
+
+    def accept_keyword(self, keyword: str) -> Optional[Span]:
+        index = self.index
+        if self.kinds[index] != IDENT:
+            return None
+        starts = self.starts
+        start = starts[index]
+        end = starts[index + 1]
+        if self.input[start:end] != keyword:
+            return None
+        # Keywords end on a word boundary, which `[a-z0-9_]` alone doesn't cover.
+        if _WORD_PATTERN.match(self.input, end) is not None:
+            return None
+        self.index = index + 1
+        return Span(start=start, end=end)
+
+    def skip_trivia(self) -> None:
+        kinds = self.kinds
+        index = self.index
+        while kinds[index] <= LAST_TRIVIA:
+            index += 1
+        self.index = index
+
+
+class BytesTokenParser(TokenParser):
+    """
+    `TokenParser` over UTF-8 bytes (`bytes`, `mmap`, `memoryview`), so a
+    memory-mapped file can be parsed without decoding it. Spans and error
+    locations count bytes; only identifiers the grammar looks at get decoded.
+    """
+
+    def peek_ident(self) -> Optional[str]:
+        index = self.index
+        if self.kinds[index] != IDENT:
+            return None
+        starts = self.starts
+        return str(self.input[starts[index] : starts[index + 1]], "ascii")
+
+    def accept_keyword(self, keyword: str) -> Optional[Span]:
+        index = self.index
+        if self.kinds[index] != IDENT:
+            return None
+        starts = self.starts
+        start = starts[index]
+        end = starts[index + 1]
+        if self.input[start:end] != keyword.encode():
+            return None
+        if end < len(self.input):
+            # The next character may be a non-ASCII letter, so decode it.
+            next_char = str(self.input[end : end + 4], "utf-8", "ignore")[:1]
+            if _WORD_PATTERN.match(next_char) is not None:
+                return None
+        self.index = index + 1
+        return Span(start=start, end=end)
+
+
+_PATTERN_KINDS: Dict[PatternType, int] = {
+    pattern: kind for kind, pattern in TOKEN_PATTERNS.items()
+}
@@ -1,36 +1,66 @@
-import re
-from typing import Literal, List, Optional, Callable, Any
+from operator import methodcaller
+from typing import Literal, Iterable, List, Optional, Callable, Any
 from dataclasses import dataclass, field
 
-from .parser import Parser, Span, SyntaxError, EOF, flip_flop, choice
+from .parser import Span, SyntaxError, dispatch, flip_flop
+from .bdl_lexer import (
+    ARROW,
+    AT,
+    ATTRIBUTE_CONTENT,
+    BRACE_CLOSE,
+    BRACE_OPEN,
+    BRACKET_CLOSE,
+    BRACKET_OPEN,
+    COLON,
+    COMMA,
+    DOT,
+    END,
+    EQ,
+    IDENT,
+    IDENT_PATTERN,
+    PAREN_CLOSE,
+    PAREN_OPEN,
+    QUESTION,
+    SHARP,
+    BytesTokenParser,
+    TokenParser,
+)
+
+# Patterns that were defined here before the lexer took over skipping
+# trivia; re-exported for code that still imports them from this module.
+from .bdl_lexer import (  # noqa: F401
+    ATTRIBUTE_CONTENT_PATTERN,
+    SINGLELINE_COMMENT_PATTERN,
+    WHITESPACE_PATTERN,
+)
 
 
-@dataclass
+@dataclass(slots=True)
 class Attribute:
     symbol: Literal["Sharp", "At"]
     name: Span
     content: Optional[Span] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Sharp:
     type: str = "Sharp"
     span: Span = None
 
 
-@dataclass
+@dataclass(slots=True)
 class At:
     type: str = "At"
     span: Span = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BdlAst:
     attributes: List[Attribute] = field(default_factory=list)
     statements: List["ModuleLevelStatement"] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Import:
     type: str = "Import"
     attributes: List[Attribute] = field(default_factory=list)
@@ -41,50 +71,50 @@ class Import:
     bracket_close: Span = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ImportItem:
     name: Span = None
     alias: Optional["ImportAlias"] = None
     comma: Optional[Span] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ImportAlias:
     as_keyword: Span = None
     name: Span = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PathItem:
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Identifier(PathItem):
     type: str = "Identifier"
     span: Span = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Dot(PathItem):
     type: str = "Dot"
     span: Span = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TypeExpression:
     value_type: Span = None
     container: Optional["Container"] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Container:
     bracket_open: Span = None
     key_type: Optional[Span] = None
     bracket_close: Span = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Custom:
     type: str = "Custom"
     attributes: List[Attribute] = field(default_factory=list)
@@ -94,7 +124,7 @@ class Custom:
     original_type: TypeExpression = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Enum:
     type: str = "Enum"
     attributes: List[Attribute] = field(default_factory=list)
@@ -105,14 +135,14 @@ class Enum:
     bracket_close: Span = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EnumItem:
     attributes: List[Attribute] = field(default_factory=list)
     name: Span = None
     comma: Optional[Span] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Oneof:
     type: str = "Oneof"
     attributes: List[Attribute] = field(default_factory=list)
@@ -123,14 +153,14 @@ class Oneof:
     bracket_close: Span = None
 
 
-@dataclass
+@dataclass(slots=True)
 class OneofItem:
     attributes: List[Attribute] = field(default_factory=list)
     item_type: TypeExpression = None
     comma: Optional[Span] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Proc:
     type: str = "Proc"
     attributes: List[Attribute] = field(default_factory=list)
@@ -143,13 +173,13 @@ class Proc:
     error: Optional["ThrowsError"] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ThrowsError:
     keyword_throws: Span = None
     error_type: TypeExpression = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Struct:
     type: str = "Struct"
     attributes: List[Attribute] = field(default_factory=list)
@@ -160,7 +190,7 @@ class Struct:
     bracket_close: Span = None
 
 
-@dataclass
+@dataclass(slots=True)
 class StructField:
     attributes: List[Attribute] = field(default_factory=list)
     name: Span = None
@@ -170,7 +200,7 @@ class StructField:
     comma: Optional[Span] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Union:
     type: str = "Union"
     attributes: List[Attribute] = field(default_factory=list)
@@ -181,7 +211,7 @@ class Union:
     bracket_close: Span = None
 
 
-@dataclass
+@dataclass(slots=True)
 class UnionItem:
     attributes: List[Attribute] = field(default_factory=list)
     name: Span = None
@@ -189,7 +219,7 @@ class UnionItem:
     comma: Optional[Span] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class UnionItemStruct:
     bracket_open: Span = None
     fields: List[StructField] = field(default_factory=list)
@@ -199,24 +229,83 @@ class UnionItemStruct:
 ModuleLevelStatement = Custom | Enum | Import | Oneof | Proc | Struct | Union
 
 
-@dataclass
+@dataclass(slots=True)
 class CollectAttributesResult:
     inner_attributes: List[Attribute]
     outer_attributes: List[Attribute]
 
 
-IDENT_PATTERN = re.compile(r"^[a-z_][a-z0-9_]*", re.IGNORECASE)
-WHITESPACE_PATTERN = re.compile(r"^(?:\x20|\t|\r|\n)+")
-SINGLELINE_COMMENT_PATTERN = re.compile(r"^//.*(?:\n|$)")
-ATTRIBUTE_CONTENT_PATTERN = re.compile(
-    r"^- ?[^\n]*|^(?:(?:\x20|\t|\r)*\|[^\n]*(?:\n|$))+"
-)
-
 TOP_LEVEL_KEYWORDS = ["custom", "enum", "import", "oneof", "proc", "struct", "union"]
 
 
 def parse_bdl(text: str) -> BdlAst:
-    parser = Parser(text)
+    return parse_module(TokenParser(text))
+
+
+def parse_bdl_bytes(data: bytes) -> BdlAst:
+    """
+    Parses UTF-8 source without decoding it first; `data` can be `bytes`, an
+    `mmap` or a `memoryview`. Spans are byte offsets into `data`, and
+    `bdl.ast.misc.slice_span` decodes just the slice it is asked for.
+    """
+    return parse_module(BytesTokenParser(data))
+
+
+@dataclass(slots=True)
+class ParseResult:
+    ast: Optional[BdlAst] = None
+    error: Optional[SyntaxError] = None
+
+
+class BdlParser:
+    """
+    Parses many inputs one after another with a single `TokenParser` whose
+    token arrays are refilled for each input, so small inputs don't pay for
+    a new parser and new arrays every time. The grammar itself is built
+    once, at import. Not safe to share between threads.
+    """
+
+    def __init__(self):
+        self._parser: Optional[TokenParser] = None
+
+    def parse(self, text: str) -> BdlAst:
+        parser = self._parser
+        if parser is None:
+            parser = self._parser = TokenParser(text)
+        else:
+            parser.reset(text)
+        try:
+            return parse_module(parser)
+        except SyntaxError:
+            # The error keeps the parser for its location and context.
+            self._parser = None
+            raise
+
+    def parse_many(self, texts: Iterable[str]) -> List[ParseResult]:
+        """
+        One result per input, in order. A `SyntaxError` is recorded on its
+        result instead of stopping the batch.
+        """
+        results = []
+        for text in texts:
+            try:
+                results.append(ParseResult(ast=self.parse(text)))
+            except SyntaxError as error:
+                # The traceback would keep every frame of the failed parse.
+                results.append(ParseResult(error=error.with_traceback(None)))
+        return results
+
+
+def parse_many(texts: Iterable[str]) -> List[ParseResult]:
+    return BdlParser().parse_many(texts)
+
+
+def parse_module(parser: TokenParser, trailing_attributes: bool = False) -> BdlAst:
+    """
+    With `trailing_attributes`, `@` attributes after the last statement are
+    kept with the module attributes instead of being a syntax error, so the
+    formatter can write them back.
+    """
     attributes = []
     statements = []
 
@@ -224,9 +313,11 @@ def parse_bdl(text: str) -> BdlAst:
         attrs = collect_attributes(parser)
         attributes.extend(attrs.inner_attributes)
 
-        if parser.accept(EOF):
+        if parser.peek_kind() == END:
             if attrs.outer_attributes:
-                raise SyntaxError(parser, TOP_LEVEL_KEYWORDS)
+                if not trailing_attributes:
+                    raise SyntaxError(parser, TOP_LEVEL_KEYWORDS)
+                attributes.extend(attrs.outer_attributes)
             break
 
         statement = accept_statement(parser)
@@ -239,77 +330,60 @@ def parse_bdl(text: str) -> BdlAst:
     return BdlAst(attributes=attributes, statements=statements)
 
 
-def skip_ws_and_comments(parser: Parser) -> None:
-    while True:
-        if parser.accept(WHITESPACE_PATTERN) is not None:
-            continue
-        if parser.accept(SINGLELINE_COMMENT_PATTERN) is not None:
-            continue
-        break
+def skip_ws_and_comments(parser: TokenParser) -> None:
+    parser.skip_trivia()
 
 
-def accept_comma(parser: Parser) -> Optional[Span]:
-    return parser.accept(",")
+def accept_comma(parser: TokenParser) -> Optional[Span]:
+    return parser.accept_token(COMMA)
 
 
-def accept_ident(parser: Parser) -> Optional[Span]:
-    return parser.accept(IDENT_PATTERN)
+def accept_ident(parser: TokenParser) -> Optional[Span]:
+    return parser.accept_token(IDENT)
 
 
-def expect_ident(parser: Parser) -> Span:
+def expect_ident(parser: TokenParser) -> Span:
     result = accept_ident(parser)
     if result is None:
         raise SyntaxError(parser, [IDENT_PATTERN])
     return result
 
 
-def accept_identifier_typed(parser: Parser) -> Optional[Identifier]:
+def accept_identifier_typed(parser: TokenParser) -> Optional[Identifier]:
     span = accept_ident(parser)
     if span is None:
         return None
     return Identifier(span=span)
 
 
-def accept_dot_typed(parser: Parser) -> Optional[Dot]:
-    span = parser.accept(".")
+def accept_dot_typed(parser: TokenParser) -> Optional[Dot]:
+    span = parser.accept_token(DOT)
     if span is None:
         return None
     return Dot(span=span)
 
 
-def accept_typed(type_name: str, pattern) -> Callable[[Parser], Optional[Any]]:
-    def accept(parser: Parser) -> Optional[Any]:
-        span = parser.accept(pattern)
+def accept_typed(type_name: str, kind: int) -> Callable[[TokenParser], Optional[Any]]:
+    node_type = {"Sharp": Sharp, "At": At}.get(type_name, lambda span: None)
+
+    def accept(parser: TokenParser) -> Optional[Any]:
+        span = parser.accept_token(kind)
         if span is None:
             return None
-        return {"Sharp": Sharp, "At": At}.get(type_name, lambda: None)(span=span)
+        return node_type(span=span)
 
     return accept
 
 
-def accept_statement(parser: Parser) -> Optional[ModuleLevelStatement]:
-    return choice(
-        [
-            accept_custom,
-            accept_enum,
-            accept_import,
-            accept_oneof,
-            accept_proc,
-            accept_struct,
-            accept_union,
-        ]
-    )(parser)
-
-
-def accept_import(parser: Parser) -> Optional[Import]:
-    keyword = parser.accept(re.compile(r"^\bimport\b"))
+def accept_import(parser: TokenParser) -> Optional[Import]:
+    keyword = parser.accept_keyword("import")
     if keyword is None:
         return None
 
     skip_ws_and_comments(parser)
     path = expect_path(parser)
     skip_ws_and_comments(parser)
-    bracket_open = parser.expect("{", [], [IDENT_PATTERN])
+    bracket_open = parser.expect_token(BRACE_OPEN, [], [IDENT_PATTERN])
 
     items = []
     while True:
@@ -319,7 +393,7 @@ def accept_import(parser: Parser) -> Optional[Import]:
             break
         items.append(item)
 
-    bracket_close = parser.expect("}", [], [IDENT_PATTERN])
+    bracket_close = parser.expect_token(BRACE_CLOSE, [], [IDENT_PATTERN])
 
     return Import(
         keyword=keyword,
@@ -330,7 +404,7 @@ def accept_import(parser: Parser) -> Optional[Import]:
     )
 
 
-def accept_import_item(parser: Parser) -> Optional[ImportItem]:
+def accept_import_item(parser: TokenParser) -> Optional[ImportItem]:
     name = accept_ident(parser)
     if name is None:
         return None
@@ -343,8 +417,8 @@ def accept_import_item(parser: Parser) -> Optional[ImportItem]:
     return ImportItem(name=name, alias=alias, comma=comma)
 
 
-def accept_import_alias(parser: Parser) -> Optional[ImportAlias]:
-    as_keyword = parser.accept(re.compile(r"^\bas\b"))
+def accept_import_alias(parser: TokenParser) -> Optional[ImportAlias]:
+    as_keyword = parser.accept_keyword("as")
     if as_keyword is None:
         return None
 
@@ -354,30 +428,30 @@ def accept_import_alias(parser: Parser) -> Optional[ImportAlias]:
     return ImportAlias(as_keyword=as_keyword, name=name)
 
 
-def accept_custom(parser: Parser) -> Optional[Custom]:
-    keyword = parser.accept(re.compile(r"^\bcustom\b"))
+def accept_custom(parser: TokenParser) -> Optional[Custom]:
+    keyword = parser.accept_keyword("custom")
     if keyword is None:
         return None
 
     skip_ws_and_comments(parser)
     name = expect_ident(parser)
     skip_ws_and_comments(parser)
-    eq = parser.expect("=", [], [IDENT_PATTERN])
+    eq = parser.expect_token(EQ, [], [IDENT_PATTERN])
     skip_ws_and_comments(parser)
     original_type = expect_type_expression(parser)
 
     return Custom(keyword=keyword, name=name, eq=eq, original_type=original_type)
 
 
-def accept_enum(parser: Parser) -> Optional[Enum]:
-    keyword = parser.accept(re.compile(r"^\benum\b"))
+def accept_enum(parser: TokenParser) -> Optional[Enum]:
+    keyword = parser.accept_keyword("enum")
     if keyword is None:
         return None
 
     skip_ws_and_comments(parser)
     name = expect_ident(parser)
     skip_ws_and_comments(parser)
-    bracket_open = parser.expect("{", [], [IDENT_PATTERN])
+    bracket_open = parser.expect_token(BRACE_OPEN, [], [IDENT_PATTERN])
 
     attributes = []
     items = []
@@ -395,7 +469,7 @@ def accept_enum(parser: Parser) -> Optional[Enum]:
         item.attributes.extend(attrs.outer_attributes)
         items.append(item)
 
-    bracket_close = parser.expect("}", [], [IDENT_PATTERN])
+    bracket_close = parser.expect_token(BRACE_CLOSE, [], [IDENT_PATTERN])
 
     return Enum(
         attributes=attributes,
@@ -407,7 +481,7 @@ def accept_enum(parser: Parser) -> Optional[Enum]:
     )
 
 
-def accept_enum_item(parser: Parser) -> Optional[EnumItem]:
+def accept_enum_item(parser: TokenParser) -> Optional[EnumItem]:
     name = accept_ident(parser)
     if name is None:
         return None
@@ -418,15 +492,15 @@ def accept_enum_item(parser: Parser) -> Optional[EnumItem]:
     return EnumItem(name=name, comma=comma)
 
 
-def accept_oneof(parser: Parser) -> Optional[Oneof]:
-    keyword = parser.accept(re.compile(r"^\boneof\b"))
+def accept_oneof(parser: TokenParser) -> Optional[Oneof]:
+    keyword = parser.accept_keyword("oneof")
     if keyword is None:
         return None
 
     skip_ws_and_comments(parser)
     name = expect_ident(parser)
     skip_ws_and_comments(parser)
-    bracket_open = parser.expect("{", [], [IDENT_PATTERN])
+    bracket_open = parser.expect_token(BRACE_OPEN, [], [IDENT_PATTERN])
 
     attributes = []
     items = []
@@ -444,7 +518,7 @@ def accept_oneof(parser: Parser) -> Optional[Oneof]:
         item.attributes.extend(attrs.outer_attributes)
         items.append(item)
 
-    bracket_close = parser.expect("}", [], [IDENT_PATTERN])
+    bracket_close = parser.expect_token(BRACE_CLOSE, [], [IDENT_PATTERN])
 
     return Oneof(
         attributes=attributes,
@@ -456,7 +530,7 @@ def accept_oneof(parser: Parser) -> Optional[Oneof]:
     )
 
 
-def accept_oneof_item(parser: Parser) -> Optional[OneofItem]:
+def accept_oneof_item(parser: TokenParser) -> Optional[OneofItem]:
     item_type = accept_type_expression(parser)
     if item_type is None:
         return None
@@ -467,15 +541,15 @@ def accept_oneof_item(parser: Parser) -> Optional[OneofItem]:
     return OneofItem(item_type=item_type, comma=comma)
 
 
-def accept_union(parser: Parser) -> Optional[Union]:
-    keyword = parser.accept(re.compile(r"^\bunion\b"))
+def accept_union(parser: TokenParser) -> Optional[Union]:
+    keyword = parser.accept_keyword("union")
     if keyword is None:
         return None
 
     skip_ws_and_comments(parser)
     name = expect_ident(parser)
     skip_ws_and_comments(parser)
-    bracket_open = parser.expect("{", [], [IDENT_PATTERN])
+    bracket_open = parser.expect_token(BRACE_OPEN, [], [IDENT_PATTERN])
 
     attributes = []
     items = []
@@ -493,7 +567,7 @@ def accept_union(parser: Parser) -> Optional[Union]:
         item.attributes.extend(attrs.outer_attributes)
         items.append(item)
 
-    bracket_close = parser.expect("}", [], [IDENT_PATTERN])
+    bracket_close = parser.expect_token(BRACE_CLOSE, [], [IDENT_PATTERN])
 
     return Union(
         attributes=attributes,
@@ -505,14 +579,14 @@ def accept_union(parser: Parser) -> Optional[Union]:
     )
 
 
-def accept_union_item(parser: Parser) -> Optional[UnionItem]:
+def accept_union_item(parser: TokenParser) -> Optional[UnionItem]:
     name = accept_ident(parser)
     if name is None:
         return None
 
     skip_ws_and_comments(parser)
     struct = None
-    bracket_open = parser.accept("(")
+    bracket_open = parser.accept_token(PAREN_OPEN)
 
     if bracket_open is not None:
         attributes = []
@@ -531,7 +605,7 @@ def accept_union_item(parser: Parser) -> Optional[UnionItem]:
             field.attributes.extend(attrs.outer_attributes)
             fields.append(field)
 
-        bracket_close = parser.expect(")", [], [IDENT_PATTERN])
+        bracket_close = parser.expect_token(PAREN_CLOSE, [], [IDENT_PATTERN])
 
         struct = UnionItemStruct(
             bracket_open=bracket_open, fields=fields, bracket_close=bracket_close
@@ -543,15 +617,15 @@ def accept_union_item(parser: Parser) -> Optional[UnionItem]:
     return UnionItem(name=name, struct=struct, comma=comma)
 
 
-def accept_struct(parser: Parser) -> Optional[Struct]:
-    keyword = parser.accept(re.compile(r"^\bstruct\b"))
+def accept_struct(parser: TokenParser) -> Optional[Struct]:
+    keyword = parser.accept_keyword("struct")
     if keyword is None:
         return None
 
     skip_ws_and_comments(parser)
     name = expect_ident(parser)
     skip_ws_and_comments(parser)
-    bracket_open = parser.expect("{", [], [IDENT_PATTERN])
+    bracket_open = parser.expect_token(BRACE_OPEN, [], [IDENT_PATTERN])
 
     attributes = []
     fields = []
@@ -569,7 +643,7 @@ def accept_struct(parser: Parser) -> Optional[Struct]:
         field.attributes.extend(attrs.outer_attributes)
         fields.append(field)
 
-    bracket_close = parser.expect("}", [], [IDENT_PATTERN])
+    bracket_close = parser.expect_token(BRACE_CLOSE, [], [IDENT_PATTERN])
 
     return Struct(
         attributes=attributes,
@@ -581,15 +655,15 @@ def accept_struct(parser: Parser) -> Optional[Struct]:
     )
 
 
-def accept_struct_field(parser: Parser) -> Optional[StructField]:
+def accept_struct_field(parser: TokenParser) -> Optional[StructField]:
     name = accept_ident(parser)
     if name is None:
         return None
 
     skip_ws_and_comments(parser)
-    question = parser.accept("?")
+    question = parser.accept_token(QUESTION)
     skip_ws_and_comments(parser)
-    colon = parser.expect(":", [], [IDENT_PATTERN])
+    colon = parser.expect_token(COLON, [], [IDENT_PATTERN])
     skip_ws_and_comments(parser)
     field_type = expect_type_expression(parser)
     skip_ws_and_comments(parser)
@@ -600,25 +674,25 @@ def accept_struct_field(parser: Parser) -> Optional[StructField]:
     )
 
 
-def accept_proc(parser: Parser) -> Optional[Proc]:
-    keyword = parser.accept(re.compile(r"^\bproc\b"))
+def accept_proc(parser: TokenParser) -> Optional[Proc]:
+    keyword = parser.accept_keyword("proc")
     if keyword is None:
         return None
 
     skip_ws_and_comments(parser)
     name = expect_ident(parser)
     skip_ws_and_comments(parser)
-    eq = parser.expect("=", [], [IDENT_PATTERN])
+    eq = parser.expect_token(EQ, [], [IDENT_PATTERN])
     skip_ws_and_comments(parser)
     input_type = expect_type_expression(parser)
     skip_ws_and_comments(parser)
-    arrow = parser.expect("->", [], [IDENT_PATTERN])
+    arrow = parser.expect_token(ARROW, [], [IDENT_PATTERN])
     skip_ws_and_comments(parser)
     output_type = expect_type_expression(parser)
 
     error = None
     skip_ws_and_comments(parser)
-    keyword_throws = parser.accept(re.compile(r"^\bthrows\b"))
+    keyword_throws = parser.accept_keyword("throws")
 
     if keyword_throws is not None:
         skip_ws_and_comments(parser)
@@ -636,18 +710,18 @@ def accept_proc(parser: Parser) -> Optional[Proc]:
     )
 
 
-def accept_type_expression(parser: Parser) -> Optional[TypeExpression]:
+def accept_type_expression(parser: TokenParser) -> Optional[TypeExpression]:
     value_type = accept_ident(parser)
     if value_type is None:
         return None
 
     skip_ws_and_comments(parser)
     container = None
-    bracket_open = parser.accept("[")
+    bracket_open = parser.accept_token(BRACKET_OPEN)
 
     if bracket_open is not None:
         key_type = accept_ident(parser)
-        bracket_close = parser.expect("]", [], [IDENT_PATTERN])
+        bracket_close = parser.expect_token(BRACKET_CLOSE, [], [IDENT_PATTERN])
 
         container = Container(
             bracket_open=bracket_open, key_type=key_type, bracket_close=bracket_close
@@ -656,14 +730,14 @@ def accept_type_expression(parser: Parser) -> Optional[TypeExpression]:
     return TypeExpression(value_type=value_type, container=container)
 
 
-def expect_type_expression(parser: Parser) -> TypeExpression:
+def expect_type_expression(parser: TokenParser) -> TypeExpression:
     type_expr = accept_type_expression(parser)
     if type_expr is None:
         raise SyntaxError(parser, [IDENT_PATTERN])
     return type_expr
 
 
-def collect_attributes(parser: Parser) -> CollectAttributesResult:
+def collect_attributes(parser: TokenParser) -> CollectAttributesResult:
     inner_attributes = []
     outer_attributes = []
 
@@ -684,8 +758,8 @@ def collect_attributes(parser: Parser) -> CollectAttributesResult:
     )
 
 
-def accept_attribute(parser: Parser) -> Optional[Attribute]:
-    symbol = choice([accept_typed("Sharp", "#"), accept_typed("At", "@")])(parser)
+def accept_attribute(parser: TokenParser) -> Optional[Attribute]:
+    symbol = accept_attribute_symbol(parser)
 
     if symbol is None:
         return None
@@ -693,15 +767,33 @@ def accept_attribute(parser: Parser) -> Optional[Attribute]:
     skip_ws_and_comments(parser)
     name = expect_ident(parser)
     skip_ws_and_comments(parser)
-    content = parser.accept(ATTRIBUTE_CONTENT_PATTERN)
+    content = parser.accept_token(ATTRIBUTE_CONTENT)
 
     return Attribute(symbol=symbol, name=name, content=content)
 
 
+accept_statement = dispatch(
+    methodcaller("peek_ident"),
+    {
+        "custom": accept_custom,
+        "enum": accept_enum,
+        "import": accept_import,
+        "oneof": accept_oneof,
+        "proc": accept_proc,
+        "struct": accept_struct,
+        "union": accept_union,
+    },
+)
+
+accept_attribute_symbol = dispatch(
+    TokenParser.peek_kind,
+    {SHARP: accept_typed("Sharp", SHARP), AT: accept_typed("At", AT)},
+)
+
 accept_path = flip_flop(accept_identifier_typed, accept_dot_typed, skip_ws_and_comments)
 
 
-def expect_path(parser: Parser) -> List[PathItem]:
+def expect_path(parser: TokenParser) -> List[PathItem]:
     path = accept_path(parser)
     if not path:
         raise SyntaxError(parser, [IDENT_PATTERN])
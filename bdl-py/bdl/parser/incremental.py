@@ -0,0 +1,152 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, fields
+from typing import Dict, List, Tuple
+
+from .bdl_parser import (
+    Attribute,
+    BdlAst,
+    Custom,
+    ModuleLevelStatement,
+    Proc,
+    TypeExpression,
+    parse_bdl,
+)
+from .parser import Span, SyntaxError
+
+
+@dataclass(slots=True)
+class TextEdit:
+    """Replaces `old_text[start:end]` with `text`."""
+
+    start: int
+    end: int
+    text: str
+
+
+def apply_text_edit(text: str, edit: TextEdit) -> str:
+    return text[: edit.start] + edit.text + text[edit.end :]
+
+
+def reparse_bdl(prev_ast: BdlAst, old_text: str, edit: TextEdit) -> BdlAst:
+    """
+    Parses `apply_text_edit(old_text, edit)` by re-parsing only the top-level
+    statements around the edit. `prev_ast` must be the result of parsing
+    `old_text`; its untouched statements are moved into the returned AST and
+    their spans are shifted in place, so `prev_ast` shouldn't be used after.
+
+    Raises the same `SyntaxError` as `parse_bdl` would for the new text.
+    """
+    new_text = apply_text_edit(old_text, edit)
+    statements = prev_ast.statements
+    # Statements entirely before `first` and from `last` on are kept. Touching
+    # the edit counts as affected: typing right after a name extends it.
+    first = bisect_left(statements, edit.start, key=get_statement_end)
+    last = bisect_right(statements, edit.end, lo=first, key=get_statement_start)
+    # `proc ... -> B` and `custom ... = B` may still grow a `throws` clause or
+    # a container from text after them, so they are re-parsed as well.
+    if first > 0 and type(statements[first - 1]) in (Proc, Custom):
+        first -= 1
+    # Line comments and `- ...` attribute content run to the end of the line,
+    # so the re-parsed region has to end on a line break.
+    while last < len(statements) and not _follows_line_break(
+        old_text, get_statement_start(statements[last])
+    ):
+        last += 1
+
+    old_region_start = get_statement_end(statements[first - 1]) if first > 0 else 0
+    old_region_end = (
+        get_statement_start(statements[last])
+        if last < len(statements)
+        else len(old_text)
+    )
+    delta = len(edit.text) - (edit.end - edit.start)
+    new_region_end = old_region_end + delta
+
+    try:
+        region_ast = parse_bdl(new_text[old_region_start:new_region_end])
+    except SyntaxError:
+        # Report the error exactly as a full parse would.
+        return parse_bdl(new_text)
+    shift_spans(region_ast, old_region_start)
+
+    tail_statements = statements[last:]
+    attributes = prev_ast.attributes
+    head_attribute_count = bisect_left(
+        attributes, old_region_start, key=_get_attribute_start
+    )
+    tail_attributes = attributes[
+        bisect_left(attributes, old_region_end, key=_get_attribute_start) :
+    ]
+    if delta:
+        for node in tail_statements:
+            shift_spans(node, delta)
+        for node in tail_attributes:
+            shift_spans(node, delta)
+
+    return BdlAst(
+        attributes=[
+            *attributes[:head_attribute_count],
+            *region_ast.attributes,
+            *tail_attributes,
+        ],
+        statements=[*statements[:first], *region_ast.statements, *tail_statements],
+    )
+
+
+def get_statement_start(statement: ModuleLevelStatement) -> int:
+    start = statement.keyword.start
+    for attribute in statement.attributes:
+        start = min(start, attribute.symbol.span.start)
+    return start
+
+
+def get_statement_end(statement: ModuleLevelStatement) -> int:
+    statement_type = type(statement)
+    if statement_type is Custom:
+        return _get_type_expression_end(statement.original_type)
+    if statement_type is Proc:
+        if statement.error is not None:
+            return _get_type_expression_end(statement.error.error_type)
+        return _get_type_expression_end(statement.output_type)
+    return statement.bracket_close.end
+
+
+def _get_type_expression_end(type_expression: TypeExpression) -> int:
+    if type_expression.container is not None:
+        return type_expression.container.bracket_close.end
+    return type_expression.value_type.end
+
+
+def _get_attribute_start(attribute: Attribute) -> int:
+    return attribute.symbol.span.start
+
+
+def _follows_line_break(text: str, offset: int) -> bool:
+    return offset == 0 or text[offset - 1] == "\n"
+
+
+# class -> names of the fields that can hold spans or child nodes
+_child_field_names: Dict[type, Tuple[str, ...]] = {}
+
+
+def shift_spans(node, delta: int) -> None:
+    """Adds `delta` to every span under `node`, in place."""
+    stack: List = [node]
+    while stack:
+        node = stack.pop()
+        node_type = type(node)
+        if node_type is Span:
+            node.start += delta
+            node.end += delta
+            continue
+        if node_type is list:
+            stack.extend(node)
+            continue
+        names = _child_field_names.get(node_type)
+        if names is None:
+            names = tuple(f.name for f in fields(node_type) if f.name != "type")
+            _child_field_names[node_type] = names
+        for name in names:
+            value = getattr(node, name)
+            if value is not None:
+                stack.append(value)
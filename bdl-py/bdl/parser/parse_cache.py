@@ -0,0 +1,165 @@
+import hashlib
+import os
+import tempfile
+from typing import Dict, Optional, Tuple
+
+from bdl.io import binary
+from bdl.io.binary import BinaryFormatError, dump_bdl_ast, load_bdl_ast
+
+from . import bdl_lexer, bdl_parser, parser
+from .bdl_parser import BdlAst, parse_bdl
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_parser_version: Optional[str] = None
+
+
+def get_parser_version() -> str:
+    """
+    Fingerprint of everything that decides what `parse_bdl` returns: the
+    grammar and node definitions, and the version of the format entries are
+    stored in. Editing any of the parser modules invalidates every cached AST.
+    """
+    global _parser_version
+    if _parser_version is None:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"binary:{binary.VERSION}".encode())
+        for module in (parser, bdl_lexer, bdl_parser):
+            with open(module.__file__, "rb") as f:
+                digest.update(f.read())
+        _parser_version = digest.hexdigest()
+    return _parser_version
+
+
+class ParseCache:
+    """
+    On-disk cache in front of `parse_bdl`, keyed by a hash of the source text
+    and the parser version. Entries are ASTs in the `bdl.io.binary` format,
+    whose decoder only builds AST nodes, so a tampered cache directory can't
+    run code. Once the directory grows past `max_bytes` the least recently
+    used entries are removed.
+
+    Writes go through a temporary file and `os.replace`, so processes can
+    share one cache directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # path -> (last use, size), loaded on the first write
+        self._entries: Optional[Dict[str, Tuple[float, int]]] = None
+        self._total_bytes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def get_key(self, text: str) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(get_parser_version().encode())
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".ast")
+
+    def parse(self, text: str) -> BdlAst:
+        path = self.get_path(self.get_key(text))
+        bdl_ast = self._read(path)
+        if bdl_ast is not None:
+            self.hits += 1
+            return bdl_ast
+        self.misses += 1
+        bdl_ast = parse_bdl(text)
+        self._write(path, dump_bdl_ast(bdl_ast))
+        return bdl_ast
+
+    def clear(self) -> None:
+        for path in list(self._load_entries()):
+            self._remove(path)
+
+    def _read(self, path: str) -> Optional[BdlAst]:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            bdl_ast = load_bdl_ast(data)
+        except BinaryFormatError:
+            # Truncated or foreign file; it gets replaced by the next write.
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        if self._entries is not None:
+            self._update_entry(path, len(data))
+        return bdl_ast
+
+    def _write(self, path: str, data: bytes) -> None:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        self._load_entries()
+        if self._update_entry(path, len(data)) and self._total_bytes > self.max_bytes:
+            self._evict(keep=path)
+
+    def _load_entries(self) -> Dict[str, Tuple[float, int]]:
+        if self._entries is None:
+            self._entries = {}
+            self._total_bytes = 0
+            for root, _, files in os.walk(self.directory):
+                for file_name in files:
+                    if not file_name.endswith(".ast"):
+                        continue
+                    path = os.path.join(root, file_name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    self._entries[path] = (stat.st_mtime, stat.st_size)
+                    self._total_bytes += stat.st_size
+        return self._entries
+
+    def _update_entry(self, path: str, size: int) -> bool:
+        """
+        Records the current mtime of `path`, or drops its entry when another
+        process has evicted the file meanwhile. Returns whether it's kept.
+        """
+        entries = self._entries
+        previous = entries.pop(path, None)
+        if previous is not None:
+            self._total_bytes -= previous[1]
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        entries[path] = (stat.st_mtime, size)
+        self._total_bytes += size
+        return True
+
+    def _evict(self, keep: str) -> None:
+        entries = self._entries
+        for path, _ in sorted(entries.items(), key=lambda item: item[1][0]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if path != keep:
+                self._remove(path)
+
+    def _remove(self, path: str) -> None:
+        _, size = self._entries.pop(path)
+        self._total_bytes -= size
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
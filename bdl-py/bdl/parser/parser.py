@@ -1,14 +1,16 @@
-from typing import List, Optional, Pattern, TypeVar, Union, Callable, Any
+import re
+from bisect import bisect_right
+from typing import Dict, List, Optional, Pattern, TypeVar, Union, Callable, Any
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Span:
     start: int
     end: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ColRow:
     col: int
     row: int
@@ -52,7 +54,37 @@ class SyntaxError(Exception):
 
     @property
     def col_row(self) -> ColRow:
-        return offset_to_col_row(self.parser.lines, self.parser.loc)
+        return self.parser.line_index.offset_to_col_row(self.parser.loc)
+
+    @property
+    def got(self) -> Union[str, object]:
+        """
+        What was found instead: the match of the first mistake pattern that
+        matches, else the character at the error, or `EOF` at the end.
+        """
+        span = self.got_span
+        return EOF if span is None else self.parser.get_text(span)
+
+    @property
+    def got_span(self) -> Optional[Span]:
+        """
+        Span of `got` in source offsets, bytes over a bytes input, or `None`
+        at the end.
+        """
+        parser = self.parser
+        for pattern in self.mistake_patterns:
+            span = parser.look(lambda parser, pattern=pattern: parser.accept(pattern))
+            if span is not None:
+                return span
+        loc = parser.loc
+        if loc >= len(parser.input):
+            return None
+        if isinstance(parser.input, str):
+            return Span(loc, loc + 1)
+        # The whole UTF-8 sequence the lead byte at `loc` starts.
+        lead = parser.input[loc]
+        length = 4 if lead >= 0xF0 else 3 if lead >= 0xE0 else 2 if lead >= 0xC0 else 1
+        return Span(loc, min(loc + length, len(parser.input)))
 
     @staticmethod
     def _pattern_to_string(pattern: PatternType) -> str:
@@ -67,12 +99,22 @@ class Parser:
     def __init__(self, input_text: str, loc: int = 0):
         self.input = input_text
         self.loc = loc
-        self._lines = input_text.split("\n")
-        self._cnt = 0
+        self._line_index = None
+        self._accept_budget = len(input_text) * 5
 
     @property
     def lines(self) -> List[str]:
-        return self._lines
+        """
+        Every line of the input. Kept for compatibility; `line_index.get_line`
+        looks a single line up without building the list.
+        """
+        return self.line_index.get_lines()
+
+    @property
+    def line_index(self) -> "LineIndex":
+        if self._line_index is None:
+            self._line_index = LineIndex(self.input)
+        return self._line_index
 
     def look(self, accept_fn: AcceptFn[T]) -> Optional[T]:
         loc = self.loc
@@ -82,42 +124,14 @@ class Parser:
             self.loc = loc
 
     def accept(self, pattern: PatternType) -> Optional[Span]:
-        self._cnt += 1
-        if self._cnt > len(self.input) * 5:
+        # A grammar that loops without consuming input runs out of budget.
+        self._accept_budget -= 1
+        if self._accept_budget < 0:
             raise RuntimeError("Infinite loop detected")
-
-        if pattern is EOF:
-            return self._accept_eof()
-        if isinstance(pattern, str):
-            return self._accept_string(pattern)
-        return self._accept_regex(pattern)
-
-    def _accept_eof(self) -> Optional[Span]:
-        if self.loc < len(self.input):
-            return None
-        return Span(start=self.loc, end=self.loc)
-
-    def _accept_string(self, pattern: str) -> Optional[Span]:
-        start = self.loc
-        end = start + len(pattern)
-        if end > len(self.input):
-            return None
-        text = self.input[start:end]
-        if text != pattern:
-            return None
-        self.loc = end
-        return Span(start=start, end=end)
-
-    def _accept_regex(self, pattern: Pattern) -> Optional[Span]:
-        match = pattern.search(self.input[self.loc :])
-        if not match or match.start() != 0:
-            return None
-
-        text = match.group(0)
-        start = self.loc
-        end = start + len(text)
-        self.loc = end
-        return Span(start=start, end=end)
+        accept_fn = _accept_fns.get(pattern)
+        if accept_fn is None:
+            accept_fn = _compile_accept_fn(pattern)
+        return accept_fn(self)
 
     def expect(
         self,
@@ -135,23 +149,30 @@ class Parser:
         return result
 
     def get_text(self, span: Span) -> str:
-        return self.input[span.start : span.end]
+        text = self.input[span.start : span.end]
+        return text if isinstance(text, str) else _decode(text)
 
     def get_around_text(self, loc: int = None, length: int = 1, window: int = 5) -> str:
         if loc is None:
             loc = self.loc
 
-        col_row = offset_to_col_row(self._lines, loc)
+        line_index = self.line_index
+        col_row = line_index.offset_to_col_row(loc)
+        col = col_row.col
+        if not isinstance(self.input, str):
+            # Point at the character, not the byte.
+            line_start = line_index.line_start(col_row.row)
+            col = len(_decode(self.input[line_start:loc]))
         head_count = min(1, (window >> 1) + (window % 2))
         tail_count = window >> 1
 
         head_start = max(0, col_row.row - head_count)
         head_end = col_row.row + 1
         tail_start = col_row.row + 1
-        tail_end = min(len(self._lines), col_row.row + tail_count + 1)
+        tail_end = min(len(line_index), col_row.row + tail_count + 1)
 
-        heads = self._lines[head_start:head_end]
-        tails = self._lines[tail_start:tail_end]
+        heads = [line_index.get_line(row) for row in range(head_start, head_end)]
+        tails = [line_index.get_line(row) for row in range(tail_start, tail_end)]
 
         line_number_digit_count = len(str(tail_end))
 
@@ -161,9 +182,7 @@ class Parser:
             line_number_text = str(line_number).rjust(line_number_digit_count)
             head_texts.append(f"{line_number_text} | {line}")
 
-        pointer_line = (
-            " " * (line_number_digit_count + 3) + " " * col_row.col + "^" * length
-        )
+        pointer_line = " " * (line_number_digit_count + 3) + " " * col + "^" * length
 
         tail_texts = []
         for index, line in enumerate(tails):
@@ -174,6 +193,216 @@ class Parser:
         return "\n".join([*head_texts, pointer_line, *tail_texts])
 
 
+_accept_fns: Dict[PatternType, Callable[[Parser], Optional[Span]]] = {}
+
+
+def _compile_accept_fn(pattern: PatternType) -> Callable[[Parser], Optional[Span]]:
+    """
+    Classifies `pattern` once, so `Parser.accept` calls the matching accept
+    function directly instead of re-checking the pattern type every time.
+    """
+    if pattern is EOF:
+
+        def accept(parser: Parser) -> Optional[Span]:
+            loc = parser.loc
+            if loc < len(parser.input):
+                return None
+            return Span(start=loc, end=loc)
+
+    elif isinstance(pattern, str):
+        length = len(pattern)
+
+        def accept(parser: Parser) -> Optional[Span]:
+            start = parser.loc
+            if not parser.input.startswith(pattern, start):
+                return None
+            parser.loc = end = start + length
+            return Span(start=start, end=end)
+
+    else:
+        match_pattern = anchor_pattern(pattern).match
+
+        def accept(parser: Parser) -> Optional[Span]:
+            start = parser.loc
+            match = match_pattern(parser.input, start)
+            if match is None:
+                return None
+            parser.loc = end = match.end()
+            return Span(start=start, end=end)
+
+    _accept_fns[pattern] = accept
+    return accept
+
+
+_anchored_patterns: Dict[Pattern, Pattern] = {}
+
+
+def anchor_pattern(pattern: Pattern) -> Pattern:
+    """
+    Returns an equivalent of `pattern` meant to be used as
+    `pattern.match(input, loc)`, so the remaining input never gets copied.
+
+    Grammar patterns are written against the remaining input (`input[loc:]`),
+    where a leading `^` means "at the current location". `re` only lets `^`
+    match at the real start of the string, so leading anchors are rewritten:
+    `^\\b` becomes `(?=\\w)` and a bare `^` is dropped.
+    """
+    anchored = _anchored_patterns.get(pattern)
+    if anchored is None:
+        source = pattern.pattern
+        if isinstance(source, str) and "^" in source:
+            source = _strip_leading_anchors(source)
+        anchored = re.compile(source, pattern.flags)
+        _anchored_patterns[pattern] = anchored
+    return anchored
+
+
+def _strip_leading_anchors(source: str) -> str:
+    result = []
+    # Whether each open group (and the pattern itself) begins at match start.
+    group_at_start = [True]
+    at_start = True
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if char == "^" and at_start:
+            if source.startswith("\\b", i + 1):
+                result.append("(?=\\w)")
+                i += 3
+                at_start = False
+            else:
+                i += 1
+            continue
+        if char == "\\":
+            result.append(source[i : i + 2])
+            i += 2
+        elif char == "[":
+            end = i + 1
+            if source.startswith("^", end):
+                end += 1
+            if source.startswith("]", end):
+                end += 1
+            while end < len(source) and source[end] != "]":
+                end += 2 if source[end] == "\\" else 1
+            result.append(source[i : end + 1])
+            i = end + 1
+        elif char == "(":
+            group_at_start.append(at_start)
+            if source.startswith("?:", i + 1):
+                result.append("(?:")
+                i += 3
+                continue
+            result.append(char)
+            i += 1
+            if not source.startswith("?", i):
+                continue
+        elif char == ")":
+            if len(group_at_start) > 1:
+                group_at_start.pop()
+            result.append(char)
+            i += 1
+        elif char == "|":
+            result.append(char)
+            i += 1
+            at_start = group_at_start[-1]
+            continue
+        else:
+            result.append(char)
+            i += 1
+        at_start = False
+    return "".join(result)
+
+
+class LineIndex:
+    """
+    Start offsets of every line in a text, for O(log n) conversion between
+    offsets and `ColRow`s. Build it once and reuse it for every lookup.
+
+    Columns count code points, like the offsets in `Span`. The `utf16`
+    variants count UTF-16 code units instead, which is what LSP clients use.
+    Over UTF-8 bytes (`bytes`, `mmap`, `memoryview`) offsets and columns count
+    bytes, and the `utf16` variants aren't available.
+    """
+
+    def __init__(self, text: Union[str, bytes]):
+        self.text = text
+        line_starts = [0]
+        if isinstance(text, str):
+            find = text.find
+            index = find("\n")
+            while index != -1:
+                line_starts.append(index + 1)
+                index = find("\n", index + 1)
+        else:
+            line_starts.extend(match.end() for match in _NEWLINE.finditer(text))
+        self.line_starts = line_starts
+        self._lines: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.line_starts)
+
+    def line_start(self, row: int) -> int:
+        return self.line_starts[row]
+
+    def line_end(self, row: int) -> int:
+        """Offset of the newline ending `row`, or the text length for the last line."""
+        if row + 1 < len(self.line_starts):
+            return self.line_starts[row + 1] - 1
+        return len(self.text)
+
+    def get_line(self, row: int) -> str:
+        line = self.text[self.line_start(row) : self.line_end(row)]
+        return line if isinstance(line, str) else _decode(line)
+
+    def get_lines(self) -> List[str]:
+        """
+        Every line, built on the first call and kept. Don't modify the result.
+        """
+        if self._lines is None:
+            self._lines = [self.get_line(row) for row in range(len(self))]
+        return self._lines
+
+    def offset_to_row(self, offset: int) -> int:
+        return bisect_right(self.line_starts, offset) - 1
+
+    def offset_to_col_row(self, offset: int) -> ColRow:
+        row = bisect_right(self.line_starts, offset) - 1
+        return ColRow(col=offset - self.line_starts[row], row=row)
+
+    def col_row_to_offset(self, col_row: ColRow) -> int:
+        return self.line_starts[col_row.row] + col_row.col
+
+    def offset_to_utf16_col_row(self, offset: int) -> ColRow:
+        row = bisect_right(self.line_starts, offset) - 1
+        line_start = self.line_starts[row]
+        return ColRow(col=_utf16_length(self.text[line_start:offset]), row=row)
+
+    def utf16_col_row_to_offset(self, col_row: ColRow) -> int:
+        line_start = self.line_starts[col_row.row]
+        line = self.text[line_start : self.line_end(col_row.row)]
+        if line.isascii():
+            return line_start + min(col_row.col, len(line))
+        units = 0
+        for col, char in enumerate(line):
+            if units >= col_row.col:
+                return line_start + col
+            units += 2 if ord(char) > 0xFFFF else 1
+        return line_start + len(line)
+
+
+_NEWLINE = re.compile(b"\n")
+
+
+def _decode(data: bytes) -> str:
+    return str(data, "utf-8", "replace")
+
+
+def _utf16_length(text: str) -> int:
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le")) >> 1
+
+
 def offset_to_col_row(lines: List[str], offset: int) -> ColRow:
     row = 0
     col = 0
@@ -245,10 +474,32 @@ def flip_flop(
 
 def choice(accept_fns: List[AcceptFn[T]]) -> AcceptFn[T]:
     def parse(parser: Parser) -> Optional[T]:
+        loc = parser.loc
         for fn in accept_fns:
-            result = parser.look(fn)
+            # Keep the first success rather than looking ahead and parsing it
+            # a second time.
+            result = fn(parser)
             if result is not None:
-                return fn(parser)
+                return result
+            parser.loc = loc
         return None
 
     return parse
+
+
+def dispatch(
+    peek_fn: Callable[["Parser"], Any], accept_fns: Dict[Any, AcceptFn[T]]
+) -> AcceptFn[T]:
+    """
+    LL(1) alternative to `choice`: `peek_fn` looks at the upcoming input
+    without consuming it, and the matching alternative runs exactly once.
+    Use `choice` when alternatives can't be told apart by a single lookahead.
+    """
+
+    def parse(parser: Parser) -> Optional[T]:
+        accept_fn = accept_fns.get(peek_fn(parser))
+        if accept_fn is None:
+            return None
+        return accept_fn(parser)
+
+    return parse
@@ -0,0 +1,238 @@
+import sys
+import time
+from dataclasses import dataclass
+from types import CodeType, FunctionType
+from typing import Any, Dict, List, Optional, Set, TextIO, Tuple
+
+from . import bdl_parser
+from .bdl_lexer import TokenParser
+from .parser import Parser, choice, dispatch, flip_flop, zero_or_more
+
+_monitoring = sys.monitoring
+_TOOL_ID = _monitoring.PROFILER_ID
+_events = _monitoring.events
+
+
+@dataclass(slots=True)
+class RuleStats:
+    calls: int = 0
+    # Calls whose work got thrown away: run under `look()`, or a `choice()`
+    # alternative that failed.
+    backtracks: int = 0
+    # Input consumed by calls that returned a result, in characters (bytes
+    # for `parse_bdl_bytes`).
+    consumed: int = 0
+    seconds: float = 0.0
+    self_seconds: float = 0.0
+
+
+@dataclass(slots=True)
+class _Activation:
+    code: CodeType
+    stats: RuleStats
+    path: Tuple[str, ...]
+    parser: Optional[Parser]
+    loc: int
+    start_ns: int
+    outermost: bool
+    children_ns: int = 0
+
+
+class ParserProfile:
+    """
+    Per-rule statistics for every parse that runs while the profile is
+    active::
+
+        with ParserProfile() as profile:
+            parse_bdl(text)
+        print(profile.report())
+        with open("parse.folded", "w", encoding="utf-8") as f:
+            profile.write_collapsed(f)
+
+    Rules are the grammar functions in `bdl_parser` and the closures built by
+    the `parser` combinators. Instrumentation goes through `sys.monitoring`
+    and is only attached between `start()` and `stop()`, so parsing without
+    an active profile runs exactly the same code as before.
+    """
+
+    def __init__(self):
+        self.rules: Dict[str, RuleStats] = {}
+        # Self time in nanoseconds per call stack, for flamegraphs.
+        self.stacks: Dict[Tuple[str, ...], int] = {}
+        self._codes: Dict[CodeType, str] = {}
+        self._choice_codes: Set[CodeType] = set()
+        self._look_codes: Set[CodeType] = set()
+        self._renamed: List[Tuple[FunctionType, CodeType]] = []
+        self._active: Dict[str, int] = {}
+        self._stack: List[_Activation] = []
+
+    def __enter__(self) -> "ParserProfile":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        # Raises `ValueError` if another profiler holds the tool id.
+        _monitoring.use_tool_id(_TOOL_ID, "bdl-parser-profile")
+        self._collect_codes()
+        _monitoring.register_callback(_TOOL_ID, _events.PY_START, self._on_start)
+        _monitoring.register_callback(_TOOL_ID, _events.PY_RETURN, self._on_return)
+        _monitoring.register_callback(_TOOL_ID, _events.PY_UNWIND, self._on_unwind)
+        for code in self._codes:
+            _monitoring.set_local_events(
+                _TOOL_ID, code, _events.PY_START | _events.PY_RETURN
+            )
+        # Exceptions leaving a rule can only be watched globally.
+        _monitoring.set_events(_TOOL_ID, _events.PY_UNWIND)
+
+    def stop(self) -> None:
+        _monitoring.set_events(_TOOL_ID, 0)
+        for code in self._codes:
+            _monitoring.set_local_events(_TOOL_ID, code, 0)
+        for event in (_events.PY_START, _events.PY_RETURN, _events.PY_UNWIND):
+            _monitoring.register_callback(_TOOL_ID, event, None)
+        _monitoring.free_tool_id(_TOOL_ID)
+        for function, code in self._renamed:
+            function.__code__ = code
+        self._renamed.clear()
+        self._stack.clear()
+        self._active.clear()
+
+    def report(self, limit: Optional[int] = None) -> str:
+        rows = sorted(
+            self.rules.items(), key=lambda item: item[1].self_seconds, reverse=True
+        )
+        lines = [
+            f"{'rule':<40} {'calls':>10} {'self ms':>10} {'total ms':>10}"
+            f" {'backtracks':>10} {'consumed':>10}"
+        ]
+        for name, stats in rows[:limit]:
+            lines.append(
+                f"{name:<40} {stats.calls:>10,} {stats.self_seconds * 1e3:>10.2f}"
+                f" {stats.seconds * 1e3:>10.2f} {stats.backtracks:>10,}"
+                f" {stats.consumed:>10,}"
+            )
+        return "\n".join(lines)
+
+    def write_collapsed(self, file: TextIO) -> None:
+        """
+        Writes `rule;rule;rule <microseconds>` lines, the collapsed-stack
+        format `flamegraph.pl` and speedscope read.
+        """
+        for path, nanoseconds in sorted(self.stacks.items()):
+            microseconds = nanoseconds // 1000
+            if microseconds:
+                file.write(f"{';'.join(path)} {microseconds}\n")
+
+    def _collect_codes(self) -> None:
+        codes = self._codes
+        codes.clear()
+        combinators = (zero_or_more, flip_flop, choice, dispatch)
+        for combinator in combinators:
+            _add_nested_codes(combinator.__code__, codes)
+        self._choice_codes = set(_iter_nested_codes(choice.__code__))
+        for name, value in vars(bdl_parser).items():
+            if type(value) is not FunctionType:
+                continue
+            code = value.__code__
+            if value.__module__ == bdl_parser.__name__ and "<locals>" not in (
+                code.co_qualname
+            ):
+                codes[code] = name
+                _add_nested_codes(code, codes)
+            elif "<locals>" in code.co_qualname and code in codes:
+                # A combinator closure bound to a grammar name, such as
+                # `accept_statement`. Its code is shared with every closure
+                # from the same combinator, so give it its own copy.
+                renamed = code.replace(co_name=name, co_qualname=name)
+                self._renamed.append((value, code))
+                value.__code__ = renamed
+                codes[renamed] = name
+                if code in self._choice_codes:
+                    self._choice_codes.add(renamed)
+        self._look_codes = {Parser.look.__code__, TokenParser.look.__code__}
+        for code in self._look_codes:
+            codes[code] = code.co_qualname
+
+    def _get_stats(self, name: str) -> RuleStats:
+        stats = self.rules.get(name)
+        if stats is None:
+            stats = self.rules[name] = RuleStats()
+        return stats
+
+    def _on_start(self, code: CodeType, offset: int) -> None:
+        name = self._codes[code]
+        frame_locals = sys._getframe(1).f_locals
+        parser = frame_locals.get("parser") or frame_locals.get("self")
+        if code in self._look_codes:
+            accept_fn = frame_locals.get("accept_fn")
+            accept_code = getattr(accept_fn, "__code__", None)
+            looked_name = self._codes.get(
+                accept_code, getattr(accept_fn, "__qualname__", "?")
+            )
+            self._get_stats(looked_name).backtracks += 1
+        stack = self._stack
+        path = (*stack[-1].path, name) if stack else (name,)
+        active = self._active.get(name, 0)
+        self._active[name] = active + 1
+        stack.append(
+            _Activation(
+                code=code,
+                stats=self._get_stats(name),
+                path=path,
+                parser=parser if isinstance(parser, Parser) else None,
+                loc=parser.loc if isinstance(parser, Parser) else 0,
+                start_ns=time.perf_counter_ns(),
+                outermost=active == 0,
+            )
+        )
+
+    def _on_return(self, code: CodeType, offset: int, retval: Any) -> None:
+        activation = self._finish(code)
+        if activation is None:
+            return
+        if retval is None:
+            stack = self._stack
+            if stack and stack[-1].code in self._choice_codes:
+                activation.stats.backtracks += 1
+        elif activation.parser is not None:
+            activation.stats.consumed += activation.parser.loc - activation.loc
+
+    def _on_unwind(self, code: CodeType, offset: int, exception: BaseException):
+        if code in self._codes:
+            self._finish(code)
+
+    def _finish(self, code: CodeType) -> Optional[_Activation]:
+        end_ns = time.perf_counter_ns()
+        stack = self._stack
+        if not stack or stack[-1].code is not code:
+            # Started before the profile was.
+            return None
+        activation = stack.pop()
+        elapsed_ns = end_ns - activation.start_ns
+        self_ns = elapsed_ns - activation.children_ns
+        if stack:
+            stack[-1].children_ns += elapsed_ns
+        stats = activation.stats
+        stats.calls += 1
+        stats.self_seconds += self_ns / 1e9
+        name = activation.path[-1]
+        self._active[name] -= 1
+        if activation.outermost:
+            stats.seconds += elapsed_ns / 1e9
+        self.stacks[activation.path] = self.stacks.get(activation.path, 0) + self_ns
+        return activation
+
+
+def _iter_nested_codes(code: CodeType):
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            yield from _iter_nested_codes(const)
+
+
+def _add_nested_codes(code: CodeType, codes: Dict[CodeType, str]) -> None:
+    for nested in _iter_nested_codes(code):
+        codes.setdefault(nested, nested.co_qualname)
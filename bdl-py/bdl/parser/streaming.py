@@ -0,0 +1,123 @@
+import mmap
+import os
+from dataclasses import dataclass
+from typing import Callable, Iterator, Union
+
+from .bdl_lexer import END, TokenParser
+from .bdl_parser import (
+    IDENT_PATTERN,
+    TOP_LEVEL_KEYWORDS,
+    ModuleLevelStatement,
+    accept_statement,
+    collect_attributes,
+    parse_bdl,
+)
+from .parser import SyntaxError
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+
+@dataclass(slots=True)
+class StreamedStatement:
+    """
+    A module-level statement and the window of source it was parsed from.
+    Spans index into `text`, which starts at `offset` in the whole source.
+    """
+
+    statement: ModuleLevelStatement
+    text: str
+    offset: int
+
+
+def iter_bdl_statements(
+    source, block_size: int = DEFAULT_BLOCK_SIZE
+) -> Iterator[StreamedStatement]:
+    """
+    Yields the module-level statements of `source` one by one, with their
+    attributes, without building a `BdlAst`. Module `#` attributes are skipped.
+
+    `source` is the text itself, UTF-8 bytes (`bytes`, `mmap`), or an open
+    file, which gets memory-mapped. Only about `block_size` characters (or
+    bytes) of source are decoded and tokenized at a time, plus whatever the
+    statement in progress needs, so memory doesn't grow with the file.
+    """
+    if isinstance(source, str):
+        yield from _iter_statements(source, "\n", _identity, block_size)
+    elif hasattr(source, "fileno"):
+        fileno = source.fileno()
+        if os.fstat(fileno).st_size == 0:
+            return
+        with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as data:
+            yield from _iter_statements(data, b"\n", _decode, block_size)
+    else:
+        yield from _iter_statements(source, b"\n", _decode, block_size)
+
+
+def _iter_statements(
+    data: Union[str, bytes, mmap.mmap],
+    newline: Union[str, bytes],
+    decode: Callable[[Union[str, bytes]], str],
+    block_size: int,
+) -> Iterator[StreamedStatement]:
+    length = len(data)
+    pos = 0  # `data[:pos]` has been decoded
+    text = ""  # decoded source from the first statement not yielded yet
+    offset = 0  # where `text` starts in the decoded source
+    read_size = block_size
+
+    while True:
+        if pos < length:
+            # Cut blocks after a newline: comments and `- ...` attribute
+            # content end there, so no token straddles two blocks.
+            end = data.find(newline, pos + read_size)
+            end = length if end == -1 else end + 1
+            text += decode(data[pos:end])
+            pos = end
+        at_eof = pos >= length
+
+        parser = TokenParser(text)
+        consumed = 0
+        try:
+            while True:
+                attrs = collect_attributes(parser)
+                if parser.peek_kind() == END:
+                    if at_eof and attrs.outer_attributes:
+                        raise SyntaxError(parser, TOP_LEVEL_KEYWORDS)
+                    break
+
+                statement = accept_statement(parser)
+                if statement is None:
+                    raise SyntaxError(parser, TOP_LEVEL_KEYWORDS, [IDENT_PATTERN])
+                statement.attributes.extend(attrs.outer_attributes)
+
+                statement_end = parser.loc
+                if not at_eof:
+                    # A proc or custom type could still take a `throws` clause
+                    # or a container from the next block.
+                    parser.skip_trivia()
+                    if parser.peek_kind() == END:
+                        break
+                consumed = statement_end
+                yield StreamedStatement(statement=statement, text=text, offset=offset)
+        except SyntaxError as error:
+            # Running into the end of a block only means the block was cut
+            # mid-statement; anything earlier is a real error.
+            if at_eof or error.loc < len(text):
+                # Report it the way `parse_bdl` does for the whole source.
+                parse_bdl(decode(data[:length]))
+                raise
+
+        if at_eof:
+            return
+        # Read more at once while a single statement outgrows the block.
+        read_size = block_size if consumed else read_size * 2
+        text = text[consumed:]
+        offset += consumed
+
+
+def _identity(text: str) -> str:
+    return text
+
+
+def _decode(data: bytes) -> str:
+    return str(data, "utf-8")
@@ -0,0 +1,435 @@
+import binascii
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from bdl.ir import model as ir
+
+# Counterpart of `bdl-ts/runtime/src/json-validator.ts`, for values as
+# `json.loads` returns them. The TypeScript validator looks defs up and
+# switches on their kind for every value; here each def is compiled once
+# into a closure that only does the checks left for its shape, and the
+# closures are cached per type path.
+
+
+@dataclass(slots=True)
+class ValidationIssue:
+    message: str
+    # Keys and indexes from the root to the invalid value.
+    path: List[Union[str, int]] = field(default_factory=list)
+
+
+# A compiled check: `None` for a valid value, or the first issue found. Its
+# path is built leaf first while returning and reversed at the root.
+Check = Callable[[Any], Optional[ValidationIssue]]
+
+INT32_MIN, INT32_MAX = -(2**31), 2**31 - 1
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+
+
+def _check_int32(value: Any) -> Optional[ValidationIssue]:
+    value_type = type(value)
+    if value_type is float and value.is_integer():
+        value_type = int
+    if value_type is int and INT32_MIN <= value <= INT32_MAX:
+        return None
+    return ValidationIssue("value is not int32")
+
+
+def _parse_integer(value: Any) -> Optional[int]:
+    """
+    Integer of a JSON number or numeric string, as the TypeScript validator
+    reads `int64` and `integer`.
+    """
+    value_type = type(value)
+    if value_type is int:
+        return value
+    if value_type is str:
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    if value_type is float and value.is_integer():
+        return int(value)
+    return None
+
+
+def _check_int64(value: Any) -> Optional[ValidationIssue]:
+    number = _parse_integer(value)
+    if number is not None and INT64_MIN <= number <= INT64_MAX:
+        return None
+    return ValidationIssue("value is not int64")
+
+
+def _check_integer(value: Any) -> Optional[ValidationIssue]:
+    if _parse_integer(value) is not None:
+        return None
+    return ValidationIssue("value is not integer")
+
+
+def _check_float64(value: Any) -> Optional[ValidationIssue]:
+    value_type = type(value)
+    if value_type is float or value_type is int:
+        return None
+    return ValidationIssue("value is not float64")
+
+
+def _check_bytes(value: Any) -> Optional[ValidationIssue]:
+    if type(value) is str:
+        try:
+            binascii.a2b_base64(value, strict_mode=True)
+            return None
+        except binascii.Error:
+            pass
+    return ValidationIssue("value is not base64 bytes")
+
+
+# Primitives of `standards/conventional.yaml` that a value of one exact
+# type passes, with the message for others. Struct fields and array items
+# of these are checked inline rather than through a call.
+_EXACT_TYPES = {
+    "boolean": (bool, "value is not boolean"),
+    "string": (str, "value is not string"),
+    "object": (dict, "value is not object"),
+}
+_PRIMITIVE_CHECKS: Dict[str, Check] = {
+    "int32": _check_int32,
+    "int64": _check_int64,
+    "integer": _check_integer,
+    "float64": _check_float64,
+    "bytes": _check_bytes,
+}
+# `void`, and primitives a standard adds without a check given for them
+# (`datetime`, ...), accept any value.
+
+
+def _check_exact_type(exact_type: type, message: str) -> Check:
+    def check(value: Any) -> Optional[ValidationIssue]:
+        if type(value) is exact_type:
+            return None
+        return ValidationIssue(message)
+
+    return check
+
+
+def _accept(value: Any) -> Optional[ValidationIssue]:
+    return None
+
+
+class JsonValidator:
+    """
+    Validates JSON values against the defs of an IR::
+
+        validator = JsonValidator(bdl_ir)
+        issue = validator.validate("portone.v2.api.data.Payment", payload)
+        issues = validator.validate_many("portone.v2.api.data.Payment", records)
+
+    Rules are those of the TypeScript validator, and the first issue found
+    is reported:
+
+    - Required fields must be present and not `null`; optional fields may
+      be missing or `null`. Fields not in the def are ignored.
+    - `T[]` is a list and `T[K]` a dict of `T`s; keys aren't checked.
+    - A union needs its discriminator (`type` unless the `discriminator`
+      attribute says otherwise) to name one of its items.
+    - An enum value is one of the `value` attributes or names of its items.
+    - A oneof value is valid if one of its items is. A oneof with a
+      `discriminator` attribute whose items all have a `mapping` attribute,
+      as in the portone REST API schemas, checks only the item the
+      discriminator maps to.
+    - `int64` and `integer` take numeric strings as well as numbers.
+      `bytes` is a base64 string. `void` takes anything.
+
+    Primitives other than the conventional ones take anything, unless
+    `primitive_checks` has a predicate for them.
+
+    Checks are compiled per type path on first use and kept; the validator
+    doesn't follow later changes to the IR.
+    """
+
+    def __init__(
+        self,
+        bdl_ir: ir.BdlIr,
+        primitive_checks: Optional[Dict[str, Callable[[Any], bool]]] = None,
+    ):
+        self.defs = bdl_ir.defs
+        self.primitive_checks = primitive_checks or {}
+        self._checks: Dict[str, Check] = {}
+        self._compiling: Set[str] = set()
+
+    def validate(self, type_path: str, value: Any) -> Optional[ValidationIssue]:
+        issue = self.get_check(type_path)(value)
+        if issue is not None:
+            issue.path.reverse()
+        return issue
+
+    def validate_many(
+        self, type_path: str, records: Iterable[Any]
+    ) -> List[Optional[ValidationIssue]]:
+        """
+        `validate` for each record, with the check looked up once.
+        """
+        check = self.get_check(type_path)
+        issues = [check(record) for record in records]
+        for issue in issues:
+            if issue is not None:
+                issue.path.reverse()
+        return issues
+
+    def get_check(self, type_path: str) -> Check:
+        """
+        Compiled check of a def or primitive. Issue paths are leaf first.
+        """
+        check = self._checks.get(type_path)
+        if check is not None:
+            return check
+        if type_path in self._compiling:
+            # A def reaching itself; it's compiled by the time this runs.
+            checks = self._checks
+            return lambda value: checks[type_path](value)
+        self._compiling.add(type_path)
+        try:
+            check = self._checks[type_path] = self._compile_path(type_path)
+        finally:
+            self._compiling.discard(type_path)
+        return check
+
+    def _compile_path(self, type_path: str) -> Check:
+        if "." not in type_path:
+            return self._compile_primitive(type_path)
+        definition = self.defs.get(type_path)
+        if definition is None:
+            raise ValueError(f"Unknown type: {type_path}")
+        compile_fn = _COMPILE_DEF_FNS.get(definition.type)
+        if compile_fn is None:
+            raise ValueError(f"Not a data type: {type_path}")
+        return compile_fn(self, definition)
+
+    def _compile_primitive(self, primitive: str) -> Check:
+        predicate = self.primitive_checks.get(primitive)
+        if predicate is not None:
+            message = f"value is not {primitive}"
+            return lambda value: None if predicate(value) else ValidationIssue(message)
+        exact_type = _EXACT_TYPES.get(primitive)
+        if exact_type is not None:
+            return _check_exact_type(*exact_type)
+        return _PRIMITIVE_CHECKS.get(primitive, _accept)
+
+    def _get_exact_type(self, type_path: str) -> Optional[Tuple[type, str]]:
+        """
+        `(type, message)` when values of `type_path` are checked by their
+        Python type alone.
+        """
+        if type_path in self.primitive_checks:
+            return None
+        return _EXACT_TYPES.get(type_path)
+
+    def _compile_type(self, type: ir.Type) -> Check:
+        type_path = type.value_type_path
+        if type.type == "Plain":
+            return self.get_check(type_path)
+        item_check = self.get_check(type_path)
+        exact_type = self._get_exact_type(type_path)
+        if type.type == "Array":
+            return _compile_array(item_check, exact_type)
+        return _compile_dictionary(item_check, exact_type)
+
+    def _compile_custom(self, custom: ir.Custom) -> Check:
+        return self._compile_type(custom.original_type)
+
+    def _compile_enum(self, enum: ir.Enum) -> Check:
+        values = frozenset(
+            item.attributes.get("value") or item.name for item in enum.items
+        )
+
+        def check_enum(value: Any) -> Optional[ValidationIssue]:
+            if type(value) is not str:
+                return ValidationIssue("value is not string")
+            if value not in values:
+                return ValidationIssue("value is not in enum")
+            return None
+
+        return check_enum
+
+    def _compile_oneof(self, oneof: ir.Oneof) -> Check:
+        discriminator = oneof.attributes.get("discriminator")
+        if (
+            discriminator
+            and oneof.items
+            and all("mapping" in item.attributes for item in oneof.items)
+        ):
+            item_checks = {}
+            for item in oneof.items:
+                item_checks.setdefault(
+                    item.attributes["mapping"], self._compile_type(item.item_type)
+                )
+            return _compile_discriminated(discriminator, item_checks)
+
+        checks = [self._compile_type(item.item_type) for item in oneof.items]
+
+        def check_oneof(value: Any) -> Optional[ValidationIssue]:
+            for check in checks:
+                if check(value) is None:
+                    return None
+            return ValidationIssue("value does not match any type")
+
+        return check_oneof
+
+    def _compile_struct(self, struct: ir.Struct) -> Check:
+        check_fields = self._compile_fields(struct.fields)
+
+        def check_struct(value: Any) -> Optional[ValidationIssue]:
+            if type(value) is not dict:
+                return ValidationIssue("value is not object")
+            return check_fields(value)
+
+        return check_struct
+
+    def _compile_union(self, union: ir.Union) -> Check:
+        discriminator = union.attributes.get("discriminator") or "type"
+        return _compile_discriminated(
+            discriminator,
+            {item.name: self._compile_fields(item.fields) for item in union.items},
+        )
+
+    def _compile_fields(self, fields: List[ir.StructField]) -> Check:
+        """
+        Check of the fields of a value already known to be a dict.
+        """
+        # (name, optional, exact type, its message, check)
+        specs = []
+        for struct_field in fields:
+            field_type = struct_field.field_type
+            exact_type = None
+            if field_type.type == "Plain":
+                exact_type = self._get_exact_type(field_type.value_type_path)
+            check = None
+            if exact_type is None:
+                check = self._compile_type(field_type)
+                if check is _accept:
+                    check = None
+            specs.append(
+                (
+                    struct_field.name,
+                    struct_field.optional,
+                    *(exact_type or (None, None)),
+                    check,
+                )
+            )
+        specs = tuple(specs)
+
+        def check_fields(value: dict) -> Optional[ValidationIssue]:
+            get = value.get
+            for name, optional, exact_type, message, check in specs:
+                field_value = get(name)
+                if field_value is None:
+                    if optional:
+                        continue
+                    return ValidationIssue("field is required", [name])
+                if exact_type is not None:
+                    if type(field_value) is not exact_type:
+                        return ValidationIssue(message, [name])
+                elif check is not None:
+                    issue = check(field_value)
+                    if issue is not None:
+                        issue.path.append(name)
+                        return issue
+            return None
+
+        return check_fields
+
+
+# Def kind -> method compiling the check of a def of that kind.
+_COMPILE_DEF_FNS: Mapping[str, Callable[[JsonValidator, Any], Check]] = {
+    "Custom": JsonValidator._compile_custom,
+    "Enum": JsonValidator._compile_enum,
+    "Oneof": JsonValidator._compile_oneof,
+    "Struct": JsonValidator._compile_struct,
+    "Union": JsonValidator._compile_union,
+}
+
+
+def _compile_array(item_check: Check, exact_type: Optional[Tuple[type, str]]) -> Check:
+    def check_array(value: Any) -> Optional[ValidationIssue]:
+        if type(value) is not list:
+            return ValidationIssue("value is not array")
+        for index, item in enumerate(value):
+            issue = item_check(item)
+            if issue is not None:
+                issue.path.append(index)
+                return issue
+        return None
+
+    if exact_type is None:
+        return check_array
+    item_type = exact_type[0]
+
+    # Items are compared by type in the loop; the issue comes from
+    # `check_array`.
+    def check_exact_array(value: Any) -> Optional[ValidationIssue]:
+        if type(value) is not list:
+            return ValidationIssue("value is not array")
+        for item in value:
+            if type(item) is not item_type:
+                return check_array(value)
+        return None
+
+    return check_exact_array
+
+
+def _compile_dictionary(
+    item_check: Check, exact_type: Optional[Tuple[type, str]]
+) -> Check:
+    def check_dictionary(value: Any) -> Optional[ValidationIssue]:
+        if type(value) is not dict:
+            return ValidationIssue("value is not object")
+        for key, item in value.items():
+            issue = item_check(item)
+            if issue is not None:
+                issue.path.append(key)
+                return issue
+        return None
+
+    if exact_type is None:
+        return check_dictionary
+    item_type = exact_type[0]
+
+    def check_exact_dictionary(value: Any) -> Optional[ValidationIssue]:
+        if type(value) is not dict:
+            return ValidationIssue("value is not object")
+        for item in value.values():
+            if type(item) is not item_type:
+                return check_dictionary(value)
+        return None
+
+    return check_exact_dictionary
+
+
+def _compile_discriminated(discriminator: str, checks: Dict[str, Check]) -> Check:
+    """
+    Check of a union, or of a oneof with mapped items: the check of the
+    item the discriminator names.
+    """
+
+    def check_discriminated(value: Any) -> Optional[ValidationIssue]:
+        if type(value) is not dict:
+            return ValidationIssue("value is not object")
+        kind = value.get(discriminator)
+        if kind is None:
+            return ValidationIssue("value has no discriminator field")
+        check = checks.get(kind) if type(kind) is str else None
+        if check is None:
+            return ValidationIssue("invalid discriminator", [discriminator])
+        return check(value)
+
+    return check_discriminated
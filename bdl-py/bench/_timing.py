@@ -0,0 +1,17 @@
+import time
+from typing import Any, Callable
+
+
+def best_of(fn: Callable[[], Any], rounds: int = 5, warmup: bool = False) -> float:
+    """
+    Fastest of `rounds` runs of `fn`, in seconds. `warmup` runs it once
+    more first, untimed, so caches and lazily built tables are filled.
+    """
+    if warmup:
+        fn()
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,109 @@
+"""
+Memory held by a parsed AST: slotted nodes vs. `__dict__` backed dataclasses.
+
+Run from `bdl-py` with `python -m bench.ast_memory [path/to/schema.bdl]`.
+Each variant parses in a fresh interpreter so peak RSS numbers are comparable.
+"""
+
+import dataclasses
+import json
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+from bdl.parser import bdl_lexer, bdl_parser, parser
+
+DEFAULT_PATH = "../example-schemas/portone/generated/v2/api/data.bdl"
+VARIANTS = ["dict", "slots"]
+
+
+def use_dict_nodes() -> None:
+    """
+    Rebinds every node class the parser instantiates to an equivalent
+    dataclass without `__slots__`, i.e. the node layout before slotting.
+    """
+    modules = [parser, bdl_lexer, bdl_parser]
+    replaced = {}
+    for module in modules:
+        for name, value in vars(module).items():
+            if not isinstance(value, type) or not dataclasses.is_dataclass(value):
+                continue
+            if value.__module__ not in (parser.__name__, bdl_parser.__name__):
+                continue
+            if value not in replaced:
+                replaced[value] = dataclasses.make_dataclass(
+                    value.__name__,
+                    [
+                        (f.name, f.type, _copy_field(f))
+                        for f in dataclasses.fields(value)
+                    ],
+                )
+            setattr(module, name, replaced[value])
+
+
+def _copy_field(f: dataclasses.Field) -> dataclasses.Field:
+    if f.default_factory is not dataclasses.MISSING:
+        return dataclasses.field(default_factory=f.default_factory)
+    if f.default is not dataclasses.MISSING:
+        return dataclasses.field(default=f.default)
+    return dataclasses.field()
+
+
+def measure(variant: str, path: str) -> dict:
+    if variant == "dict":
+        use_dict_nodes()
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    ast = bdl_parser.parse_bdl(text)
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    stats = snapshot.statistics("filename")
+    return {
+        "variant": variant,
+        "statements": len(ast.statements),
+        "retained_bytes": sum(stat.size for stat in stats),
+        "retained_blocks": sum(stat.count for stat in stats),
+        "peak_traced_bytes": peak,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_growth_kib": rss_after - rss_before,
+    }
+
+
+def main() -> None:
+    if len(sys.argv) > 2 and sys.argv[1] == "--variant":
+        print(json.dumps(measure(sys.argv[2], sys.argv[3])))
+        return
+
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    results = {}
+    for variant in VARIANTS:
+        output = subprocess.run(
+            [sys.executable, "-m", "bench.ast_memory", "--variant", variant, path],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results[variant] = json.loads(output)
+
+    print(f"ast/memory {path}")
+    for key in [
+        "retained_bytes",
+        "retained_blocks",
+        "peak_traced_bytes",
+        "peak_rss_growth_kib",
+    ]:
+        before = results["dict"][key]
+        after = results["slots"][key]
+        ratio = after / before if before else 0
+        print(f"  {key:<20} dict {before:>12,}  slots {after:>12,}  (x{ratio:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Binary AST/IR encoding vs. `json` and `pickle`.
+
+Run from `bdl-py` with `python -m bench.binary_format [bdl.yaml] [def path]`.
+Encodes the IR of the project and the AST of its largest module, and
+reports size plus best-of-5 encode and decode times. `json` decodes to
+plain dicts only, which flatters it. `lazy` opens the binary IR and decodes
+a single def.
+"""
+
+import dataclasses
+import json
+import pickle
+import sys
+from typing import Any
+
+from bdl.io.binary import (
+    dump_bdl_ast,
+    dump_bdl_ir,
+    load_bdl_ast,
+    load_bdl_ir,
+    open_bdl_ir,
+)
+from bdl.io.ir import build_ir
+from bench._timing import best_of
+
+DEFAULT_CONFIG_PATH = "../bdl.yaml"
+DEFAULT_DEF_PATH = "portone.v2.api.data.Payment"
+
+
+def report(name: str, value: Any, dump_binary, load_binary) -> None:
+    encoders = {
+        "json": (
+            lambda: json.dumps(dataclasses.asdict(value)).encode(),
+            json.loads,
+        ),
+        "pickle": (
+            lambda: pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+            pickle.loads,
+        ),
+        "binary": (lambda: dump_binary(value), load_binary),
+    }
+    print(f"binary/{name}")
+    for encoder_name, (dump, load) in encoders.items():
+        data = dump()
+        dump_s = best_of(dump)
+        load_s = best_of(lambda: load(data))
+        print(
+            f"  {encoder_name:<7} {len(data) / 1024:9.1f}KiB"
+            f"  dump {dump_s * 1000:8.2f}ms  load {load_s * 1000:8.2f}ms"
+        )
+
+
+def main() -> None:
+    config_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CONFIG_PATH
+    def_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_DEF_PATH
+    result = build_ir(config_path, omit_file_url=True)
+
+    report("ir", result.ir, dump_bdl_ir, load_bdl_ir)
+    data = dump_bdl_ir(result.ir)
+    lazy_s = best_of(lambda: open_bdl_ir(data).defs[def_path])
+    print(f"  lazy    open and decode {def_path}: {lazy_s * 1000:.2f}ms")
+
+    module_path, bdl_ast = max(
+        result.asts.items(), key=lambda item: len(item[1].statements)
+    )
+    report(f"ast {module_path}", bdl_ast, dump_bdl_ast, load_bdl_ast)
+
+
+if __name__ == "__main__":
+    main()
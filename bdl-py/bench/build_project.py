@@ -0,0 +1,42 @@
+"""
+Wall-clock time of `build_project` by worker count.
+
+Run from `bdl-py` with `python -m bench.build_project [path/to/bdl.yaml]`.
+"""
+
+import os
+import sys
+import time
+
+from bdl.io.project import build_project
+
+DEFAULT_CONFIG_PATH = "../bdl.yaml"
+
+
+def measure_ms(config_path: str, workers: int, iterations: int = 3) -> float:
+    best = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        build_project(config_path, workers=workers)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main() -> None:
+    config_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CONFIG_PATH
+    cpu_count = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, cpu_count} & set(range(1, cpu_count + 1)))
+    serial_ms = None
+    for workers in worker_counts:
+        ms = measure_ms(config_path, workers)
+        if serial_ms is None:
+            serial_ms = ms
+        print(
+            f"project/build/workers={workers:<3} {ms:9.1f}ms "
+            f"(speedup x{serial_ms / ms:.2f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Loading and parsing a schema from a `str` vs. straight from an `mmap`.
+
+Run from `bdl-py` with `python -m bench.bytes_source [path/to/schema.bdl]`.
+Each mode runs in a fresh interpreter. `source_bytes` is what the source
+itself costs on the Python heap (the decoded `str` and anything derived from
+it before tokenizing); `peak_traced_bytes` includes the AST.
+"""
+
+import json
+import mmap
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from bdl.parser.bdl_parser import parse_bdl, parse_bdl_bytes
+
+DEFAULT_PATH = "../example-schemas/portone/generated/v2/api/data.bdl"
+MODES = ["str", "mmap"]
+
+
+def measure(mode: str, path: str) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        if mode == "str":
+            source = f.read().decode("utf-8")
+            source_bytes, _ = tracemalloc.get_traced_memory()
+            statements = len(parse_bdl(source).statements)
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                source_bytes, _ = tracemalloc.get_traced_memory()
+                statements = len(parse_bdl_bytes(source).statements)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "mode": mode,
+        "statements": statements,
+        "seconds": seconds,
+        "source_bytes": source_bytes,
+        "peak_traced_bytes": peak,
+    }
+
+
+def main() -> None:
+    if len(sys.argv) > 2 and sys.argv[1] == "--mode":
+        print(json.dumps(measure(sys.argv[2], sys.argv[3])))
+        return
+
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    print(f"bytes_source {path}")
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, "-m", "bench.bytes_source", "--mode", mode, path],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output)
+        print(
+            f"  {mode:<5} {result['statements']:>7,} statements"
+            f"  {result['seconds']:6.2f}s"
+            f"  source {result['source_bytes'] / 1024:9.1f} KiB"
+            f"  peak traced {result['peak_traced_bytes'] / 1024 / 1024:7.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
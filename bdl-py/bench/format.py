@@ -0,0 +1,50 @@
+"""
+`format_bdl` over every `.bdl` file under `example-schemas`.
+
+Run from `bdl-py` with `python -m bench.format [directory]`. Times the
+first pass over the sources, a second pass over its output, which is
+already formatted and should cost little more than parsing, and parsing
+alone for reference.
+"""
+
+import glob
+import os
+import sys
+from typing import List
+
+from bdl.formatter import format_bdl
+from bdl.parser.bdl_parser import parse_bdl
+from bench._timing import best_of
+
+DEFAULT_DIRECTORY = "../example-schemas"
+
+
+def read_all(directory: str) -> List[str]:
+    texts = []
+    for path in sorted(glob.glob(os.path.join(directory, "**/*.bdl"), recursive=True)):
+        with open(path, "r", encoding="utf-8") as f:
+            texts.append(f.read())
+    return texts
+
+
+def main() -> None:
+    directory = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DIRECTORY
+    texts = read_all(directory)
+    formatted = [format_bdl(text) for text in texts]
+    changed = sum(result != text for result, text in zip(formatted, texts))
+    unchanged = sum(format_bdl(text) is text for text in formatted)
+    size = sum(len(text) for text in texts)
+
+    print(f"formatter {len(texts)} files, {size / 1024:.0f}KiB, {changed} changed")
+    print(f"  {unchanged} of {len(texts)} formatted files returned as is")
+    timings = {
+        "format": lambda: [format_bdl(text) for text in texts],
+        "format formatted": lambda: [format_bdl(text) for text in formatted],
+        "parse only": lambda: [parse_bdl(text) for text in texts],
+    }
+    for name, fn in timings.items():
+        print(f"  {name:<18} {best_of(fn) * 1000:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+`diff_bdl_ir` on two nearly identical versions of the project IR.
+
+Run from `bdl-py` with `python -m bench.ir_diff [bdl.yaml] [changed defs]`.
+The next version is a deep copy with a field added to (or an attribute set
+on) some defs, so no def is shared by identity. Reports best-of-5 times of
+the diff with and without stored fingerprints, of fingerprinting a whole IR,
+and of descending into every shared def, which is what the diff would cost
+without the whole-def checks.
+"""
+
+import copy
+import random
+import sys
+
+from bdl.io.ir import build_ir
+from bdl.ir import model as ir
+from bdl.ir.differ import _diff_def, diff_bdl_ir, fingerprint_bdl_ir
+from bench._timing import best_of
+
+DEFAULT_CONFIG_PATH = "../bdl.yaml"
+DEFAULT_CHANGED_DEFS = 10
+
+
+def change_def(definition: ir.Def) -> None:
+    if definition.type == "Struct":
+        field_type = ir.Plain(value_type_path="string")
+        definition.fields.append(ir.StructField(name="added", field_type=field_type))
+    else:
+        definition.attributes["description"] = "changed"
+
+
+def descend_all(prev: ir.BdlIr, next: ir.BdlIr) -> None:
+    for path, definition in prev.defs.items():
+        if path in next.defs:
+            _diff_def(definition, next.defs[path], lambda ref, is_prev: ref)
+
+
+def main() -> None:
+    config_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CONFIG_PATH
+    changed = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHANGED_DEFS
+    prev = build_ir(config_path, omit_file_url=True).ir
+    next = copy.deepcopy(prev)
+    random.seed(0)
+    for path in random.sample(list(next.defs), changed):
+        change_def(next.defs[path])
+
+    prev_fingerprints = fingerprint_bdl_ir(prev)
+    next_fingerprints = fingerprint_bdl_ir(next)
+    diff = diff_bdl_ir(prev, next)
+    modified = sum(item.type != "Keep" for item in diff.defs)
+    assert diff == diff_bdl_ir(prev, next, prev_fingerprints, next_fingerprints)
+
+    print(f"ir/diff {len(prev.defs):,} defs, {modified} changed")
+    timings = {
+        "diff": lambda: diff_bdl_ir(prev, next),
+        "diff with fingerprints": lambda: diff_bdl_ir(
+            prev, next, prev_fingerprints, next_fingerprints
+        ),
+        "fingerprint one ir": lambda: fingerprint_bdl_ir(next),
+        "descend into every def": lambda: descend_all(prev, next),
+    }
+    for name, fn in timings.items():
+        print(f"  {name:<24} {best_of(fn) * 1000:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Type reference index queries on the project IR.
+
+Run from `bdl-py` with `python -m bench.ir_index [bdl.yaml] [def path]`.
+Reports best-of-5 times of building `TypeReferenceIndex` and of the impact
+queries it answers, next to finding the procs that use a def by walking
+the references of every proc, which is what callers did without the index.
+"""
+
+import sys
+from typing import List
+
+from bdl.io.ir import build_ir
+from bdl.ir import model as ir
+from bdl.ir.analyzer import TypeReferenceIndex, get_def_type_paths
+from bench._timing import best_of
+
+DEFAULT_CONFIG_PATH = "../bdl.yaml"
+DEFAULT_DEF_PATH = "portone.v2.api.data.Payment"
+
+
+def walk_dependent_procs(bdl_ir: ir.BdlIr, def_path: str) -> List[str]:
+    result = []
+    for proc_path, definition in bdl_ir.defs.items():
+        if definition.type != "Proc":
+            continue
+        seen = {proc_path}
+        stack = [proc_path]
+        while stack:
+            path = stack.pop()
+            if path not in bdl_ir.defs:
+                continue
+            for type_path in get_def_type_paths(bdl_ir.defs[path]):
+                if type_path not in seen:
+                    seen.add(type_path)
+                    stack.append(type_path)
+        if def_path in seen:
+            result.append(proc_path)
+    return result
+
+
+def main() -> None:
+    config_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CONFIG_PATH
+    def_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_DEF_PATH
+    bdl_ir = build_ir(config_path, omit_file_url=True).ir
+    index = TypeReferenceIndex(bdl_ir)
+    procs = index.get_dependent_procs(def_path)
+    assert sorted(procs) == sorted(walk_dependent_procs(bdl_ir, def_path))
+
+    print(
+        f"ir/index {index.def_count:,} defs, {len(index.paths):,} type paths,"
+        f" {len(procs)} procs use {def_path},"
+        f" {len(index.get_dead_defs()):,} defs unreachable from procs"
+    )
+    timings = {
+        "build index": lambda: TypeReferenceIndex(bdl_ir),
+        "dependent procs": lambda: index.get_dependent_procs(def_path),
+        "reachable from procs": lambda: index.get_reachable_defs(),
+        "dead defs": lambda: index.get_dead_defs(),
+        "dependent procs, walk": lambda: walk_dependent_procs(bdl_ir, def_path),
+    }
+    for name, fn in timings.items():
+        print(f"  {name:<24} {best_of(fn) * 1000:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Peak memory of scanning a large schema: `parse_bdl` on the whole text vs.
+`iter_bdl_statements` over a memory-mapped file.
+
+Run from `bdl-py` with `python -m bench.iter_statements [path/to/schema.bdl]`.
+The schema is repeated `REPEAT` times into a temporary file, and each mode
+runs in a fresh interpreter so peak RSS numbers are comparable.
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bdl.parser.bdl_parser import parse_bdl
+from bdl.parser.streaming import iter_bdl_statements
+
+DEFAULT_PATH = "../example-schemas/portone/generated/v2/api/data.bdl"
+REPEAT = 10
+MODES = ["parse_bdl", "iter_bdl_statements"]
+
+
+def measure(mode: str, path: str) -> dict:
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    start = time.perf_counter()
+    if mode == "parse_bdl":
+        with open(path, "r", encoding="utf-8") as f:
+            statements = len(parse_bdl(f.read()).statements)
+    else:
+        with open(path, "rb") as f:
+            statements = sum(1 for _ in iter_bdl_statements(f))
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "mode": mode,
+        "statements": statements,
+        "seconds": seconds,
+        "peak_traced_bytes": peak,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_growth_kib": rss_after - rss_before,
+    }
+
+
+def main() -> None:
+    if len(sys.argv) > 2 and sys.argv[1] == "--mode":
+        print(json.dumps(measure(sys.argv[2], sys.argv[3])))
+        return
+
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    with tempfile.NamedTemporaryFile("w", suffix=".bdl", delete=False) as f:
+        for _ in range(REPEAT):
+            f.write(text)
+            f.write("\n")
+        big_path = f.name
+
+    try:
+        size = os.path.getsize(big_path)
+        print(f"iter_statements {path} x{REPEAT} ({size / 1024 / 1024:.1f} MiB)")
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, "-m", "bench.iter_statements", "--mode", mode]
+                + [big_path],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"  {mode:<20} {result['statements']:>8,} statements"
+                f"  {result['seconds']:6.2f}s"
+                f"  peak traced {result['peak_traced_bytes'] / 1024 / 1024:8.1f} MiB"
+                f"  rss growth {result['peak_rss_growth_kib'] / 1024:8.1f} MiB"
+            )
+    finally:
+        os.unlink(big_path)
+
+
+if __name__ == "__main__":
+    main()
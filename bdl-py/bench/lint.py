@@ -0,0 +1,139 @@
+"""
+Twenty lint rules over one schema, in one walk vs. one walk per rule.
+
+Run from `bdl-py` with `python -m bench.lint [path/to/schema.bdl]`. The
+rules are the default ones plus naming and documentation rules of the kind
+a project would add. `walk` is one rule that subscribes to every node
+kind and does nothing: the bare cost of one traversal. The AST is parsed
+once, outside the timings. Ends with the per-rule profile of the single
+walk.
+"""
+
+import re
+import sys
+from typing import Any, List
+
+from bdl.io.standard import get_builtin_standard
+from bdl.linter import (
+    NODE_KINDS,
+    LintContext,
+    Linter,
+    LintProfile,
+    LintRule,
+    get_default_rules,
+)
+from bdl.parser.bdl_parser import parse_bdl
+from bench._timing import best_of
+
+DEFAULT_PATH = "../example-schemas/portone/generated/v2/api/data.bdl"
+
+
+class NoopRule(LintRule):
+    name = "noop"
+
+    def __init__(self):
+        for method_name in NODE_KINDS.values():
+            setattr(self, method_name, self.visit)
+
+    def visit(self, node: Any, parent: Any, context: LintContext) -> None:
+        pass
+
+
+class NamingRule(LintRule):
+    def __init__(self, name: str, kinds: List[str], pattern: str):
+        self.name = name
+        self.pattern = re.compile(pattern)
+        for kind in kinds:
+            setattr(self, NODE_KINDS[kind], self.check)
+
+    def check(self, node: Any, parent: Any, context: LintContext) -> None:
+        if not self.pattern.match(context.get_text(node.name)):
+            context.report(f"bench/{self.name}", "Bad name.", node.name, "warning")
+
+
+class RequiredAttributeRule(LintRule):
+    def __init__(self, name: str, kinds: List[str], key: str):
+        self.name = name
+        self.key = key
+        for kind in kinds:
+            setattr(self, NODE_KINDS[kind], self.check)
+
+    def check(self, node: Any, parent: Any, context: LintContext) -> None:
+        if self.key not in context.get_attributes_by_name(node):
+            span = getattr(node, "name", None) or node.keyword
+            context.report(f"bench/{self.name}", "Missing attribute.", span, "warning")
+
+
+class MaxFieldsRule(LintRule):
+    name = "max-fields"
+
+    def visit_struct(self, node: Any, parent: Any, context: LintContext) -> None:
+        if len(node.fields) > 50:
+            context.report("bench/max-fields", "Too many fields.", node.name, "warning")
+
+
+class EmptyAttributeRule(LintRule):
+    name = "empty-attribute"
+
+    def visit_attribute(self, node: Any, parent: Any, context: LintContext) -> None:
+        if node.content is not None and node.content.end - node.content.start < 2:
+            context.report("bench/empty-attribute", "Empty.", node.name, "warning")
+
+
+def get_rules() -> List[LintRule]:
+    pascal_case = r"[A-Z][A-Za-z0-9]*$"
+    return [
+        *get_default_rules(),
+        NamingRule("struct-name", ["Struct"], pascal_case),
+        NamingRule("union-name", ["Union"], pascal_case),
+        NamingRule("enum-name", ["Enum"], pascal_case),
+        NamingRule("oneof-name", ["Oneof"], pascal_case),
+        NamingRule("custom-name", ["Custom"], pascal_case),
+        NamingRule("proc-name", ["Proc"], r"[a-z][A-Za-z0-9]*$"),
+        NamingRule("field-name", ["StructField"], r"[a-z][A-Za-z0-9]*$"),
+        NamingRule("enum-item-name", ["EnumItem"], r"[A-Z][A-Z0-9_]*$"),
+        NamingRule("union-item-name", ["UnionItem"], r"[A-Z][A-Za-z0-9_]*$"),
+        RequiredAttributeRule(
+            "def-description",
+            ["Struct", "Union", "Enum", "Oneof", "Custom", "Proc"],
+            "description",
+        ),
+        RequiredAttributeRule("field-description", ["StructField"], "description"),
+        RequiredAttributeRule("item-description", ["EnumItem"], "description"),
+        MaxFieldsRule(),
+        EmptyAttributeRule(),
+    ]
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    bdl_ast = parse_bdl(text)
+    standard = get_builtin_standard("conventional")
+    rules = get_rules()
+    linter = Linter(rules)
+    single_rule_linters = [Linter([rule]) for rule in rules]
+    walk_only = Linter([NoopRule()])
+    diagnostics = linter.lint(text, bdl_ast, standard=standard).diagnostics
+
+    def lint_per_rule() -> None:
+        for single_rule_linter in single_rule_linters:
+            single_rule_linter.lint(text, bdl_ast, standard=standard)
+
+    print(f"linter {path}, {len(rules)} rules, {len(diagnostics):,} diagnostics")
+    timings = {
+        "walk": lambda: walk_only.lint(text, bdl_ast, standard=standard),
+        "one walk": lambda: linter.lint(text, bdl_ast, standard=standard),
+        "one walk per rule": lint_per_rule,
+    }
+    for name, fn in timings.items():
+        print(f"  {name:<18} {best_of(fn) * 1000:8.2f}ms")
+
+    profile = LintProfile()
+    linter.lint(text, bdl_ast, standard=standard, profile=profile)
+    print(profile.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Loading one module and its imports vs. building the whole project.
+
+Run from `bdl-py` with
+`python -m bench.module_loader [path/to/bdl.yaml] [module path ...]`.
+Each load uses a fresh `ModuleLoader`, so every module in the closure is
+read and parsed; best of 3.
+"""
+
+import sys
+
+from bdl.io.ir import build_ir
+from bdl.io.loader import create_module_loader
+from bench._timing import best_of
+
+DEFAULT_CONFIG_PATH = "../bdl.yaml"
+DEFAULT_MODULE_PATHS = [
+    "portone.v2.api.payment",
+    "portone.v2.browserSdk.methods",
+    "swagger.petstore.pet",
+]
+
+
+def main() -> None:
+    config_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CONFIG_PATH
+    module_paths = sys.argv[2:] or DEFAULT_MODULE_PATHS
+    full = build_ir(config_path).ir
+    full_s = best_of(lambda: build_ir(config_path), 3)
+    print(
+        f"io/loader {'whole project':<32} {len(full.modules):>3} modules"
+        f" {full_s * 1000:8.1f}ms"
+    )
+    for module_path in module_paths:
+        loaded = create_module_loader(config_path).load([module_path]).ir
+        load_s = best_of(
+            lambda: create_module_loader(config_path).load([module_path]), 3
+        )
+        print(
+            f"io/loader {module_path:<32} {len(loaded.modules):>3} modules"
+            f" {load_s * 1000:8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
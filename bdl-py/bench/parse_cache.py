@@ -0,0 +1,61 @@
+"""
+Cold vs. warm `ParseCache` over every `.bdl` file under `example-schemas`.
+
+Run from `bdl-py` with `python -m bench.parse_cache [directory]`.
+A warm run costs hashing, reading and decoding the entries; decoding
+the `bdl.io.binary` entries takes most of it.
+"""
+
+import glob
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+from bdl.parser.bdl_parser import parse_bdl
+from bdl.parser.parse_cache import ParseCache
+
+DEFAULT_DIRECTORY = "../example-schemas"
+
+
+def read_all(directory: str):
+    texts = []
+    for path in sorted(glob.glob(os.path.join(directory, "**/*.bdl"), recursive=True)):
+        with open(path, "r", encoding="utf-8") as f:
+            texts.append(f.read())
+    return texts
+
+
+def measure_ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    directory = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DIRECTORY
+    texts = read_all(directory)
+    size = sum(len(text) for text in texts)
+    print(f"parser/cache {len(texts)} files, {size / 1024:.0f}KiB")
+
+    with tempfile.TemporaryDirectory() as cache_directory:
+        parse_ms = measure_ms(lambda: [parse_bdl(text) for text in texts])
+        hash_ms = measure_ms(
+            lambda: [hashlib.blake2b(text.encode()).digest() for text in texts]
+        )
+        cold_ms = measure_ms(
+            lambda: [ParseCache(cache_directory).parse(text) for text in texts]
+        )
+        warm_ms = measure_ms(
+            lambda: [ParseCache(cache_directory).parse(text) for text in texts]
+        )
+
+    print(f"  no cache : {parse_ms:8.1f}ms")
+    print(f"  hash only: {hash_ms:8.1f}ms")
+    print(f"  cold     : {cold_ms:8.1f}ms")
+    print(f"  warm     : {warm_ms:8.1f}ms (x{parse_ms / warm_ms:.2f} vs no cache)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Per-construct parser micro-benchmarks.
+
+Run from `bdl-py` with `python -m bench.parse_constructs [filter]`.
+Each case repeats one construct many times and reports the time per
+construct, split into tokenizing and parsing the token stream. `core/*` cases
+drive the generic `Parser.accept` with string, regex and EOF patterns, per
+matched item.
+"""
+
+import re
+import sys
+from typing import Callable, List, Tuple
+
+from bdl.parser.bdl_lexer import TokenParser, tokenize_bdl
+from bdl.parser.bdl_parser import parse_module
+from bdl.parser.parser import EOF, Parser
+from bench._timing import best_of
+
+COUNT = 2000
+
+
+def struct_fields(count: int) -> str:
+    fields = "".join(f"  field{i}?: string[],\n" for i in range(count))
+    return f"struct S {{\n{fields}}}\n"
+
+
+def union_items(count: int) -> str:
+    items = "".join(f"  Item{i}(id: string, value: int64),\n" for i in range(count))
+    return f"union U {{\n{items}}}\n"
+
+
+def attributes(count: int) -> str:
+    attrs = "".join(
+        f"  @ description - field {i}\n  a{i}: string,\n" for i in range(count)
+    )
+    return f"struct S {{\n{attrs}}}\n"
+
+
+def pipe_attributes(count: int) -> str:
+    attrs = "".join(
+        f"  @ description\n  | first line {i}\n  | second line\n  a{i}: string,\n"
+        for i in range(count)
+    )
+    return f"struct S {{\n{attrs}}}\n"
+
+
+def imports(count: int) -> str:
+    return "".join(
+        f"import a.b.module{i} {{ A{i}, B{i} as C{i} }}\n" for i in range(count)
+    )
+
+
+def enum_items(count: int) -> str:
+    items = "".join(f"  Item{i},\n" for i in range(count))
+    return f"enum E {{\n{items}}}\n"
+
+
+def procs(count: int) -> str:
+    return "".join(
+        f"proc P{i} = In{i} -> Out{i}[] throws Err{i}\n" for i in range(count)
+    )
+
+
+CASES: List[Tuple[str, Callable[[int], str]]] = [
+    ("struct_fields", struct_fields),
+    ("union_items", union_items),
+    ("attributes", attributes),
+    ("pipe_attributes", pipe_attributes),
+    ("imports", imports),
+    ("enum_items", enum_items),
+    ("procs", procs),
+]
+
+_WORD = re.compile(r"^[a-z]+")
+
+
+def core_accept_string(count: int) -> Callable[[], None]:
+    text = "ab" * count
+
+    def run() -> None:
+        parser = Parser(text)
+        while parser.accept("ab") is not None:
+            pass
+        parser.expect(EOF)
+
+    return run
+
+
+def core_accept_regex(count: int) -> Callable[[], None]:
+    text = "word " * count
+
+    def run() -> None:
+        parser = Parser(text)
+        while parser.accept(_WORD) is not None:
+            parser.accept(" ")
+        parser.expect(EOF)
+
+    return run
+
+
+CORE_CASES: List[Tuple[str, Callable[[int], Callable[[], None]]]] = [
+    ("accept_string", core_accept_string),
+    ("accept_regex", core_accept_regex),
+]
+
+
+def main() -> None:
+    name_filter = sys.argv[1] if len(sys.argv) > 1 else ""
+    for name, build in CASES:
+        if name_filter not in name:
+            continue
+        text = build(COUNT)
+        tokens = tokenize_bdl(text)
+        lex_s = best_of(lambda: tokenize_bdl(text), warmup=True)
+        parse_s = best_of(lambda: parse_module(TokenParser(text, tokens)), warmup=True)
+        print(
+            f"parser/construct/{name:<16} {len(tokens):>7,} tokens"
+            f"  lex {lex_s * 1e6 / COUNT:7.2f}us"
+            f"  parse {parse_s * 1e6 / COUNT:7.2f}us per construct"
+        )
+    for name, build in CORE_CASES:
+        if name_filter not in name:
+            continue
+        run = build(COUNT * 10)
+        seconds = best_of(run, warmup=True)
+        print(f"parser/core/{name:<20} {seconds * 1e9 / (COUNT * 10):7.1f}ns per item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Thousands of tiny schemas through `parse_bdl` vs. `BdlParser.parse_many`.
+
+Run from `bdl-py` with `python -m bench.parse_many [count]`. Inputs are
+small structs, enums with imports and attributes, and one broken snippet
+in ten, so error collection is part of the batch. `setup` is the time to
+parse an empty input, the fixed cost paid once per item.
+"""
+
+import sys
+from typing import List
+
+from bdl.parser.bdl_parser import BdlParser, ParseResult, parse_bdl
+from bdl.parser.parser import SyntaxError
+from bench._timing import best_of
+
+DEFAULT_COUNT = 5000
+
+
+def build_snippets(count: int) -> List[str]:
+    snippets = []
+    for i in range(count):
+        if i % 10 == 9:
+            snippets.append(f"struct Broken{i} {{\n  id: ,\n}}\n")
+        elif i % 2:
+            snippets.append(
+                f"import common.types {{ Id }}\n"
+                f"@ description - Status {i}\n"
+                f"enum Status{i} {{ Active, Inactive }}\n"
+            )
+        else:
+            snippets.append(f"struct User{i} {{\n  id: Id,\n  name?: string,\n}}\n")
+    return snippets
+
+
+def parse_each(texts: List[str]) -> List[ParseResult]:
+    """
+    What callers do without `parse_many`: a fresh parser per input.
+    """
+    results = []
+    for text in texts:
+        try:
+            results.append(ParseResult(ast=parse_bdl(text)))
+        except SyntaxError as error:
+            results.append(ParseResult(error=error.with_traceback(None)))
+    return results
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    snippets = build_snippets(count)
+    bdl_parser = BdlParser()
+    results = bdl_parser.parse_many(snippets)
+    errors = sum(result.error is not None for result in results)
+
+    print(f"parser/many {count:,} snippets, {errors:,} with syntax errors")
+    timings = {
+        "parse_bdl each": (lambda: parse_each(snippets), count),
+        "parse_many": (lambda: bdl_parser.parse_many(snippets), count),
+        "setup, parse_bdl": (lambda: parse_each([""] * count), count),
+        "setup, parse_many": (lambda: bdl_parser.parse_many([""] * count), count),
+    }
+    for name, (fn, items) in timings.items():
+        print(f"  {name:<20} {best_of(fn, 11) / items * 1e6:8.2f}us/item")
+
+
+if __name__ == "__main__":
+    main()
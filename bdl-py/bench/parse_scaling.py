@@ -0,0 +1,56 @@
+"""
+Parse time vs. input size.
+
+Run from `bdl-py` with `python -m bench.parse_scaling`.
+Time per KiB should stay flat as the schema grows.
+"""
+
+import time
+
+from bdl.parser.bdl_parser import parse_bdl
+
+
+def build_schema(repeat: int) -> str:
+    parts = []
+    for i in range(repeat):
+        parts.append(f"// module comment {i}")
+        parts.append(f"@ description - user {i}")
+        parts.append(
+            f"struct User{i} {{\n  id: string,\n  name?: string,\n  tags: string[],\n}}"
+        )
+        parts.append(f"enum Role{i} {{ Admin, User, Guest }}")
+        parts.append(f"oneof Value{i} {{ A, B, C, D }}")
+        parts.append(f"union Event{i} {{\n  Created(at: datetime),\n  Deleted,\n}}")
+        parts.append(
+            f"proc GetUser{i} = GetUserInput{i} -> GetUserOutput{i}"
+            f" throws GetUserError{i}"
+        )
+        parts.append(f"custom Amount{i} = int64[string]")
+    return "\n\n".join(parts)
+
+
+def measure_ms(text: str, iterations: int) -> float:
+    parse_bdl(text)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse_bdl(text)
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main() -> None:
+    base_ms_per_kib = None
+    for repeat in [100, 200, 400, 800, 1600]:
+        text = build_schema(repeat)
+        kib = len(text) / 1024
+        ms = measure_ms(text, iterations=max(1, 800 // repeat))
+        ms_per_kib = ms / kib
+        if base_ms_per_kib is None:
+            base_ms_per_kib = ms_per_kib
+        print(
+            f"parser/scaling/{repeat:<5} {kib:8.1f}KiB {ms:9.2f}ms "
+            f"{ms_per_kib:6.3f}ms/KiB (x{ms_per_kib / base_ms_per_kib:.2f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Per-rule parser profile of one schema.
+
+Run from `bdl-py` with
+`python -m bench.profile_rules [path/to/schema.bdl] [out.folded]`.
+Prints the rules by self time and writes a collapsed-stack file that
+`flamegraph.pl` or speedscope can render.
+"""
+
+import sys
+
+from bdl.parser.bdl_parser import parse_bdl
+from bdl.parser.profiling import ParserProfile
+
+DEFAULT_PATH = "../example-schemas/portone/generated/v2/api/data.bdl"
+DEFAULT_OUTPUT_PATH = "parse.folded"
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    output_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_OUTPUT_PATH
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    with ParserProfile() as profile:
+        parse_bdl(text)
+
+    print(f"parser/profile {path}")
+    print(profile.report(limit=25))
+    with open(output_path, "w", encoding="utf-8") as f:
+        profile.write_collapsed(f)
+    print(f"\ncollapsed stacks written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
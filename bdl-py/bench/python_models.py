@@ -0,0 +1,255 @@
+"""
+Generated Python models against a generic, schema-walking decoder.
+
+Run from `bdl-py` with `python -m bench.python_models [bdl.yaml] [def path]`.
+Generates models for the project into a temporary directory, builds a
+payload of the def with every optional field filled and every oneof and
+union variant used in turn, and times decoding it from and encoding it to
+`json.loads` form:
+
+- `generated` is the `from_json`/`to_json` code of the models.
+- `reflective` decodes the same payload into the same classes by looking
+  each def up in the IR as it goes and calling the class with keyword
+  arguments, the way `bdl-ts/runtime/src/pojo-ser-des.ts` and dataclass
+  or pydantic-style decoders work.
+
+Both results are checked to be equal before timing.
+"""
+
+import importlib
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Callable, Dict
+
+from bdl.generator.python import generate_python
+from bdl.io.ir import build_ir
+from bdl.ir import model as ir
+from bench._timing import best_of
+
+DEFAULT_CONFIG_PATH = "../example-schemas/portone/bdl.yaml"
+DEFAULT_DEF_PATH = "portone.v2.api.data.GetPaymentsResponse"
+# Items of each array in the payload, and depth below which optional
+# fields are left out so recursive types end.
+ARRAY_LENGTH = 3
+MAX_DEPTH = 6
+ROUNDS = 20
+
+
+_SAMPLE_PRIMITIVES = {
+    "boolean": True,
+    "int32": 32,
+    "int64": 64,
+    "integer": 100,
+    "float64": 1.5,
+    "bytes": "AAECAw==",
+    "object": {"key": "value"},
+    "void": None,
+}
+
+
+class SampleMaker:
+    """
+    JSON values of a type, rotating through oneof and union variants.
+    """
+
+    def __init__(self, bdl_ir: ir.BdlIr):
+        self.defs = bdl_ir.defs
+        self.turns: Dict[str, int] = {}
+
+    def make(self, type: ir.Type, depth: int) -> Any:
+        if type.type == "Array":
+            count = ARRAY_LENGTH if depth < MAX_DEPTH else 0
+            return [self.make_plain(type.value_type_path, depth) for _ in range(count)]
+        if type.type == "Dictionary":
+            return {"key": self.make_plain(type.value_type_path, depth)}
+        return self.make_plain(type.value_type_path, depth)
+
+    def make_plain(self, type_path: str, depth: int) -> Any:
+        definition = self.defs.get(type_path)
+        if definition is None:
+            return _SAMPLE_PRIMITIVES.get(type_path, f"{type_path} value")
+        if definition.type == "Custom":
+            return self.make(definition.original_type, depth)
+        if definition.type == "Enum":
+            item = definition.items[self.turn(type_path, len(definition.items))]
+            return item.attributes.get("value") or item.name
+        if definition.type == "Struct":
+            return self.make_fields(definition.fields, depth + 1)
+        if definition.type == "Union":
+            item = definition.items[self.turn(type_path, len(definition.items))]
+            discriminator = definition.attributes.get("discriminator") or "type"
+            return {
+                discriminator: item.name,
+                **self.make_fields(item.fields, depth + 1),
+            }
+        item = definition.items[self.turn(type_path, len(definition.items))]
+        value = self.make(item.item_type, depth)
+        if "discriminator" in definition.attributes and "mapping" in item.attributes:
+            value[definition.attributes["discriminator"]] = item.attributes["mapping"]
+        return value
+
+    def make_fields(self, fields: list, depth: int) -> Dict[str, Any]:
+        return {
+            field.name: self.make(field.field_type, depth)
+            for field in fields
+            if not field.optional or depth < MAX_DEPTH
+        }
+
+    def turn(self, type_path: str, count: int) -> int:
+        turn = self.turns.get(type_path, 0)
+        self.turns[type_path] = turn + 1
+        return turn % count
+
+
+_REFLECTIVE_PRIMITIVES: Dict[str, Callable[[Any], Any]] = {
+    "int32": int,
+    "int64": int,
+    "integer": int,
+    "float64": float,
+}
+
+
+class ReflectiveDecoder:
+    """
+    Decodes into the generated classes by walking the IR for every value.
+    """
+
+    def __init__(self, bdl_ir: ir.BdlIr):
+        self.defs = bdl_ir.defs
+
+    def get_class(self, def_path: str) -> Any:
+        module_path, name = def_path.rsplit(".", 1)
+        return getattr(sys.modules[module_path], name)
+
+    def decode(self, type: ir.Type, value: Any) -> Any:
+        if type.type == "Array":
+            return [self.decode_plain(type.value_type_path, item) for item in value]
+        if type.type == "Dictionary":
+            return {
+                key: self.decode_plain(type.value_type_path, item)
+                for key, item in value.items()
+            }
+        return self.decode_plain(type.value_type_path, value)
+
+    def decode_plain(self, type_path: str, value: Any) -> Any:
+        definition = self.defs.get(type_path)
+        if definition is None:
+            convert = _REFLECTIVE_PRIMITIVES.get(type_path)
+            return value if convert is None else convert(value)
+        if definition.type == "Custom":
+            return self.decode(definition.original_type, value)
+        if definition.type == "Enum":
+            return self.get_class(type_path)(value)
+        if definition.type == "Struct":
+            return self.decode_fields(self.get_class(type_path), definition, value)
+        if definition.type == "Union":
+            discriminator = definition.attributes.get("discriminator") or "type"
+            for item in definition.items:
+                if item.name == value[discriminator]:
+                    item_class = self.get_class(f"{type_path}_{item.name}")
+                    return self.decode_fields(item_class, item, value)
+            raise ValueError(value[discriminator])
+        discriminator = definition.attributes["discriminator"]
+        for item in definition.items:
+            if item.attributes["mapping"] == value[discriminator]:
+                return self.decode(item.item_type, value)
+        raise ValueError(value[discriminator])
+
+    def decode_fields(self, cls: Any, definition: Any, value: Any) -> Any:
+        kwargs = {}
+        for field in definition.fields:
+            if field.name in value:
+                item = value[field.name]
+                if item is not None:
+                    item = self.decode(field.field_type, item)
+                kwargs[field.name] = item
+        return cls(**kwargs)
+
+    def encode(self, type: ir.Type, value: Any) -> Any:
+        if type.type == "Array":
+            return [self.encode_plain(type.value_type_path, item) for item in value]
+        if type.type == "Dictionary":
+            return {
+                key: self.encode_plain(type.value_type_path, item)
+                for key, item in value.items()
+            }
+        return self.encode_plain(type.value_type_path, value)
+
+    def encode_plain(self, type_path: str, value: Any) -> Any:
+        definition = self.defs.get(type_path)
+        if definition is None or definition.type == "Enum":
+            return value
+        if definition.type == "Custom":
+            return self.encode(definition.original_type, value)
+        if definition.type == "Struct":
+            return self.encode_fields(definition, value, {})
+        if definition.type == "Union":
+            discriminator = definition.attributes.get("discriminator") or "type"
+            item_name = getattr(value, discriminator)
+            for item in definition.items:
+                if item.name == item_name:
+                    return self.encode_fields(item, value, {discriminator: item_name})
+        for item in definition.items:
+            if type(value) is self.get_class(item.item_type.value_type_path):
+                return self.encode(item.item_type, value)
+        raise TypeError(value)
+
+    def encode_fields(self, definition: Any, value: Any, result: Dict) -> Any:
+        for field in definition.fields:
+            item = getattr(value, field.name)
+            if item is not None:
+                result[field.name] = self.encode(field.field_type, item)
+        return result
+
+
+def main() -> None:
+    config_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CONFIG_PATH
+    def_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_DEF_PATH
+    bdl_ir = build_ir(config_path, omit_file_url=True).ir
+    generate_s = best_of(lambda: generate_python(bdl_ir), 3)
+    files = generate_python(bdl_ir).files
+
+    directory = tempfile.TemporaryDirectory()
+    for file_path, code in files.items():
+        path = os.path.join(directory.name, file_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(code)
+    sys.path.insert(0, directory.name)
+    module_path, name = def_path.rsplit(".", 1)
+    model = getattr(importlib.import_module(module_path), name)
+
+    target = ir.Plain(value_type_path=def_path)
+    payload = SampleMaker(bdl_ir).make(target, 0)
+    payload_text = json.dumps(payload)
+    reflective = ReflectiveDecoder(bdl_ir)
+    decoded = model.from_json(payload)
+    assert decoded == reflective.decode(target, payload)
+    assert decoded.to_json() == reflective.encode(target, decoded) == payload
+
+    print(
+        f"python models {len(files)} modules, {sum(map(len, files.values())):,} "
+        f"bytes of code in {generate_s * 1000:.0f}ms"
+    )
+    print(f"  {def_path}, {len(payload_text):,} bytes of JSON, x{ROUNDS}")
+    timings = {
+        "json.loads": lambda: json.loads(payload_text),
+        "decode generated": lambda: model.from_json(payload),
+        "decode reflective": lambda: reflective.decode(target, payload),
+        "encode generated": lambda: decoded.to_json(),
+        "encode reflective": lambda: reflective.encode(target, decoded),
+    }
+    for timing_name, fn in timings.items():
+
+        def run(fn=fn) -> None:
+            for _ in range(ROUNDS):
+                fn()
+
+        print(f"  {timing_name:<18} {best_of(run) * 1000:8.2f}ms")
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Parser benchmark suite with a regression gate.
+
+Run from `bdl-py`:
+
+    python -m bench.suite                          # measure and print
+    python -m bench.suite --save baseline.json     # also record a baseline
+    python -m bench.suite --baseline baseline.json # fail on regressions
+
+Cases are every schema under `example-schemas/` (parsed file by file and
+reported as one case) and synthetic schemas of structs, unions and
+attributes scaled to 10k, 100k and 1M lines. Each case reports throughput
+(MB/s of UTF-8 source, statements/s), peak traced memory and the number of
+memory blocks the resulting ASTs keep alive.
+
+Baselines only make sense on the machine that recorded them. With
+`--baseline`, the exit status is 1 when any case's MB/s drops more than
+`--threshold` (default 15%) below the baseline.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from bdl.parser.bdl_parser import parse_bdl
+
+EXAMPLE_SCHEMAS_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "example-schemas"
+)
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_THRESHOLD = 0.15
+# Enough repetitions to time about this many bytes per case.
+TARGET_BYTES_PER_CASE = 4 * 1024 * 1024
+MAX_ROUNDS = 5
+
+
+@dataclass(slots=True)
+class Case:
+    name: str
+    texts: List[str]
+
+
+@dataclass(slots=True)
+class CaseResult:
+    name: str
+    files: int
+    bytes: int
+    lines: int
+    statements: int
+    seconds: float
+    mb_per_s: float
+    statements_per_s: float
+    peak_traced_bytes: int
+    retained_blocks: int
+
+
+def build_synthetic_schema(line_count: int) -> str:
+    parts = []
+    lines = 0
+    i = 0
+    while lines < line_count:
+        block = (
+            f"// generated block {i}\n"
+            f"@ description - A user record {i}\n"
+            f"struct User{i} {{\n"
+            f"  @ description - unique id\n"
+            f"  id: string,\n"
+            f"  name?: string,\n"
+            f"  tags: string[],\n"
+            f"  scores: int32[string],\n"
+            f"}}\n"
+            f"\n"
+            f"@ description\n"
+            f"| Events emitted for user {i}\n"
+            f"| across several lines.\n"
+            f"union Event{i} {{\n"
+            f"  @ description - created\n"
+            f"  Created(at: datetime, by?: User{i}),\n"
+            f"  Deleted,\n"
+            f"  Renamed(from: string, to: string),\n"
+            f"}}\n"
+            f"\n"
+        )
+        parts.append(block)
+        lines += block.count("\n")
+        i += 1
+    return "".join(parts)
+
+
+def gather_cases(sizes: List[int]) -> List[Case]:
+    example_texts = []
+    for root, directories, files in os.walk(EXAMPLE_SCHEMAS_DIRECTORY):
+        directories.sort()
+        for file_name in sorted(files):
+            if file_name.endswith(".bdl"):
+                with open(os.path.join(root, file_name), "r", encoding="utf-8") as f:
+                    example_texts.append(f.read())
+    cases = [Case(name="example-schemas", texts=example_texts)]
+    for size in sizes:
+        cases.append(
+            Case(name=f"synthetic-{size}", texts=[build_synthetic_schema(size)])
+        )
+    return cases
+
+
+def measure(case: Case) -> CaseResult:
+    total_bytes = sum(len(text.encode("utf-8")) for text in case.texts)
+    lines = sum(text.count("\n") + 1 for text in case.texts)
+    rounds = max(1, min(MAX_ROUNDS, TARGET_BYTES_PER_CASE // max(total_bytes, 1)))
+
+    statements = 0
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        statements = sum(len(parse_bdl(text).statements) for text in case.texts)
+        best = min(best, time.perf_counter() - start)
+
+    # Memory is measured in a separate pass; tracemalloc slows parsing down.
+    gc.collect()
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    asts = [parse_bdl(text) for text in case.texts]
+    retained_blocks = sys.getallocatedblocks() - blocks_before
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del asts
+
+    return CaseResult(
+        name=case.name,
+        files=len(case.texts),
+        bytes=total_bytes,
+        lines=lines,
+        statements=statements,
+        seconds=best,
+        mb_per_s=total_bytes / best / 1e6,
+        statements_per_s=statements / best,
+        peak_traced_bytes=peak,
+        retained_blocks=retained_blocks,
+    )
+
+
+def find_regressions(
+    results: List[CaseResult], baseline: Dict, threshold: float
+) -> List[str]:
+    baseline_cases = {case["name"]: case for case in baseline["cases"]}
+    regressions = []
+    for result in results:
+        previous = baseline_cases.get(result.name)
+        if previous is None:
+            continue
+        limit = previous["mb_per_s"] * (1 - threshold)
+        if result.mb_per_s < limit:
+            regressions.append(
+                f"{result.name}: {result.mb_per_s:.2f} MB/s, baseline "
+                f"{previous['mb_per_s']:.2f} MB/s (limit {limit:.2f})"
+            )
+    return regressions
+
+
+def print_result(result: CaseResult, baseline_case: Optional[Dict]) -> None:
+    change = ""
+    if baseline_case is not None:
+        change = f"  ({result.mb_per_s / baseline_case['mb_per_s'] - 1:+.1%})"
+    print(
+        f"parser/suite/{result.name:<18} {result.bytes / 1e6:8.2f}MB"
+        f" {result.lines:>9,} lines  {result.mb_per_s:6.2f}MB/s"
+        f" {result.statements_per_s:>9,.0f} stmt/s"
+        f"  peak {result.peak_traced_bytes / 1024 / 1024:8.1f}MiB"
+        f" {result.retained_blocks:>10,} blocks{change}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(prog="python -m bench.suite")
+    arg_parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=DEFAULT_SIZES,
+        help="comma-separated line counts of the synthetic schemas",
+    )
+    arg_parser.add_argument("--save", help="write the results to this JSON file")
+    arg_parser.add_argument("--baseline", help="compare against this JSON file")
+    arg_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = arg_parser.parse_args(argv)
+
+    baseline = None
+    baseline_cases = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        baseline_cases = {case["name"]: case for case in baseline["cases"]}
+
+    results = []
+    for case in gather_cases(args.sizes):
+        result = measure(case)
+        results.append(result)
+        print_result(result, baseline_cases.get(result.name))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "cases": [asdict(result) for result in results],
+                },
+                f,
+                indent=2,
+            )
+            f.write("\n")
+
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nthroughput regressed more than {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+Tree shaking the project IR for one standard.
+
+Run from `bdl-py` with `python -m bench.tree_shaking [bdl.yaml] [standard]`.
+Reports how many defs and modules survive, the best-of-5 time of shaking,
+and the binary encoding size and time of the IR before and after, as a
+stand-in for the downstream stages that get cheaper.
+"""
+
+import sys
+
+from bdl.io.binary import dump_bdl_ir
+from bdl.io.ir import build_ir
+from bdl.ir.tree_shaking import get_entry_proc_paths, shake_bdl_ir
+from bench._timing import best_of
+
+DEFAULT_CONFIG_PATH = "../bdl.yaml"
+DEFAULT_STANDARD = "portone-rest-api"
+
+
+def main() -> None:
+    config_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CONFIG_PATH
+    standard = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_STANDARD
+    full = build_ir(config_path, standard=standard, omit_file_url=True).ir
+    entry_paths = get_entry_proc_paths(full, standard)
+    shaken = shake_bdl_ir(full, entry_paths)
+
+    print(f"ir/tree-shaking {standard}, {len(entry_paths)} entry procs")
+    shake_s = best_of(lambda: shake_bdl_ir(full, entry_paths))
+    print(f"  shake {shake_s * 1000:8.2f}ms")
+    for name, bdl_ir in (("full", full), ("shaken", shaken)):
+        size = len(dump_bdl_ir(bdl_ir))
+        dump_s = best_of(lambda: dump_bdl_ir(bdl_ir))
+        print(
+            f"  {name:<7} {len(bdl_ir.defs):>6,} defs {len(bdl_ir.modules):>4} modules"
+            f"  binary {size / 1024:8.1f}KiB in {dump_s * 1000:7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+`bdl.validator` against a validator that walks the IR.
+
+Run from `bdl-py` with `python -m bench.validator [bdl.yaml] [def path]`.
+Builds `DEFAULT_COUNT` records of the def, rotating through oneof and union
+variants, and a copy of them with one field of every tenth record broken,
+then times validating each batch:
+
+- `validate_many` and `validate` per record use the compiled checks.
+- `interpreted` looks each def up in the IR and switches on its kind for
+  every value, the way `bdl-ts/runtime/src/json-validator.ts` does.
+
+All three are checked to find the same invalid records before timing.
+"""
+
+import copy
+import json
+import sys
+from typing import Any, List, Optional
+
+from bdl.io.ir import build_ir
+from bdl.ir import model as ir
+from bdl.validator import JsonValidator
+from bench._timing import best_of
+from bench.python_models import SampleMaker
+
+DEFAULT_CONFIG_PATH = "../example-schemas/portone/bdl.yaml"
+DEFAULT_DEF_PATH = "portone.v2.api.data.Payment"
+DEFAULT_COUNT = 10_000
+
+
+_INTERPRETED_PRIMITIVES = {
+    "boolean": lambda value: type(value) is bool,
+    "string": lambda value: type(value) is str,
+    "object": lambda value: type(value) is dict,
+    "int32": lambda value: type(value) is int,
+    "int64": lambda value: type(value) is int or type(value) is str,
+    "integer": lambda value: type(value) is int or type(value) is str,
+    "float64": lambda value: type(value) in (int, float),
+}
+
+
+class InterpretedValidator:
+    """
+    Validity of a value, found by walking the IR for every value.
+    """
+
+    def __init__(self, bdl_ir: ir.BdlIr):
+        self.defs = bdl_ir.defs
+
+    def validate(self, type: ir.Type, value: Any) -> bool:
+        if type.type == "Array":
+            return isinstance(value, list) and all(
+                self.validate_plain(type.value_type_path, item) for item in value
+            )
+        if type.type == "Dictionary":
+            return isinstance(value, dict) and all(
+                self.validate_plain(type.value_type_path, item)
+                for item in value.values()
+            )
+        return self.validate_plain(type.value_type_path, value)
+
+    def validate_plain(self, type_path: str, value: Any) -> bool:
+        definition = self.defs.get(type_path)
+        if definition is None:
+            check = _INTERPRETED_PRIMITIVES.get(type_path)
+            return check is None or check(value)
+        if definition.type == "Custom":
+            return self.validate(definition.original_type, value)
+        if definition.type == "Enum":
+            return any(
+                (item.attributes.get("value") or item.name) == value
+                for item in definition.items
+            )
+        if not isinstance(value, dict):
+            return False
+        if definition.type == "Struct":
+            return self.validate_fields(definition.fields, value)
+        if definition.type == "Union":
+            discriminator = definition.attributes.get("discriminator") or "type"
+            for item in definition.items:
+                if item.name == value.get(discriminator):
+                    return self.validate_fields(item.fields, value)
+            return False
+        discriminator = definition.attributes["discriminator"]
+        for item in definition.items:
+            if item.attributes["mapping"] == value.get(discriminator):
+                return self.validate(item.item_type, value)
+        return False
+
+    def validate_fields(self, fields: List[ir.StructField], value: Any) -> bool:
+        for field in fields:
+            item = value.get(field.name)
+            if item is None:
+                if not field.optional:
+                    return False
+            elif not self.validate(field.field_type, item):
+                return False
+        return True
+
+
+def break_records(records: List[Any]) -> List[Any]:
+    """
+    Copies of `records` with the first field of every tenth one set to a
+    value of no conventional type.
+    """
+    broken = copy.deepcopy(records)
+    for record in broken[::10]:
+        record[next(iter(record))] = [None]
+    return broken
+
+
+def invalid_indexes(results: List[Optional[Any]]) -> List[int]:
+    return [index for index, result in enumerate(results) if result is not None]
+
+
+def main() -> None:
+    config_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CONFIG_PATH
+    def_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_DEF_PATH
+    bdl_ir = build_ir(config_path, omit_file_url=True).ir
+    target = ir.Plain(value_type_path=def_path)
+    maker = SampleMaker(bdl_ir)
+    records = json.loads(
+        json.dumps([maker.make(target, 0) for _ in range(DEFAULT_COUNT)])
+    )
+    megabytes = len(json.dumps(records)) / 1_000_000
+    validator = JsonValidator(bdl_ir)
+    interpreted = InterpretedValidator(bdl_ir)
+
+    compile_s = best_of(lambda: JsonValidator(bdl_ir).get_check(def_path))
+    print(
+        f"validator {def_path}, {DEFAULT_COUNT:,} records, {megabytes:.1f}MB "
+        f"of JSON, compiled in {compile_s * 1000:.1f}ms"
+    )
+    for batch_name, batch in [("valid", records), ("broken", break_records(records))]:
+        expected = invalid_indexes(validator.validate_many(def_path, batch))
+        assert expected == invalid_indexes(
+            [validator.validate(def_path, record) for record in batch]
+        )
+        assert expected == [
+            index
+            for index, record in enumerate(batch)
+            if not interpreted.validate(target, record)
+        ]
+        print(f"  {batch_name}, {len(expected):,} invalid")
+        timings = {
+            "validate_many": lambda: validator.validate_many(def_path, batch),
+            "validate": lambda: [
+                validator.validate(def_path, record) for record in batch
+            ],
+            "interpreted": lambda: [
+                interpreted.validate(target, record) for record in batch
+            ],
+        }
+        for timing_name, fn in timings.items():
+            seconds = best_of(fn)
+            print(
+                f"    {timing_name:<14} {seconds * 1000:8.2f}ms "
+                f"{len(batch) / seconds:>10,.0f} records/s "
+                f"{megabytes / seconds:7.1f}MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
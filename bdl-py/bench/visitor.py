@@ -0,0 +1,97 @@
+"""
+`bdl.ast.visitor` against the loops it replaces.
+
+Run from `bdl-py` with `python -m bench.visitor [path/to/schema.bdl]`.
+Counts struct fields, the fields of union items included, with a
+hand-written loop over the AST and with a visitor, then visits every node,
+spans included, with a visitor and with `iter_nodes`. The schema is
+repeated `DEFAULT_REPEAT` times into one file so the walk is long enough
+to time; the AST is parsed once, outside the timings.
+"""
+
+import sys
+from typing import Any
+
+from bdl.ast.visitor import Visitor, iter_nodes, walk
+from bdl.parser.bdl_parser import BdlAst, parse_bdl
+from bench._timing import best_of
+
+DEFAULT_PATH = "../example-schemas/portone/generated/v2/api/data.bdl"
+DEFAULT_REPEAT = 10
+
+
+def count_fields_by_hand(bdl_ast: BdlAst) -> int:
+    count = 0
+    for statement in bdl_ast.statements:
+        if statement.type == "Struct":
+            for _ in statement.fields:
+                count += 1
+        elif statement.type == "Union":
+            for item in statement.items:
+                if item.struct is not None:
+                    for _ in item.struct.fields:
+                        count += 1
+    return count
+
+
+class FieldCounter(Visitor):
+    def __init__(self):
+        self.count = 0
+
+    def visit_struct_field(self, node: Any) -> None:
+        self.count += 1
+
+
+class NodeCounter(Visitor):
+    def __init__(self):
+        self.count = 0
+
+    def visit_node(self, node: Any) -> None:
+        self.count += 1
+
+    visit_bdl_ast = visit_attribute = visit_import = visit_import_item = visit_node
+    visit_custom = visit_enum = visit_enum_item = visit_oneof = visit_node
+    visit_oneof_item = visit_proc = visit_struct = visit_struct_field = visit_node
+    visit_union = visit_union_item = visit_type_expression = visit_node
+    visit_container = visit_span = visit_node
+
+
+def count_fields_by_visitor(bdl_ast: BdlAst) -> int:
+    counter = FieldCounter()
+    walk(bdl_ast, counter)
+    return counter.count
+
+
+def count_nodes_by_visitor(bdl_ast: BdlAst) -> int:
+    counter = NodeCounter()
+    walk(bdl_ast, counter)
+    return counter.count
+
+
+def count_nodes_by_iter(bdl_ast: BdlAst) -> int:
+    return sum(1 for _ in iter_nodes(bdl_ast))
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    bdl_ast = parse_bdl(text * DEFAULT_REPEAT)
+    fields = count_fields_by_hand(bdl_ast)
+    nodes = count_nodes_by_iter(bdl_ast)
+    assert count_fields_by_visitor(bdl_ast) == fields
+    assert count_nodes_by_visitor(bdl_ast) == nodes
+
+    print(f"visitor {path} x{DEFAULT_REPEAT}, {fields:,} fields, {nodes:,} nodes")
+    timings = {
+        "fields by hand": lambda: count_fields_by_hand(bdl_ast),
+        "fields by visitor": lambda: count_fields_by_visitor(bdl_ast),
+        "nodes by visitor": lambda: count_nodes_by_visitor(bdl_ast),
+        "nodes by iter": lambda: count_nodes_by_iter(bdl_ast),
+    }
+    for name, fn in timings.items():
+        print(f"  {name:<18} {best_of(fn) * 1000:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
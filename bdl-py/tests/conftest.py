@@ -0,0 +1,33 @@
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from bdl.io.ir import build_ir
+from bdl.ir import model as ir
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+EXAMPLE_SCHEMAS = REPO_ROOT / "example-schemas"
+PORTONE_CONFIG = EXAMPLE_SCHEMAS / "portone" / "bdl.yaml"
+PETSTORE_CONFIG = EXAMPLE_SCHEMAS / "swagger-petstore" / "bdl.yaml"
+
+
+@pytest.fixture(scope="session")
+def example_texts() -> Dict[str, str]:
+    """
+    Every `.bdl` file under `example-schemas`, by path relative to it.
+    """
+    return {
+        str(path.relative_to(EXAMPLE_SCHEMAS)): path.read_text(encoding="utf-8")
+        for path in sorted(EXAMPLE_SCHEMAS.rglob("*.bdl"))
+    }
+
+
+@pytest.fixture(scope="session")
+def portone_ir() -> ir.BdlIr:
+    return build_ir(str(PORTONE_CONFIG), omit_file_url=True).ir
+
+
+@pytest.fixture(scope="session")
+def petstore_ir() -> ir.BdlIr:
+    return build_ir(str(PETSTORE_CONFIG), omit_file_url=True).ir
@@ -0,0 +1,80 @@
+import pytest
+
+from bdl.io.binary import (
+    BinaryFormatError,
+    dump_bdl_ast,
+    dump_bdl_ir,
+    load_bdl_ast,
+    load_bdl_ir,
+    open_bdl_ast,
+    open_bdl_ir,
+)
+from bdl.parser.bdl_parser import BdlAst, parse_bdl
+
+
+def test_ast_round_trip(example_texts):
+    for path, text in example_texts.items():
+        bdl_ast = parse_bdl(text)
+        data = dump_bdl_ast(bdl_ast)
+        assert load_bdl_ast(data) == bdl_ast, path
+        lazy = open_bdl_ast(data)
+        assert list(lazy.statements) == bdl_ast.statements, path
+        assert lazy.to_ast() == bdl_ast, path
+
+
+@pytest.mark.parametrize("ir_fixture", ["portone_ir", "petstore_ir"])
+def test_ir_round_trip(request, ir_fixture):
+    bdl_ir = request.getfixturevalue(ir_fixture)
+    data = dump_bdl_ir(bdl_ir)
+    assert load_bdl_ir(data) == bdl_ir
+    assert open_bdl_ir(data).to_ir() == bdl_ir
+
+
+def test_open_bdl_ir_decodes_single_defs(portone_ir):
+    lazy = open_bdl_ir(dump_bdl_ir(portone_ir))
+    assert list(lazy.defs) == list(portone_ir.defs)
+    assert dict(lazy.modules) == portone_ir.modules
+    # Reversed, so no def is decoded as a side effect of an earlier one.
+    for def_path in reversed(list(portone_ir.defs)):
+        assert lazy.defs[def_path] == portone_ir.defs[def_path]
+    assert lazy.defs[def_path] is lazy.defs[def_path]
+
+
+def test_truncated_data(portone_ir):
+    data = dump_bdl_ir(portone_ir)
+    for size in [0, 3, 8, 20, *range(100, len(data), len(data) // 97)]:
+        with pytest.raises(BinaryFormatError):
+            load_bdl_ir(data[:size])
+        with pytest.raises(BinaryFormatError):
+            open_bdl_ir(data[:size])
+    with pytest.raises(BinaryFormatError, match="Trailing data"):
+        load_bdl_ir(data + b"\0")
+    with pytest.raises(BinaryFormatError, match="Trailing data"):
+        open_bdl_ir(data + b"\0")
+
+
+def test_corrupt_data(petstore_ir):
+    data = dump_bdl_ir(petstore_ir)
+    with pytest.raises(BinaryFormatError, match="Not a serialized BDL file"):
+        load_bdl_ir(b"XXXX" + data[4:])
+    with pytest.raises(BinaryFormatError, match="Unsupported version"):
+        load_bdl_ir(data[:4] + b"\xff" + data[5:])
+    with pytest.raises(BinaryFormatError, match="Expected a serialized BdlAst"):
+        load_bdl_ast(data)
+    with pytest.raises(BinaryFormatError, match="Expected a serialized BdlAst"):
+        open_bdl_ast(data)
+
+
+def test_unknown_tag():
+    data = dump_bdl_ast(BdlAst(attributes=[], statements=[]))
+    # Ends with the tag and length of the empty statement list.
+    assert data.endswith(b"\x06\x00")
+    garbled = data[:-2] + b"\xff\x00"
+    with pytest.raises(BinaryFormatError, match="Unknown tag 255"):
+        load_bdl_ast(garbled)
+    with pytest.raises(BinaryFormatError, match="Unknown tag 255"):
+        open_bdl_ast(garbled)
+
+
+def test_corrupt_data_is_a_value_error():
+    assert issubclass(BinaryFormatError, ValueError)
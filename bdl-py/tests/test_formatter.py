@@ -0,0 +1,1949 @@
+import re
+
+import pytest
+
+from bdl.formatter import FormatConfig, format_bdl
+from bdl.parser.parser import SyntaxError
+from conftest import REPO_ROOT
+
+# Cases of `bdl-ts/src/formatter/bdl/bdl.test.ts`, in its order.
+
+FIXTURES = REPO_ROOT / "bdl-ts" / "src" / "formatter" / "bdl" / "fixtures"
+
+_INDENT_PATTERN = re.compile(r"^\s*")
+
+
+def format_for_test(text: str, **config) -> str:
+    return format_bdl(
+        normalize_fixture_text(text), FormatConfig(final_newline=False, **config)
+    )
+
+
+def normalize_fixture_text(text: str) -> str:
+    """
+    `text` with the indentation of its lines removed, like a dedent that
+    also works when the first line was already stripped.
+    """
+    normalized = text.replace("\r\n", "\n")
+    lines = normalized.split("\n")
+
+    def get_indent(lines):
+        return min(
+            (
+                len(_INDENT_PATTERN.match(line).group())
+                for line in lines
+                if line.strip()
+            ),
+            default=0,
+        )
+
+    indent = get_indent(lines)
+    strip_from_second_line = False
+    if indent == 0:
+        indent = get_indent(lines[1:])
+        strip_from_second_line = indent > 0
+    if indent == 0:
+        return normalized
+    return "\n".join(
+        line if strip_from_second_line and index == 0 else line[indent:]
+        for index, line in enumerate(lines)
+    )
+
+
+def assert_line_width_boundary(
+    source: str, expected_oneline: str, expected_multiline: str
+) -> None:
+    boundary_width = len(expected_oneline)
+    assert format_for_test(source, line_width=boundary_width) == expected_oneline
+    assert format_for_test(source, line_width=boundary_width - 1) == expected_multiline
+
+
+def assert_fixture(fixture_name: str, **config) -> None:
+    text = (FIXTURES / f"{fixture_name}.input.bdl").read_text(encoding="utf-8")
+    expected = (FIXTURES / f"{fixture_name}.expected.bdl").read_text(encoding="utf-8")
+    expected = expected.replace("\r\n", "\n").rstrip()
+    config = FormatConfig(final_newline=False, **config)
+    assert format_bdl(text, config) == expected
+
+
+STATEMENT_COVERAGE_MATRIX = {
+    "Attribute": ["basic", "comment", "multiline-content"],
+    "Import": ["basic", "comment", "alias+comma"],
+    "Struct": ["basic", "comment", "attribute-mix"],
+    "Oneof": ["basic", "comment", "lineWidth-boundary"],
+    "Enum": ["basic", "comment", "attribute-mix"],
+    "Proc": ["basic", "comment", "line-wrap"],
+    "Custom": ["basic", "comment", "container-type"],
+    "Union": ["basic", "comment", "inline-struct"],
+}
+
+
+def test_coverage_module_level_statement_matrix_is_complete():
+    assert sorted(STATEMENT_COVERAGE_MATRIX) == [
+        "Attribute",
+        "Custom",
+        "Enum",
+        "Import",
+        "Oneof",
+        "Proc",
+        "Struct",
+        "Union",
+    ]
+    assert all(len(cases) >= 3 for cases in STATEMENT_COVERAGE_MATRIX.values())
+
+
+def test_statement_import_aliases_comments_width_and_trailing_comment_rules():
+    assert (
+        format_for_test(
+            """
+    import
+    // comment
+    aa
+    // comment1
+    .
+    // comment2
+    bb.cc
+    { Bar
+    // are
+    ,
+    // here
+    // comes
+     Baz,   // hh
+
+     // b
+
+     // c
+
+     Baa,
+     // Boo
+     Baa, // hi
+     // Boo
+     Boo,
+     A, B, C
+    }
+""".strip()
+        )
+        == """
+// comment
+// comment1
+// comment2
+import aa.bb.cc {
+  Bar, // are
+  // here
+  // comes
+  Baz, // hh
+
+  // b
+
+  // c
+
+  Baa,
+  // Boo
+  Baa, // hi
+  // Boo
+  Boo,
+  A,
+  B,
+  C,
+}
+""".strip()
+    )
+    assert format_for_test("import aa.bb { A,\n}") == "import aa.bb { A }"
+    assert format_for_test("import pkg.mod { A,\nB }") == "import pkg.mod { A, B }"
+    assert format_for_test(
+        "import very.long.namespace.path "
+        "{ AlphaIdentifier, BetaIdentifier, GammaIdentifier }",
+        line_width=40,
+    ) == "\n".join(
+        [
+            "import very.long.namespace.path {",
+            "  AlphaIdentifier,",
+            "  BetaIdentifier,",
+            "  GammaIdentifier,",
+            "}",
+        ]
+    )
+    assert format_for_test(
+        """import pkg.mod { A, // keep this inline comment
+B, }""",
+        line_width=12,
+    ) == "\n".join(
+        [
+            "import pkg.mod {",
+            "  A, // keep this inline comment",
+            "  B,",
+            "}",
+        ]
+    )
+
+
+def test_statement_attribute_line_and_multiline_content_formatting():
+    assert format_for_test(
+        """
+    #
+    // hi
+    standard - hi
+    @ http - GET // not a comment
+    @ security // a comment
+    | hello
+    | bye
+    @ security
+    // a comment
+    | hello
+    | bye
+""".strip()
+    ) == "\n".join(
+        [
+            "// hi",
+            "# standard - hi",
+            "@ http - GET // not a comment",
+            "// a comment",
+            "@ security",
+            "| hello",
+            "| bye",
+            "// a comment",
+            "@ security",
+            "| hello",
+            "| bye",
+        ]
+    )
+
+
+def test_statement_struct_fields_attributes_comments_and_width_transitions():
+    assert (
+        format_for_test(
+            """
+    struct
+    // c1
+    Name
+    // c2
+
+    {
+      @ a - b
+      // hi
+      @ c - d
+      // c1
+      f1
+      // c2
+      :
+      // c3
+      string
+      // c4
+      , // c5
+
+
+      f2?: string, f3: string // keyType
+      [number],
+
+      f4: string, f5: number,
+
+
+      f6: string,
+    }
+""".strip()
+        )
+        == """
+// c1
+// c2
+struct Name {
+  @ a - b
+  // hi
+  @ c - d
+  // c1
+  // c2
+  // c3
+  // c4
+  f1: string, // c5
+
+  f2?: string,
+  // keyType
+  f3: string[number],
+
+  f4: string,
+  f5: number,
+
+  f6: string,
+}
+""".strip()
+    )
+    assert (
+        format_for_test("struct User { id: string,\n}") == "struct User { id: string }"
+    )
+    assert (
+        format_for_test("struct User { id: string,\nname: string }")
+        == "struct User { id: string, name: string }"
+    )
+    assert format_for_test("struct // note\nUser { id: string, }") == "\n".join(
+        [
+            "// note",
+            "struct User { id: string }",
+        ]
+    )
+    assert format_for_test(
+        "struct User { veryLongFieldName: string, anotherVeryLongFieldName: string }",
+        line_width=45,
+    ) == "\n".join(
+        [
+            "struct User {",
+            "  veryLongFieldName: string,",
+            "  anotherVeryLongFieldName: string,",
+            "}",
+        ]
+    )
+    assert format_for_test(
+        """struct User { id: string, // keep this inline comment
+name: string, }""",
+        line_width=16,
+    ) == "\n".join(
+        [
+            "struct User {",
+            "  id: string, // keep this inline comment",
+            "  name: string,",
+            "}",
+        ]
+    )
+
+
+def test_statement_oneof_item_layout_and_width_transitions():
+    assert (
+        format_for_test(
+            """
+    oneof
+    // c1
+    SomeOneof
+    // c2
+    {
+    // c3
+      @ attribute - x
+      // c4
+      Foo,
+
+      // c5
+      Bar,
+      // c6
+
+      A, B, C
+    }
+""".strip()
+        )
+        == """
+// c1
+// c2
+oneof SomeOneof {
+  // c3
+  @ attribute - x
+  // c4
+  Foo,
+
+  // c5
+  Bar,
+  // c6
+
+  A,
+  B,
+  C,
+}
+""".strip()
+    )
+    assert (
+        format_for_test(
+            """
+    oneof
+    // c1
+    SomeOneof
+    // c2
+    {
+      Foo, Bar,
+
+      Baz
+    }
+""".strip()
+        )
+        == """
+// c1
+// c2
+oneof SomeOneof {
+  Foo,
+  Bar,
+
+  Baz,
+}
+""".strip()
+    )
+    assert format_for_test(
+        "oneof SomeOneof { Foo, Bar, Baz }", line_width=20
+    ) == "\n".join(
+        [
+            "oneof SomeOneof {",
+            "  Foo,",
+            "  Bar,",
+            "  Baz,",
+            "}",
+        ]
+    )
+    assert format_for_test("oneof Foo { Bar\n}") == "oneof Foo { Bar }"
+    assert format_for_test(
+        """oneof Kind { A, // keep this inline comment
+B, }""",
+        line_width=12,
+    ) == "\n".join(
+        [
+            "oneof Kind {",
+            "  A, // keep this inline comment",
+            "  B,",
+            "}",
+        ]
+    )
+
+
+def test_statement_enum_item_layout_and_width_transitions():
+    assert (
+        format_for_test(
+            """
+    enum
+    // c1
+    SomeEnum
+    // c2
+    {
+    // c3
+      @ attribute - x
+      // c4
+      Foo,
+
+      // c5
+      Bar,
+      // c6
+
+      A, B, C
+    }
+""".strip()
+        )
+        == """
+// c1
+// c2
+enum SomeEnum {
+  // c3
+  @ attribute - x
+  // c4
+  Foo,
+
+  // c5
+  Bar,
+  // c6
+
+  A,
+  B,
+  C,
+}
+""".strip()
+    )
+    assert format_for_test("enum E { A,\n}") == "enum E { A }"
+    assert (
+        format_for_test("enum Status { Ready,\nDone }") == "enum Status { Ready, Done }"
+    )
+    assert format_for_test("enum // note\nStatus { Ready, }") == "\n".join(
+        [
+            "// note",
+            "enum Status { Ready }",
+        ]
+    )
+    assert format_for_test(
+        "enum Status { ReallyLongValueOne, ReallyLongValueTwo, ReallyLongValueThree }",
+        line_width=38,
+    ) == "\n".join(
+        [
+            "enum Status {",
+            "  ReallyLongValueOne,",
+            "  ReallyLongValueTwo,",
+            "  ReallyLongValueThree,",
+            "}",
+        ]
+    )
+    assert format_for_test(
+        """enum Status { Ready, // keep this inline comment
+Done, }""",
+        line_width=14,
+    ) == "\n".join(
+        [
+            "enum Status {",
+            "  Ready, // keep this inline comment",
+            "  Done,",
+            "}",
+        ]
+    )
+
+
+def test_statement_proc_wrapping_strategy_and_trailing_comment_behavior():
+    assert (
+        format_for_test(
+            """
+    proc  MyProcedure
+    =
+    RequestType
+    ->
+    ResponseType
+""".strip()
+        )
+        == """
+proc MyProcedure = RequestType -> ResponseType
+""".strip()
+    )
+    assert (
+        format_for_test(
+            """
+    proc   MyProcedureWithError = RequestType
+    -> ResponseType
+    throws
+    MyError
+""".strip()
+        )
+        == """
+proc MyProcedureWithError = RequestType -> ResponseType throws MyError
+""".strip()
+    )
+    assert format_for_test(
+        "proc ExtremelyLongProcedureName = ExtremelyLongRequestType -> "
+        "ExtremelyLongResponseType throws ExtremelyLongErrorType",
+        line_width=80,
+    ) == "\n".join(
+        [
+            "proc ExtremelyLongProcedureName =",
+            "  ExtremelyLongRequestType -> ExtremelyLongResponseType",
+            "  throws ExtremelyLongErrorType",
+        ]
+    )
+    assert format_for_test(
+        "proc ExtremelyLongProcedureName = ExtremelyLongRequestType -> "
+        "ExtremelyLongResponseTypeThatKeepsGoing "
+        "throws ExtremelyLongErrorTypeThatKeepsGoing",
+        line_width=60,
+    ) == "\n".join(
+        [
+            "proc ExtremelyLongProcedureName =",
+            "  ExtremelyLongRequestType ->",
+            "  ExtremelyLongResponseTypeThatKeepsGoing",
+            "  throws ExtremelyLongErrorTypeThatKeepsGoing",
+        ]
+    )
+    assert format_for_test(
+        "proc MyProc = // this is a very very very very very very very very long "
+        "comment\nInput -> Output throws Error",
+        line_width=40,
+    ) == "\n".join(
+        [
+            "proc MyProc =",
+            "  // this is a very very very very very very very very long comment",
+            "  Input -> Output throws Error",
+        ]
+    )
+    assert format_for_test(
+        "proc MyProc = Input -> Output // keep as standalone\nthrows Error",
+        line_width=120,
+    ) == "\n".join(
+        [
+            "proc MyProc = Input -> Output",
+            "  // keep as standalone",
+            "  throws Error",
+        ]
+    )
+    assert format_for_test("proc A = In -> Out // note") == "proc A = In -> Out // note"
+    assert format_for_test(
+        "proc ExtremelyLongProcedureName = ExtremelyLongRequestType -> "
+        "ExtremelyLongResponseType // keep",
+        line_width=30,
+    ) == "\n".join(
+        [
+            "// keep",
+            "proc ExtremelyLongProcedureName =",
+            "  ExtremelyLongRequestType ->",
+            "  ExtremelyLongResponseType",
+        ]
+    )
+    assert (
+        format_for_test(
+            "proc A = In -> Out // this comment is intentionally long", line_width=18
+        )
+        == "proc A = In -> Out // this comment is intentionally long"
+    )
+    assert format_for_test("proc A = In -> Out // note\noneof X { Y }") == "\n".join(
+        [
+            "proc A = In -> Out // note",
+            "oneof X { Y }",
+        ]
+    )
+
+
+def test_statement_custom_wrapping_strategy_and_trailing_comment_behavior():
+    assert (
+        format_for_test(
+            """
+    custom   Amount
+    =
+    int64[string]
+""".strip()
+        )
+        == """
+custom Amount = int64[string]
+""".strip()
+    )
+    assert (
+        format_for_test("custom Amount = int64 // cmt")
+        == "custom Amount = int64 // cmt"
+    )
+    assert format_for_test(
+        "custom VeryLongCustomTypeName = VeryLongOriginalTypeName // keep",
+        line_width=20,
+    ) == "\n".join(
+        [
+            "// keep",
+            "custom VeryLongCustomTypeName =",
+            "  VeryLongOriginalTypeName",
+        ]
+    )
+    assert format_for_test(
+        "custom VeryLongCustomTypeName = VeryLongOriginalTypeName", line_width=20
+    ) == "\n".join(
+        [
+            "custom VeryLongCustomTypeName =",
+            "  VeryLongOriginalTypeName",
+        ]
+    )
+    assert (
+        format_for_test(
+            "custom A = string // this comment is intentionally long", line_width=17
+        )
+        == "custom A = string // this comment is intentionally long"
+    )
+    assert format_for_test("custom Amount = int64 // cmt\noneof X { Y }") == "\n".join(
+        [
+            "custom Amount = int64 // cmt",
+            "oneof X { Y }",
+        ]
+    )
+
+
+def test_statement_proc_custom_keyword_name_comments_move_above_declarations():
+    assert format_for_test("""proc // note
+Get = In -> Out""") == "\n".join(
+        [
+            "// note",
+            "proc Get = In -> Out",
+        ]
+    )
+    assert format_for_test("""custom // note
+Amount = int64""") == "\n".join(
+        [
+            "// note",
+            "custom Amount = int64",
+        ]
+    )
+
+
+def test_oneline_keeps_compact_rendering_for_import_custom_struct_type_forms():
+    assert (
+        format_for_test("import pkg.mod { A as Alias, }")
+        == "import pkg.mod { A as Alias }"
+    )
+    assert (
+        format_for_test("custom Amount = int64[string]")
+        == "custom Amount = int64[string]"
+    )
+    assert (
+        format_for_test("struct User { id?: string[number], }")
+        == "struct User { id?: string[number] }"
+    )
+
+
+def test_statement_union_nested_struct_formatting_and_width_transitions():
+    assert (
+        format_for_test(
+            """
+    union
+    Result
+    {
+    Ok(
+    code
+    :
+    string
+    ,
+    value:number,
+    ),
+    Err
+    }
+""".strip()
+        )
+        == """
+union Result {
+  Ok(
+    code: string,
+    value: number,
+  ),
+  Err,
+}
+""".strip()
+    )
+    assert format_for_test("union R { Ok( // note\n id: string, ), }") == "\n".join(
+        [
+            "union R {",
+            "  Ok(",
+            "    // note",
+            "    id: string,",
+            "  ),",
+            "}",
+        ]
+    )
+    assert format_for_test("union R { Ok,\n// note\nErr }") == "\n".join(
+        [
+            "union R {",
+            "  Ok,",
+            "  // note",
+            "  Err,",
+            "}",
+        ]
+    )
+    assert (
+        format_for_test("union R { Ok(id: string,\n), }")
+        == "union R { Ok(id: string) }"
+    )
+    assert format_for_test(
+        "union R { Ok(id: string, another: string, ), }", line_width=24
+    ) == "\n".join(
+        [
+            "union R {",
+            "  Ok(",
+            "    id: string,",
+            "    another: string,",
+            "  ),",
+            "}",
+        ]
+    )
+    assert (
+        format_for_test("union R {Ok(id: string,),\nErr}")
+        == "union R { Ok(id: string), Err }"
+    )
+    assert (
+        format_for_test("union R {Ok( id: string,),\nErr}")
+        == "union R { Ok(id: string), Err }"
+    )
+    assert format_for_test(
+        "union U { Ok(id: string,), Err }", line_width=16
+    ) == "\n".join(
+        [
+            "union U {",
+            "  Ok(",
+            "    id: string,",
+            "  ),",
+            "  Err,",
+            "}",
+        ]
+    )
+    assert format_for_test(
+        "union U {\n  Ok(id: string,), // note\n  Err,\n}", line_width=16
+    ) == "\n".join(
+        [
+            "union U {",
+            "  // note",
+            "  Ok(",
+            "    id: string,",
+            "  ),",
+            "  Err,",
+            "}",
+        ]
+    )
+    assert format_for_test(
+        "union U {\n  Ok(id: string,), // very long note\n  Err,\n}", line_width=17
+    ) == "\n".join(
+        [
+            "union U {",
+            "  Ok(id: string), // very long note",
+            "  Err,",
+            "}",
+        ]
+    )
+    assert format_for_test("union U { Ok(\n), Err }") == "union U { Ok(), Err }"
+    assert format_for_test("union R { Ok,\n}") == "union R { Ok }"
+    assert format_for_test("union Result { Ok,\nErr }") == "union Result { Ok, Err }"
+    assert format_for_test("union // note\nResult { Ok, }") == "\n".join(
+        [
+            "// note",
+            "union Result { Ok }",
+        ]
+    )
+    assert format_for_test(
+        "union Result { ReallyLongOkType, ReallyLongErrType, ReallyLongPendingType }",
+        line_width=46,
+    ) == "\n".join(
+        [
+            "union Result {",
+            "  ReallyLongOkType,",
+            "  ReallyLongErrType,",
+            "  ReallyLongPendingType,",
+            "}",
+        ]
+    )
+
+
+def test_errors_parse_failure_raises_the_syntax_error():
+    # The TypeScript formatter wraps the parser's error; here it is raised
+    # as is.
+    with pytest.raises(SyntaxError) as info:
+        format_bdl("oneof Value {")
+    assert info.value.loc == len("oneof Value {")
+
+
+def test_linewidth_boundary_transitions_across_statement_kinds():
+    assert_line_width_boundary(
+        "import pkg.mod { Alpha, Beta }",
+        "import pkg.mod { Alpha, Beta }",
+        "\n".join(
+            [
+                "import pkg.mod {",
+                "  Alpha,",
+                "  Beta,",
+                "}",
+            ]
+        ),
+    )
+
+    assert_line_width_boundary(
+        "struct User { id: string, name: string }",
+        "struct User { id: string, name: string }",
+        "\n".join(
+            [
+                "struct User {",
+                "  id: string,",
+                "  name: string,",
+                "}",
+            ]
+        ),
+    )
+
+    assert_line_width_boundary(
+        "enum Status { Ready, Done }",
+        "enum Status { Ready, Done }",
+        "\n".join(
+            [
+                "enum Status {",
+                "  Ready,",
+                "  Done,",
+                "}",
+            ]
+        ),
+    )
+
+    assert_line_width_boundary(
+        "union Result { Ok, Err }",
+        "union Result { Ok, Err }",
+        "\n".join(
+            [
+                "union Result {",
+                "  Ok,",
+                "  Err,",
+                "}",
+            ]
+        ),
+    )
+
+    assert_line_width_boundary(
+        "proc Get = Input -> Output",
+        "proc Get = Input -> Output",
+        "\n".join(
+            [
+                "proc Get =",
+                "  Input -> Output",
+            ]
+        ),
+    )
+
+    assert_line_width_boundary(
+        "custom Amount = int64[string]",
+        "custom Amount = int64[string]",
+        "\n".join(
+            [
+                "custom Amount =",
+                "  int64[string]",
+            ]
+        ),
+    )
+
+
+@pytest.mark.xfail(reason="FormatConfig values are used as given, not coerced")
+def test_config_invalid_values_are_coerced_to_defaults():
+    source = "oneof Value { Alpha, Beta, Gamma }"
+    for invalid_line_width in [0, -3, 1.5, float("nan"), float("inf")]:
+        assert (
+            format_for_test(source, line_width=invalid_line_width)
+            == "oneof Value { Alpha, Beta, Gamma }"
+        )
+
+    assert format_for_test(
+        source, line_width=20, indent_type="invalid", indent_count=-2
+    ) == "\n".join(
+        [
+            "oneof Value {",
+            "  Alpha,",
+            "  Beta,",
+            "  Gamma,",
+            "}",
+        ]
+    )
+
+    assert (
+        format_bdl("oneof Value { A, B }", FormatConfig(final_newline="invalid"))
+        == "oneof Value { A, B }\n"
+    )
+
+
+@pytest.mark.xfail(raises=TypeError, reason="there is no trivia cache to turn off")
+def test_config_triviacache_on_off_output_parity():
+    samples = [
+        ("import pkg.mod { A, B, C }", {}),
+        ("struct User { id: string, name: string, age: int32 }", {"line_width": 24}),
+        ("enum Status { Ready, Done, Failed }", {"line_width": 18}),
+        (
+            "proc GetUser = GetUserInput -> GetUserOutput throws GetUserError",
+            {"line_width": 42},
+        ),
+        ("custom Amount = int64[string] // note", {"line_width": 18}),
+        (
+            "union Result { Ok(id: string,), // keep this inline comment\nErr, }",
+            {"line_width": 17},
+        ),
+    ]
+    for text, config in samples:
+        cache_on = format_for_test(text, **config, trivia_cache=True)
+        cache_off = format_for_test(text, **config, trivia_cache=False)
+        assert cache_on == cache_off
+
+
+def test_fixture_validates_mixed_module_formatting_with_golden_files():
+    assert_fixture("complex-mixed")
+
+
+def test_fixture_validates_line_width_and_trailing_comment_policy_with_golden_files():
+    assert_fixture("comment-width", line_width=17)
+
+
+def test_idempotency():
+    samples = [
+        "import aa.bb { A, B }",
+        "struct User { id:string, name:string }",
+        "oneof Value { A, B, C }",
+        "enum E { A, B }",
+        "proc GetUser = GetUserInput -> GetUserOutput throws GetUserError",
+        "custom Amount = int64[string]",
+        "union Result { Ok(id: string,), Err, }",
+        "@ auth - bearer\nproc Login = LoginReq -> LoginRes throws LoginErr",
+        "struct Box { data: bytes[string], }\n\ncustom Token = string",
+        "oneof Payload { A, B, C, D }\n\nenum Kind { X, Y, Z }",
+        "union Outcome { Ok(id: string,), @ reason - failed\nErr, }",
+        "import pkg.api { User as ApiUser, Role, }\n\n"
+        "struct Use { user: ApiUser, role: Role, }",
+    ]
+    for sample in samples:
+        once = format_for_test(sample)
+        twice = format_for_test(once)
+        assert twice == once
+    assert len(samples) >= 10
+
+
+def test_edge_trailing_comma_mixed():
+    assert format_for_test("oneof A { X, Y }\noneof B { X, Y, }") == "\n".join(
+        [
+            "oneof A { X, Y }",
+            "oneof B { X, Y }",
+        ]
+    )
+
+
+def test_edge_inline_comment_then_next_comment_before_throws():
+    assert format_for_test(
+        "proc A = In -> Out // inline\n// block-like\nthrows Err"
+    ) == "\n".join(
+        [
+            "proc A = In -> Out",
+            "  // inline",
+            "  // block-like",
+            "  throws Err",
+        ]
+    )
+
+
+def test_edge_multiline_attribute_adjacent_to_single_line_attribute():
+    assert format_for_test(
+        """
+    struct S {
+    @ first - x
+    @ second
+    | line1
+    | line2
+    @ third - y
+    value: string,
+    }
+""".strip()
+    ) == "\n".join(
+        [
+            "struct S {",
+            "  @ first - x",
+            "  @ second",
+            "  | line1",
+            "  | line2",
+            "  @ third - y",
+            "  value: string,",
+            "}",
+        ]
+    )
+
+
+def test_edge_oneof_oneline_vs_multiline_boundary():
+    source = "oneof Value { Alpha, Beta, Gamma }"
+    oneline = "oneof Value { Alpha, Beta, Gamma }"
+    assert format_for_test(source, line_width=len(oneline)) == oneline
+    assert format_for_test(source, line_width=len(oneline) - 1) == "\n".join(
+        [
+            "oneof Value {",
+            "  Alpha,",
+            "  Beta,",
+            "  Gamma,",
+            "}",
+        ]
+    )
+
+
+def test_edge_union_item_struct_with_nested_attribute():
+    assert format_for_test(
+        """
+    union Response {
+    Ok(
+    @ note - alpha
+    id: string,
+    ),
+    @ reason - failed
+    Err
+    }
+""".strip()
+    ) == "\n".join(
+        [
+            "union Response {",
+            "  Ok(",
+            "    @ note - alpha",
+            "    id: string,",
+            "  ),",
+            "  @ reason - failed",
+            "  Err,",
+            "}",
+        ]
+    )
+
+
+def test_config_indent():
+    assert (
+        format_for_test(
+            """
+    struct User {
+    id: string,
+    }
+""".strip(),
+            indent_type="tab",
+            indent_count=1,
+        )
+        == """
+struct User {
+\tid: string,
+}
+""".strip()
+    )
+
+
+def test_config_linewidth():
+    assert (
+        format_for_test(
+            """
+oneof Value {
+  Alpha,
+  Beta,
+  Gamma,
+  Delta,
+}
+""".strip(),
+            line_width=20,
+        )
+        == """
+oneof Value {
+  Alpha,
+  Beta,
+  Gamma,
+  Delta,
+}
+""".strip()
+    )
+
+
+def test_trailing_newline_at_eof():
+    assert format_for_test("oneof Value { A, B }\n\n") == "oneof Value { A, B }"
+
+
+def test_preserve_newlines_between_module_statements():
+    assert format_for_test(
+        """
+    import pkg.mod { A, }
+
+    oneof Value {
+      A,
+    }
+""".strip()
+    ) == "\n".join(
+        [
+            "import pkg.mod { A }",
+            "",
+            "oneof Value {",
+            "  A,",
+            "}",
+        ]
+    )
+
+
+def test_limit_blank_lines_between_module_statements():
+    assert format_for_test(
+        """
+    import pkg.mod { A, }
+
+
+
+    oneof Value {
+      A,
+    }
+""".strip()
+    ) == "\n".join(
+        [
+            "import pkg.mod { A }",
+            "",
+            "oneof Value {",
+            "  A,",
+            "}",
+        ]
+    )
+
+
+def test_default_final_newline():
+    assert format_bdl("oneof Value { A, B }") == "oneof Value { A, B }\n"
+
+
+def test_import_sort_module_imports_are_sorted_by_path():
+    source = "\n".join(
+        [
+            "import z.pkg { Z }",
+            "import a.pkg { A }",
+            "import m.pkg { M }",
+            "oneof Value { A, B, }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "import a.pkg { A }",
+            "import m.pkg { M }",
+            "import z.pkg { Z }",
+            "oneof Value { A, B }",
+        ]
+    )
+
+
+def test_import_sort_import_items_are_sorted_by_name_and_alias():
+    assert format_for_test(
+        """
+    import pkg.mod {
+      Zoo,
+      Apple as B,
+      Apple as A,
+      Mid,
+    }
+""".strip()
+    ) == "\n".join(
+        [
+            "import pkg.mod {",
+            "  Apple as A,",
+            "  Apple as B,",
+            "  Mid,",
+            "  Zoo,",
+            "}",
+        ]
+    )
+
+
+def test_import_sort_sorted_item_gets_required_separator():
+    assert (
+        format_bdl("import pkg.mod { B, A }", FormatConfig(final_newline=False))
+        == "import pkg.mod { A, B }"
+    )
+
+
+def test_import_sort_attributed_imports_move_together_with_their_attributes():
+    source = "\n".join(
+        [
+            "@ tag - z",
+            "import z.pkg { Z }",
+            "@ tag - a",
+            "import a.pkg { A }",
+            "oneof Value { A, B, }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "@ tag - a",
+            "import a.pkg { A }",
+            "@ tag - z",
+            "import z.pkg { Z }",
+            "oneof Value { A, B }",
+        ]
+    )
+
+
+def test_import_sort_multi_attribute_import_unit_stays_grouped():
+    source = "\n".join(
+        [
+            "@ first - z",
+            "@ second - z",
+            "import z.pkg { Z }",
+            "@ first - a",
+            "@ second - a",
+            "import a.pkg { A }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "@ first - a",
+            "@ second - a",
+            "import a.pkg { A }",
+            "@ first - z",
+            "@ second - z",
+            "import z.pkg { Z }",
+        ]
+    )
+
+
+def test_import_sort_leading_comments_move_with_each_import_unit():
+    source = "\n".join(
+        [
+            "// comment-z",
+            "import z.pkg { Z }",
+            "// comment-a",
+            "import a.pkg { A }",
+            "oneof Value { A, B, }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "// comment-a",
+            "import a.pkg { A }",
+            "// comment-z",
+            "import z.pkg { Z }",
+            "oneof Value { A, B }",
+        ]
+    )
+
+
+def test_import_sort_comments_and_attributes_move_together_with_import_unit():
+    source = "\n".join(
+        [
+            "// z comment",
+            "@ tag - z",
+            "import z.pkg { Z }",
+            "// a comment",
+            "@ tag - a",
+            "import a.pkg { A }",
+            "oneof Value { A, B, }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "// a comment",
+            "@ tag - a",
+            "import a.pkg { A }",
+            "// z comment",
+            "@ tag - z",
+            "import z.pkg { Z }",
+            "oneof Value { A, B }",
+        ]
+    )
+
+
+def test_import_sort_outer_hash_attribute_stays_anchored_before_sorted_imports():
+    source = "\n".join(
+        [
+            "# standard - conventional",
+            "import b { B }",
+            "import a { A }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "# standard - conventional",
+            "import a { A }",
+            "import b { B }",
+        ]
+    )
+
+
+def test_import_sort_ignore_between_attribute_and_import_prevents_sorting():
+    source = "\n".join(
+        [
+            "@ tag - z",
+            "// bdlc-fmt-ignore",
+            "import z.pkg { Z }",
+            "import a.pkg { A }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "@ tag - z",
+            "// bdlc-fmt-ignore",
+            "import z.pkg { Z }",
+            "import a.pkg { A }",
+        ]
+    )
+
+
+def test_import_sort_ignore_between_grouped_attributes_prevents_sorting():
+    source = "\n".join(
+        [
+            "@ first - z",
+            "// bdlc-fmt-ignore",
+            "@ second - z",
+            "import z.pkg { Z }",
+            "@ first - a",
+            "@ second - a",
+            "import a.pkg { A }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "@ first - z",
+            "// bdlc-fmt-ignore",
+            "@ second - z",
+            "import z.pkg { Z }",
+            "@ first - a",
+            "@ second - a",
+            "import a.pkg { A }",
+        ]
+    )
+
+
+def test_import_sort_trailing_inline_import_comment_stays_attached_while_sorting():
+    source = "\n".join(
+        [
+            "import z.pkg { Z } // keep with z",
+            "import a.pkg { A }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "import a.pkg { A }",
+            "import z.pkg { Z } // keep with z",
+        ]
+    )
+
+
+def test_import_sort_detached_run_header_comment_stays_before_sorted_block():
+    source = "\n".join(
+        [
+            "// imports for domain",
+            "",
+            "import z.pkg { Z }",
+            "import a.pkg { A }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "// imports for domain",
+            "",
+            "import a.pkg { A }",
+            "import z.pkg { Z }",
+        ]
+    )
+
+
+def test_import_sort_first_run_inline_trailing_comment_still_allows_following_sort():
+    source = "\n".join(
+        [
+            "import x.pkg { X } // keep with x",
+            "import z.pkg { Z }",
+            "import a.pkg { A }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "import a.pkg { A }",
+            "import x.pkg { X } // keep with x",
+            "import z.pkg { Z }",
+        ]
+    )
+
+
+def test_import_sort_previous_statement_inline_comment_stays_attached():
+    source = "\n".join(
+        [
+            "struct User {} // keep with struct",
+            "import z.pkg { Z }",
+            "import a.pkg { A }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "struct User {} // keep with struct",
+            "import a.pkg { A }",
+            "import z.pkg { Z }",
+        ]
+    )
+
+
+def test_import_sort_inline_trailing_anchor_does_not_pin_first_import_comment():
+    source = "\n".join(
+        [
+            "struct User {} // keep with struct",
+            "// keep with x",
+            "import x.pkg { X }",
+            "import a.pkg { A }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "struct User {} // keep with struct",
+            "import a.pkg { A }",
+            "// keep with x",
+            "import x.pkg { X }",
+        ]
+    )
+
+
+def test_import_sort_anchored_first_run_gap_does_not_add_extra_blank_line():
+    source = "\n".join(
+        [
+            "struct User {} // keep with struct",
+            "// keep with a",
+            "import a.pkg { A }",
+            "import z.pkg { Z }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "struct User {} // keep with struct",
+            "// keep with a",
+            "import a.pkg { A }",
+            "import z.pkg { Z }",
+        ]
+    )
+
+
+def test_import_sort_url_in_leading_comment_does_not_trigger_inline_anchor():
+    source = "\n".join(
+        [
+            "// docs https://example.com/x",
+            "import z.pkg { Z }",
+            "import a.pkg { A }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "import a.pkg { A }",
+            "// docs https://example.com/x",
+            "import z.pkg { Z }",
+        ]
+    )
+
+
+def test_import_sort_works_together_with_general_statement_formatting():
+    source = "\n".join(
+        [
+            "@ route - z",
+            "import z.pkg { Zed, Alpha, }",
+            "import a.pkg { Bee, Aaa, }",
+            "",
+            "oneof  Value{ B, A, }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "import a.pkg { Aaa, Bee }",
+            "@ route - z",
+            "import z.pkg { Alpha, Zed }",
+            "",
+            "oneof Value { B, A }",
+        ]
+    )
+
+
+def test_import_sort_multiline_import_stays_sorted_with_statement_after():
+    assert format_for_test(
+        """
+    import z.pkg {
+      Zoo,
+      Alpha,
+    }
+    import a.pkg {
+      Bee,
+      Aaa,
+    }
+
+    struct User {
+      id:string,
+    }
+""".strip()
+    ) == "\n".join(
+        [
+            "import a.pkg {",
+            "  Aaa,",
+            "  Bee,",
+            "}",
+            "import z.pkg {",
+            "  Alpha,",
+            "  Zoo,",
+            "}",
+            "",
+            "struct User {",
+            "  id: string,",
+            "}",
+        ]
+    )
+
+
+def test_ignore_file_directive_formatbdl_returns_input_unchanged():
+    source = "\n".join(
+        [
+            "// bdlc-fmt-ignore-file",
+            "oneof Value { A,",
+            "}",
+        ]
+    )
+    assert format_bdl(source) == source
+    assert (
+        format_bdl(source, FormatConfig(final_newline=False, line_width=10)) == source
+    )
+
+
+def test_ignore_directive_skip_formatting_for_the_next_module_statement():
+    source = "\n".join(
+        [
+            "oneof First { A, B, }",
+            "",
+            "// bdlc-fmt-ignore",
+            "oneof Second { A,",
+            "}",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "oneof First { A, B }",
+            "",
+            "// bdlc-fmt-ignore",
+            "oneof Second { A,",
+            "}",
+        ]
+    )
+
+
+def test_ignore_directive_inline_trailing_module_comment_does_not_skip_next_statement():
+    source = "\n".join(
+        [
+            "oneof First { A, B, } // bdlc-fmt-ignore",
+            "oneof Second { C, D, }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "oneof First { A, B } // bdlc-fmt-ignore",
+            "oneof Second { C, D }",
+        ]
+    )
+
+
+def test_ignore_directive_skip_formatting_for_the_next_block_statement():
+    assert format_for_test(
+        """
+    struct User {
+      id:string,
+      // bdlc-fmt-ignore
+      name  :   string,
+    }
+""".strip()
+    ) == "\n".join(
+        [
+            "struct User {",
+            "  id: string,",
+            "  // bdlc-fmt-ignore",
+            "  name  :   string,",
+            "}",
+        ]
+    )
+
+
+def test_ignore_directive_preserves_attributed_module_statement_as_one_unit():
+    source = "\n".join(
+        [
+            "oneof First { A, B, }",
+            "",
+            "// bdlc-fmt-ignore",
+            "@ http - GET",
+            "proc   GetUser=GetUserInput->GetUserOutput",
+            "",
+            "oneof Last { X, Y, }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "oneof First { A, B }",
+            "",
+            "// bdlc-fmt-ignore",
+            "@ http - GET",
+            "proc   GetUser=GetUserInput->GetUserOutput",
+            "",
+            "oneof Last { X, Y }",
+        ]
+    )
+
+
+def test_ignore_directive_preserves_attributed_block_item_as_one_unit():
+    assert format_for_test(
+        """
+    struct User {
+      id: string,
+      // bdlc-fmt-ignore
+      @ validation - strict
+      name  :   string,
+      age:number,
+    }
+""".strip()
+    ) == "\n".join(
+        [
+            "struct User {",
+            "  id: string,",
+            "  // bdlc-fmt-ignore",
+            "  @ validation - strict",
+            "  name  :   string,",
+            "  age: number,",
+            "}",
+        ]
+    )
+
+
+def test_ignore_directive_preserves_leading_comment_before_directive():
+    assert format_for_test(
+        """
+    struct User {
+      id: string,
+      // keep this comment
+      // bdlc-fmt-ignore
+      name  :   string,
+    }
+""".strip()
+    ) == "\n".join(
+        [
+            "struct User {",
+            "  id: string,",
+            "  // keep this comment",
+            "  // bdlc-fmt-ignore",
+            "  name  :   string,",
+            "}",
+        ]
+    )
+
+
+def test_ignore_directive_skip_formatting_for_import_statement():
+    source = "\n".join(
+        [
+            "oneof First { A, B, }",
+            "",
+            "// bdlc-fmt-ignore",
+            "import pkg.mod { A,",
+            "}",
+            "",
+            "oneof Last { X, Y, }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "oneof First { A, B }",
+            "",
+            "// bdlc-fmt-ignore",
+            "import pkg.mod { A,",
+            "}",
+            "",
+            "oneof Last { X, Y }",
+        ]
+    )
+
+
+def test_ignore_directive_skip_formatting_for_custom_statement():
+    source = "\n".join(
+        [
+            "oneof First { A, B, }",
+            "",
+            "// bdlc-fmt-ignore",
+            "custom   Amount=int64[string]",
+            "",
+            "oneof Last { X, Y, }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "oneof First { A, B }",
+            "",
+            "// bdlc-fmt-ignore",
+            "custom   Amount=int64[string]",
+            "",
+            "oneof Last { X, Y }",
+        ]
+    )
+
+
+def test_ignore_directive_skip_formatting_for_enum_statement():
+    source = "\n".join(
+        [
+            "oneof First { A, B, }",
+            "",
+            "// bdlc-fmt-ignore",
+            "enum Status { Ready,",
+            "}",
+            "",
+            "oneof Last { X, Y, }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "oneof First { A, B }",
+            "",
+            "// bdlc-fmt-ignore",
+            "enum Status { Ready,",
+            "}",
+            "",
+            "oneof Last { X, Y }",
+        ]
+    )
+
+
+def test_ignore_directive_skip_formatting_for_union_statement():
+    source = "\n".join(
+        [
+            "oneof First { A, B, }",
+            "",
+            "// bdlc-fmt-ignore",
+            "union Result { Ok,",
+            "Err }",
+            "",
+            "oneof Last { X, Y, }",
+        ]
+    )
+    assert format_bdl(source, FormatConfig(final_newline=False)) == "\n".join(
+        [
+            "oneof First { A, B }",
+            "",
+            "// bdlc-fmt-ignore",
+            "union Result { Ok,",
+            "Err }",
+            "",
+            "oneof Last { X, Y }",
+        ]
+    )
+
+
+def test_ignore_directive_skip_formatting_for_import_item():
+    assert format_for_test(
+        """
+    import pkg.mod {
+      A   as   A1,
+      // bdlc-fmt-ignore
+      Foo    as    Bar,
+      C   as   C1,
+    }
+""".strip()
+    ) == "\n".join(
+        [
+            "import pkg.mod {",
+            "  A as A1,",
+            "  // bdlc-fmt-ignore",
+            "  Foo    as    Bar,",
+            "  C as C1,",
+            "}",
+        ]
+    )
+
+
+def test_ignore_directive_skip_formatting_for_enum_item():
+    assert format_for_test(
+        """
+    enum Status {
+      Ready   ,
+      // bdlc-fmt-ignore
+      Running   ,
+      Done   ,
+    }
+""".strip()
+    ) == "\n".join(
+        [
+            "enum Status {",
+            "  Ready,",
+            "  // bdlc-fmt-ignore",
+            "  Running   ,",
+            "  Done,",
+            "}",
+        ]
+    )
+
+
+def test_ignore_directive_skip_formatting_for_union_item():
+    assert format_for_test(
+        """
+    union Result {
+      Ok   ,
+      // bdlc-fmt-ignore
+      Err (  message : string, ),
+      Unknown   ,
+    }
+""".strip()
+    ) == "\n".join(
+        [
+            "union Result {",
+            "  Ok,",
+            "  // bdlc-fmt-ignore",
+            "  Err (  message : string, ),",
+            "  Unknown,",
+            "}",
+        ]
+    )
+
+
+def test_ignore_directive_inline_item_comment_does_not_trigger_skipping():
+    assert format_for_test(
+        """
+    struct User {
+      name
+      // bdlc-fmt-ignore
+      :   string,
+      age:number,
+    }
+""".strip()
+    ) == "\n".join(
+        [
+            "struct User {",
+            "  // bdlc-fmt-ignore",
+            "  name: string,",
+            "  age: number,",
+            "}",
+        ]
+    )
+
+
+def test_ignore_directive_union_multiline_item_stays_idempotent():
+    source = normalize_fixture_text(
+        """
+  union Result {
+    Ok,
+    // bdlc-fmt-ignore
+    Err(
+        message : string,
+      code: int32,
+    ),
+    Unknown   ,
+  }
+""".strip()
+    )
+    once = format_bdl(source, FormatConfig(final_newline=False))
+    twice = format_bdl(once, FormatConfig(final_newline=False))
+    assert once == twice
+    assert once == "\n".join(
+        [
+            "union Result {",
+            "  Ok,",
+            "  // bdlc-fmt-ignore",
+            "  Err(",
+            "      message : string,",
+            "    code: int32,",
+            "  ),",
+            "  Unknown,",
+            "}",
+        ]
+    )
+
+
+def test_ignore_directive_multiline_struct_field_stays_idempotent():
+    source = normalize_fixture_text(
+        """
+  struct User {
+    // bdlc-fmt-ignore
+    payload:
+        string
+      [number],
+    id:string,
+  }
+""".strip()
+    )
+    once = format_bdl(source, FormatConfig(final_newline=False))
+    twice = format_bdl(once, FormatConfig(final_newline=False))
+    assert once == twice
+    assert "  payload:\n      string\n    [number]," in once
+    assert "\n  id: string,\n" in once
+
+
+def test_ignore_directive_multiline_import_item_stays_idempotent():
+    source = normalize_fixture_text(
+        """
+  import pkg.mod {
+    // bdlc-fmt-ignore
+    Foo
+        as
+      Bar,
+    A   as   A1,
+  }
+""".strip()
+    )
+    once = format_bdl(source, FormatConfig(final_newline=False))
+    twice = format_bdl(once, FormatConfig(final_newline=False))
+    assert once == twice
+    assert once == "\n".join(
+        [
+            "import pkg.mod {",
+            "  // bdlc-fmt-ignore",
+            "  Foo",
+            "      as",
+            "    Bar,",
+            "  A as A1,",
+            "}",
+        ]
+    )
+
+
+def test_ignore_directive_first_block_item_keeps_expected_indentation():
+    assert format_for_test(
+        """
+    enum Status {
+      // bdlc-fmt-ignore
+      Ready   ,
+      Done   ,
+    }
+""".strip()
+    ) == "\n".join(
+        [
+            "enum Status {",
+            "  // bdlc-fmt-ignore",
+            "  Ready   ,",
+            "  Done,",
+            "}",
+        ]
+    )
+
+
+@pytest.mark.xfail(
+    raises=ValueError,
+    reason="the parser drops `#` attributes inside a union item struct",
+)
+def test_union_item_struct_with_hash_attribute():
+    text = "\n".join(
+        [
+            "union Response {",
+            "  Ok(",
+            "    # note - alpha",
+            "    id: string,",
+            "  ),",
+            "}",
+        ]
+    )
+    assert format_for_test(text) == text
@@ -0,0 +1,287 @@
+import random
+from typing import Callable, List, Optional, Tuple
+
+import pytest
+
+from bdl.parser.bdl_parser import BdlAst, parse_bdl
+from bdl.parser.incremental import (
+    TextEdit,
+    apply_text_edit,
+    get_statement_end,
+    get_statement_start,
+    reparse_bdl,
+)
+from bdl.parser.parser import SyntaxError
+
+EDITS_PER_FILE = 25
+# Big files are parsed in full after every edit; fewer edits keep it quick.
+EDITS_PER_LARGE_FILE = 4
+LARGE_FILE_SIZE = 50_000
+
+_SNIPPETS = [
+    "{", "}", "(", ")", "[", "]", ":", ",", "?", "=", "->", ".", "@", "#",
+    " ", "\n", "//", "- ", "a", "struct", "oneof", "string[]", "X_1",
+]  # fmt: skip
+
+
+def parse_or_error(text: str) -> Tuple[Optional[BdlAst], Optional[SyntaxError]]:
+    try:
+        return parse_bdl(text), None
+    except SyntaxError as error:
+        return None, error
+
+
+def reparse_or_error(
+    bdl_ast: BdlAst, text: str, edit: TextEdit
+) -> Tuple[Optional[BdlAst], Optional[SyntaxError]]:
+    try:
+        return reparse_bdl(bdl_ast, text, edit), None
+    except SyntaxError as error:
+        return None, error
+
+
+def diff_edit(old_text: str, new_text: str) -> TextEdit:
+    """
+    The single edit turning `old_text` into `new_text`, as an editor that
+    kept the last text that parsed would send.
+    """
+    start = 0
+    limit = min(len(old_text), len(new_text))
+    while start < limit and old_text[start] == new_text[start]:
+        start += 1
+    end = 0
+    while (
+        end < limit - start
+        and old_text[len(old_text) - end - 1] == new_text[len(new_text) - end - 1]
+    ):
+        end += 1
+    return TextEdit(start, len(old_text) - end, new_text[start : len(new_text) - end])
+
+
+class EditMaker:
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.count = 0
+
+    def make(self, text: str, bdl_ast: BdlAst) -> TextEdit:
+        makers: List[Callable[[str, BdlAst], Optional[TextEdit]]] = [
+            self.snippet,
+            self.cross_statements,
+            self.delete_statement,
+            self.duplicate_statement,
+            self.insert_statement,
+            self.insert_attribute,
+            self.change_attribute,
+            self.rename,
+            self.join_lines,
+        ]
+        while True:
+            edit = self.rng.choice(makers)(text, bdl_ast)
+            if edit is not None:
+                return edit
+
+    def offset(self, text: str) -> int:
+        return self.rng.randint(0, len(text))
+
+    def statement_bounds(self, bdl_ast: BdlAst) -> Optional[Tuple[int, int]]:
+        if not bdl_ast.statements:
+            return None
+        statement = self.rng.choice(bdl_ast.statements)
+        return get_statement_start(statement), get_statement_end(statement)
+
+    def boundary(self, text: str, bdl_ast: BdlAst) -> int:
+        """
+        Start of a line between two statements, or the end of the text.
+        """
+        bounds = self.statement_bounds(bdl_ast)
+        if bounds is None or self.rng.random() < 0.2:
+            return len(text)
+        return text.rfind("\n", 0, bounds[0]) + 1
+
+    def snippet(self, text: str, bdl_ast: BdlAst) -> TextEdit:
+        start = self.offset(text)
+        end = min(len(text), start + self.rng.choice([0, 0, 1, 2, 5]))
+        return TextEdit(start, end, self.rng.choice(_SNIPPETS + [""]))
+
+    def cross_statements(self, text: str, bdl_ast: BdlAst) -> Optional[TextEdit]:
+        first = self.statement_bounds(bdl_ast)
+        last = self.statement_bounds(bdl_ast)
+        if first is None:
+            return None
+        (first_start, first_end), (last_start, last_end) = sorted([first, last])
+        start = self.rng.randint(first_start, first_end)
+        end = max(start, self.rng.randint(last_start, last_end))
+        if self.rng.random() < 0.5:
+            # Whole statements, so the result usually still parses.
+            return TextEdit(first_start, last_end, text[last_start:last_end])
+        return TextEdit(start, end, "")
+
+    def delete_statement(self, text: str, bdl_ast: BdlAst) -> Optional[TextEdit]:
+        bounds = self.statement_bounds(bdl_ast)
+        return bounds and TextEdit(bounds[0], bounds[1], "")
+
+    def duplicate_statement(self, text: str, bdl_ast: BdlAst) -> Optional[TextEdit]:
+        bounds = self.statement_bounds(bdl_ast)
+        if bounds is None:
+            return None
+        offset = self.boundary(text, bdl_ast)
+        return TextEdit(offset, offset, text[bounds[0] : bounds[1]] + "\n\n")
+
+    def insert_statement(self, text: str, bdl_ast: BdlAst) -> TextEdit:
+        self.count += 1
+        offset = self.boundary(text, bdl_ast)
+        statement = self.rng.choice(
+            [
+                f"struct New{self.count} {{\n  a?: string,\n}}\n\n",
+                f"enum New{self.count} {{\n  A,\n  B,\n}}\n\n",
+                f"custom New{self.count} = int64[string]\n\n",
+                f"// comment {self.count}\n",
+            ]
+        )
+        return TextEdit(offset, offset, statement)
+
+    def insert_attribute(self, text: str, bdl_ast: BdlAst) -> TextEdit:
+        offset = self.boundary(text, bdl_ast)
+        attribute = self.rng.choice(
+            ["@deprecated\n", "@description - new\n", "# note - x\n", "#x\n"]
+        )
+        return TextEdit(offset, offset, attribute)
+
+    def change_attribute(self, text: str, bdl_ast: BdlAst) -> Optional[TextEdit]:
+        spans = [
+            attribute.content or attribute.name
+            for statement in bdl_ast.statements
+            for attribute in statement.attributes
+        ] + [attribute.name for attribute in bdl_ast.attributes]
+        if not spans:
+            return None
+        span = self.rng.choice(spans)
+        if text[span.start : span.end].startswith("-"):
+            replacement = self.rng.choice(["- changed", "-", "- a\n  | b", ""])
+        else:
+            replacement = self.rng.choice(["renamed", "", "x y"])
+        return TextEdit(span.start, span.end, replacement)
+
+    def rename(self, text: str, bdl_ast: BdlAst) -> Optional[TextEdit]:
+        names = [
+            statement.name
+            for statement in bdl_ast.statements
+            if hasattr(statement, "name")
+        ]
+        if not names:
+            return None
+        name = self.rng.choice(names)
+        return TextEdit(name.end, name.end, self.rng.choice(["X", "_2", " "]))
+
+    def join_lines(self, text: str, bdl_ast: BdlAst) -> Optional[TextEdit]:
+        """
+        Moves a statement up onto the line of the one before it.
+        """
+        statements = bdl_ast.statements
+        if len(statements) < 2:
+            return None
+        index = self.rng.randrange(1, len(statements))
+        start = get_statement_end(statements[index - 1])
+        end = get_statement_start(statements[index])
+        if text[start:end].strip():
+            return None
+        return TextEdit(start, end, " ")
+
+
+def check_edit(text: str, bdl_ast: BdlAst, edit: TextEdit) -> Optional[BdlAst]:
+    """
+    Reparses `edit`, checks it against a full parse and returns the new AST,
+    or `None` if the new text doesn't parse. `bdl_ast` stays usable then.
+    """
+    new_text = apply_text_edit(text, edit)
+    expected, expected_error = parse_or_error(new_text)
+    result, error = reparse_or_error(bdl_ast, text, edit)
+    if expected_error is not None:
+        assert error is not None, edit
+        assert error.loc == expected_error.loc, edit
+        assert error.expected_patterns == expected_error.expected_patterns, edit
+        assert bdl_ast == parse_bdl(text), edit
+        return None
+    assert error is None, edit
+    assert result == expected, edit
+    return result
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_random_chained_edits(example_texts, seed):
+    for path, text in example_texts.items():
+        rng = random.Random(f"{seed}:{path}")
+        maker = EditMaker(rng)
+        bdl_ast = parse_bdl(text)
+        count = EDITS_PER_FILE if len(text) < LARGE_FILE_SIZE else EDITS_PER_LARGE_FILE
+        for _ in range(count):
+            edit = maker.make(text, bdl_ast)
+            new_ast = check_edit(text, bdl_ast, edit)
+            if new_ast is not None:
+                text, bdl_ast = apply_text_edit(text, edit), new_ast
+
+
+def test_error_then_fix(example_texts):
+    """
+    Typing a statement in two steps, with a syntax error in between. The
+    fix is diffed against the last text that parsed.
+    """
+    rng = random.Random(0)
+    for path, text in example_texts.items():
+        if len(text) >= LARGE_FILE_SIZE:
+            continue
+        bdl_ast = parse_bdl(text)
+        maker = EditMaker(rng)
+        for index in range(4):
+            offset = maker.boundary(text, bdl_ast)
+            head = f"struct Typed{index} {{\n  a: "
+            tail = "string,\n}\n\n"
+            broken = TextEdit(offset, offset, head)
+            assert check_edit(text, bdl_ast, broken) is None, path
+            fixed_text = apply_text_edit(
+                apply_text_edit(text, broken),
+                TextEdit(offset + len(head), offset + len(head), tail),
+            )
+            fix = diff_edit(text, fixed_text)
+            bdl_ast = check_edit(text, bdl_ast, fix)
+            assert bdl_ast is not None, path
+            text = fixed_text
+
+
+def test_line_comment_swallowing_next_statement():
+    text = "struct A {} struct B {}\n\nstruct C {}\n"
+    bdl_ast = parse_bdl(text)
+    # `B` starts past the edit, but the comment runs over it.
+    edit = TextEdit(11, 11, "//")
+    assert len(check_edit(text, bdl_ast, edit).statements) == 2
+
+
+def test_attribute_content_swallowing_next_statement():
+    text = "struct A {} struct B {}\nstruct C {}\n"
+    bdl_ast = parse_bdl(text)
+    # `@note - struct B {}` becomes an attribute of `C`.
+    edit = TextEdit(12, 12, "@note - ")
+    new_ast = check_edit(text, bdl_ast, edit)
+    assert len(new_ast.statements) == 2
+    assert len(new_ast.statements[1].attributes) == 1
+
+
+@pytest.mark.parametrize(
+    "text, insert",
+    [
+        ("proc P = A -> B\n\nstruct C {}\n", "throws E\n"),
+        ("custom A = string\n\nstruct C {}\n", "[string]\n"),
+    ],
+)
+def test_clause_after_proc_or_custom(text, insert):
+    bdl_ast = parse_bdl(text)
+    offset = text.index("\n") + 1
+    assert check_edit(text, bdl_ast, TextEdit(offset, offset, insert)) is not None
+
+
+def test_edit_touching_statement_end():
+    text = "struct A {}\n\ncustom B = string\n"
+    bdl_ast = parse_bdl(text)
+    # Extends `string` into `string[]` right at the end of the custom.
+    edit = TextEdit(len(text) - 1, len(text) - 1, "[]")
+    assert check_edit(text, bdl_ast, edit) is not None
@@ -0,0 +1,583 @@
+from typing import List
+
+import pytest
+
+from bdl.io.config import BdlConfig
+from bdl.io.standard import get_builtin_standard
+from bdl.linter import (
+    DuplicateAttributeRule,
+    DuplicateItemRule,
+    DuplicateNameRule,
+    LintContext,
+    Linter,
+    LintProfile,
+    LintResult,
+    LintRule,
+    StandardRule,
+    UnknownAttributeRule,
+    UnknownTypeRule,
+    get_default_rules,
+    get_disabled_lines,
+    lint_bdl,
+)
+from bdl.parser.bdl_parser import parse_bdl, parse_bdl_bytes
+from bdl.parser.parser import EOF, Span, SyntaxError
+
+CONVENTIONAL = get_builtin_standard("conventional")
+
+
+def lines(*lines: str) -> str:
+    return "\n".join(lines) + "\n"
+
+
+def messages(result: LintResult) -> List[str]:
+    return [diagnostic.message for diagnostic in result.diagnostics]
+
+
+def codes(result: LintResult) -> List[str]:
+    return [diagnostic.code for diagnostic in result.diagnostics]
+
+
+def lint_with(rule: LintRule, text: str) -> LintResult:
+    return Linter([rule]).lint(text, standard=CONVENTIONAL)
+
+
+# Cases of `bdl-ts/src/linter/bdl.test.ts` that need nothing but the module.
+
+
+def test_reports_syntax_errors():
+    result = lint_bdl("struct User { id: string")
+    assert len(result.diagnostics) == 1
+    diagnostic = result.diagnostics[0]
+    assert diagnostic.code == "bdl/syntax"
+    assert diagnostic.severity == "error"
+    assert "Expected" in diagnostic.message
+    assert result.ast is None
+
+
+def test_reports_unknown_attributes():
+    text = lines("struct User {", "  @ nope - true", "  id: string,", "}")
+    result = lint_bdl(text, standard=CONVENTIONAL)
+    assert "Unknown attribute 'nope'." in messages(result)
+
+
+def test_requires_standard_by_default():
+    result = lint_bdl("struct User { id: string }\n")
+    assert "No BDL standard specified." in messages(result)
+
+
+def test_validates_standard_id_from_bdl_config():
+    text = lines("# standard - unknown", "struct User {", "  id: string,", "}")
+    bdl_config = BdlConfig(
+        paths={"pkg": "./schemas"},
+        standards={"conventional": "./standards/conventional.yaml"},
+    )
+    result = lint_bdl(text, bdl_config=bdl_config)
+    assert "Unknown BDL standard." in messages(result)
+
+
+def test_standard_from_bdl_config_is_known():
+    text = lines("# standard - custom", "struct User {", "  id: string,", "}")
+    bdl_config = BdlConfig(standards={"custom": "./standards/custom.yaml"})
+    result = lint_bdl(text, standard=CONVENTIONAL, bdl_config=bdl_config)
+    assert "bdl/unknown-standard" not in codes(result)
+
+
+def test_directives_disable_and_enable_control_lint_region():
+    text = lines(
+        "# standard - conventional",
+        "  // bdlc-lint-disable",
+        "struct A { x: MissingA }",
+        "  // bdlc-lint-enable",
+        "struct B { y: MissingB }",
+    )
+    result = lint_bdl(text, standard=CONVENTIONAL)
+    assert "Cannot find name 'MissingA'." not in messages(result)
+    assert "Cannot find name 'MissingB'." in messages(result)
+
+
+def test_directives_disable_line_suppresses_same_line():
+    text = lines(
+        "# standard - conventional",
+        "struct A { x: MissingA } // bdlc-lint-disable-line",
+        "struct B { y: MissingB }",
+    )
+    result = lint_bdl(text, standard=CONVENTIONAL)
+    assert "Cannot find name 'MissingA'." not in messages(result)
+    assert "Cannot find name 'MissingB'." in messages(result)
+
+
+def test_directives_disable_next_line_suppresses_only_next_line():
+    text = lines(
+        "# standard - conventional",
+        "// bdlc-lint-disable-next-line",
+        "struct A { x: MissingA }",
+        "struct B { y: MissingB }",
+    )
+    result = lint_bdl(text, standard=CONVENTIONAL)
+    assert "Cannot find name 'MissingA'." not in messages(result)
+    assert "Cannot find name 'MissingB'." in messages(result)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # Directive-like text in attribute content.
+        lines(
+            "# standard - conventional // bdlc-lint-disable", "struct A { x: MissingA }"
+        ),
+        # ... in multiline attribute content.
+        lines(
+            "# standard - conventional",
+            "@ note",
+            "| // bdlc-lint-disable",
+            "struct A { x: MissingA }",
+        ),
+        # A mention in prose.
+        lines(
+            "# standard - conventional",
+            "// docs: mention bdlc-lint-disable for examples",
+            "struct A { x: MissingA }",
+        ),
+        # Compact hash attribute text.
+        lines(
+            "#standard- conventional // bdlc-lint-disable", "struct A { x: MissingA }"
+        ),
+    ],
+)
+def test_directives_ignore_text_that_is_not_a_directive(text):
+    result = lint_bdl(text, standard=CONVENTIONAL)
+    assert "Cannot find name 'MissingA'." in messages(result)
+
+
+def test_directives_disable_line_works_with_crlf_input():
+    text = "\r\n".join(["// bdlc-lint-disable-line", "struct User { id: string }", ""])
+    assert lint_bdl(text, standard=CONVENTIONAL).diagnostics == []
+
+
+def test_recognizes_builtin_standard_with_crlf_input():
+    text = "\r\n".join(
+        ["# standard - conventional", "struct User {", "  id: string,", "}", ""]
+    )
+    result = lint_bdl(text, standard=CONVENTIONAL)
+    assert "bdl/unknown-standard" not in codes(result)
+    assert "bdl/unknown-type" not in codes(result)
+
+
+def test_trims_one_line_attribute_content():
+    text = lines(
+        "# standard -   conventional   ", "struct User {", "  id: string,", "}"
+    )
+    result = lint_bdl(text, standard=CONVENTIONAL)
+    assert "bdl/unknown-standard" not in codes(result)
+    assert "bdl/unknown-type" not in codes(result)
+
+
+# syntax errors
+
+
+def test_syntax_error_span_covers_what_was_found():
+    text = "struct A { a: 한 }"
+    result = lint_bdl(text)
+    diagnostic = result.diagnostics[0]
+    assert diagnostic.message == 'Expected /^[a-z_][a-z0-9_]*/i, got "한".'
+    assert text[diagnostic.span.start : diagnostic.span.end] == "한"
+
+
+def test_syntax_error_at_end_has_empty_span():
+    result = lint_bdl("struct A {")
+    diagnostic = result.diagnostics[0]
+    assert diagnostic.message == 'Expected "}", got <EOF>.'
+    assert diagnostic.span == Span(10, 10)
+
+
+@pytest.mark.parametrize(
+    "source, got_span",
+    [
+        (b"struct A { a: \xed\x95\x9c }", Span(14, 17)),
+        # Cut short, the sequence ends with the input.
+        (b"struct A { a: \xed\x95", Span(14, 16)),
+    ],
+)
+def test_syntax_error_over_bytes_covers_the_whole_character(source, got_span):
+    with pytest.raises(SyntaxError) as info:
+        parse_bdl_bytes(source)
+    assert info.value.got_span == got_span
+    assert info.value.got == source[got_span.start : got_span.end].decode(
+        "utf-8", "replace"
+    )
+
+
+def test_syntax_error_got_at_end_is_eof():
+    with pytest.raises(SyntaxError) as info:
+        parse_bdl_bytes(b"struct A {")
+    assert info.value.got is EOF
+    assert info.value.got_span is None
+
+
+# rules
+
+
+def test_standard_rule():
+    result = lint_with(StandardRule(), "struct A {}\n")
+    assert [(d.code, d.span) for d in result.diagnostics] == [
+        ("bdl/missing-standard", Span(0, 0))
+    ]
+    result = lint_with(StandardRule(), "# standard - nope\n")
+    assert [(d.code, d.span) for d in result.diagnostics] == [
+        ("bdl/unknown-standard", Span(2, 10))
+    ]
+    assert lint_with(StandardRule(), "# standard - global\n").diagnostics == []
+
+
+def test_unknown_type_rule():
+    text = lines(
+        "# standard - conventional",
+        "import pkg.model { Imported, Other as Aliased }",
+        "struct A {",
+        "  a: string,",
+        "  b: B,",
+        "  c: Imported[],",
+        "  d: Aliased[Missing1],",
+        "  e: Missing2,",
+        "}",
+        "custom B = Missing3",
+        "proc P = A -> Missing4 throws Missing5",
+        "oneof O {",
+        "  A,",
+        "  Missing6,",
+        "}",
+        "union U {",
+        "  X(f: Missing7),",
+        "}",
+    )
+    result = lint_with(UnknownTypeRule(), text)
+    assert messages(result) == [
+        f"Cannot find name 'Missing{index}'." for index in range(1, 8)
+    ]
+    for diagnostic in result.diagnostics:
+        span = diagnostic.span
+        assert (
+            diagnostic.message == f"Cannot find name '{text[span.start : span.end]}'."
+        )
+    # The name an import is aliased to, not the imported one.
+    result = lint_with(
+        UnknownTypeRule(), lines("import pkg { A as B }", "custom C = A")
+    )
+    assert messages(result) == ["Cannot find name 'A'."]
+
+
+def test_unknown_type_rule_primitives_come_from_the_standard():
+    text = "custom A = int32\n"
+    assert messages(Linter([UnknownTypeRule()]).lint(text)) == [
+        "Cannot find name 'int32'."
+    ]
+    assert lint_with(UnknownTypeRule(), text).diagnostics == []
+
+
+def test_unknown_attribute_rule():
+    text = lines(
+        "# standard - conventional",
+        "# description - module",
+        "@ description - struct",
+        "@ nope1",
+        "struct A {",
+        "  @ description - field",
+        "  @ nope2",
+        "  a: string,",
+        "}",
+        "enum E {",
+        "  @ nope3",
+        "  X,",
+        "}",
+    )
+    result = lint_with(UnknownAttributeRule(), text)
+    assert messages(result) == [
+        f"Unknown attribute 'nope{index}'." for index in (1, 2, 3)
+    ]
+    # `#` attributes belong to the module, `@` ones to the statement.
+    result = Linter([UnknownAttributeRule()]).lint("# nope\n")
+    assert [(d.code, d.span) for d in result.diagnostics] == [
+        ("bdl/unknown-attribute", Span(2, 6))
+    ]
+
+
+def test_duplicate_name_rule():
+    text = lines(
+        "import pkg.model { A, B as C }",
+        "struct A {}",
+        "enum C { X }",
+        "custom D = string",
+        "custom D = string",
+        "union E { X }",
+    )
+    result = lint_with(DuplicateNameRule(), text)
+    assert messages(result) == [
+        "Duplicated name 'A'.",
+        "Duplicated name 'C'.",
+        "Duplicated name 'A'.",
+        "Duplicated name 'C'.",
+        "Duplicated name 'D'.",
+        "Duplicated name 'D'.",
+    ]
+    assert {text[d.span.start : d.span.end] for d in result.diagnostics} == {
+        "A",
+        "C",
+        "D",
+    }
+
+
+def test_duplicate_attribute_rule():
+    text = lines(
+        "# standard - conventional",
+        "# standard - conventional",
+        "@ description - a",
+        "@ description - b",
+        "struct A {",
+        "  @ deprecated",
+        "  @ deprecated",
+        "  a: string,",
+        "  @ description - c",
+        "  b: string,",
+        "}",
+    )
+    result = lint_with(DuplicateAttributeRule(), text)
+    # Module attributes are the standard rule's business.
+    assert messages(result) == [
+        "Duplicated attribute 'description'.",
+        "Duplicated attribute 'description'.",
+        "Duplicated attribute 'deprecated'.",
+        "Duplicated attribute 'deprecated'.",
+    ]
+
+
+def test_duplicate_item_rule():
+    text = lines(
+        "enum E { X, Y, X }",
+        "union U {",
+        "  A(a: string, a: string),",
+        "  A,",
+        "}",
+        "struct S { s: string, t: string, s: int32 }",
+        "oneof O { string, string }",
+    )
+    result = lint_with(DuplicateItemRule(), text)
+    assert messages(result) == [
+        "Duplicated item 'X'.",
+        "Duplicated item 'X'.",
+        "Duplicated item 'A'.",
+        "Duplicated item 'a'.",
+        "Duplicated item 'a'.",
+        "Duplicated item 'A'.",
+        "Duplicated item 's'.",
+        "Duplicated item 's'.",
+    ]
+
+
+def test_default_rules_are_the_rules_above():
+    assert [type(rule) for rule in get_default_rules()] == [
+        StandardRule,
+        UnknownTypeRule,
+        UnknownAttributeRule,
+        DuplicateNameRule,
+        DuplicateAttributeRule,
+        DuplicateItemRule,
+    ]
+
+
+def test_lint_bdl_sorts_diagnostics_by_position():
+    text = lines("struct A { a: Missing }", "struct A {}")
+    result = lint_bdl(text, standard=CONVENTIONAL)
+    starts = [diagnostic.span.start for diagnostic in result.diagnostics]
+    assert starts == sorted(starts)
+    assert codes(result) == [
+        "bdl/missing-standard",
+        "bdl/duplicate-name",
+        "bdl/unknown-type",
+        "bdl/duplicate-name",
+    ]
+
+
+def test_lint_given_ast_skips_parsing():
+    text = "struct A { a: Missing }\n"
+    bdl_ast = parse_bdl(text)
+    result = lint_bdl(text, bdl_ast, standard=CONVENTIONAL)
+    assert result.ast is bdl_ast
+    assert "Cannot find name 'Missing'." in messages(result)
+
+
+# lint directives
+
+
+def test_get_disabled_lines():
+    text = lines(
+        "a // bdlc-lint-disable-line",
+        "b // bdlc-lint-disable-next-line",
+        "c",
+        "// bdlc-lint-disable",
+        "d",
+        "// bdlc-lint-enable",
+        "e",
+        "// bdlc-lint-disable-line bdlc-lint-disable-next-line",
+        "f",
+        "// bdlc-lint-unknown",
+    )
+    # The enabling line is still off.
+    assert get_disabled_lines(text) == {1, 3, 4, 5, 6, 8, 9}
+    assert get_disabled_lines("struct A {}\n") == set()
+
+
+def test_directives_filter_syntax_errors():
+    assert lint_bdl("struct A { // bdlc-lint-disable-line").diagnostics == []
+
+
+# engine
+
+
+class RecordingRule(LintRule):
+    """
+    Records every node it is subscribed to, and the runs it is started and
+    finished for.
+    """
+
+    name = "recording"
+
+    def __init__(self):
+        self.events: List[str] = []
+
+    def start(self, context: LintContext) -> None:
+        self.events.append("start")
+
+    def finish(self, context: LintContext) -> None:
+        self.events.append("finish")
+
+    def visit_module(self, node, parent, context: LintContext) -> None:
+        assert parent is None
+        self.events.append("module")
+
+    def visit_struct(self, node, parent, context: LintContext) -> None:
+        assert parent is context.bdl_ast
+        self.events.append(f"struct {context.get_text(node.name)}")
+
+    def visit_struct_field(self, node, parent, context: LintContext) -> None:
+        self.events.append(f"field {context.get_text(node.name)}")
+
+    def visit_attribute(self, node, parent, context: LintContext) -> None:
+        self.events.append(f"attribute {context.get_text(node.name)}")
+
+    def visit_type_expression(self, node, parent, context: LintContext) -> None:
+        self.events.append(f"type {context.get_text(node.value_type)}")
+
+
+def test_walk_visits_subscribed_nodes_in_order():
+    text = lines(
+        "# standard - conventional",
+        "@ description - a",
+        "struct A {",
+        "  @ deprecated",
+        "  a: string,",
+        "}",
+        "enum E { X }",
+        "union U {",
+        "  X(b: int32),",
+        "}",
+        "custom C = A",
+    )
+    rule = RecordingRule()
+    Linter([rule]).lint(text)
+    assert rule.events == [
+        "start",
+        "module",
+        "attribute standard",
+        "struct A",
+        "attribute description",
+        "field a",
+        "attribute deprecated",
+        "type string",
+        "field b",
+        "type int32",
+        "type A",
+        "finish",
+    ]
+
+
+def test_rules_see_only_their_node_kinds():
+    class EnumItemRule(LintRule):
+        def __init__(self):
+            self.items: List[str] = []
+
+        def visit_enum_item(self, node, parent, context: LintContext) -> None:
+            self.items.append(context.get_text(node.name))
+
+    rule = EnumItemRule()
+    linter = Linter([rule])
+    assert [kind for kind, handlers in linter._handlers.items() if handlers] == [
+        "EnumItem",
+        "start",
+        "finish",
+    ]
+    linter.lint(lines("enum E { X, Y }", "struct A { a: string }", "enum F { Z }"))
+    assert rule.items == ["X", "Y", "Z"]
+
+
+def test_start_resets_rule_state_between_runs():
+    linter = Linter([DuplicateNameRule()])
+    assert messages(linter.lint("struct A {}\nstruct A {}\n")) == [
+        "Duplicated name 'A'.",
+        "Duplicated name 'A'.",
+    ]
+    assert linter.lint("struct A {}\n").diagnostics == []
+    # A run cut short by a syntax error doesn't start the rules.
+    assert codes(linter.lint("struct A {")) == ["bdl/syntax"]
+    assert linter.lint("struct A {}\n").diagnostics == []
+
+
+def test_linter_runs_rules_together_as_apart():
+    text = lines(
+        "# standard - nope",
+        "@ nope",
+        "struct A { a: Missing, a: string }",
+        "struct A {}",
+    )
+    together = Linter(get_default_rules()).lint(text, standard=CONVENTIONAL)
+    apart = []
+    for rule in get_default_rules():
+        apart.extend(Linter([rule]).lint(text, standard=CONVENTIONAL).diagnostics)
+    apart.sort(key=lambda diagnostic: diagnostic.span.start)
+    assert sorted(together.diagnostics, key=repr) == sorted(apart, key=repr)
+    assert len(together.diagnostics) == 7
+
+
+def test_lint_profile():
+    text = lines("struct A { a: string, b: int32 }", "struct B { c: A }")
+    profile = LintProfile()
+    rule = RecordingRule()
+    linter = Linter([rule, DuplicateItemRule()])
+    expected = linter.lint(text, standard=CONVENTIONAL)
+    for _ in range(2):
+        result = linter.lint(text, standard=CONVENTIONAL, profile=profile)
+        assert result.diagnostics == expected.diagnostics
+    assert profile.runs == 2
+    assert list(profile.rules) == ["recording", "duplicate-item"]
+    # start, module, 2 structs, 3 fields, 3 types and finish, twice.
+    assert profile.rules["recording"].calls == 2 * 11
+    # start, 2 structs and finish, twice.
+    assert profile.rules["duplicate-item"].calls == 2 * 4
+    assert profile.seconds >= sum(t.seconds for t in profile.rules.values())
+    assert profile.walk_seconds >= 0
+    report = profile.report().splitlines()
+    assert report[0].split() == ["rule", "calls", "ms"]
+    assert report[-1].split()[:2] == ["(walk)", "2"]
+    assert len(profile.report(limit=1).splitlines()) == 3
+    # Without a profile, handlers aren't wrapped.
+    linter.lint(text, standard=CONVENTIONAL)
+    assert profile.runs == 2
+
+
+def test_lint_profile_names_unnamed_rules_by_class():
+    class Unnamed(LintRule):
+        pass
+
+    profile = LintProfile()
+    Linter([Unnamed()]).lint("struct A {}\n", profile=profile)
+    assert profile.rules["Unnamed"].calls == 2
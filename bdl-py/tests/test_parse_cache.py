@@ -0,0 +1,57 @@
+import os
+import pickle
+
+from bdl.parser.bdl_parser import parse_bdl
+from bdl.parser.parse_cache import ParseCache
+
+TEXT = "struct A {\n  a: string,\n}\n"
+
+
+class MakeDirectory:
+    """
+    Pickles to a call of `os.mkdir`, run by whoever unpickles it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __reduce__(self):
+        return (os.mkdir, (self.path,))
+
+
+def test_hit_and_miss(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    assert cache.parse(TEXT) == parse_bdl(TEXT)
+    assert (cache.hits, cache.misses) == (0, 1)
+    other = ParseCache(str(tmp_path))
+    assert other.parse(TEXT) == parse_bdl(TEXT)
+    assert (other.hits, other.misses) == (1, 0)
+
+
+def test_foreign_entries_are_reparsed(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    path = cache.get_path(cache.get_key(TEXT))
+    os.makedirs(os.path.dirname(path))
+    marker = tmp_path / "unpickled"
+    for data in [b"", b"garbage", pickle.dumps(MakeDirectory(str(marker)))]:
+        with open(path, "wb") as f:
+            f.write(data)
+        assert cache.parse(TEXT) == parse_bdl(TEXT)
+    assert (cache.hits, cache.misses) == (0, 3)
+    assert not marker.exists()
+    # The last parse replaced the entry.
+    assert ParseCache(str(tmp_path)).parse(TEXT) == parse_bdl(TEXT)
+
+
+def test_eviction(tmp_path):
+    cache = ParseCache(str(tmp_path), max_bytes=1)
+    texts = [f"struct A{i} {{}}\n" for i in range(3)]
+    for text in texts:
+        cache.parse(text)
+    entries = [
+        file_name
+        for _, _, files in os.walk(tmp_path)
+        for file_name in files
+        if file_name.endswith(".ast")
+    ]
+    assert len(entries) == 1
@@ -0,0 +1,250 @@
+import importlib
+import json
+import sys
+from typing import Any, Callable, Dict
+
+import pytest
+
+from bdl.generator.python import generate_python
+from bdl.ir import model as ir
+from bdl.ir.builder import ModuleFile, build_bdl_ir
+from bench.python_models import SampleMaker
+
+
+@pytest.fixture
+def load_models(tmp_path, monkeypatch) -> Callable[[ir.BdlIr], Dict[str, Any]]:
+    """
+    Generates the models of an IR into `tmp_path` and imports every module,
+    by module path. The modules are unloaded again after the test.
+    """
+    packages = set()
+
+    def load(bdl_ir: ir.BdlIr) -> Dict[str, Any]:
+        for file_path, code in generate_python(bdl_ir).files.items():
+            path = tmp_path / file_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(code, encoding="utf-8")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        importlib.invalidate_caches()
+        packages.update(module_path.split(".")[0] for module_path in bdl_ir.modules)
+        return {
+            module_path: importlib.import_module(module_path)
+            for module_path in bdl_ir.modules
+        }
+
+    yield load
+    for name in list(sys.modules):
+        if name.split(".")[0] in packages:
+            del sys.modules[name]
+
+
+def build_models_ir(text: str) -> ir.BdlIr:
+    """
+    IR of `text` as the module `models.test`.
+    """
+    modules = {"models.test": text}
+    return build_bdl_ir(list(modules), lambda path: ModuleFile(modules[path])).ir
+
+
+def get_converters(module: Any, definition: ir.Def) -> tuple:
+    """
+    `(from_json, to_json)` of a def.
+    """
+    if definition.type in ("Custom", "Oneof"):
+        name = definition.name
+        return getattr(module, f"{name}_from_json"), getattr(module, f"{name}_to_json")
+    cls = getattr(module, definition.name)
+    return cls.from_json, lambda value: value.to_json()
+
+
+# Defs whose payloads go through the oneof `Range`, where `{from, to}` also
+# matches the first item, `{from}`. Like the TypeScript runtime, decoding
+# takes the first item that matches, and `to` is lost.
+LOSSY_PORTONE_DEFS = {
+    "portone.v2.browserSdk.entity.OfferPeriod",
+    "portone.v2.browserSdk.request.IssueBillingKeyAndPayRequestBase",
+}
+
+
+def test_portone_models_round_trip(portone_ir, load_models):
+    modules = load_models(portone_ir)
+    maker = SampleMaker(portone_ir)
+    count = 0
+    for def_path, definition in portone_ir.defs.items():
+        if definition.type == "Proc":
+            continue
+        module_path = def_path.rsplit(".", 1)[0]
+        from_json, to_json = get_converters(modules[module_path], definition)
+        # Twice, so oneofs and unions are tried with more than one variant.
+        for _ in range(2):
+            payload = json.loads(
+                json.dumps(maker.make(ir.Plain(value_type_path=def_path), 0))
+            )
+            encoded = to_json(from_json(payload))
+            if def_path in LOSSY_PORTONE_DEFS:
+                assert to_json(from_json(encoded)) == encoded, def_path
+            else:
+                assert encoded == payload, def_path
+            count += 1
+    assert count > 3000
+
+
+def test_keyword_and_method_field_names_get_suffix(load_models):
+    module = load_models(
+        build_models_ir(
+            "struct Names {\n"
+            "  class: string,\n"
+            "  from_json: int32,\n"
+            "  to_json?: boolean,\n"
+            "  plain: string,\n"
+            "}\n"
+            "enum Kinds { None, lambda, Plain }\n"
+        )
+    )["models.test"]
+    payload = {"class": "a", "from_json": 1, "to_json": True, "plain": "b"}
+    names = module.Names.from_json(payload)
+    assert (names.class_, names.from_json_, names.to_json_, names.plain) == (
+        "a",
+        1,
+        True,
+        "b",
+    )
+    assert names.to_json() == payload
+    assert [member.name for member in module.Kinds] == ["None_", "lambda_", "Plain"]
+    assert module.Kinds.from_json("None") is module.Kinds.None_
+
+
+def test_missing_required_fields_get_zero_values(load_models):
+    module = load_models(
+        build_models_ir(
+            "struct Inner { a: string }\n"
+            "struct Fields {\n"
+            "  b: boolean,\n"
+            "  i: int32,\n"
+            "  l: int64,\n"
+            "  f: float64,\n"
+            "  s: string,\n"
+            "  y: bytes,\n"
+            "  o: object,\n"
+            "  a: string[],\n"
+            "  d: int32[string],\n"
+            "  n?: Inner,\n"
+            "}\n"
+            "struct Nested { inner: Inner }\n"
+        )
+    )["models.test"]
+    fields = module.Fields.from_json({})
+    assert fields == module.Fields(
+        b=False, i=0, l=0, f=0.0, s="", y=b"", o={}, a=[], d={}, n=None
+    )
+    assert fields.to_json() == {
+        "b": False,
+        "i": 0,
+        "l": 0,
+        "f": 0.0,
+        "s": "",
+        "y": "",
+        "o": {},
+        "a": [],
+        "d": {},
+    }
+    # A struct has no zero value.
+    with pytest.raises(KeyError):
+        module.Nested.from_json({})
+
+
+def test_numeric_strings_and_bytes_are_converted(load_models):
+    module = load_models(
+        build_models_ir("struct Values { i: int64, f: float64, y: bytes }\n")
+    )["models.test"]
+    values = module.Values.from_json({"i": "64", "f": "1.5", "y": "AAECAw=="})
+    assert (values.i, values.f, values.y) == (64, 1.5, b"\x00\x01\x02\x03")
+    assert values.to_json() == {"i": 64, "f": 1.5, "y": "AAECAw=="}
+
+
+def test_oneof_without_discriminator_decodes_by_shape(load_models):
+    module = load_models(
+        build_models_ir(
+            "struct Point { x: float64, y: float64 }\n"
+            "struct Named { name: string, x?: float64 }\n"
+            "oneof Value { int32, string, Point, Named, string[] }\n"
+        )
+    )["models.test"]
+    cases = [
+        (3, 3),
+        ("a", "a"),
+        ({"x": 1, "y": 2}, module.Point(x=1.0, y=2.0)),
+        ({"name": "n", "x": 1}, module.Named(name="n", x=1.0)),
+        (["a", "b"], ["a", "b"]),
+    ]
+    for payload, expected in cases:
+        value = module.Value_from_json(payload)
+        assert value == expected
+        assert type(value) is type(expected)
+        assert module.Value_to_json(value) == payload
+    # `True` is no `int32`, and a point needs both coordinates.
+    for payload in [True, {"x": 1}, None]:
+        with pytest.raises(ValueError, match="Invalid Value"):
+            module.Value_from_json(payload)
+    with pytest.raises(TypeError, match="Invalid Value"):
+        module.Value_to_json(1.5)
+
+
+def test_oneof_with_discriminator_decodes_by_mapping(load_models):
+    module = load_models(
+        build_models_ir(
+            "struct Card { type: string, number: string }\n"
+            "struct Cash { type: string, amount?: int64 }\n"
+            "@ discriminator - type\n"
+            "oneof Method {\n"
+            "  @ mapping - CARD\n"
+            "  Card,\n"
+            "  @ mapping - CASH\n"
+            "  Cash,\n"
+            "}\n"
+        )
+    )["models.test"]
+    # Decoded by the discriminator alone, not by the shape.
+    cash = module.Method_from_json({"type": "CASH", "number": "1"})
+    assert cash == module.Cash(type="CASH", amount=None)
+    card = module.Method_from_json({"type": "CARD", "number": "1"})
+    assert card == module.Card(type="CARD", number="1")
+    assert module.Method_to_json(card) == {"type": "CARD", "number": "1"}
+    with pytest.raises(ValueError, match="Invalid Method type: 'BANK'"):
+        module.Method_from_json({"type": "BANK"})
+
+
+def test_union_items_carry_the_discriminator(load_models):
+    module = load_models(
+        build_models_ir(
+            "@ discriminator - kind\n"
+            "union Event {\n"
+            "  Created(id: string),\n"
+            "  Deleted,\n"
+            "}\n"
+            "union Plain { A(a?: int32) }\n"
+        )
+    )["models.test"]
+    created = module.Event.from_json({"kind": "Created", "id": "1"})
+    assert created == module.Event_Created(id="1")
+    assert isinstance(created, module.Event)
+    assert created.kind == "Created"
+    assert created.to_json() == {"kind": "Created", "id": "1"}
+    assert module.Event.from_json({"kind": "Deleted"}).to_json() == {"kind": "Deleted"}
+    assert module.Plain.from_json({"type": "A"}).to_json() == {"type": "A"}
+    with pytest.raises(ValueError, match="Invalid Event kind"):
+        module.Event.from_json({"kind": "Updated"})
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "union U { A(type: string) }\n",
+        "@ discriminator - kind\nunion U { A(kind?: string) }\n",
+        # A keyword discriminator is compared by its Python name.
+        "@ discriminator - class\nunion U { A(class: string) }\n",
+    ],
+)
+def test_field_named_after_union_discriminator_is_an_error(text):
+    with pytest.raises(ValueError, match="U_A has a field named after its discr"):
+        generate_python(build_models_ir(text))
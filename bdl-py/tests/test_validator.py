@@ -0,0 +1,437 @@
+import pytest
+
+from bdl.ir import model as ir
+from bdl.ir.builder import ModuleFile, build_bdl_ir
+from bdl.validator import INT32_MAX, INT32_MIN, INT64_MAX, INT64_MIN, JsonValidator
+
+SCHEMA = """
+struct Address {
+  city: string,
+  zip?: string,
+}
+
+struct User {
+  id: int64,
+  name: string,
+  tags: string[],
+  role: Role,
+  age?: int32,
+  scores?: float64[string],
+  address?: Address,
+  friends?: User[],
+  avatar?: bytes,
+  extra?: object,
+  flag?: boolean,
+  count?: integer,
+  nothing?: void,
+  when?: datetime,
+}
+
+enum Role {
+  Admin,
+  @ value - member
+  Member,
+}
+
+union Event {
+  Created(id: string),
+  Deleted,
+}
+
+@ discriminator - kind
+union Tagged {
+  A(a: int32),
+}
+
+oneof IdOrName {
+  int32,
+  string,
+}
+
+struct Card {
+  type: string,
+  number: string,
+}
+
+struct Cash {
+  type: string,
+  amount: int64,
+}
+
+@ discriminator - type
+oneof Payment {
+  @ mapping - CARD
+  Card,
+  @ mapping - CASH
+  Cash,
+}
+
+struct Node {
+  value: int32,
+  next?: Node,
+  children?: Node[],
+}
+
+custom Id = int64
+custom Ids = Id[]
+
+proc GetUser = Id -> User
+"""
+
+
+def build_test_ir(text: str) -> ir.BdlIr:
+    modules = {"test": text}
+    return build_bdl_ir(list(modules), lambda path: ModuleFile(modules[path])).ir
+
+
+@pytest.fixture(scope="module")
+def test_ir() -> ir.BdlIr:
+    return build_test_ir(SCHEMA)
+
+
+@pytest.fixture
+def validator(test_ir) -> JsonValidator:
+    return JsonValidator(test_ir)
+
+
+def issue_of(validator: JsonValidator, type_path: str, value):
+    """
+    `(message, path)` of the issue of `value`, `None` if it is valid.
+    """
+    issue = validator.validate(f"test.{type_path}", value)
+    return None if issue is None else (issue.message, issue.path)
+
+
+def make_user(**fields) -> dict:
+    return {"id": 1, "name": "a", "tags": [], "role": "Admin", **fields}
+
+
+def test_valid_user(validator):
+    user = make_user(
+        age=3,
+        scores={"a": 1, "b": 1.5},
+        address={"city": "c", "zip": None},
+        friends=[make_user()],
+        avatar="AAECAw==",
+        extra={"key": [1]},
+        flag=False,
+        count="12",
+        nothing=[None],
+        when="2024-01-01T00:00:00Z",
+        unknown=object(),
+    )
+    assert issue_of(validator, "User", user) is None
+
+
+def test_required_and_optional_fields(validator):
+    user = make_user()
+    del user["name"]
+    assert issue_of(validator, "User", user) == ("field is required", ["name"])
+    assert issue_of(validator, "User", make_user(id=None)) == (
+        "field is required",
+        ["id"],
+    )
+    # Optional fields may be missing or `null`.
+    assert issue_of(validator, "User", make_user(age=None, address=None)) is None
+    assert issue_of(validator, "User", make_user(age="3")) == (
+        "value is not int32",
+        ["age"],
+    )
+    assert issue_of(validator, "User", make_user(address={})) == (
+        "field is required",
+        ["address", "city"],
+    )
+
+
+def test_first_issue_is_reported(validator):
+    user = make_user(name=1, role="Nope")
+    assert issue_of(validator, "User", user) == ("value is not string", ["name"])
+
+
+def test_struct_needs_an_object(validator):
+    for value in [None, [], "a", 1]:
+        assert issue_of(validator, "User", value) == ("value is not object", [])
+    assert issue_of(validator, "User", make_user(address="a")) == (
+        "value is not object",
+        ["address"],
+    )
+
+
+def test_exact_type_primitives(validator):
+    assert issue_of(validator, "User", make_user(name=b"a")) == (
+        "value is not string",
+        ["name"],
+    )
+    assert issue_of(validator, "User", make_user(flag=0)) == (
+        "value is not boolean",
+        ["flag"],
+    )
+    assert issue_of(validator, "User", make_user(extra=[])) == (
+        "value is not object",
+        ["extra"],
+    )
+
+
+def test_arrays(validator):
+    assert issue_of(validator, "User", make_user(tags="a")) == (
+        "value is not array",
+        ["tags"],
+    )
+    assert issue_of(validator, "User", make_user(tags=["a", 1])) == (
+        "value is not string",
+        ["tags", 1],
+    )
+    friends = [make_user(), make_user(id="x")]
+    assert issue_of(validator, "User", make_user(friends=friends)) == (
+        "value is not int64",
+        ["friends", 1, "id"],
+    )
+
+
+def test_dictionaries(validator):
+    assert issue_of(validator, "User", make_user(scores=[])) == (
+        "value is not object",
+        ["scores"],
+    )
+    assert issue_of(validator, "User", make_user(scores={"a": 1, "b": "x"})) == (
+        "value is not float64",
+        ["scores", "b"],
+    )
+
+
+def test_customs(validator):
+    assert issue_of(validator, "Id", "12") is None
+    assert issue_of(validator, "Ids", [1, "2"]) is None
+    assert issue_of(validator, "Ids", [1, "x"]) == ("value is not int64", [1])
+
+
+def test_union_discriminator(validator):
+    assert issue_of(validator, "Event", {"type": "Created", "id": "1"}) is None
+    assert issue_of(validator, "Event", {"type": "Deleted"}) is None
+    assert issue_of(validator, "Event", {"type": "Created"}) == (
+        "field is required",
+        ["id"],
+    )
+    assert issue_of(validator, "Event", {"id": "1"}) == (
+        "value has no discriminator field",
+        [],
+    )
+    assert issue_of(validator, "Event", {"type": None}) == (
+        "value has no discriminator field",
+        [],
+    )
+    for kind in ["Updated", 1, ["Created"]]:
+        assert issue_of(validator, "Event", {"type": kind}) == (
+            "invalid discriminator",
+            ["type"],
+        )
+    assert issue_of(validator, "Event", "Created") == ("value is not object", [])
+
+
+def test_union_discriminator_attribute(validator):
+    assert issue_of(validator, "Tagged", {"kind": "A", "a": 1}) is None
+    assert issue_of(validator, "Tagged", {"type": "A", "a": 1}) == (
+        "value has no discriminator field",
+        [],
+    )
+    assert issue_of(validator, "Tagged", {"kind": "A", "a": "1"}) == (
+        "value is not int32",
+        ["a"],
+    )
+
+
+def test_enum_membership(validator):
+    # Items are matched by their `value` attribute, or by their name.
+    assert issue_of(validator, "Role", "Admin") is None
+    assert issue_of(validator, "Role", "member") is None
+    assert issue_of(validator, "Role", "Member") == ("value is not in enum", [])
+    assert issue_of(validator, "Role", 1) == ("value is not string", [])
+    assert issue_of(validator, "User", make_user(role="admin")) == (
+        "value is not in enum",
+        ["role"],
+    )
+
+
+def test_oneof(validator):
+    assert issue_of(validator, "IdOrName", 1) is None
+    assert issue_of(validator, "IdOrName", "a") is None
+    for value in [True, 1.5, None, []]:
+        assert issue_of(validator, "IdOrName", value) == (
+            "value does not match any type",
+            [],
+        )
+
+
+def test_discriminated_oneof(validator):
+    assert issue_of(validator, "Payment", {"type": "CASH", "amount": "5"}) is None
+    # Only the mapped item is checked, though the value is a valid card.
+    card = {"type": "CASH", "number": "1"}
+    assert issue_of(validator, "Payment", card) == ("field is required", ["amount"])
+    assert issue_of(validator, "Payment", {"type": "BANK"}) == (
+        "invalid discriminator",
+        ["type"],
+    )
+    assert issue_of(validator, "Payment", {"number": "1"}) == (
+        "value has no discriminator field",
+        [],
+    )
+
+
+@pytest.mark.parametrize(
+    "value, valid",
+    [
+        (0, True),
+        (INT32_MAX, True),
+        (INT32_MIN, True),
+        (INT32_MAX + 1, False),
+        (INT32_MIN - 1, False),
+        (2.0, True),
+        (1.5, False),
+        ("1", False),
+        (True, False),
+    ],
+)
+def test_int32_bounds(validator, value, valid):
+    expected = None if valid else ("value is not int32", ["age"])
+    assert issue_of(validator, "User", make_user(age=value)) == expected
+
+
+@pytest.mark.parametrize(
+    "value, valid",
+    [
+        (INT64_MAX, True),
+        (INT64_MIN, True),
+        (INT64_MAX + 1, False),
+        (INT64_MIN - 1, False),
+        (str(INT64_MAX), True),
+        (str(INT64_MAX + 1), False),
+        ("-12", True),
+        ("1.5", False),
+        ("x", False),
+        (3.0, True),
+        (3.5, False),
+        (False, False),
+    ],
+)
+def test_int64_bounds_and_numeric_strings(validator, value, valid):
+    expected = None if valid else ("value is not int64", ["id"])
+    assert issue_of(validator, "User", make_user(id=value)) == expected
+
+
+@pytest.mark.parametrize(
+    "value, valid",
+    [(INT64_MAX * 4, True), (str(INT64_MIN * 4), True), ("1e3", False), (None, True)],
+)
+def test_integer_is_unbounded(validator, value, valid):
+    expected = None if valid else ("value is not integer", ["count"])
+    assert issue_of(validator, "User", make_user(count=value)) == expected
+
+
+@pytest.mark.parametrize(
+    "value, valid", [(1, True), (1.5, True), ("1.5", False), (True, False)]
+)
+def test_float64(validator, value, valid):
+    expected = None if valid else ("value is not float64", ["scores", "a"])
+    assert issue_of(validator, "User", make_user(scores={"a": value})) == expected
+
+
+@pytest.mark.parametrize(
+    "value, valid",
+    [
+        ("", True),
+        ("AAECAw==", True),
+        ("AAECAw=", False),
+        ("AAEC*w==", False),
+        ("AAE CAw==", False),
+        (b"AAECAw==", False),
+    ],
+)
+def test_base64_bytes(validator, value, valid):
+    expected = None if valid else ("value is not base64 bytes", ["avatar"])
+    assert issue_of(validator, "User", make_user(avatar=value)) == expected
+
+
+def test_self_referencing_defs(validator):
+    node = {"value": 1, "next": {"value": 2, "next": {"value": 3}}}
+    assert issue_of(validator, "Node", node) is None
+    node["next"]["next"]["value"] = "3"
+    assert issue_of(validator, "Node", node) == (
+        "value is not int32",
+        ["next", "next", "value"],
+    )
+    node = {"value": 1, "children": [{"value": 2}, {"value": 3, "children": [{}]}]}
+    assert issue_of(validator, "Node", node) == (
+        "field is required",
+        ["children", 1, "children", 0, "value"],
+    )
+    friend = make_user(friends=[make_user(friends=[make_user(tags=None)])])
+    assert issue_of(validator, "User", friend) == (
+        "field is required",
+        ["friends", 0, "friends", 0, "tags"],
+    )
+
+
+def test_primitive_checks(test_ir):
+    validator = JsonValidator(
+        test_ir,
+        primitive_checks={
+            "datetime": lambda value: isinstance(value, str) and "T" in value,
+            # Overrides a built-in check, including the inline ones.
+            "string": lambda value: isinstance(value, str) and value != "",
+        },
+    )
+    assert issue_of(validator, "User", make_user(when="2024-01-01T00:00")) is None
+    assert issue_of(validator, "User", make_user(when="2024-01-01")) == (
+        "value is not datetime",
+        ["when"],
+    )
+    assert issue_of(validator, "User", make_user(name="")) == (
+        "value is not string",
+        ["name"],
+    )
+    assert issue_of(validator, "User", make_user(tags=["a", ""])) == (
+        "value is not string",
+        ["tags", 1],
+    )
+    # Without a check, a primitive the standard adds takes anything.
+    assert issue_of(JsonValidator(test_ir), "User", make_user(when=1)) is None
+
+
+def test_validate_many(validator):
+    records = [make_user(), make_user(tags=[1]), None, make_user()]
+    issues = validator.validate_many("test.User", records)
+    assert [issue and (issue.message, issue.path) for issue in issues] == [
+        None,
+        ("value is not string", ["tags", 0]),
+        ("value is not object", []),
+        None,
+    ]
+    # Issues are new each time, so paths aren't reversed twice.
+    assert validator.validate("test.User", records[1]).path == ["tags", 0]
+    assert validator.validate("test.User", records[1]).path == ["tags", 0]
+
+
+def test_checks_are_compiled_once(validator):
+    check = validator.get_check("test.User")
+    assert validator.get_check("test.User") is check
+    assert validator.get_check("test.Node") is validator.get_check("test.Node")
+
+
+def test_unknown_and_non_data_types(validator):
+    with pytest.raises(ValueError, match="Unknown type: test.Missing"):
+        validator.get_check("test.Missing")
+    with pytest.raises(ValueError, match="Not a data type: test.GetUser"):
+        validator.get_check("test.GetUser")
+
+
+def test_portone_samples_are_valid(portone_ir):
+    # `bench.python_models.SampleMaker` builds values of every def.
+    from bench.python_models import SampleMaker
+
+    validator = JsonValidator(portone_ir)
+    maker = SampleMaker(portone_ir)
+    for def_path, definition in portone_ir.defs.items():
+        if definition.type == "Proc":
+            continue
+        value = maker.make(ir.Plain(value_type_path=def_path), 0)
+        assert validator.validate(def_path, value) is None, def_path